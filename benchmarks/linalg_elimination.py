@@ -0,0 +1,95 @@
+# PyZX - Python library for quantum circuit rewriting
+#        and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the Gaussian elimination paths of :mod:`pyzx.linalg` on random
+square matrices over Z2:
+
+- ``list``: :meth:`Mat2.gauss` on lists of ints,
+- ``packed``: :meth:`PackedMat2.gauss`, the same blocked elimination on packed rows,
+- ``m4ri``: :meth:`PackedMat2.gauss_m4ri`, the Method of Four Russians.
+
+Each path computes the reduced echelon form and the inverse. Run as::
+
+    python benchmarks/linalg_elimination.py --sizes 250 500 1000 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pyzx.linalg import Mat2, PackedMat2
+
+
+def timed(f: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+def list_inverse(data: List[List[int]]) -> None:
+    # Mat2.inverse would switch to PackedMat2 for large matrices
+    m = Mat2([list(row) for row in data])
+    inv = Mat2.id(m.rows())
+    m.gauss(x=inv, full_reduce=True)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 250, 500, 1000, 2000])
+    parser.add_argument('--repeat', type=int, default=3, help='report the best of this many runs')
+    parser.add_argument('--max-list-size', type=int, default=500,
+                        help='skip the list-based path for larger matrices, as it is very slow')
+    parser.add_argument('--seed', type=int, default=1337)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    old_min_size = Mat2.PACKED_MIN_SIZE
+    Mat2.PACKED_MIN_SIZE = 2**62
+    try:
+        print('{:>6} {:>12} {:>12} {:>12} {:>12} {:>12} {:>12}'.format(
+            'n', 'list rref', 'packed rref', 'm4ri rref', 'list inv', 'packed inv', 'm4ri inv'))
+        for n in args.sizes:
+            a = rng.integers(0, 2, size=(n, n), dtype=np.uint8)
+            data = a.tolist()
+            def packed_inverse() -> None:
+                m = PackedMat2(a)
+                m.gauss(x=PackedMat2.id(n), full_reduce=True)
+            times: List[Optional[float]] = []
+            if n <= args.max_list_size:
+                times.append(timed(lambda: Mat2([list(row) for row in data]).gauss(full_reduce=True, pivot_cols=[]), args.repeat))
+            else:
+                times.append(None)
+            times.append(timed(lambda: PackedMat2(a).gauss(full_reduce=True), args.repeat))
+            times.append(timed(lambda: PackedMat2(a).gauss_m4ri(full_reduce=True), args.repeat))
+            if n <= args.max_list_size:
+                times.append(timed(lambda: list_inverse(data), args.repeat))
+            else:
+                times.append(None)
+            times.append(timed(packed_inverse, args.repeat))
+            times.append(timed(lambda: PackedMat2(a).inverse(), args.repeat))
+            print('{:>6} '.format(n) + ' '.join('{:>12}'.format('-' if t is None else '{:.4f}s'.format(t)) for t in times))
+    finally:
+        Mat2.PACKED_MIN_SIZE = old_min_size
+
+
+if __name__ == '__main__':
+    main()
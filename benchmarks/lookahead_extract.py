@@ -0,0 +1,97 @@
+# PyZX - Python library for quantum circuit rewriting
+#        and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the wall time of :func:`pyzx.extract.lookahead_fast`, :func:`pyzx.extract.lookahead_extract` and
+:func:`pyzx.extract.lookahead_full` with and without worker processes, on the circuits of the ``circuits/`` corpus.
+Each circuit is fully reduced and then extracted sequentially and with each of the given numbers of workers.
+The extracted circuits are checked to be the same. Run as::
+
+    python benchmarks/lookahead_extract.py circuits/Fast --workers 2 4 --functions fast extract
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pyzx.circuit import Circuit
+from pyzx.extract import lookahead_fast, lookahead_extract, lookahead_full
+from pyzx.simplify import full_reduce
+
+FUNCTIONS = {'fast': lookahead_fast, 'extract': lookahead_extract, 'full': lookahead_full}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', default=['circuits/Fast'],
+                        help='circuit files or directories of circuits')
+    parser.add_argument('--functions', nargs='+', default=list(FUNCTIONS), choices=list(FUNCTIONS),
+                        help='the lookahead extractions to compare')
+    parser.add_argument('--workers', type=int, nargs='+', default=[os.cpu_count() or 1],
+                        help='the numbers of worker processes to compare')
+    parser.add_argument('--depth', action='store_true', help='optimize for depth instead of two qubit gates')
+    parser.add_argument('--max-qubits', type=int, default=50, help='skip circuits with more qubits')
+    parser.add_argument('--max-gates', type=int, default=2000, help='skip circuits with more gates')
+    args = parser.parse_args()
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(sorted(f for f in glob.glob(os.path.join(path, '*')) if os.path.isfile(f)))
+        else:
+            files.append(path)
+
+    header = '{:<28} {:>6} {:<8} {:>7} {:>10}'.format('circuit', 'qubits', 'function', '2q', 'sequential')
+    for w in args.workers:
+        header += ' {:>10} {:>7}'.format('{} worker{}'.format(w, 's' if w > 1 else ''), 'speedup')
+    print(header)
+    totals = {name: [0.0] * (len(args.workers) + 1) for name in args.functions}
+    for fname in files:
+        try:
+            c = Circuit.load(fname)
+        except Exception:
+            continue
+        if c.qubits > args.max_qubits or len(c.gates) > args.max_gates:
+            continue
+        g = c.to_graph()
+        full_reduce(g)
+        for name in args.functions:
+            extract = FUNCTIONS[name]
+            t = time.perf_counter()
+            expected = extract(g.clone(), args.depth)
+            elapsed = time.perf_counter() - t
+            totals[name][0] += elapsed
+            row = '{:<28} {:>6} {:<8} {:>7} {:>9.3f}s'.format(
+                os.path.basename(fname)[:28], c.qubits, name, expected.twoqubitcount(), elapsed)
+            for i, w in enumerate(args.workers):
+                t = time.perf_counter()
+                result = extract(g.clone(), args.depth, max_workers=w)
+                par_elapsed = time.perf_counter() - t
+                totals[name][i + 1] += par_elapsed
+                row += ' {:>9.3f}s {:>6.2f}x'.format(par_elapsed, elapsed / par_elapsed)
+                if [str(gate) for gate in result.gates] != [str(gate) for gate in expected.gates]:
+                    row += ' (mismatch)'
+            print(row, flush=True)
+    for name, total in totals.items():
+        for w, par_total in zip(args.workers, total[1:]):
+            print('total {}: sequential {:.3f}s, {} workers {:.3f}s ({:.2f}x)'.format(
+                name, total[0], w, par_total, total[0] / par_total if par_total else 0.0))
+
+
+if __name__ == '__main__':
+    main()
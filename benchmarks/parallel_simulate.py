@@ -0,0 +1,112 @@
+# PyZX - Python library for quantum circuit rewriting
+#        and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares :func:`pyzx.simulation.simulate` with :func:`pyzx.simulation.parallel_simulate`
+on amplitudes of the circuits of the ``circuits/`` corpus. Most of these circuits are classical
+reversible circuits, whose amplitudes on computational basis states are trivial, so for a circuit
+``C`` the amplitude ``<0...0| C (H T)^n C |+...+>`` is computed instead. Only the amplitudes
+whose diagram has a T-count between ``--min-tcount`` and ``--max-tcount`` after simplification
+are computed, and only for Clifford+T circuits. Run as::
+
+    python benchmarks/parallel_simulate.py circuits/Fast --workers 1 2 4 --depth 2
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pyzx.circuit import Circuit
+from pyzx.simplify import full_reduce, tcount
+from pyzx.simulation import Strategy, simulate, parallel_simulate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', default=['circuits/Fast'],
+                        help='circuit files or directories of circuits')
+    parser.add_argument('--strategy', default='bss', choices=[s.value for s in Strategy],
+                        help='the decomposition strategy to use')
+    parser.add_argument('--workers', type=int, nargs='+', default=[os.cpu_count() or 1],
+                        help='the numbers of worker processes to compare')
+    parser.add_argument('--depth', type=int, default=2, help='the depth at which to split the decomposition')
+    parser.add_argument('--min-tcount', type=int, default=8)
+    parser.add_argument('--max-tcount', type=int, default=40)
+    parser.add_argument('--max-circuit-tcount', type=int, default=80,
+                        help='skip larger circuits, which take long to simplify')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    kind = Strategy(args.strategy)
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(sorted(f for f in glob.glob(os.path.join(path, '*')) if os.path.isfile(f)))
+        else:
+            files.append(path)
+
+    header = '{:<36} {:>6} {:>6} {:>10}'.format('circuit', 'qubits', 'tcount', 'sequential')
+    for w in args.workers:
+        header += ' {:>10} {:>7}'.format('{} worker{}'.format(w, 's' if w > 1 else ''), 'speedup')
+    print(header)
+    total_seq = 0.0
+    total_par = {w: 0.0 for w in args.workers}
+    for fname in files:
+        try:
+            c = Circuit.load(fname)
+        except Exception:
+            continue
+        if tcount(c) > args.max_circuit_tcount:
+            continue
+        n = c.qubits
+        c2 = c.copy()
+        for q in range(n):
+            c2.add_gate('T', q)
+            c2.add_gate('HAD', q)
+        c2.add_circuit(c)
+        g = c2.to_graph()
+        g.apply_state('+' * n)
+        g.apply_effect('0' * n)
+        full_reduce(g)
+        t_count = tcount(g)
+        if not args.min_tcount <= t_count <= args.max_tcount:
+            continue
+        if any(phase.denominator > 4 for phase in g.phases().values()):
+            continue  # the decompositions only handle Clifford+T diagrams
+
+        t = time.perf_counter()
+        expected = simulate(kind, g.copy())
+        elapsed = time.perf_counter() - t
+        total_seq += elapsed
+        row = '{:<36} {:>6} {:>6} {:>9.3f}s'.format(os.path.basename(fname)[:36], n, t_count, elapsed)
+        for w in args.workers:
+            t = time.perf_counter()
+            val = parallel_simulate(kind, g.copy(), depth=args.depth, max_workers=w, seed=args.seed)
+            par_elapsed = time.perf_counter() - t
+            total_par[w] += par_elapsed
+            row += ' {:>9.3f}s {:>6.2f}x'.format(par_elapsed, elapsed / par_elapsed)
+            if abs(val - expected) > 1e-9 * max(1.0, abs(expected)):
+                row += ' (mismatch)'
+        print(row, flush=True)
+    for w, total in total_par.items():
+        print('total: sequential {:.3f}s, {} workers {:.3f}s ({:.2f}x)'.format(
+            total_seq, w, total, total_seq / total if total else 0.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# PyZX - Python library for quantum circuit rewriting
+#        and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Times :func:`pyzx.rank_width.tensorfy_rw` on the circuits of the ``circuits/``
+corpus. Every circuit gets a random product state of ``0``, ``1``, ``+`` and ``-`` on
+its inputs and a random computational basis effect on its outputs, so that the result
+is a single amplitude, and circuits whose rank-decomposition is wider than ``--max-width``
+are skipped. With ``--check`` the amplitudes are compared against the ``greedy`` strategy
+of :func:`pyzx.tensor.tensorfy`, where it fits in 1 GiB of memory. Run as::
+
+    python benchmarks/rank_width.py circuits/Fast --strategy rw-auto
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pyzx.circuit import Circuit
+from pyzx.simplify import full_reduce
+from pyzx.rank_width import generate_decomposition, rank_width, rank_score_flops, tensorfy_rw
+from pyzx.tensor import tensorfy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', default=['circuits/Fast'],
+                        help='circuit files or directories of circuits')
+    parser.add_argument('--strategy', default='rw-auto', choices=['rw-auto', 'rw-greedy-b2t', 'rw-greedy-linear'])
+    parser.add_argument('--max-width', type=int, default=18, help='skip circuits with a wider decomposition')
+    parser.add_argument('--check', action='store_true', help='compare with the greedy tensor contraction')
+    parser.add_argument('--seed', type=int, default=1337)
+    args = parser.parse_args()
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(sorted(f for f in glob.glob(os.path.join(path, '*')) if os.path.isfile(f)))
+        else:
+            files.append(path)
+
+    rng = random.Random(args.seed)
+    total = 0.0
+    print('{:<36} {:>6} {:>6} {:>6} {:>8} {:>10}'.format('circuit', 'qubits', 'gates', 'width', 'score', 'time'))
+    for fname in files:
+        try:
+            c = Circuit.load(fname)
+        except Exception:
+            continue
+        g = c.to_graph()
+        g.apply_state(''.join(rng.choice('01+-') for _ in range(c.qubits)))
+        g.apply_effect(''.join(rng.choice('01') for _ in range(c.qubits)))
+        h = g.copy()
+        full_reduce(h)
+        decomp = generate_decomposition(h, strategy=args.strategy)
+        width = rank_width(decomp, h) if decomp is not None else 0
+        score = rank_score_flops(decomp, h) if decomp is not None else 0
+        row = '{:<36} {:>6} {:>6} {:>6} {:>8.2f} '.format(os.path.basename(fname)[:36], c.qubits, len(c.gates), width, score)
+        if width > args.max_width:
+            print(row + '{:>10}'.format('skipped'), flush=True)
+            continue
+        t = time.perf_counter()
+        amp = tensorfy_rw(g, strategy=args.strategy)
+        elapsed = time.perf_counter() - t
+        total += elapsed
+        if args.check:
+            try:
+                if not np.allclose(amp, tensorfy(h, memory_limit=2**30)):
+                    row += '(mismatch) '
+            except MemoryError:
+                row += '(unchecked) '
+        print(row + '{:>9.3f}s'.format(elapsed), flush=True)
+    print('total {:.3f}s'.format(total))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# PyZX - Python library for quantum circuit rewriting
+#        and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Times :func:`pyzx.simplify.teleport_reduce` on the circuits of the ``circuits/``
+corpus, and separately the time spent in :meth:`pyzx.simplify.Simplifier.fuse_phases`,
+which records where the phases of fused spiders end up. Every circuit is also repeated
+``--repeat`` times in sequence, so that the cost per fusion can be compared as the
+diagram grows; it should stay roughly constant. With ``--check`` the reduced circuits
+are verified to be equal to the original ones. Run as::
+
+    python benchmarks/teleport_reduce.py circuits/Fast --repeat 1 4 16
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pyzx.circuit import Circuit
+from pyzx.simplify import Simplifier
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', default=['circuits/Fast'],
+                        help='circuit files or directories of circuits')
+    parser.add_argument('--repeat', type=int, nargs='+', default=[1, 4, 16],
+                        help='the number of copies of each circuit to compose')
+    parser.add_argument('--check', action='store_true', help='verify the reduced circuits')
+    args = parser.parse_args()
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(sorted(f for f in glob.glob(os.path.join(path, '*')) if os.path.isfile(f)))
+        else:
+            files.append(path)
+
+    totals = {k: 0.0 for k in args.repeat}
+    print('{:<36} {:>6} {:>8} {:>10} {:>8} {:>10} {:>10}'.format(
+        'circuit', 'repeat', 'vertices', 'time', 'fusions', 'tracking', 'us/fusion'))
+    for fname in files:
+        try:
+            c = Circuit.load(fname)
+        except Exception:
+            continue
+        for k in args.repeat:
+            ck = Circuit(c.qubits)
+            for _ in range(k): ck.add_circuit(c)
+            g = ck.to_graph()
+            n = g.num_vertices()
+            t = time.perf_counter()
+            s = Simplifier(g)
+            fuse_phases = s.fuse_phases
+            tracking = [0.0, 0]
+            def timed_fuse_phases(i1: int, i2: int) -> None:
+                t = time.perf_counter()
+                fuse_phases(i1, i2)
+                tracking[0] += time.perf_counter() - t
+                tracking[1] += 1
+            s.fuse_phases = timed_fuse_phases  # type: ignore
+            s.full_reduce()
+            elapsed = time.perf_counter() - t
+            totals[k] += tracking[0]
+            row = '{:<36} {:>6} {:>8} {:>9.3f}s {:>8} {:>9.3f}s {:>10.1f}'.format(
+                os.path.basename(fname)[:36], k, n, elapsed, tracking[1], tracking[0],
+                1e6 * tracking[0] / max(tracking[1], 1))
+            if args.check and not ck.verify_equality(Circuit.from_graph(s.mastergraph)):
+                row += ' (mismatch)'
+            print(row, flush=True)
+    for k, total in totals.items():
+        print('total tracking time for repeat {}: {:.3f}s'.format(k, total))
+
+
+if __name__ == '__main__':
+    main()
@@ -16,50 +16,131 @@
 
 __version__ = "0.10.5"
 
-from .graph.graph import Graph
-from .circuit import Circuit, gates, id
-from .linalg import Mat2
-from .utils import settings, VertexType, EdgeType, original_colors, rgb_colors, grayscale_colors
-from .quimb import to_quimb_tensor
-from .drawing import *
-from .simplify import *
-from .optimize import *
-from .extract import *
-from .graph.jsonparser import *
-from .tensor import *
-from .local_search.simulated_annealing import anneal
-from .local_search.genetic import GeneticOptimizer
-from .circuit.qasmparser import qasm
-from .circuit.sqasm import sqasm
-from . import generate
-from . import todd
-from . import linalg
-from . import extract
-from .rewrite_rules import *
-from . import optimize
-from . import simplify
-from . import hsimplify
-from . import ft_simplify
-from . import d3
-from . import tikz
-from . import simulate
-from . import editor
-from . import routing
-from . import local_search
-from .routing.parity_maps import CNOT_tracker
-from . import simulation
-
-# some common scalars
-from .graph.base import Scalar
-ONE = Scalar()
-SQRT_TWO = Scalar()
-SQRT_TWO.add_power(1)
-TWO = Scalar()
-TWO.add_power(2)
-SQRT_TWO_INV = Scalar()
-SQRT_TWO_INV.add_power(-1)
-TWO_INV = Scalar()
-TWO_INV.add_power(-2)
+# The public names of PyZX are imported on first access (PEP 562), so that
+# ``import pyzx`` is cheap and e.g. a worker process that only calls
+# ``full_reduce`` never loads the drawing, editor or routing code.
+
+import importlib
+import importlib.util
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+# name -> (module relative to this package, attribute in that module)
+_lazy_attrs: Dict[str, Tuple[str, str]] = {
+    'Graph': ('.graph.graph', 'Graph'),
+    'Circuit': ('.circuit', 'Circuit'),
+    'gates': ('.circuit', 'gates'),
+    'id': ('.circuit', 'id'),
+    'Mat2': ('.linalg', 'Mat2'),
+    'settings': ('.utils', 'settings'),
+    'VertexType': ('.utils', 'VertexType'),
+    'EdgeType': ('.utils', 'EdgeType'),
+    'original_colors': ('.utils', 'original_colors'),
+    'rgb_colors': ('.utils', 'rgb_colors'),
+    'grayscale_colors': ('.utils', 'grayscale_colors'),
+    'to_quimb_tensor': ('.quimb', 'to_quimb_tensor'),
+    'anneal': ('.local_search.simulated_annealing', 'anneal'),
+    'GeneticOptimizer': ('.local_search.genetic', 'GeneticOptimizer'),
+    'qasm': ('.circuit.qasmparser', 'qasm'),
+    'sqasm': ('.circuit.sqasm', 'sqasm'),
+    'CNOT_tracker': ('.routing.parity_maps', 'CNOT_tracker'),
+    'Scalar': ('.graph.base', 'Scalar'),
+}
+
+# the modules whose ``__all__`` is exported from this package, checked by tests/test_init.py
+_star_exports: Dict[str, List[str]] = {
+    '.drawing': ['draw', 'arrange_scalar_diagram', 'draw_matplotlib', 'draw_d3', 'draw_3d',
+                 'matrix_to_latex', 'print_matrix', 'graphs_to_gif'],
+    '.simplify': ['bialg_simp', 'bialg_op_simp', 'spider_simp', 'id_simp', 'phase_free_simp',
+                  'pivot_simp', 'remove_self_loop_simp', 'pivot_gadget_simp', 'pivot_boundary_simp',
+                  'gadget_simp', 'lcomp_simp', 'clifford_simp', 'tcount', 'to_gh', 'to_rg',
+                  'full_reduce', 'teleport_reduce', 'reduce_scalar', 'supplementarity_simp',
+                  'to_clifford_normal_form_graph', 'to_graph_like', 'is_graph_like', 'copy_simp',
+                  'drop_orphan_reset_discards'],
+    '.optimize': ['full_optimize', 'basic_optimization', 'phase_block_optimize'],
+    '.extract': ['extract_circuit', 'extract_simple', 'graph_to_swaps', 'extract_clifford_normal_form',
+                 'lookahead_extract_base', 'lookahead_full', 'lookahead_fast', 'lookahead_extract'],
+    '.graph.jsonparser': ['string_to_phase', 'to_graphml'],
+    '.tensor': ['tensorfy', 'compare_tensors', 'compose_tensors', 'adjoint', 'is_unitary',
+                'tensor_to_matrix', 'find_scalar_correction'],
+}
+for _module, _names in _star_exports.items():
+    _lazy_attrs.update((_name, (_module, _name)) for _name in _names)
+
+# the submodules that ``import pyzx`` used to make available as attributes
+_submodules: Tuple[str, ...] = (
+    'circuit', 'd3', 'drawing', 'editor', 'editor_actions', 'extract', 'ft_rewrite', 'ft_simplify',
+    'generate', 'gflow', 'graph', 'hsimplify', 'linalg', 'local_search', 'optimize', 'parity_network',
+    'pauliweb', 'quimb', 'rewrite', 'rewrite_rules', 'routing', 'simplify', 'simulate', 'simulation',
+    'symbolic', 'tensor', 'tikz', 'todd', 'utils',
+)
+
+# some common scalars, as powers of sqrt(2)
+_scalars: Dict[str, int] = {'ONE': 0, 'SQRT_TWO': 1, 'TWO': 2, 'SQRT_TWO_INV': -1, 'TWO_INV': -2}
+
+# all the rewrite rules are exported as well (see rewrite_rules/__init__.py)
+_rules_module = '.rewrite_rules'
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy_attrs:
+        module, attr = _lazy_attrs[name]
+        value = getattr(importlib.import_module(module, __name__), attr)
+    elif name in _scalars:
+        from .graph.base import Scalar
+        value = Scalar()
+        value.add_power(_scalars[name])
+    elif name in _submodules:
+        value = importlib.import_module('.' + name, __name__)
+    elif name == '__all__':
+        value = _public_names()
+    elif name.startswith('__'):
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    elif importlib.util.find_spec(__name__ + '.' + name) is not None:
+        return importlib.import_module('.' + name, __name__)
+    else:
+        rules = importlib.import_module(_rules_module, __name__)
+        if name.startswith('_') or not hasattr(rules, name):
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+        value = getattr(rules, name)
+    globals()[name] = value
+    return value
+
+def _public_names() -> List[str]:
+    rules = importlib.import_module(_rules_module, __name__)
+    names = set(_lazy_attrs) | set(_scalars) | set(_submodules)
+    names |= set(n for n in dir(rules) if not n.startswith('_'))
+    return sorted(names)
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_public_names()))
+
+if TYPE_CHECKING:
+    from .graph.graph import Graph
+    from .circuit import Circuit, gates, id
+    from .linalg import Mat2
+    from .utils import settings, VertexType, EdgeType, original_colors, rgb_colors, grayscale_colors
+    from .quimb import to_quimb_tensor
+    from .drawing import *
+    from .simplify import *
+    from .optimize import *
+    from .extract import *
+    from .graph.jsonparser import *
+    from .tensor import *
+    from .local_search.simulated_annealing import anneal
+    from .local_search.genetic import GeneticOptimizer
+    from .circuit.qasmparser import qasm
+    from .circuit.sqasm import sqasm
+    from .rewrite_rules import *
+    from .routing.parity_maps import CNOT_tracker
+    from .graph.base import Scalar
+    from . import (circuit, d3, drawing, editor, editor_actions, extract, ft_rewrite, ft_simplify,
+                   generate, gflow, graph, hsimplify, linalg, local_search, optimize, parity_network,
+                   pauliweb, quimb, rewrite, rewrite_rules, routing, simplify, simulate, simulation,
+                   symbolic, tensor, tikz, todd, utils)
+    ONE: Scalar
+    SQRT_TWO: Scalar
+    TWO: Scalar
+    SQRT_TWO_INV: Scalar
+    TWO_INV: Scalar
 
 if __name__ == '__main__':
     print("Please execute this as a module by running 'python -m pyzx'")
@@ -436,11 +436,12 @@ class Circuit:
         """Produces a :class:`Circuit` based on a QASM description of a circuit.
         Supports OpenQASM 2 and 3, including ``reset``, ``measure``,
         and ``if`` (classical control / feedforward) statements.
-        It currently doesn't support custom gates that have parameters."""
+        It currently doesn't support custom gates that have parameters.
+        The file is read one line at a time, see :meth:`QASMParser.iter_gates`."""
         from .qasmparser import QASMParser
         p = QASMParser()
         with open(fname, 'r') as f:
-            c = p.parse(f.read())
+            c = p.parse_file(f)
         c.name = os.path.basename(fname)
         return c
 
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import warnings
+from collections.abc import Iterable
 
 from ..graph import Graph
 from ..graph.base import ET, VT, BaseGraph
@@ -303,6 +304,24 @@ def circuit_to_graph(
     holds, eliding avoids creating an ``input -> Z(0) -> X(_rN)``
     measurement-and-discard fragment plus a separate ``X(0)`` |0⟩ prep
     per qubit."""
+    return gates_to_graph(c.gates, c.qubits, c.bits, compress_rows, backend,
+                          initialize_qubits, postselect_qubits, elide_initial_resets)
+
+
+def gates_to_graph(
+    gates: Iterable[Gate],
+    qubits: int,
+    bits: int = 0,
+    compress_rows: bool = True,
+    backend: str | None = None,
+    initialize_qubits: list[bool] | None = None,
+    postselect_qubits: list[int] | None = None,
+    elide_initial_resets: bool = False,
+) -> BaseGraph:
+    """Turns a sequence of gates on ``qubits`` qubits and ``bits`` classical bits into a
+    ZX-Graph, like :func:`circuit_to_graph`. The gates are consumed one at a time, so
+    they can come from a generator, e.g. :meth:`QASMParser.iter_gates`, without ever
+    being stored in a :class:`Circuit`."""
     g = Graph(backend)
     q_mapper: TargetMapper = TargetMapper()
     c_mapper: TargetMapper = TargetMapper()
@@ -327,13 +346,13 @@ def circuit_to_graph(
         return name
 
     # Create input vertices
-    for i in range(c.qubits):
+    for i in range(qubits):
         v = g.add_vertex(VertexType.BOUNDARY,i,0)
         inputs.append(v)
         q_mapper.add_label(i, 1)
         q_mapper.set_prev_vertex(i, v)
-    for i in range(c.bits):
-        qubit = i+c.qubits
+    for i in range(bits):
+        qubit = i+qubits
         v = g.add_vertex(VertexType.BOUNDARY, qubit, 0)
         # Tag classical-bit boundaries so ``graph_to_circuit`` can
         # distinguish them from quantum input boundaries when deriving
@@ -345,7 +364,7 @@ def circuit_to_graph(
         c_mapper.set_prev_vertex(i, v)
 
 
-    for gate in c.gates:
+    for gate in gates:
         if isinstance(gate, Measurement):
             measure_targets.add(gate.target)
         if isinstance(gate, InitAncilla):
@@ -453,16 +472,16 @@ def circuit_to_graph(
     g.set_outputs(tuple(outputs))
 
     if initialize_qubits:
-        # ``inputs`` contains the ``c.qubits`` quantum inputs first,
-        # followed by ``c.bits`` classical-bit boundaries. Only the
+        # ``inputs`` contains the ``qubits`` quantum inputs first,
+        # followed by ``bits`` classical-bit boundaries. Only the
         # quantum prefix should be initialised, so the state string is
         # padded with '/' for classical inputs (which ``apply_state``
         # treats as "leave as-is"); otherwise ``apply_state`` would
         # drop the trailing classical boundaries from ``g.inputs()``.
-        assert len(initialize_qubits) == c.qubits, \
+        assert len(initialize_qubits) == qubits, \
             "Length of init list must be equal to number of qubits!"
         state = "".join("0" if i else "/" for i in initialize_qubits)
-        state += "/" * c.bits
+        state += "/" * bits
         g.apply_state(state)
 
     if postselect_qubits:
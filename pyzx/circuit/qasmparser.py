@@ -15,13 +15,17 @@
 # limitations under the License.
 
 
+import itertools
 import math
 import re
+from collections.abc import Iterable, Iterator
 from fractions import Fraction
+from typing import TextIO
 
 from ..symbolic import Var, new_var
 from ..symbolic import parse as parse_symbolic_expr
 from ..symbolic import parse_phase_list
+from ..graph.base import BaseGraph
 from ..utils import settings
 from . import Circuit
 from .gates import (CCZ, CHAD, CNOT, CRX, CRY, CRZ, CSWAP, CSX, CU, CU3, CY,
@@ -30,6 +34,11 @@ from .gates import (CCZ, CHAD, CNOT, CRX, CRY, CRZ, CSWAP, CSX, CU, CU3, CY,
                     YPhase, Z, ZPhase, qasm_gate_table)
 
 
+_GATE_DECLARATION = re.compile(r"gate\s")
+_IF_BLOCK = re.compile(r'if\s*\([^)]*\)\s*\{')
+_PHASE_CACHE_SIZE = 4096
+
+
 class QASMParser:
     """Class for parsing QASM source files into circuit descriptions."""
 
@@ -39,6 +48,7 @@ class QASMParser:
         self.custom_gates: dict[str, Circuit] = {}
         self.parametrized_gates: dict[str, tuple[list[str], list[str], list[str]]] = {}
         self._param_subst: dict[str, Fraction] | None = None
+        self._phase_cache: dict[str, tuple[tuple[Fraction, ...], int]] = {}
         self.registers: dict[str, tuple[int, int]] = {}
         self.cregisters: dict[str, int] = {}
         self.qubit_count: int = 0
@@ -46,58 +56,92 @@ class QASMParser:
         self.circuit: Circuit | None = None
 
     def parse(self, s: str, strict: bool = True) -> Circuit:
+        return self.parse_lines(s.splitlines(), strict)
+
+    def parse_file(self, f: TextIO, strict: bool = True) -> Circuit:
+        """Parses an open QASM file, reading it one line at a time."""
+        return self.parse_lines(f, strict)
+
+    def parse_lines(self, lines: Iterable[str], strict: bool = True) -> Circuit:
+        self.gates = list(self.iter_gates(lines, strict))
+        circ = Circuit(self.qubit_count, bit_amount=self.bit_count)
+        circ.gates = self.gates
+        self.circuit = circ
+        return self.circuit
+
+    def iter_gates(self, lines: Iterable[str], strict: bool = True) -> Iterator[Gate]:
+        """Parses a QASM program given as an iterable of lines, e.g. an open file, and
+        yields its gates one statement at a time, so that the program is never held in
+        memory as a whole. Custom gates have to be declared before they are used. Once
+        the generator is exhausted, :attr:`qubit_count` and :attr:`bit_count` hold the
+        size of the circuit."""
         self.gates = []
         self.custom_gates = {}
         self.parametrized_gates = {}
         self._param_subst = None
+        self._phase_cache = {}
         self.registers = {}
         self.cregisters = {}
         self.qubit_count = 0
         self.bit_count = 0
         self.circuit = None
-        lines = s.splitlines()
-        r = []
-        #strip comments
-        for s in lines:
-            if s.find("//")!=-1:
-                t = s[0:s.find("//")].strip()
-            else: t = s.strip()
-            if t: r.append(t)
-
-        match = re.fullmatch(r"OPENQASM ([23])(\.\d+)?;", r[0])
+        statements = self._statements(lines)
+
+        c = next(statements, None)
+        match = re.fullmatch(r"OPENQASM ([23])(\.\d+)?", c) if c is not None else None
         if match and match.group(1):
             self.qasm_version = int(match.group(1))
-            r.pop(0)
+            c = next(statements, None)
         elif strict:
             raise TypeError("File does not start with supported OPENQASM descriptor.")
 
-        if self.qasm_version == 2 and r[0].startswith('include "qelib1.inc";') or \
-                self.qasm_version == 3 and r[0].startswith('include "stdgates.inc";'):
-            r.pop(0)
+        if self.qasm_version == 2 and c == 'include "qelib1.inc"' or \
+                self.qasm_version == 3 and c == 'include "stdgates.inc"':
+            c = next(statements, None)
         elif strict:
             raise TypeError("File is not importing standard library")
 
-        data = "\n".join(r)
-        # Strip the custom command definitions from the normal commands.
-        gate_decl = re.compile(r"\bgate ")
-        while True:
-            m = gate_decl.search(data)
-            if m is None: break
-            i = m.start()
-            j = data.find("}", i)
-            self.parse_custom_gate(data[i:j+1])
-            data = data[:i] + data[j+1:]
-        data = self._expand_if_blocks(data)
-        # Parse the regular commands.
-        commands = [s.strip() for s in data.split(";") if s.strip()]
-        for c in commands:
-            self.gates.extend(self.parse_command(c, self.registers))
-
+        while c is not None:
+            if _GATE_DECLARATION.match(c):
+                self.parse_custom_gate(c)
+            else:
+                yield from self.parse_command(c, self.registers)
+            c = next(statements, None)
         self.bit_count = sum(self.cregisters.values())
-        circ = Circuit(self.qubit_count, bit_amount=self.bit_count)
-        circ.gates = self.gates
-        self.circuit = circ
-        return self.circuit
+
+    @classmethod
+    def _statements(cls, lines: Iterable[str]) -> Iterator[str]:
+        """Strips the comments from the lines of a QASM program and yields its statements
+        without the terminating semicolons. A custom gate declaration is yielded as a whole,
+        including its braces, and braced if-blocks are expanded into flat if-statements."""
+        buf = ''
+        for line in lines:
+            i = line.find("//")
+            if i != -1: line = line[:i]
+            line = line.strip()
+            if not line: continue
+            buf = buf + "\n" + line if buf else line
+            while buf:
+                if _GATE_DECLARATION.match(buf) or _IF_BLOCK.match(buf):
+                    j = buf.find("}")
+                    if j == -1: break
+                    block, buf = buf[:j+1], buf[j+1:].lstrip()
+                    if block.startswith("gate"):
+                        yield block
+                    else:
+                        for c in cls._expand_if_blocks(block).split(";"):
+                            if c.strip(): yield c.strip()
+                else:
+                    j = buf.find(";")
+                    if j == -1: break
+                    c, buf = buf[:j].strip(), buf[j+1:].lstrip()
+                    if c: yield c
+        if _IF_BLOCK.match(buf):
+            cls._expand_if_blocks(buf)  # raises the error for the missing brace
+        if _GATE_DECLARATION.match(buf) and "{" in buf:
+            raise TypeError("Unterminated gate declaration (missing closing '}}') near: "
+                            "{}".format(buf[:80]))
+        if buf: yield buf
 
     @staticmethod
     def _expand_if_blocks(s: str) -> str:
@@ -202,13 +246,23 @@ class QASMParser:
         if left_bracket == -1:
             name, rest = (c.split(" ", 1) + [""])[:2]
         else:
-            # Delegate paren matching and top-level comma splitting to the symbolic grammar.
-            try:
-                vals, offset = parse_phase_list(c[left_bracket:])
-            except Exception as exc:
-                raise TypeError(
-                    "Invalid phase list in {}: {}".format(c, exc)) from exc
-            phases = [self.parse_phase_arg(v) for v in vals if v]
+            # Generated circuits repeat the same few phase lists many times, so the parsed
+            # lists are cached by their text. The qubit arguments contain no parentheses.
+            key = c[left_bracket:c.rfind(')') + 1]
+            cached = self._phase_cache.get(key) if self._param_subst is None else None
+            if cached is not None:
+                phases, offset = list(cached[0]), cached[1]
+            else:
+                # Delegate paren matching and top-level comma splitting to the symbolic grammar.
+                try:
+                    vals, offset = parse_phase_list(c[left_bracket:])
+                except Exception as exc:
+                    raise TypeError(
+                        "Invalid phase list in {}: {}".format(c, exc)) from exc
+                phases = [self.parse_phase_arg(v) for v in vals if v]
+                if self._param_subst is None and offset == len(key):
+                    if len(self._phase_cache) >= _PHASE_CACHE_SIZE: self._phase_cache.clear()
+                    self._phase_cache[key] = (tuple(phases), offset)
             name = c[:left_bracket]
             rest = c[left_bracket + offset:].lstrip()
         args = [s.strip() for s in rest.split(",") if s.strip()]
@@ -482,3 +536,37 @@ def qasm(s: str) -> Circuit:
     """Parses a string representing a program in QASM, and outputs a `Circuit`."""
     p = QASMParser()
     return p.parse(s, strict=False)
+
+
+def qasm_file_to_graph(
+    fname: str,
+    zh: bool = False,
+    compress_rows: bool = True,
+    backend: str | None = None,
+    elide_initial_resets: bool = False,
+) -> BaseGraph:
+    """Reads a QASM file straight into a ZX-diagram, giving the same graph as
+    ``Circuit.from_qasm_file(fname).to_graph(...)``. The gates are added to the graph as
+    they are parsed, so neither the text of the file nor a :class:`Circuit` with all its
+    gates is held in memory. All registers have to be declared before the first gate."""
+    from .graphparser import gates_to_graph
+    p = QASMParser()
+    with open(fname, 'r') as f:
+        gates = p.iter_gates(f)
+        first = next(gates, None)
+        qubits, bits = p.qubit_count, sum(p.cregisters.values())
+
+        def check_registers() -> None:
+            if p.qubit_count != qubits or sum(p.cregisters.values()) != bits:
+                raise TypeError("Registers have to be declared before the first gate "
+                                "to stream a QASM file into a graph")
+
+        def stream() -> Iterator[Gate]:
+            for gate in itertools.chain([first] if first is not None else [], gates):
+                check_registers()
+                if zh: yield gate
+                else: yield from gate.to_basic_gates()
+            check_registers()
+
+        return gates_to_graph(stream(), qubits, bits, compress_rows, backend,
+                              elide_initial_resets=elide_initial_resets)
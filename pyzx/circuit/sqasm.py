@@ -29,13 +29,13 @@ __all__ = ['sqasm']
 # isolated vertices. n.b. remove_ids already does this, but this might change
 # in the future...
 
-spider_nocheck: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_fuse, unsafe_fuse, None, False, False)
+spider_nocheck: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_fuse, unsafe_fuse, None, False, False, name='spider_nocheck')
 
 # def spider_nocheck(g: BaseGraph, ms: List) -> RewriteOutputType:
 #     etab,rem_v,rem_e,check = spider(g, ms)
 #     return (etab, rem_v, rem_e, False)
 
-remove_ids_nocheck: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_remove_id, unsafe_remove_id, None, False)
+remove_ids_nocheck: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_remove_id, unsafe_remove_id, None, False, name='remove_ids_nocheck')
 
 
 def sqasm(s: str, simplify: bool = True) -> BaseGraph:
@@ -17,8 +17,10 @@
 __all__ = ['extract_circuit', 'extract_simple', 'graph_to_swaps', 'extract_clifford_normal_form',
            'lookahead_extract_base', 'lookahead_full', 'lookahead_fast', 'lookahead_extract']
 
+from concurrent.futures import Future, ProcessPoolExecutor
 from fractions import Fraction
 import itertools
+import multiprocessing
 from typing_extensions import deprecated
 
 from .utils import EdgeType, VertexType, toggle_edge
@@ -30,7 +32,7 @@ from .circuit.gates import Gate, ParityPhase, CNOT, HAD, ZPhase, XPhase, CZ, XCX
 
 from .graph.base import BaseGraph, VT, ET
 
-from typing import Generic, List, Optional, Tuple, Dict, Set, Union, Iterator
+from typing import Any, Callable, Generic, List, Optional, Tuple, Dict, Set, Union, Iterator
 
 
 def bi_adj(g: BaseGraph[VT,ET], vs:List[VT], ws:List[VT]) -> Mat2:
@@ -1140,9 +1142,23 @@ class LookaheadNode(Generic[VT, ET]):
     def apply_cnots(self, cnots: List[CNOT], m: Mat2, neighbors: List[VT]):
         self.ext_count += apply_cnots(self.g, self.c, self.frontier, self.qubit_map, cnots, m, neighbors)
 
-    def expand(self, limit: int, max_depth: int, algorithms: List[int]):
+    def expand(self, limit: int, max_depth: int, algorithms: List[int],
+               shared_limit: Optional[Callable[[], int]] = None):
+        """
+        Extracts vertices until 'limit' vertices have been extracted, branching into children when the
+        algorithms give different CNOTs.
+
+        Args:
+            limit: the number of extracted vertices to stop at
+            max_depth: the maximum depth of the tree below this node
+            algorithms: the algorithms used to branch
+            shared_limit: used by the workers of :func:`lookahead_extract_base`, returns a hard limit found by
+            other workers, which is at least the limit this node would get in the sequential search
+        """
         if max_depth == 0:
             return
+        if shared_limit is not None:
+            self.hard_limit = min(self.hard_limit, shared_limit())
         if self.total_d >= self.hard_limit > -1:
             return
         while not self.expanded and self.ext_count < limit and len(self.frontier) != 0:
@@ -1198,7 +1214,7 @@ class LookaheadNode(Generic[VT, ET]):
             self.apply_cnots(cnots, m, neighbors)
 
         for child in self.children:
-            child.expand(limit, max_depth - 1, algorithms)
+            child.expand(limit, max_depth - 1, algorithms, shared_limit)
 
     def apply_operation(self, operation_id: int, m: Mat2, neighbors: List[VT]) -> Optional[List[CNOT]]:
         """
@@ -1313,6 +1329,38 @@ class RootPicker:
         return nodes
 
 
+# The best two qubit count/depth found by the worker expanding each root of the current step, -1 if none.
+# Set once per worker process by _init_lookahead_worker.
+_lookahead_bounds: Optional[Any] = None
+
+
+def _init_lookahead_worker(bounds: Any) -> None:
+    global _lookahead_bounds
+    _lookahead_bounds = bounds
+
+
+def _expand_root(index: int, root: LookaheadNode, hard_limit: int, steps: int, depth_limit: int,
+                 algorithms: List[int], up_to_perm: bool) -> Tuple[LookaheadNode, Optional[Circuit], int]:
+    """
+    Expands the root with the given index in a worker process of :func:`lookahead_extract_base`.
+
+    While expanding, the hard limit is lowered to the best result of the roots before this one, as in the
+    sequential search. Results of the roots after this one are not used, as the sequential search does not know
+    them when it expands this root. Returns the expanded root and its best finished circuit.
+    """
+    bounds = _lookahead_bounds
+    assert bounds is not None
+    shared_limit = None
+    if hard_limit > -1:
+        def shared_limit() -> int:
+            return min([hard_limit] + [d for d in bounds[:index] if d > -1])
+    root.update_hard_limit(hard_limit)
+    root.expand(root.ext_count + steps, depth_limit, algorithms, shared_limit)
+    c, d = root.get_finished(None, -1, up_to_perm)
+    bounds[index] = d if c is not None else -1
+    return root, c, d
+
+
 def lookahead_extract_base(
         g: BaseGraph[VT, ET],
         steps: int = -1,  # ideal number of steps to look ahead
@@ -1323,7 +1371,8 @@ def lookahead_extract_base(
         algorithms: Optional[List[int]] = None,  # always include 0, pick any from 1, 2, 3
         optimize_for_depth: bool = False,  # optimize for depth instead of two qubit gates
         compare_basic: bool = True,  # use the default extractions and pick the best
-        up_to_perm: bool = False  # return an equivalent circuit up to an input permutation
+        up_to_perm: bool = False,  # return an equivalent circuit up to an input permutation
+        max_workers: Optional[int] = 1  # number of worker processes expanding the roots
         ) -> Optional[Circuit]:
     """
     Main method for the lookahead extraction. Uses different methods to produce CNOTS and extract vertices,
@@ -1340,6 +1389,7 @@ def lookahead_extract_base(
         optimize_for_depth: if set to false (default), optimize for the number of two qubit gates; if set to true, optimize for depth
         compare_basic: perform the standard extractions and pick the best between the standard and the result of the lookahead extraction
         up_to_perm: if set to true, returns a circuit that corresponds to the graph up to a permutation of th inputs
+        max_workers: the number of worker processes; None uses all processors. With more than one worker, the roots of each step are expanded in parallel, and each worker lowers its hard limit to the results of the roots before its own as they finish. The roots are then processed in order as in the sequential search, so the result is the same.
 
     Returns:
         A circuit that corresponds to the given graph, with two qubit count / depth less than 'hard_limit'; None if no such circuit was found
@@ -1395,26 +1445,61 @@ def lookahead_extract_base(
     roots: List[Optional[LookaheadNode]] =\
         [LookaheadNode(g, Circuit(len(inputs)), frontier, qubit_map, gadgets, optimize_for_depth, hard_limit)]
 
-    while len(roots) > 0:
-        rp = RootPicker(nodes_kept)
-        for i in range(len(roots)):
-            root = roots[i]
-            if root is None:
-                continue  # Never happens, but creates problems with type checker
-            if root.hard_limit > hard_limit:
-                root.update_hard_limit(hard_limit)
-            if root.can_expand():
-                new_limit = root.ext_count + steps
-                prev_extracted = root.ext_count
-                root.expand(new_limit, depth_limit, algorithms)
-                best_c, best_d = root.get_finished(best_c, best_d, up_to_perm)
-                if best_d < hard_limit:
-                    hard_limit = best_d
+    executor: Optional[ProcessPoolExecutor] = None
+    bounds = None
+    try:
+        while len(roots) > 0:
+            rp = RootPicker(nodes_kept)
+            futures: List[Optional[Future]] = [None] * len(roots)
+            if max_workers != 1 and len(roots) > 1:
+                for i, root in enumerate(roots):
+                    if root is None:
+                        continue
+                    if root.hard_limit > hard_limit:
+                        root.update_hard_limit(hard_limit)
+                    if not root.can_expand():
+                        continue
+                    if executor is None:
+                        bounds = multiprocessing.Array('q', nodes_kept, lock=False)
+                        executor = ProcessPoolExecutor(max_workers, initializer=_init_lookahead_worker,
+                                                       initargs=(bounds,))
+                    assert bounds is not None
+                    bounds[i] = -1
+                    futures[i] = executor.submit(_expand_root, i, root, hard_limit, steps, depth_limit,
+                                                 algorithms, up_to_perm)
+            for i in range(len(roots)):
+                root = roots[i]
+                if root is None:
+                    continue  # Never happens, but creates problems with type checker
+                if root.hard_limit > hard_limit:
                     root.update_hard_limit(hard_limit)
-                root.next_nodes(prev_extracted + min_extract, rp)
-            # Allow unneeded nodes to be removed to free memory
-            roots[i] = None
-        roots = rp.get_next_roots()
+                future = futures[i]
+                if root.can_expand():
+                    prev_extracted = root.ext_count
+                    if future is None:
+                        new_limit = root.ext_count + steps
+                        root.expand(new_limit, depth_limit, algorithms)
+                        best_c, best_d = root.get_finished(best_c, best_d, up_to_perm)
+                    else:
+                        # The worker may have expanded more nodes, using a higher hard limit, but all of these
+                        # have a two qubit count/depth over the hard limit and are ignored by next_nodes
+                        root, c, d = future.result()
+                        root.update_hard_limit(hard_limit)
+                        if c is not None and (d < best_d or best_d == -1):
+                            best_c = c
+                            best_d = d
+                    if best_d < hard_limit:
+                        hard_limit = best_d
+                        root.update_hard_limit(hard_limit)
+                    root.next_nodes(prev_extracted + min_extract, rp)
+                elif future is not None:
+                    future.result()
+                # Allow unneeded nodes to be removed to free memory
+                roots[i] = None
+            roots = rp.get_next_roots()
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
     return best_c
 
@@ -1453,26 +1538,28 @@ def compare_cnots(c1: List[CNOT], c2: List[CNOT], size: int) -> bool:
     return True
 
 
-def lookahead_fast(g: BaseGraph[VT, ET], optimize_for_depth: bool = False, up_to_perm: bool = False) -> Circuit:
+def lookahead_fast(g: BaseGraph[VT, ET], optimize_for_depth: bool = False, up_to_perm: bool = False,
+        max_workers: Optional[int] = 1) -> Circuit:
     """
     A lookahead extraction with relatively fast results. For details see :func:`lookahead_extract_base`
     """
-    c = lookahead_extract_base(g, 4 * len(g.inputs()), 8, 5, 4, -1, [0, 1], optimize_for_depth, False, up_to_perm)
+    c = lookahead_extract_base(g, 4 * len(g.inputs()), 8, 5, 4, -1, [0, 1], optimize_for_depth, False, up_to_perm, max_workers)
     if c is None:
         raise AssertionError("Lookahead extraction with no hard limit returned None")
     return c
 
 
-def lookahead_extract(g: BaseGraph[VT, ET], optimize_for_depth: bool = False, up_to_perm: bool = False) -> Circuit:
+def lookahead_extract(g: BaseGraph[VT, ET], optimize_for_depth: bool = False, up_to_perm: bool = False,
+        max_workers: Optional[int] = 1) -> Circuit:
     """
         A lookahead extraction with recommended parameters. For details see :func:`lookahead_extract_base`
     """
     qubits = len(g.inputs())
-    c = lookahead_extract_base(g.clone(), 4 * qubits, 8, 0, 4, -1, [0, 1], optimize_for_depth, True, up_to_perm)
+    c = lookahead_extract_base(g.clone(), 4 * qubits, 8, 0, 4, -1, [0, 1], optimize_for_depth, True, up_to_perm, max_workers)
     if c is None:
         raise AssertionError("Lookahead extraction with no hard limit returned None")
     d = get_optimize_value(c, optimize_for_depth, True)
-    c1 = lookahead_extract_base(g, 4 * qubits, 8, 5, 4, d, [0, 3], optimize_for_depth, False, up_to_perm)
+    c1 = lookahead_extract_base(g, 4 * qubits, 8, 5, 4, d, [0, 3], optimize_for_depth, False, up_to_perm, max_workers)
     if c1 is not None:
         d1 = get_optimize_value(c1, optimize_for_depth, True)
         if d1 < d:
@@ -1480,30 +1567,31 @@ def lookahead_extract(g: BaseGraph[VT, ET], optimize_for_depth: bool = False, up
     return c
 
 
-def lookahead_full(g: BaseGraph[VT, ET], optimize_for_depth: bool = False, up_to_perm: bool = False) -> Circuit:
+def lookahead_full(g: BaseGraph[VT, ET], optimize_for_depth: bool = False, up_to_perm: bool = False,
+        max_workers: Optional[int] = 1) -> Circuit:
     """
         A lookahead extraction which compares a number of possible extractions and returns the best result.
         Can take a very long time for large circuits. For details see :func:`lookahead_extract_base`
     """
     qubits = len(g.inputs())
     c = lookahead_extract_base(g.clone(), 3 * qubits, 7, qubits, 4, -1,
-                               [0, 1, 3], optimize_for_depth, True, up_to_perm)
+                               [0, 1, 3], optimize_for_depth, True, up_to_perm, max_workers)
     if c is None:
         raise AssertionError("Lookahead extraction with no hard limit returned None")
     d = get_optimize_value(c, optimize_for_depth, True)
-    c1 = lookahead_extract_base(g.clone(), 4 * qubits, 8, 0, 4, d, [0, 1], optimize_for_depth, False, up_to_perm)
+    c1 = lookahead_extract_base(g.clone(), 4 * qubits, 8, 0, 4, d, [0, 1], optimize_for_depth, False, up_to_perm, max_workers)
     if c1 is not None:
         d1 = get_optimize_value(c1, optimize_for_depth, True)
         if d1 < d:
             c = c1
             d = d1
-    c1 = lookahead_extract_base(g.clone(), 4 * qubits, 8, 5, 4, d, [0, 2], optimize_for_depth, False, up_to_perm)
+    c1 = lookahead_extract_base(g.clone(), 4 * qubits, 8, 5, 4, d, [0, 2], optimize_for_depth, False, up_to_perm, max_workers)
     if c1 is not None:
         d1 = get_optimize_value(c1, optimize_for_depth, True)
         if d1 < d:
             c = c1
             d = d1
-    c1 = lookahead_extract_base(g, 4 * qubits, 8, 5, 4, d, [0, 3], optimize_for_depth, False, up_to_perm)
+    c1 = lookahead_extract_base(g, 4 * qubits, 8, 5, 4, d, [0, 3], optimize_for_depth, False, up_to_perm, max_workers)
     if c1 is not None:
         d1 = get_optimize_value(c1, optimize_for_depth, True)
         if d1 < d:
@@ -18,13 +18,13 @@
 """
 
 from typing import Callable, Optional, Generic, Set, Tuple, List
-from .rewrite import Rewrite
+from .rewrite import Rewrite, _run_applier
 from .graph.base import BaseGraph, VT, ET
 
 class Rewrite_ft(Rewrite[VT, ET]):
 
-    def __init__(self) -> None:
-        pass
+    def __init__(self, name: Optional[str] = None) -> None:
+        super().__init__(name)
 
     def simp(self, graph: BaseGraph[VT, ET]) -> bool:
         raise Exception("This rewrite rule cannot terminate when run automatically. Try using apply() instead to manually target vertices.")
@@ -43,6 +43,8 @@ class RewriteSingleVertex_ft(Rewrite_ft[VT, ET]):
         function that checks whether a given vertex can be rewritten.
     rmv_isolated : bool
         whether to remove isolated vertices after running the applier.
+    name : Optional[str]
+        the name of the rewrite. Defaults to the name of the applier.
     """
 
     applier: Callable[[BaseGraph[VT, ET], VT, Optional[int]], bool]
@@ -54,8 +56,9 @@ class RewriteSingleVertex_ft(Rewrite_ft[VT, ET]):
     def __init__(self, is_match: Callable[[BaseGraph[VT, ET], VT], bool],
                  applier: Callable[[BaseGraph[VT, ET], VT, Optional[int]], bool],
                  rmv_isolated: bool = False,
-                 weight: Optional[int] = None) -> None:
-        super().__init__()
+                 weight: Optional[int] = None,
+                 name: Optional[str] = None) -> None:
+        super().__init__(name if name is not None else getattr(applier, '__name__', None))
         self.is_match = is_match
         self.applier = applier
         self.rmv_isolated = rmv_isolated
@@ -65,9 +68,7 @@ class RewriteSingleVertex_ft(Rewrite_ft[VT, ET]):
         applied: bool = False
         w = weight if weight is not None else self.weight
         if self.is_match(graph, v):
-            applied = self.applier(graph, v, w)
-            if self.rmv_isolated:
-                graph.remove_isolated_vertices()
+            applied = _run_applier(graph, self.applier, (v, w), self.rmv_isolated)
         return applied
 
 class RewriteSimpSingleVertex_ft(RewriteSingleVertex_ft[VT, ET]):
@@ -83,14 +84,17 @@ class RewriteSimpSingleVertex_ft(RewriteSingleVertex_ft[VT, ET]):
         optional function that checks whether graph can be rewritten automatically.
     rmv_isolated : bool
         whether to remove isolated vertices after running the applier.
+    name : Optional[str]
+        the name of the rewrite. Defaults to the name of the applier.
     """
     simp_match: Optional[Callable[[BaseGraph[VT, ET], VT], bool]]
 
     def __init__(self, is_match: Callable[[BaseGraph[VT, ET], VT], bool],
                  applier: Callable[[BaseGraph[VT, ET], VT, Optional[int]], bool],
                  simp_match: Optional[Callable[[BaseGraph[VT, ET], VT], bool]] = None,
-                 rmv_isolated: bool = False) -> None:
-        super().__init__(is_match, applier, rmv_isolated)
+                 rmv_isolated: bool = False,
+                 name: Optional[str] = None) -> None:
+        super().__init__(is_match, applier, rmv_isolated, name=name)
         self.simp_match = simp_match
 
     def find_all_matches(self, graph: BaseGraph[VT, ET]) -> Set[VT]:
@@ -117,9 +121,7 @@ class RewriteSimpSingleVertex_ft(RewriteSingleVertex_ft[VT, ET]):
             for m in all_matches:
                 if match(graph, m):
                     j += 1
-                    self.applier(graph, m, self.weight)
+                    _run_applier(graph, self.applier, (m, self.weight), self.rmv_isolated)
                     applied = True
-                    if self.rmv_isolated:
-                        graph.remove_isolated_vertices()
             if j == 0: break
         return applied
@@ -15,13 +15,65 @@
 # limitations under the License.
 
 from fractions import Fraction
-from typing import Dict, Set, Tuple, Optional
+from typing import Dict, Generic, Iterable, List, Set, Tuple, Optional
 
-from .linalg import Mat2
+import numpy as np
+from numpy.typing import NDArray
+
+from .linalg import PackedMat2
 from .graph.base import BaseGraph, VT, ET
 from .utils import phase_is_clifford, phase_is_pauli, vertex_is_zx
 
 
+class _FlowSystem(Generic[VT]):
+    """The linear system ``M * x = e_u`` that is solved for every vertex ``u`` in
+    :func:`gflow`, kept in reduced echelon form while columns are added to ``M``.
+
+    The rows of ``M`` are fixed. Rather than eliminating ``M`` itself, we keep the
+    invertible matrix ``T`` such that ``T * M`` is in reduced echelon form, along
+    with the variable belonging to each pivot row. Adding a column then costs one
+    product with ``T`` and at most one row operation on ``T`` per row, and all
+    right-hand sides ``e_u`` can be checked at once: ``M * x = e_u`` has a solution
+    iff column ``u`` of ``T`` vanishes below the rank, in which case setting the
+    pivot variables to the upper part of that column gives one.
+
+    A row can be dropped from the system by adding a column ``e_r`` for it, which
+    is a variable of its own (``None``) that absorbs that row.
+    """
+    def __init__(self, n: int) -> None:
+        self.t = PackedMat2.id(n).words
+        self.rank = 0
+        self.pivot_vars: List[Optional[VT]] = []
+
+    def add_column(self, var: Optional[VT], support: Iterable[int]) -> None:
+        """Adds a column for ``var`` which is 1 exactly on the rows in ``support``."""
+        t = self.t
+        tcol = np.zeros(len(t), dtype=np.uint64)
+        for j in support:
+            tcol ^= (t[:, j // 64] >> np.uint64(j % 64)) & np.uint64(1)
+        below = np.flatnonzero(tcol[self.rank:])
+        if len(below) == 0: return # the new column depends on the previous ones
+        p = self.rank + int(below[0])
+        if p != self.rank:
+            t[[self.rank, p]] = t[[p, self.rank]]
+            tcol[[self.rank, p]] = tcol[[p, self.rank]]
+        hits = np.flatnonzero(tcol)
+        hits = hits[hits != self.rank]
+        t[hits] ^= t[self.rank]
+        self.pivot_vars.append(var)
+        self.rank += 1
+
+    def unsolvable(self) -> NDArray[np.uint64]:
+        """Returns a bitmask of the rows ``r`` for which ``M * x = e_r`` has no solution."""
+        if self.rank == len(self.t): return np.zeros(self.t.shape[1], dtype=np.uint64)
+        return np.bitwise_or.reduce(self.t[self.rank:], axis=0)
+
+    def solution(self, r: int) -> Set[VT]:
+        """The variables set in the solution of ``M * x = e_r``, which must exist."""
+        bits = (self.t[:self.rank, r // 64] >> np.uint64(r % 64)) & np.uint64(1)
+        return {v for v in (self.pivot_vars[i] for i in np.flatnonzero(bits)) if v is not None}
+
+
 def gflow(
     g: BaseGraph[VT, ET], focus: bool=False, reverse: bool=False, pauli: bool=False
 ) -> Optional[Tuple[Dict[VT, int], Dict[VT, Set[VT]]]]:
@@ -37,6 +89,13 @@ def gflow(
 
     Slightly extended to allow searching for Pauli flow with measurement planes {XY, X, Y}.
 
+    Instead of solving the system below from scratch for every vertex on every layer,
+    its elimination is kept up to date as vertices are added to the candidate set
+    (see :class:`_FlowSystem`), and all vertices of a layer are checked at once.
+    Without ``focus``, the rows of vertices that are already processed are dropped
+    from the system, so that only the vertices that are still open constrain the
+    correction sets.
+
     Here is the pseudocode it is based on:
     ```
     input : An open graph
@@ -97,43 +156,37 @@ def gflow(
 
     processed: Set[VT] = pattern_outputs.copy() | g.grounds()
     non_outputs = list(vertices.difference(pattern_outputs))
-    zerovec = Mat2.zeros(len(non_outputs), 1)
+    row = {v: i for i, v in enumerate(non_outputs)}
     for v in processed:
         l[v] = 0
 
+    # The columns of the "flow-demand matrix" are the vertices that can be used in
+    # correction sets, i.e. the bi-adjacency matrix from the non-outputs to these
+    # vertices, which additionally relates every Y-measured node to itself.
+    system: _FlowSystem[VT] = _FlowSystem(len(non_outputs))
+    candidates: Set[VT] = set()
+    if not focus:
+        for v in processed:
+            if v in row: system.add_column(None, [row[v]])
+
     k: int = 1
     while True:
         correct: Set[VT] = set()
 
-        # a list of nodes that can currently be used in the correction set of the next node
-        candidates = [
-            v
-            for v in (processed | pauli_x | pauli_y).difference(pattern_inputs)
-            if focus or any(w not in processed for w in g.neighbors(v))
-        ]
-
-        if focus:
-            clean = non_outputs
-        else:
-            clean = [v for v in vertices
-                        if v not in processed and 
-                        any(w in candidates for w in g.neighbors(v))]
-
-        # compute the "flow-demand matrix", which is essentially the bi-adjacency matrix from
-        # "clean" to "candidates", which additionally relates every Y-measured node to
-        # itself.
-        m = Mat2([[1 if g.connected(v,w) or (v==w and v in pauli_y) else 0 
-                   for v in candidates] for w in clean])
-
-        for index, u in enumerate(clean):
-            if not focus or (u not in processed and any(w in candidates for w in g.neighbors(u))):
-                vu = zerovec.copy()
-                vu.data[index][0] = 1
-                x = m.solve(vu)
-                if x:
-                    correct.add(u)
-                    gflow[u] = {candidates[i] for i in range(x.rows()) if x.data[i][0]}
-                    l[u] = k
+        for v in (processed | pauli_x | pauli_y).difference(pattern_inputs, candidates):
+            support = [row[w] for w in g.neighbors(v) if w in row]
+            if v in pauli_y and v in row: support.append(row[v])
+            system.add_column(v, support)
+            candidates.add(v)
+
+        unsolvable = system.unsolvable()
+        for u in non_outputs:
+            if u in processed: continue
+            r = row[u]
+            if (int(unsolvable[r // 64]) >> (r % 64)) & 1: continue
+            correct.add(u)
+            gflow[u] = system.solution(r)
+            l[u] = k
 
         if not correct:
             if len(vertices) == len(processed):
@@ -141,5 +194,6 @@ def gflow(
             return None
         else:
             processed.update(correct)
+            if not focus:
+                for u in correct: system.add_column(None, [row[u]])
             k += 1
-
@@ -90,6 +90,8 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
     :class:`~pyzx.graph.graph_s.GraphS` or :class:`~pyzx.graph.graph_ig.GraphIG`."""
 
     backend: ClassVar[str] = 'None'
+    # Whether the backend fills in the record passed to track_touched()
+    records_touched: ClassVar[bool] = False
 
     def __init__(self) -> None:
         self.scalar: Scalar = Scalar()
@@ -98,6 +100,7 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
         #Data necessary for phase tracking for phase teleportation
         self.track_phases: bool = False
         self.phase_index : dict[VT, int] = dict() # {vertex:index tracking its phase for phase teleportation}
+        self._phase_vertex: dict[int, VT] = dict() # the inverse of phase_index, see vertex_from_phase_index
         self.phase_master: Optional['simplify.Simplifier'] = None
         self.phase_mult: dict[int, Literal[1,-1]] = dict()
         self.max_phase_index: int = -1
@@ -107,6 +110,8 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
         self.merge_vdata: Callable[[VT, VT], None] | None = None
         self.variable_types: dict[str, bool] = dict() # DEPRICATED - mapping of variable names to their type (bool or continuous)
         self.var_registry: VarRegistry = VarRegistry() # registry for variable types
+        # set of vertices modified since recording started, see track_touched()
+        self._touched: set[VT] | None = None
 
     # MANDATORY OVERRIDES {{{
 
@@ -396,6 +401,7 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
         if self.track_phases:
             self.max_phase_index += 1
             self.phase_index[v] = self.max_phase_index
+            self._phase_vertex[self.max_phase_index] = v
             self.phase_mult[self.max_phase_index] = 1
         return v
 
@@ -1079,14 +1085,35 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
         This function does that. Used in some of the rules in `simplify`."""
         if not self.track_phases: return
         i = self.phase_index[old]
-        self.phase_index[old] = self.phase_index[new]
+        j = self.phase_index[new]
+        self.phase_index[old] = j
         self.phase_index[new] = i
+        self._phase_vertex[j] = old
+        self._phase_vertex[i] = new
+
+    def set_phase_index(self, v: VT, i: int) -> None:
+        """Lets the vertex ``v`` track the phase with index ``i`` for phase teleportation."""
+        old = self.phase_index.get(v)
+        if old is not None and self._phase_vertex.get(old) == v:
+            del self._phase_vertex[old]
+        self.phase_index[v] = i
+        self._phase_vertex[i] = v
+
+    def remove_phase_index(self, v: VT) -> None:
+        """Stops tracking the phase of the vertex ``v`` for phase teleportation."""
+        i = self.phase_index.pop(v)
+        if self._phase_vertex.get(i) == v:
+            del self._phase_vertex[i]
 
     def fuse_phases(self, p1: VT, p2: VT) -> None:
         if p1 not in self.phase_index or p2 not in self.phase_index:
             return
         if self.phase_master is not None:
             self.phase_master.fuse_phases(self.phase_index[p1],self.phase_index[p2])
+        # p1 stays the vertex that vertex_from_phase_index returns for this index
+        i = self.phase_index[p2]
+        if self._phase_vertex.get(i) == p2:
+            del self._phase_vertex[i]
         self.phase_index[p2] = self.phase_index[p1]
 
     def phase_negate(self, v: VT) -> None:
@@ -1098,13 +1125,40 @@ class BaseGraph(Generic[VT, ET], metaclass=DocstringMeta):
         #self.phase_mult[index] = -1*mult
 
     def vertex_from_phase_index(self, i: int) -> VT:
-        return list(self.phase_index.keys())[list(self.phase_index.values()).index(i)]
+        """Returns the vertex tracking the phase with index ``i``, and raises a ``ValueError``
+        if there is none."""
+        v = self._phase_vertex.get(i)
+        if v is None or self.phase_index.get(v) != i:
+            raise ValueError(f'No vertex tracks the phase with index {i}')
+        return v
+
+
+    def track_touched(self, record: set[VT] | None) -> set[VT] | None:
+        """Sets the set in which the backend records every vertex whose type, phase,
+        ground status, vertex data or incident edges are changed, and returns the
+        record that was active before. Passing ``None`` stops the recording.
 
+        Only backends with ``records_touched`` set to True fill in the record.
+        It is used by the automatic rewrites in :mod:`~pyzx.rewrite` to only
+        look for new matches in the part of the graph that changed."""
+        old = self._touched
+        self._touched = record
+        return old
 
-    def remove_isolated_vertices(self) -> None:
-        """Deletes all vertices and vertex pairs that are not connected to any other vertex."""
+    def remove_isolated_vertices(self, candidates: Iterable[VT] | None = None) -> None:
+        """Deletes all vertices and vertex pairs that are not connected to any other vertex.
+
+        If ``candidates`` is given, only these vertices are checked, together with the other vertex
+        of a pair they are part of. Rewrites pass the vertices whose neighbourhood they changed,
+        so that cleaning up after a single rewrite doesn't need to scan the entire graph.
+        Candidates that are no longer in the graph are ignored."""
         rem: list[VT] = []
-        for v in self.vertices():
+        if candidates is None:
+            vs: Iterable[VT] = self.vertices()
+        else:
+            vertices = self.vertices()
+            vs = [v for v in set(candidates) if v in vertices]
+        for v in vs:
             d = self.vertex_degree(v)
             if d == 0:
                 rem.append(v)
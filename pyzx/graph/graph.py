@@ -16,6 +16,8 @@
 
 from .base import BaseGraph
 from .graph_s import GraphS
+from .graph_array import GraphArray
+from .graph_cow import GraphCOW
 from .multigraph import Multigraph
 
 try:
@@ -23,13 +25,15 @@ try:
 except ImportError:
 	quizx = None
 
-backends = { 'simple': True, 'multigraph': True, 'quizx-vec': False if quizx is None else True }
+backends = { 'simple': True, 'multigraph': True, 'array': True, 'cow': True, 'quizx-vec': False if quizx is None else True }
 
 def Graph(backend: str | None = None) -> BaseGraph:
 	"""Returns an instance of an implementation of :class:`~pyzx.graph.base.BaseGraph`.
 	By default :class:`~pyzx.graph.graph_s.GraphS` is used.
 	Currently ``backend`` is allowed to be `simple` (for the default),
-	or 'graph_tool' and 'igraph'.
+	'multigraph', 'array' (the compact :class:`~pyzx.graph.graph_array.GraphArray`
+	for large diagrams), 'cow' (the copy-on-write :class:`~pyzx.graph.graph_cow.GraphCOW`,
+	whose ``clone()`` takes constant time), or 'graph_tool' and 'igraph'.
 	This method is the preferred way to instantiate a ZX-diagram in PyZX.
 
 	Example:
@@ -43,6 +47,8 @@ def Graph(backend: str | None = None) -> BaseGraph:
 		raise KeyError("Unavailable backend '{}'".format(backend))
 	if backend == 'simple': return GraphS()
 	if backend == 'multigraph': return Multigraph()
+	if backend == 'array': return GraphArray()
+	if backend == 'cow': return GraphCOW()
 	if backend == 'graph_tool':
 		return GraphGT()
 	if backend == 'igraph': return GraphIG()
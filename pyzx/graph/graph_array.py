@@ -0,0 +1,701 @@
+# PyZX - Python library for quantum circuit rewriting
+#       and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#   http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Array-backed implementation of :class:`~pyzx.graph.base.BaseGraph`.
+
+:class:`GraphArray` stores the vertex types, qubits, rows and the numerators and
+denominators of the phases in NumPy arrays indexed by the vertex. Deleted vertices
+are kept on a free-list, so that their slot is reused by the next added vertex.
+
+The adjacency of each vertex is a segment of a shared pool of neighbour and edge-type
+arrays. A segment has some spare capacity, and is moved to the end of the pool with twice
+the capacity when it fills up. The pool is compacted when more than half of it is unused.
+
+This uses a fraction of the memory of :class:`~pyzx.graph.graph_s.GraphS`, and makes
+:meth:`GraphArray.clone` a copy of a handful of arrays, at the cost of somewhat slower
+individual edge operations."""
+
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from fractions import Fraction
+from typing import Any
+
+import numpy as np
+
+from ..utils import (EdgeType, FloatInt, FractionLike, VertexType,
+                     add_phases, assert_phase_real, get_z_box_label, normalize_phase,
+                     set_z_box_label, vertex_is_z_like, vertex_is_zx_like)
+from .base import BaseGraph
+
+_VERTEX_TYPES: dict[int, VertexType] = {int(t): t for t in VertexType}
+_EDGE_TYPES: dict[int, EdgeType] = {int(t): t for t in EdgeType}
+_INT64_MAX = np.iinfo(np.int64).max
+_MIN_SEGMENT = 4
+
+
+def _to_floatint(x: float) -> FloatInt:
+    return int(x) if x.is_integer() else x
+
+
+class _VertexView(Collection[int]):
+    """Live view of the vertices of a :class:`GraphArray`."""
+    def __init__(self, g: 'GraphArray') -> None:
+        self._g = g
+
+    def __contains__(self, v: object) -> bool:
+        g = self._g
+        return isinstance(v, (int, np.integer)) and 0 <= v < g._vindex and bool(g._alive[v])
+
+    def __len__(self) -> int:
+        return self._g._nverts
+
+    def __iter__(self) -> Iterator[int]:
+        g = self._g
+        return iter(np.flatnonzero(g._alive[:g._vindex]).tolist())
+
+
+class _ArrayMap(Mapping[int, Any]):
+    """Live read-only mapping from the vertices of a :class:`GraphArray` to one of its vertex attributes."""
+    def __init__(self, g: 'GraphArray', get: Any) -> None:
+        self._g = g
+        self._get = get
+
+    def __getitem__(self, v: int) -> Any:
+        if v not in self._g._vertex_view: raise KeyError(v)
+        return self._get(int(v))
+
+    def __contains__(self, v: object) -> bool:
+        return v in self._g._vertex_view
+
+    def __len__(self) -> int:
+        return self._g._nverts
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._g._vertex_view)
+
+
+class GraphArray(BaseGraph[int, tuple[int, int]]):
+    """Array-backed implementation of :class:`~graph.base.BaseGraph`,
+    intended for large diagrams. See :mod:`~pyzx.graph.graph_array` for the layout."""
+    backend = 'array'
+    records_touched = True
+
+    #The documentation of what these methods do
+    #can be found in base.BaseGraph
+    def __init__(self, capacity: int = 16) -> None:
+        BaseGraph.__init__(self)
+        capacity = max(capacity, 1)
+        self._vindex: int = 0
+        self._nverts: int = 0
+        self._free: list[int] = []
+        self.nedges: int = 0
+        self._alive = np.zeros(capacity, dtype=np.bool_)
+        self._ty = np.zeros(capacity, dtype=np.int8)
+        self._qindex = np.full(capacity, -1.0)
+        self._rindex = np.full(capacity, -1.0)
+        # phase = _pnum/_pden, or _phase_obj[v] when _pden is 0 (e.g. for symbolic phases)
+        self._pnum = np.zeros(capacity, dtype=np.int64)
+        self._pden = np.ones(capacity, dtype=np.int64)
+        self._phase_obj: dict[int, FractionLike] = {}
+        self._maxq: FloatInt = -1
+        self._maxr: FloatInt = -1
+        # adjacency: the neighbours of v are _nbr[_astart[v]:_astart[v]+_alen[v]]
+        self._astart = np.zeros(capacity, dtype=np.int64)
+        self._alen = np.zeros(capacity, dtype=np.int64)
+        self._acap = np.zeros(capacity, dtype=np.int64)
+        self._nbr = np.zeros(_MIN_SEGMENT * capacity, dtype=np.int64)
+        self._ety = np.zeros(_MIN_SEGMENT * capacity, dtype=np.int8)
+        self._pool_end: int = 0
+        self._pool_garbage: int = 0
+        self._grounds: set[int] = set()
+
+        self._vdata: dict[int, Any] = {}
+        self._edata: dict[tuple[int,int], Any] = {}
+        self._inputs: tuple[int, ...] = tuple()
+        self._outputs: tuple[int, ...] = tuple()
+
+        self._vertex_view = _VertexView(self)
+
+    def clone(self) -> 'GraphArray':
+        cpy = GraphArray.__new__(GraphArray)
+        BaseGraph.__init__(cpy)
+        cpy._vindex = self._vindex
+        cpy._nverts = self._nverts
+        cpy._free = self._free.copy()
+        cpy.nedges = self.nedges
+        cpy._alive = self._alive.copy()
+        cpy._ty = self._ty.copy()
+        cpy._qindex = self._qindex.copy()
+        cpy._rindex = self._rindex.copy()
+        cpy._pnum = self._pnum.copy()
+        cpy._pden = self._pden.copy()
+        cpy._phase_obj = self._phase_obj.copy()
+        cpy._maxq = self._maxq
+        cpy._maxr = self._maxr
+        cpy._astart = self._astart.copy()
+        cpy._alen = self._alen.copy()
+        cpy._acap = self._acap.copy()
+        cpy._nbr = self._nbr.copy()
+        cpy._ety = self._ety.copy()
+        cpy._pool_end = self._pool_end
+        cpy._pool_garbage = self._pool_garbage
+        cpy._grounds = self._grounds.copy()
+        cpy._vdata = self._vdata.copy()
+        cpy._edata = self._edata.copy()
+        cpy._inputs = self._inputs
+        cpy._outputs = self._outputs
+        cpy._vertex_view = _VertexView(cpy)
+        cpy.scalar = self.scalar.copy()
+        cpy.track_phases = self.track_phases
+        cpy.phase_index = self.phase_index.copy()
+        cpy._phase_vertex = self._phase_vertex.copy()
+        cpy.phase_master = self.phase_master
+        cpy.phase_mult = self.phase_mult.copy()
+        cpy.max_phase_index = self.max_phase_index
+        return cpy
+
+    def nbytes(self) -> int:
+        """Returns the number of bytes used by the arrays of the graph."""
+        return sum(a.nbytes for a in (self._alive, self._ty, self._qindex, self._rindex,
+                                      self._pnum, self._pden, self._astart, self._alen,
+                                      self._acap, self._nbr, self._ety))
+
+    # Internal storage {{{
+
+    def _grow_vertices(self, n: int) -> None:
+        """Makes sure the vertex arrays have room for ``n`` vertices."""
+        cap = len(self._alive)
+        if n <= cap: return
+        new_cap = max(n, 2 * cap)
+        def grow(a: np.ndarray, fill: Any) -> np.ndarray:
+            b = np.full(new_cap, fill, dtype=a.dtype)
+            b[:cap] = a
+            return b
+        self._alive = grow(self._alive, False)
+        self._ty = grow(self._ty, 0)
+        self._qindex = grow(self._qindex, -1.0)
+        self._rindex = grow(self._rindex, -1.0)
+        self._pnum = grow(self._pnum, 0)
+        self._pden = grow(self._pden, 1)
+        self._astart = grow(self._astart, 0)
+        self._alen = grow(self._alen, 0)
+        self._acap = grow(self._acap, 0)
+
+    def _reserve_pool(self, n: int) -> None:
+        """Makes sure there are ``n`` free entries at the end of the adjacency pool,
+        compacting the pool if more than half of it is unused."""
+        if self._pool_end + n <= len(self._nbr): return
+        if self._pool_garbage > self._pool_end // 2:
+            self._compact_pool(n)
+            if self._pool_end + n <= len(self._nbr): return
+        new_size = max(self._pool_end + n, 2 * len(self._nbr))
+        nbr = np.zeros(new_size, dtype=np.int64)
+        ety = np.zeros(new_size, dtype=np.int8)
+        nbr[:self._pool_end] = self._nbr[:self._pool_end]
+        ety[:self._pool_end] = self._ety[:self._pool_end]
+        self._nbr, self._ety = nbr, ety
+
+    def _compact_pool(self, extra: int = 0) -> None:
+        """Moves all adjacency segments to the front of a new pool, removing the unused gaps."""
+        vs = np.flatnonzero(self._alive[:self._vindex])
+        caps = np.maximum(self._alen[vs], _MIN_SEGMENT)
+        starts = np.zeros(len(vs), dtype=np.int64)
+        if len(vs): starts[1:] = np.cumsum(caps)[:-1]
+        end = int(caps.sum())
+        size = max(2 * end, end + extra, _MIN_SEGMENT)
+        nbr = np.zeros(size, dtype=np.int64)
+        ety = np.zeros(size, dtype=np.int8)
+        old_starts = self._astart[vs]
+        lens = self._alen[vs]
+        for s_old, s_new, l in zip(old_starts.tolist(), starts.tolist(), lens.tolist()):
+            nbr[s_new:s_new+l] = self._nbr[s_old:s_old+l]
+            ety[s_new:s_new+l] = self._ety[s_old:s_old+l]
+        self._nbr, self._ety = nbr, ety
+        self._astart[vs] = starts
+        self._acap[vs] = caps
+        self._pool_end = end
+        self._pool_garbage = 0
+
+    def _new_segment(self, v: int, cap: int) -> None:
+        self._reserve_pool(cap)
+        self._astart[v] = self._pool_end
+        self._alen[v] = 0
+        self._acap[v] = cap
+        self._pool_end += cap
+
+    def _slot(self, v: int, w: int) -> int:
+        """Returns the position of ``w`` in the adjacency segment of ``v``, or -1."""
+        s = int(self._astart[v])
+        seg = self._nbr[s:s+int(self._alen[v])]
+        if len(seg) <= 32:
+            try: return s + seg.tolist().index(w)
+            except ValueError: return -1
+        idx = np.flatnonzero(seg == w)
+        return s + int(idx[0]) if len(idx) else -1
+
+    def _append_half(self, v: int, w: int, et: int) -> None:
+        l = int(self._alen[v])
+        if l == int(self._acap[v]):
+            # move the segment to the end of the pool, doubling its capacity
+            new_cap = 2 * max(l, _MIN_SEGMENT)
+            self._reserve_pool(new_cap)
+            s_old = int(self._astart[v]) # the pool might have been compacted
+            s = self._pool_end
+            self._nbr[s:s+l] = self._nbr[s_old:s_old+l]
+            self._ety[s:s+l] = self._ety[s_old:s_old+l]
+            self._pool_garbage += int(self._acap[v])
+            self._astart[v] = s
+            self._acap[v] = new_cap
+            self._pool_end += new_cap
+        i = int(self._astart[v]) + l
+        self._nbr[i] = w
+        self._ety[i] = et
+        self._alen[v] = l + 1
+
+    def _remove_half(self, v: int, w: int) -> None:
+        i = self._slot(v, w)
+        if i < 0: raise KeyError((v, w))
+        last = int(self._astart[v] + self._alen[v]) - 1
+        self._nbr[i] = self._nbr[last]
+        self._ety[i] = self._ety[last]
+        self._alen[v] = last - int(self._astart[v])
+
+    def _check_vertex(self, v: int) -> None:
+        if not (0 <= v < self._vindex and self._alive[v]):
+            raise KeyError(v)
+
+    # }}}
+
+    def vindex(self) -> int:
+        return self._vindex
+
+    def depth(self) -> int:
+        vs = self._alive[:self._vindex]
+        self._maxr = _to_floatint(float(self._rindex[:self._vindex][vs].max())) if self._nverts else -1
+        return int(self._maxr)
+
+    def qubit_count(self) -> FloatInt:
+        vs = self._alive[:self._vindex]
+        self._maxq = _to_floatint(float(self._qindex[:self._vindex][vs].max())) if self._nverts else -1
+        return self._maxq + 1
+
+    def inputs(self) -> tuple[int, ...]:
+        return self._inputs
+
+    def num_inputs(self) -> int:
+        return len(self._inputs)
+
+    def set_inputs(self, inputs: tuple[int, ...]) -> None:
+        self._inputs = inputs
+
+    def outputs(self) -> tuple[int, ...]:
+        return self._outputs
+
+    def num_outputs(self) -> int:
+        return len(self._outputs)
+
+    def set_outputs(self, outputs: tuple[int, ...]) -> None:
+        self._outputs = outputs
+
+    def add_vertices(self, amount: int) -> list[int]:
+        vs: list[int] = []
+        while self._free and len(vs) < amount:
+            vs.append(self._free.pop())
+        rest = amount - len(vs)
+        if rest > 0:
+            self._grow_vertices(self._vindex + rest)
+            vs.extend(range(self._vindex, self._vindex + rest))
+            self._vindex += rest
+        for v in vs:
+            self._alive[v] = True
+            self._ty[v] = VertexType.BOUNDARY
+            self._qindex[v] = -1.0
+            self._rindex[v] = -1.0
+            self._pnum[v] = 0
+            self._pden[v] = 1
+            self._new_segment(v, _MIN_SEGMENT)
+        self._nverts += amount
+        if self._touched is not None: self._touched.update(vs)
+        return vs
+
+    def add_vertex_indexed(self, v: int) -> None:
+        """Adds a vertex that is guaranteed to have the chosen index (i.e. 'name').
+        If the index isn't available, raises a ValueError.
+        This method is used in the editor to support undo, which requires vertices
+        to preserve their index."""
+        if v in self._vertex_view: raise ValueError("Vertex with this index already exists")
+        if v >= self._vindex:
+            self._grow_vertices(v + 1)
+            self._free.extend(range(self._vindex, v))
+            self._vindex = v + 1
+        else:
+            self._free.remove(v)
+        self._alive[v] = True
+        self._ty[v] = VertexType.BOUNDARY
+        self._qindex[v] = -1.0
+        self._rindex[v] = -1.0
+        self._pnum[v] = 0
+        self._pden[v] = 1
+        self._new_segment(v, _MIN_SEGMENT)
+        self._nverts += 1
+        if self._touched is not None: self._touched.add(v)
+
+    def add_edges(self, edge_pairs: Iterable[tuple[int, int]], edgetype: EdgeType = EdgeType.SIMPLE) -> None:
+        for s,t in edge_pairs:
+            self.nedges += 1
+            self._append_half(s, t, edgetype)
+            self._append_half(t, s, edgetype)
+            if self._touched is not None:
+                self._touched.add(s)
+                self._touched.add(t)
+
+    def add_edge(self, edge_pair: tuple[int, int], edgetype: EdgeType = EdgeType.SIMPLE) -> tuple[int, int]:
+        s,t = edge_pair
+        self._check_vertex(s)
+        self._check_vertex(t)
+        t1 = self.type(s)
+        t2 = self.type(t)
+        if self._touched is not None:
+            self._touched.add(s)
+            self._touched.add(t)
+        if s == t:
+            if not vertex_is_zx_like(t1) or not vertex_is_zx_like(t2):
+                raise ValueError(f'Unexpected vertex type, it should be either z or x because you are trying to add a self-loop')
+            if edgetype==EdgeType.SIMPLE:
+                return edge_pair
+            elif edgetype==EdgeType.HADAMARD:
+                self.add_to_phase(s, 1)
+                return edge_pair
+            else:
+                raise ValueError(f'The edge you are adding is not an accepted type')
+
+        i = self._slot(s, t)
+        if i < 0:
+            self.nedges += 1
+            self._append_half(s, t, edgetype)
+            self._append_half(t, s, edgetype)
+        else:
+            if (vertex_is_zx_like(t1) and vertex_is_zx_like(t2)):
+                et1 = _EDGE_TYPES[int(self._ety[i])]
+
+                # set the roles of simple or hadamard edges, depending on whether the colours match
+                if vertex_is_z_like(t1) == vertex_is_z_like(t2): # same colour
+                    fuse, hopf = (EdgeType.SIMPLE, EdgeType.HADAMARD)
+                else:
+                    fuse, hopf = (EdgeType.HADAMARD, EdgeType.SIMPLE)
+
+                # handle parallel edges for all possible combinations of fuse/hopf type edges
+                if edgetype == fuse and et1 == fuse:
+                    pass # no-op
+                elif ((edgetype == fuse and et1 == hopf) or (edgetype == hopf and et1 == fuse)):
+                    # ensure the remaining edge is 'fuse' type
+                    self.set_edge_type((s,t), fuse)
+                    # add a pi phase to one of the neighbours
+                    if t1 == VertexType.Z_BOX:
+                        set_z_box_label(self, s, get_z_box_label(self, s) * -1)
+                    else:
+                        self.add_to_phase(s, 1)
+                    self.scalar.add_power(-1)
+                elif edgetype == hopf and et1 == hopf:
+                    # remove the edge (reducing mod 2)
+                    self.remove_edge((s,t))
+                    self.scalar.add_power(-2)
+                else:
+                    raise ValueError(f'Got unexpected edge types: {t1}, {t2}')
+            else:
+                if (vertex_is_z_like(t1) and t2 == VertexType.H_BOX) or (vertex_is_z_like(t2) and t1 == VertexType.H_BOX):
+                    if edgetype == EdgeType.SIMPLE: return edge_pair # Parallel simple edges between Z and H-boxes just reduce to a single edge
+                raise ValueError(f'Attempted to add unreducible parallel edge {edge_pair}, types: {t1}, {t2}')
+
+        return edge_pair
+
+    def remove_vertices(self, vertices: Iterable[int]) -> None:
+        for v in vertices:
+            self._check_vertex(v)
+            vs = self.neighbors(v)
+            if self._touched is not None: self._touched.update(vs)
+            # remove all edges
+            for v1 in vs:
+                if v1 == v:
+                    continue
+                self.nedges -= 1
+                self._remove_half(v1, v)
+                self._edata.pop((v, v1) if v < v1 else (v1, v), None)
+            # remove the vertex
+            self._alive[v] = False
+            self._alen[v] = 0
+            self._pool_garbage += int(self._acap[v])
+            self._acap[v] = 0
+            self._phase_obj.pop(v, None)
+            self._nverts -= 1
+            self._free.append(v)
+            if v in self._inputs:
+                self._inputs = tuple(u for u in self._inputs if u != v)
+            if v in self._outputs:
+                self._outputs = tuple(u for u in self._outputs if u != v)
+            if v in self.phase_index: self.remove_phase_index(v)
+            self._grounds.discard(v)
+            self._vdata.pop(v,None)
+
+    def remove_vertex(self, vertex: int) -> None:
+        self.remove_vertices([vertex])
+
+    def remove_edges(self, edges: Iterable[tuple[int, int]]) -> None:
+        for s,t in edges:
+            if s == t:
+                continue
+            self.nedges -= 1
+            self._remove_half(s, t)
+            self._remove_half(t, s)
+            self._edata.pop((s, t), None)
+            if self._touched is not None:
+                self._touched.add(s)
+                self._touched.add(t)
+
+    def remove_edge(self, edge: tuple[int, int]) -> None:
+        self.remove_edges([edge])
+
+    def num_vertices(self) -> int:
+        return self._nverts
+
+    def num_edges(self, s: int | None = None, t: int | None = None, et: EdgeType | None = None) -> int:
+        if s is not None and t is not None:
+            if self.connected(s, t):
+                if et is not None:
+                    if self.edge_type((s, t)) == et:
+                        return 1
+                    else:
+                        return 0
+                else:
+                    return 1
+            else:
+                return 0
+        elif s is not None:
+            return self.vertex_degree(s)
+        else:
+            return self.nedges
+
+    def vertices(self) -> Collection[int]:
+        return self._vertex_view
+
+    def vertex_set(self) -> set[int]:
+        return set(self._vertex_view)
+
+    def vertices_in_range(self, start: FloatInt, end: FloatInt) -> Iterator[int]:
+        """Returns all vertices with index between start and end
+        that only have neighbours whose indices are between start and end"""
+        for v in self.vertices():
+            if not start<v<end: continue
+            if all(start<v2<end for v2 in self.neighbors(v)):
+                yield v
+
+    def edges(self, s: int | None = None, t: int | None = None) -> Iterator[tuple[int, int]]:
+        if s is not None and t is not None:
+            if self.connected(s, t):
+                yield (s,t) if s < t else (t,s)
+        elif s is not None:
+            for t in self.neighbors(s):
+                yield (s,t) if s < t else (t,s)
+        else:
+            for v0 in self.vertices():
+                for v1 in self.neighbors(v0):
+                    if v1 > v0: yield (v0,v1)
+
+    def edges_in_range(self, start: FloatInt, end: FloatInt, safe: bool = False) -> Iterator[tuple[int, int]]:
+        """like self.edges, but only returns edges that belong to vertices
+        that are only directly connected to other vertices with
+        index between start and end.
+        If safe=True then it also checks that every neighbour is only connected to vertices with the right index"""
+        for v0 in self.vertices():
+            if not (start<v0<end): continue
+            adj = self.neighbors(v0)
+            #verify that all neighbours are in range
+            if not all(start<v1<end for v1 in adj): continue
+            if safe and not all(all(start<v2<end for v2 in self.neighbors(v1)) for v1 in adj): continue
+            for v1 in adj:
+                if v1 > v0: yield (v0,v1)
+
+    def edge(self, s: int, t: int, et: EdgeType | None = None) -> tuple[int, int]:
+        """Return the canonical pair ``(min(s, t), max(s, t))`` whether or not the
+        edge exists, like :meth:`~pyzx.graph.graph_s.GraphS.edge`."""
+        return (s,t) if s < t else (t,s)
+
+    def edge_set(self) -> set[tuple[int, int]]:
+        return set(self.edges())
+
+    def edge_st(self, edge: tuple[int, int]) -> tuple[int, int]:
+        return edge
+
+    def neighbors(self, vertex: int) -> list[int]:
+        self._check_vertex(vertex)
+        s = int(self._astart[vertex])
+        return self._nbr[s:s+int(self._alen[vertex])].tolist()
+
+    def vertex_degree(self, vertex: int) -> int:
+        self._check_vertex(vertex)
+        return int(self._alen[vertex])
+
+    def incident_edges(self, vertex: int) -> list[tuple[int, int]]:
+        return [(vertex, v1) if v1 > vertex else (v1, vertex) for v1 in self.neighbors(vertex)]
+
+    def connected(self, v1: int, v2: int) -> bool:
+        self._check_vertex(v1)
+        return self._slot(v1, v2) >= 0
+
+    def edge_type(self, e: tuple[int, int]) -> EdgeType:
+        v1,v2 = e
+        if v1 not in self._vertex_view: return EdgeType(0)
+        i = self._slot(v1, v2)
+        if i < 0: return EdgeType(0)
+        return _EDGE_TYPES[int(self._ety[i])]
+
+    def set_edge_type(self, e: tuple[int, int], t: EdgeType) -> None:
+        v1,v2 = e
+        i, j = self._slot(v1, v2), self._slot(v2, v1)
+        if i < 0 or j < 0: raise KeyError(e)
+        self._ety[i] = t
+        self._ety[j] = t
+        if self._touched is not None:
+            self._touched.add(v1)
+            self._touched.add(v2)
+
+    def type(self, vertex: int) -> VertexType:
+        self._check_vertex(vertex)
+        return _VERTEX_TYPES[int(self._ty[vertex])]
+
+    def types(self) -> Mapping[int, VertexType]:
+        return _ArrayMap(self, self.type)
+
+    def set_type(self, vertex: int, t: VertexType) -> None:
+        self._check_vertex(vertex)
+        self._ty[vertex] = t
+        if self._touched is not None: self._touched.add(vertex)
+
+    def phase(self, vertex: int) -> FractionLike:
+        if vertex not in self._vertex_view: return Fraction(1)
+        d = int(self._pden[vertex])
+        if d == 0: return self._phase_obj[vertex]
+        n = int(self._pnum[vertex])
+        return n if d == 1 else Fraction(n, d)
+
+    def phases(self) -> Mapping[int, FractionLike]:
+        return _ArrayMap(self, self.phase)
+
+    def _store_phase(self, vertex: int, phase: FractionLike) -> None:
+        if isinstance(phase, (int, Fraction)):
+            n, d = phase.numerator, phase.denominator
+            if -_INT64_MAX <= n <= _INT64_MAX and d <= _INT64_MAX:
+                self._pnum[vertex] = n
+                self._pden[vertex] = d
+                if self._phase_obj: self._phase_obj.pop(vertex, None)
+                return
+        self._pnum[vertex] = 0
+        self._pden[vertex] = 0
+        self._phase_obj[vertex] = phase
+
+    def set_phase(self, vertex: int, phase: FractionLike) -> None:
+        self._check_vertex(vertex)
+        if type(phase) is not int and type(phase) is not Fraction:
+            assert_phase_real(phase)
+            phase = normalize_phase(phase)
+        try:
+            phase = phase % 2
+        except Exception:
+            pass
+        self._store_phase(vertex, phase)
+        if self._touched is not None: self._touched.add(vertex)
+
+    def add_to_phase(self, vertex: int, phase: FractionLike) -> None:
+        if type(phase) is not int and type(phase) is not Fraction:
+            assert_phase_real(phase)
+            phase = normalize_phase(phase)
+        self._store_phase(vertex, add_phases(self.phase(vertex), phase))
+        if self._touched is not None: self._touched.add(vertex)
+
+    def qubit(self, vertex: int) -> FloatInt:
+        if vertex not in self._vertex_view: return -1
+        return _to_floatint(float(self._qindex[vertex]))
+
+    def qubits(self) -> Mapping[int, FloatInt]:
+        return _ArrayMap(self, self.qubit)
+
+    def set_qubit(self, vertex: int, q: FloatInt) -> None:
+        self._check_vertex(vertex)
+        if q > self._maxq: self._maxq = q
+        self._qindex[vertex] = q
+
+    def row(self, vertex: int) -> FloatInt:
+        if vertex not in self._vertex_view: return -1
+        return _to_floatint(float(self._rindex[vertex]))
+
+    def rows(self) -> Mapping[int, FloatInt]:
+        return _ArrayMap(self, self.row)
+
+    def set_row(self, vertex: int, r: FloatInt) -> None:
+        self._check_vertex(vertex)
+        if r > self._maxr: self._maxr = r
+        self._rindex[vertex] = r
+
+    def is_ground(self, vertex: int) -> bool:
+        return vertex in self._grounds
+
+    def grounds(self) -> set[int]:
+        return self._grounds
+
+    def set_ground(self, vertex: int, flag: bool = True) -> None:
+        if flag:
+            self._grounds.add(vertex)
+        else:
+            self._grounds.discard(vertex)
+        if self._touched is not None: self._touched.add(vertex)
+
+    def clear_vdata(self, vertex: int) -> None:
+        if vertex in self._vdata:
+            del self._vdata[vertex]
+        if self._touched is not None: self._touched.add(vertex)
+
+    def vdata_keys(self, vertex: int) -> list[str]:
+        return list(self._vdata.get(vertex, {}).keys())
+
+    def vdata(self, vertex: int, key: str, default: Any = None) -> Any:
+        if vertex in self._vdata:
+            return self._vdata[vertex].get(key,default)
+        else:
+            return default
+
+    def set_vdata(self, vertex: int, key: str, val: Any) -> None:
+        if vertex in self._vdata:
+            self._vdata[vertex][key] = val
+        else:
+            self._vdata[vertex] = {key: val}
+        if self._touched is not None: self._touched.add(vertex)
+
+    def clear_edata(self, edge: tuple[int, int]) -> None:
+        self._edata.pop(edge, None)
+
+    def edata_keys(self, edge: tuple[int, int]) -> list[str]:
+        return list(self._edata.get(edge, {}).keys())
+
+    def edata(self, edge: tuple[int, int], key: str, default: Any = None) -> Any:
+        if edge in self._edata:
+            return self._edata[edge].get(key, default)
+        else:
+            return default
+
+    def set_edata(self, edge: tuple[int, int], key: str, val: Any) -> None:
+        if edge in self._edata:
+            self._edata[edge][key] = val
+        else:
+            self._edata[edge] = {key: val}
@@ -0,0 +1,185 @@
+# PyZX - Python library for quantum circuit rewriting
+#       and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#   http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Copy-on-write variant of :class:`~pyzx.graph.graph_s.GraphS`.
+
+:meth:`GraphCOW.clone` does not copy anything: the clone shares the dicts of the
+graph, and both graphs mark them as shared. A shared dict is copied by whichever
+graph first modifies it. The adjacency is shared at two levels: the dict of all
+vertices is copied by reference only, and the adjacency dict of a vertex is copied
+when an edge of that vertex changes. Search algorithms that make many candidates
+from one graph, and change a few vertices in each, then only copy what they touch.
+
+The dicts returned by :meth:`~GraphCOW.types`, :meth:`~GraphCOW.phases` and the like,
+and the view returned by :meth:`~GraphCOW.vertices`, may be shared with clones. They should
+not be modified directly, and are not updated by later changes to the graph."""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from ..utils import EdgeType, FloatInt, FractionLike, VertexType
+from .graph_s import GraphS
+
+# the attributes of GraphS that are shared between clones until they are modified
+_SHARED = ('graph', 'ty', '_phase', '_qindex', '_rindex', '_grounds', '_vdata', '_edata')
+
+
+class GraphCOW(GraphS):
+    """Copy-on-write implementation of :class:`~graph.base.BaseGraph`, whose :meth:`clone` takes constant time."""
+    backend = 'cow'
+
+    def __init__(self) -> None:
+        GraphS.__init__(self)
+        # the attributes in _SHARED that are shared with a clone and have to be copied before they are modified
+        self._shared: set[str] = set()
+        # the vertices whose adjacency dict belongs to this graph alone
+        self._owned: set[int] = set()
+
+    def clone(self) -> 'GraphCOW':
+        cpy = GraphCOW()
+        for name in _SHARED:
+            setattr(cpy, name, getattr(self, name))
+        self._shared = set(_SHARED)
+        self._owned = set()
+        cpy._shared = set(_SHARED)
+        cpy._vindex = self._vindex
+        cpy.nedges = self.nedges
+        cpy._maxq = self._maxq
+        cpy._maxr = self._maxr
+        cpy.scalar = self.scalar.copy()
+        cpy._inputs = self._inputs
+        cpy._outputs = self._outputs
+        cpy.track_phases = self.track_phases
+        cpy.phase_index = self.phase_index.copy()
+        cpy._phase_vertex = self._phase_vertex.copy()
+        cpy.phase_master = self.phase_master
+        cpy.phase_mult = self.phase_mult.copy()
+        cpy.max_phase_index = self.max_phase_index
+        return cpy
+
+    def _own(self, name: str) -> None:
+        """Copies the attribute ``name`` if it is shared with a clone."""
+        if name in self._shared:
+            self._shared.discard(name)
+            setattr(self, name, getattr(self, name).copy())
+
+    def _own_adjacency(self, v: int) -> None:
+        """Copies the adjacency dict of ``v`` if it is shared with a clone."""
+        if v not in self._owned:
+            if 'graph' in self._shared: self._own('graph')
+            self.graph[v] = self.graph[v].copy()
+            self._owned.add(v)
+
+    def add_vertices(self, amount: int) -> list[int]:
+        self._own('graph'); self._own('ty'); self._own('_phase')
+        self._owned.update(range(self._vindex, self._vindex + amount))
+        return GraphS.add_vertices(self, amount)
+
+    def add_vertex_indexed(self, v: int) -> None:
+        self._own('graph'); self._own('ty'); self._own('_phase')
+        GraphS.add_vertex_indexed(self, v)
+        self._owned.add(v)
+
+    def add_edges(self, edge_pairs: Iterable[tuple[int, int]], edgetype: EdgeType = EdgeType.SIMPLE) -> None:
+        edge_pairs = list(edge_pairs)
+        owned = self._owned
+        for s, t in edge_pairs:
+            if s not in owned: self._own_adjacency(s)
+            if t not in owned: self._own_adjacency(t)
+        GraphS.add_edges(self, edge_pairs, edgetype)
+
+    def add_edge(self, edge_pair: tuple[int, int], edgetype: EdgeType = EdgeType.SIMPLE) -> tuple[int, int]:
+        s, t = edge_pair
+        owned = self._owned
+        if s not in owned: self._own_adjacency(s)
+        if t not in owned: self._own_adjacency(t)
+        return GraphS.add_edge(self, edge_pair, edgetype)
+
+    def add_edge_table(self, etab: Mapping[tuple[int, int], list[int]]) -> None:
+        for s, t in etab:
+            self._own_adjacency(s)
+            self._own_adjacency(t)
+        if self._edata: self._own('_edata')
+        GraphS.add_edge_table(self, etab)
+
+    def remove_vertices(self, vertices: Iterable[int]) -> None:
+        vertices = list(vertices)
+        for v in vertices:
+            self._own_adjacency(v)
+            for w in self.graph[v]:
+                self._own_adjacency(w)
+        self._own('graph'); self._own('ty'); self._own('_phase')
+        self._own('_qindex'); self._own('_rindex')
+        if self._grounds: self._own('_grounds')
+        if self._vdata: self._own('_vdata')
+        GraphS.remove_vertices(self, vertices)
+        self._owned.difference_update(vertices)
+
+    def remove_edges(self, edges: Iterable[tuple[int, int]]) -> None:
+        edges = list(edges)
+        owned = self._owned
+        for s, t in edges:
+            if s not in owned: self._own_adjacency(s)
+            if t not in owned: self._own_adjacency(t)
+        if self._edata: self._own('_edata')
+        GraphS.remove_edges(self, edges)
+
+    def set_edge_type(self, e: tuple[int, int], t: EdgeType) -> None:
+        self._own_adjacency(e[0])
+        self._own_adjacency(e[1])
+        GraphS.set_edge_type(self, e, t)
+
+    def set_type(self, vertex: int, t: VertexType) -> None:
+        self._own('ty')
+        GraphS.set_type(self, vertex, t)
+
+    def set_phase(self, vertex: int, phase: FractionLike) -> None:
+        self._own('_phase')
+        GraphS.set_phase(self, vertex, phase)
+
+    def add_to_phase(self, vertex: int, phase: FractionLike) -> None:
+        self._own('_phase')
+        GraphS.add_to_phase(self, vertex, phase)
+
+    def set_qubit(self, vertex: int, q: FloatInt) -> None:
+        self._own('_qindex')
+        GraphS.set_qubit(self, vertex, q)
+
+    def set_row(self, vertex: int, r: FloatInt) -> None:
+        self._own('_rindex')
+        GraphS.set_row(self, vertex, r)
+
+    def set_ground(self, vertex: int, flag: bool = True) -> None:
+        self._own('_grounds')
+        GraphS.set_ground(self, vertex, flag)
+
+    def clear_vdata(self, vertex: int) -> None:
+        if vertex in self._vdata: self._own('_vdata')
+        GraphS.clear_vdata(self, vertex)
+
+    def set_vdata(self, vertex: int, key: str, val: Any) -> None:
+        # the data of a vertex is a dict of its own, which can also be shared
+        self._own('_vdata')
+        self._vdata[vertex] = {**self._vdata.get(vertex, {}), key: val}
+        if self._touched is not None: self._touched.add(vertex)
+
+    def clear_edata(self, edge: tuple[int, int]) -> None:
+        if edge in self._edata: self._own('_edata')
+        GraphS.clear_edata(self, edge)
+
+    def set_edata(self, edge: tuple[int, int], key: str, val: Any) -> None:
+        self._own('_edata')
+        self._edata[edge] = {**self._edata.get(edge, {}), key: val}
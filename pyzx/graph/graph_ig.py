@@ -67,7 +67,7 @@ class GraphIG(BaseGraph):
 	def remove_vertices(self, vertices):
 		self.graph.delete_vertices(vertices)
 
-	def remove_isolated_vertices(self):
+	def remove_isolated_vertices(self, candidates=None):
 		self.graph.vs.select(_degree=0).delete()
 
 	def remove_edges(self, edges):
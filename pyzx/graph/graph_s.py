@@ -14,19 +14,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections.abc import Collection, Iterable, Iterator
+from collections.abc import Collection, Iterable, Iterator, Mapping
 from fractions import Fraction
 from typing import Any
 
 from ..utils import (EdgeType, FloatInt, FractionLike, VertexType,
-                     assert_phase_real, get_z_box_label, normalize_phase,
+                     add_phases, assert_phase_real, get_z_box_label, normalize_phase,
                      set_z_box_label, vertex_is_z_like, vertex_is_zx_like)
 from .base import BaseGraph
 
+# the colours of the zx-like vertex types, for resolving parallel edges in add_edge_table
+_spider_colour = {VertexType.Z: 0, VertexType.Z_BOX: 0, VertexType.X: 1}
+
+# the phase of a vertex without one, shared rather than rebuilt on every lookup
+_ONE = Fraction(1)
+
 
 class GraphS(BaseGraph[int, tuple[int, int]]):
     """Purely Pythonic implementation of :class:`~graph.base.BaseGraph`."""
     backend = 'simple'
+    records_touched = True
 
     #The documentation of what these methods do
     #can be found in base.BaseGraph
@@ -67,6 +74,7 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
         cpy._outputs = tuple(list(self._outputs))
         cpy.track_phases = self.track_phases
         cpy.phase_index = self.phase_index.copy()
+        cpy._phase_vertex = self._phase_vertex.copy()
         cpy.phase_master = self.phase_master
         cpy.phase_mult = self.phase_mult.copy()
         cpy.max_phase_index = self.max_phase_index
@@ -108,6 +116,8 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
             self.graph[i] = dict()
             self.ty[i] = VertexType.BOUNDARY
             self._phase[i] = 0
+        if self._touched is not None:
+            self._touched.update(range(self._vindex, self._vindex + amount))
         self._vindex += amount
         return list(range(self._vindex - amount, self._vindex))
     
@@ -121,17 +131,24 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
         self.graph[v] = dict()
         self.ty[v] = VertexType.BOUNDARY
         self._phase[v] = 0
+        if self._touched is not None: self._touched.add(v)
 
     def add_edges(self, edge_pairs: Iterable[tuple[int, int]], edgetype: EdgeType = EdgeType.SIMPLE) -> None:
         for s,t in edge_pairs:
             self.nedges += 1
             self.graph[s][t] = edgetype
             self.graph[t][s] = edgetype
+            if self._touched is not None:
+                self._touched.add(s)
+                self._touched.add(t)
     
     def add_edge(self, edge_pair: tuple[int, int], edgetype: EdgeType = EdgeType.SIMPLE) -> tuple[int, int]:
         s,t = edge_pair
         t1 = self.ty[s]
         t2 = self.ty[t]
+        if self._touched is not None:
+            self._touched.add(s)
+            self._touched.add(t)
         if s == t:
             if not vertex_is_zx_like(t1) or not vertex_is_zx_like(t2):
                 raise ValueError(f'Unexpected vertex type, it should be either z or x because you are trying to add a self-loop')
@@ -183,9 +200,63 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
 
         return edge_pair
 
+    def add_edge_table(self, etab: Mapping[tuple[int, int], list[int]]) -> None:
+        # Between two spiders the outcome of adding several parallel edges only depends on their
+        # numbers, so every entry is resolved at once instead of calling add_edge for each edge.
+        # Other pairs of vertices, and self-loops, are handled by add_edge.
+        graph, ty, touched = self.graph, self.ty, self._touched
+        colour = _spider_colour
+        nedges = power = 0
+        flip: set[int] = set()  # vertices that get an odd number of pi phases
+        for (s, t), (ns, nh) in etab.items():
+            c1 = colour.get(ty[s])
+            c2 = colour.get(ty[t])
+            gs = graph[s]
+            et = gs.get(t)
+            if s == t or c1 is None or c2 is None or \
+                    (et is not None and et != EdgeType.SIMPLE and et != EdgeType.HADAMARD):
+                for _ in range(ns): self.add_edge((s, t), EdgeType.SIMPLE)
+                for _ in range(nh): self.add_edge((s, t), EdgeType.HADAMARD)
+                continue
+            if c1 == c2:
+                fuse, hopf, nfuse, nhopf = EdgeType.SIMPLE, EdgeType.HADAMARD, ns, nh
+            else:
+                fuse, hopf, nfuse, nhopf = EdgeType.HADAMARD, EdgeType.SIMPLE, nh, ns
+            if et == hopf: nhopf += 1
+            if nfuse or et == fuse:
+                # a single fuse edge remains, and every hopf edge adds a pi phase
+                if et is None: nedges += 1
+                gs[t] = graph[t][s] = fuse
+                if nhopf & 1: flip ^= {s}
+                power -= nhopf
+            elif nhopf & 1:
+                if et is None:
+                    nedges += 1
+                    gs[t] = graph[t][s] = hopf
+                power -= nhopf - 1
+            else:
+                # the hopf edges cancel in pairs
+                if et is not None:
+                    nedges -= 1
+                    del gs[t]
+                    del graph[t][s]
+                    self._edata.pop((s, t), None)
+                power -= nhopf
+            if touched is not None:
+                touched.add(s)
+                touched.add(t)
+        self.nedges += nedges
+        for v in flip:
+            if ty[v] == VertexType.Z_BOX:
+                set_z_box_label(self, v, get_z_box_label(self, v) * -1)
+            else:
+                self.add_to_phase(v, 1)
+        if power: self.scalar.add_power(power)
+
     def remove_vertices(self, vertices: Iterable[int]) -> None:
         for v in vertices:
             vs = list(self.graph[v])
+            if self._touched is not None: self._touched.update(vs)
             # remove all edges
             for v1 in vs:
                 if v1 == v:
@@ -205,11 +276,12 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
             except: pass
             try: del self._rindex[v]
             except: pass
-            try: del self.phase_index[v]
-            except: pass
+            if v in self.phase_index: self.remove_phase_index(v)
             self._grounds.discard(v)
             self._vdata.pop(v,None)
-        self._vindex = max(self.vertices(), default=0) + 1
+        # the index only changes when the vertex with the largest index was removed
+        if self._vindex - 1 not in self.graph:
+            self._vindex = max(self.vertices(), default=0) + 1
 
     def remove_vertex(self, vertex: int) -> None:
         self.remove_vertices([vertex])
@@ -222,6 +294,9 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
             del self.graph[s][t]
             del self.graph[t][s]
             self._edata.pop((s, t), None)
+            if self._touched is not None:
+                self._touched.add(s)
+                self._touched.add(t)
 
     def remove_edge(self, edge: tuple[int, int]) -> None:
         self.remove_edges([edge])
@@ -327,6 +402,9 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
         v1,v2 = e
         self.graph[v1][v2] = t
         self.graph[v2][v1] = t
+        if self._touched is not None:
+            self._touched.add(v1)
+            self._touched.add(v2)
 
     def type(self, vertex: int) -> VertexType:
         return self.ty[vertex]
@@ -336,29 +414,30 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
     
     def set_type(self, vertex: int, t: VertexType) -> None:
         self.ty[vertex] = t
+        if self._touched is not None: self._touched.add(vertex)
 
     def phase(self, vertex: int) -> FractionLike:
-        return self._phase.get(vertex, Fraction(1))
+        return self._phase.get(vertex, _ONE)
     
     def phases(self) -> dict[int, FractionLike]:
         return self._phase
     
     def set_phase(self, vertex: int, phase: FractionLike) -> None:
-        assert_phase_real(phase)
-        phase = normalize_phase(phase)
+        if type(phase) is not int and type(phase) is not Fraction:
+            assert_phase_real(phase)
+            phase = normalize_phase(phase)
         try:
             self._phase[vertex] = phase % 2
         except Exception:
             self._phase[vertex] = phase
+        if self._touched is not None: self._touched.add(vertex)
     
     def add_to_phase(self, vertex: int, phase: FractionLike) -> None:
-        assert_phase_real(phase)
-        phase = normalize_phase(phase)
-        old_phase = self._phase.get(vertex, Fraction(1))
-        try:
-            self._phase[vertex] = (old_phase + phase) % 2
-        except Exception:
-            self._phase[vertex] = old_phase + phase
+        if type(phase) is not int and type(phase) is not Fraction:
+            assert_phase_real(phase)
+            phase = normalize_phase(phase)
+        self._phase[vertex] = add_phases(self._phase.get(vertex, _ONE), phase)
+        if self._touched is not None: self._touched.add(vertex)
     
     def qubit(self, vertex: int) -> FloatInt:
         return self._qindex.get(vertex,-1)
@@ -391,10 +470,12 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
             self._grounds.add(vertex)
         else:
             self._grounds.discard(vertex)
+        if self._touched is not None: self._touched.add(vertex)
 
     def clear_vdata(self, vertex: int) -> None:
         if vertex in self._vdata:
             del self._vdata[vertex]
+        if self._touched is not None: self._touched.add(vertex)
     
     def vdata_keys(self, vertex: int) -> list[str]:
         return list(self._vdata.get(vertex, {}).keys())
@@ -409,6 +490,7 @@ class GraphS(BaseGraph[int, tuple[int, int]]):
             self._vdata[vertex][key] = val
         else:
             self._vdata[vertex] = {key: val}
+        if self._touched is not None: self._touched.add(vertex)
 
     def clear_edata(self, edge: tuple[int, int]) -> None:
         self._edata.pop(edge, None)
@@ -16,15 +16,18 @@
 
 import itertools
 from collections import Counter
-from collections.abc import Collection, Iterable, Iterator
+from collections.abc import Collection, Iterable, Iterator, Mapping
 from fractions import Fraction
 from typing import Any, cast
 
 from ..utils import (EdgeType, FloatInt, FractionLike, VertexType,
-                     assert_phase_real, get_z_box_label, normalize_phase,
+                     add_phases, assert_phase_real, get_z_box_label, normalize_phase,
                      set_z_box_label, vertex_is_zx_like)
 from .base import BaseGraph
 
+# the vertex types whose parallel edges are merged or cancelled by add_edge_table
+_zx_like_types = frozenset((VertexType.Z, VertexType.X, VertexType.Z_BOX))
+
 
 class Edge:
     """A structure for storing the number of simple and number of Hadamard edges
@@ -64,6 +67,7 @@ class Edge:
 class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
     """Purely Pythonic multigraph implementation of :class:`~graph.base.BaseGraph`."""
     backend = 'multigraph'
+    records_touched = True
 
     #The documentation of what these methods do
     #can be found in base.BaseGraph
@@ -107,6 +111,7 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
         cpy._outputs = tuple(list(self._outputs))
         cpy.track_phases = self.track_phases
         cpy.phase_index = self.phase_index.copy()
+        cpy._phase_vertex = self._phase_vertex.copy()
         cpy.phase_master = self.phase_master
         cpy.phase_mult = self.phase_mult.copy()
         cpy.max_phase_index = self.max_phase_index
@@ -158,6 +163,8 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
             self.graph[i] = {}
             self.ty[i] = VertexType.BOUNDARY
             self._phase[i] = 0
+        if self._touched is not None:
+            self._touched.update(range(self._vindex, self._vindex + amount))
         self._vindex += amount
         return range(self._vindex - amount, self._vindex)
     
@@ -171,6 +178,7 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
         self.graph[v] = {}
         self.ty[v] = VertexType.BOUNDARY
         self._phase[v] = 0
+        if self._touched is not None: self._touched.add(v)
 
     def add_edges(self, edge_pairs: Iterable[tuple[int, int]], edgetype: EdgeType = EdgeType.SIMPLE) -> None:
         for ep in edge_pairs: self.add_edge(ep, edgetype)
@@ -178,6 +186,9 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
     def add_edge(self, edge_pair: tuple[int, int], edgetype: EdgeType = EdgeType.SIMPLE) -> tuple[int, int, EdgeType]:
         self.nedges += 1
         s,t = edge_pair
+        if self._touched is not None:
+            self._touched.add(s)
+            self._touched.add(t)
         if not t in self.graph[s]:
             e = Edge()
             self.graph[s][t] = e
@@ -190,47 +201,95 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
         else: e.add(w_io=1)
 
         if self._auto_simplify: # This currently can keep a parallel regular and Hadamard edge
-            t1 = self.ty[s]
-            t2 = self.ty[t]
-            if (vertex_is_zx_like(t1) and vertex_is_zx_like(t2)):
-                if s == t: # turn self-loops in pi phases
-                    e.s = 0
-                    if e.h % 2 == 1:
-                        if t1 == VertexType.Z_BOX:
-                            set_z_box_label(self, s, get_z_box_label(self, s) * -1)
-                        else:
-                            self.add_to_phase(s, 1)
-                    self.scalar.add_power(-e.h)
-                    self.nedges = self.nedges - e.h
-                    e.h = 0
-                else: # apply spider and hopf to merge/cancel parallel edges
-                    if t1 == t2:
-                        if e.s > 0:
-                            self.nedges = self.nedges - e.s + 1
-                            e.s = 1
-                        if e.h > 0:
-                            self.nedges = self.nedges - (e.h - e.h % 2)
-                            self.scalar.add_power(-(e.h - (e.h % 2)))
-                            e.h = e.h % 2
-                    else:
-                        if e.h > 0:
-                            self.nedges = self.nedges - e.h + 1
-                            e.h = 1
-                        if e.s > 0:
-                            self.nedges = self.nedges - (e.s - e.s % 2)
-                            self.scalar.add_power(-(e.s - (e.s % 2)))
-                            e.s = e.s % 2
-            if e.is_empty():
-                del self.graph[s][t]
-                if s != t:
-                    del self.graph[t][s]
-                self._edata.pop((s, t, edgetype), None)
+            self._reduce_parallel_edges(s, t, e, (edgetype,))
 
         return (s,t, edgetype) if s <= t else (t,s,edgetype)
 
+    def add_edge_table(self, etab: Mapping[tuple[int, int], list[int]]) -> None:
+        # The parallel edges are only merged or cancelled once per entry, since the result
+        # only depends on the number of edges of each type between the two vertices.
+        graph, ty, touched = self.graph, self.ty, self._touched
+        zx_like = _zx_like_types if self._auto_simplify else frozenset()
+        nedges = power = 0
+        for (s, t), (ns, nh) in etab.items():
+            if not (ns or nh): continue
+            if touched is not None:
+                touched.add(s)
+                touched.add(t)
+            gs = graph[s]
+            e = gs.get(t)
+            if e is None:
+                e = Edge()
+                gs[t] = e
+                graph[t][s] = e
+            t1, t2 = ty[s], ty[t]
+            if s == t or t1 not in zx_like or t2 not in zx_like or e.w_io:
+                e.add(s=ns, h=nh)
+                self.nedges += ns + nh
+                if self._auto_simplify:
+                    self._reduce_parallel_edges(s, t, e, (EdgeType.SIMPLE, EdgeType.HADAMARD))
+                continue
+            es, eh = e.s + ns, e.h + nh
+            nedges -= e.s + e.h
+            if t1 == t2: # spider fusion on the simple edges, Hopf on the Hadamard edges
+                power -= eh & ~1
+                e.s, e.h = min(es, 1), eh & 1
+            else:
+                power -= es & ~1
+                e.s, e.h = es & 1, min(eh, 1)
+            nedges += e.s + e.h
+            if not (e.s or e.h):
+                del gs[t]
+                del graph[t][s]
+                self._edata.pop((s, t, EdgeType.SIMPLE), None)
+                self._edata.pop((s, t, EdgeType.HADAMARD), None)
+        self.nedges += nedges
+        if power: self.scalar.add_power(power)
+
+    def _reduce_parallel_edges(self, s: int, t: int, e: Edge, added: tuple[EdgeType, ...]) -> None:
+        """Merges or cancels the parallel edges between s and t after the edge types in
+        ``added`` were added to ``e``, and removes ``e`` if no edges remain."""
+        t1 = self.ty[s]
+        t2 = self.ty[t]
+        if (vertex_is_zx_like(t1) and vertex_is_zx_like(t2)):
+            if s == t: # turn self-loops in pi phases
+                e.s = 0
+                if e.h % 2 == 1:
+                    if t1 == VertexType.Z_BOX:
+                        set_z_box_label(self, s, get_z_box_label(self, s) * -1)
+                    else:
+                        self.add_to_phase(s, 1)
+                self.scalar.add_power(-e.h)
+                self.nedges = self.nedges - e.h
+                e.h = 0
+            else: # apply spider and hopf to merge/cancel parallel edges
+                if t1 == t2:
+                    if e.s > 0:
+                        self.nedges = self.nedges - e.s + 1
+                        e.s = 1
+                    if e.h > 0:
+                        self.nedges = self.nedges - (e.h - e.h % 2)
+                        self.scalar.add_power(-(e.h - (e.h % 2)))
+                        e.h = e.h % 2
+                else:
+                    if e.h > 0:
+                        self.nedges = self.nedges - e.h + 1
+                        e.h = 1
+                    if e.s > 0:
+                        self.nedges = self.nedges - (e.s - e.s % 2)
+                        self.scalar.add_power(-(e.s - (e.s % 2)))
+                        e.s = e.s % 2
+        if e.is_empty():
+            del self.graph[s][t]
+            if s != t:
+                del self.graph[t][s]
+            for edgetype in added:
+                self._edata.pop((s, t, edgetype), None)
+
     def remove_vertices(self, vertices: Iterable[int]) -> None:
         for v in vertices:
             vs = list(self.graph[v])
+            if self._touched is not None: self._touched.update(vs)
             # remove all edges
             for v1 in vs:
                 e = self.graph[v][v1]
@@ -252,11 +311,12 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
             except: pass
             try: del self._rindex[v]
             except: pass
-            try: del self.phase_index[v]
-            except: pass
+            if v in self.phase_index: self.remove_phase_index(v)
             self._grounds.discard(v)
             self._vdata.pop(v,None)
-        self._vindex = max(self.vertices(),default=0) + 1
+        # the index only changes when the vertex with the largest index was removed
+        if self._vindex - 1 not in self.graph:
+            self._vindex = max(self.vertices(),default=0) + 1
 
     def remove_vertex(self, vertex: int) -> None:
         self.remove_vertices([vertex])
@@ -268,6 +328,9 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
     def remove_edge(self, edge: tuple[int, int, EdgeType]) -> None:
         s,t,ty = edge
         e = self.graph[s][t]
+        if self._touched is not None:
+            self._touched.add(s)
+            self._touched.add(t)
         if ty == EdgeType.SIMPLE: e.remove(s=1)
         elif ty == EdgeType.HADAMARD: e.remove(h=1)
         else: e.remove(w_io=1)
@@ -417,6 +480,9 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
 
     def set_edge_type(self, e: tuple[int, int, EdgeType], t: EdgeType) -> None:
         v1,v2,ty = e
+        if self._touched is not None:
+            self._touched.add(v1)
+            self._touched.add(v2)
         if ty != t:
             edge = self.graph[v1][v2]
             # decrement the old type and increment the new type
@@ -435,6 +501,7 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
     
     def set_type(self, vertex: int, t: VertexType) -> None:
         self.ty[vertex] = t
+        if self._touched is not None: self._touched.add(vertex)
 
     def phase(self, vertex: int) -> FractionLike:
         return self._phase.get(vertex, Fraction(1))
@@ -443,8 +510,9 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
         return self._phase
     
     def set_phase(self, vertex: int, phase: FractionLike) -> None:
-        assert_phase_real(phase)
-        phase = normalize_phase(phase)
+        if type(phase) is not int and type(phase) is not Fraction:
+            assert_phase_real(phase)
+            phase = normalize_phase(phase)
         try:
             if isinstance(phase, Fraction):
                 self._phase[vertex] = phase % 2
@@ -452,18 +520,21 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
                 self._phase[vertex] = phase
         except Exception:
             self._phase[vertex] = phase
+        if self._touched is not None: self._touched.add(vertex)
     
     def add_to_phase(self, vertex: int, phase: FractionLike) -> None:
-        assert_phase_real(phase)
-        phase = normalize_phase(phase)
+        if type(phase) is not int and type(phase) is not Fraction:
+            assert_phase_real(phase)
+            phase = normalize_phase(phase)
         old_phase = self._phase.get(vertex, Fraction(1))
         try:
             if isinstance(old_phase, Fraction) and isinstance(phase, Fraction):
-                self._phase[vertex] = (old_phase + phase) % 2
+                self._phase[vertex] = add_phases(old_phase, phase)
             else:
                 self._phase[vertex] = old_phase + phase
         except Exception:
             self._phase[vertex] = old_phase + phase
+        if self._touched is not None: self._touched.add(vertex)
     
     def qubit(self, vertex: int) -> FloatInt:
         return self._qindex.get(vertex,-1)
@@ -496,10 +567,12 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
             self._grounds.add(vertex)
         else:
             self._grounds.discard(vertex)
+        if self._touched is not None: self._touched.add(vertex)
 
     def clear_vdata(self, vertex: int) -> None:
         if vertex in self._vdata:
             del self._vdata[vertex]
+        if self._touched is not None: self._touched.add(vertex)
     
     def vdata_keys(self, vertex: int) -> Iterable[str]:
         return self._vdata.get(vertex, {}).keys()
@@ -515,6 +588,7 @@ class Multigraph(BaseGraph[int, tuple[int, int, EdgeType]]):
             self._vdata[vertex][key] = val
         else:
             self._vdata[vertex] = {key: val}
+        if self._touched is not None: self._touched.add(vertex)
 
     def clear_edata(self, edge: tuple[int, int, EdgeType]) -> Any:
         self._edata.pop(edge, None)
@@ -17,7 +17,6 @@
 """This file contains the Scalar class used to represent a global scalar in a Graph."""
 
 import cmath
-import copy
 import json
 import math
 from collections.abc import Mapping
@@ -25,9 +24,9 @@ from fractions import Fraction
 from typing import Any
 
 from ..symbolic import Poly, Var
-from ..utils import FractionLike, phase_is_clifford, phase_is_pauli
+from ..utils import FractionLike, dyadic_phase, phase_is_clifford, phase_is_pauli
 
-__all__ = ['Scalar']
+__all__ = ['Scalar', 'ZOmega']
 
 
 def cexp(val: Fraction | complex | Poly) -> complex:
@@ -80,12 +79,139 @@ unicode_fractions = {
     Fraction(3,4): '¾',
 }
 
+def omega_exponent(phase: FractionLike) -> int | None:
+    """Returns the ``n`` in ``0..7`` for which ``e^(i*pi*phase)`` is ``ω^n``, with
+    ``ω = e^(i*pi/4)``, or ``None`` if ``phase`` is not a multiple of 1/4."""
+    d = dyadic_phase(phase)
+    if d is None or d[1] > 2: return None
+    return d[0] << (2 - d[1])
+
+class ZOmega:
+    """An element ``(a + bω + cω² + dω³)·√2^k`` of the ring Z[ω, 1/√2], where
+    ``ω = e^(iπ/4)``. These are exactly the numbers that the Clifford+T fragment of the
+    ZX-calculus produces as scalars, so they can be multiplied and summed without
+    rounding.
+
+    The representation is canonical: the coefficients are never all divisible by
+    ``√2 = ω - ω³``, and zero has ``k = 0``. Two equal numbers therefore have equal
+    coefficients, and instances are immutable and hashable.
+    """
+    __slots__ = ('a', 'b', 'c', 'd', 'k')
+
+    def __init__(self, a: int = 0, b: int = 0, c: int = 0, d: int = 0, k: int = 0) -> None:
+        if not (a or b or c or d):
+            k = 0
+        else:
+            # x is divisible by √2 iff a = c and b = d modulo 2, and then x/√2 = x·√2/2
+            while not ((a - c) & 1 or (b - d) & 1):
+                a, b, c, d = (b - d) >> 1, (a + c) >> 1, (b + d) >> 1, (c - a) >> 1
+                k += 1
+        self.a, self.b, self.c, self.d, self.k = a, b, c, d, k
+
+    @classmethod
+    def omega_power(cls, n: int) -> 'ZOmega':
+        """Returns ``ω^n``."""
+        n %= 8
+        coeffs = [0, 0, 0, 0]
+        coeffs[n % 4] = 1 if n < 4 else -1
+        return cls(*coeffs)
+
+    @classmethod
+    def from_phase(cls, phase: FractionLike) -> 'ZOmega | None':
+        """Returns ``e^(i*pi*phase)``, or ``None`` if ``phase`` is not a multiple of 1/4."""
+        n = omega_exponent(phase)
+        return None if n is None else cls.omega_power(n)
+
+    def _times_sqrt2(self, m: int) -> tuple[int, int, int, int]:
+        # the coefficients of this number times √2^m, for m >= 0
+        a, b, c, d = self.a, self.b, self.c, self.d
+        if m & 1:
+            a, b, c, d = b - d, a + c, b + d, c - a
+        s = m >> 1
+        return a << s, b << s, c << s, d << s
+
+    def __add__(self, other: 'ZOmega | int') -> 'ZOmega':
+        if isinstance(other, int):
+            other = ZOmega(other)
+        if not isinstance(other, ZOmega):
+            return NotImplemented
+        if other.k < self.k:
+            self, other = other, self
+        a, b, c, d = other._times_sqrt2(other.k - self.k)
+        return ZOmega(self.a + a, self.b + b, self.c + c, self.d + d, self.k)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> 'ZOmega':
+        return ZOmega(-self.a, -self.b, -self.c, -self.d, self.k)
+
+    def __sub__(self, other: 'ZOmega | int') -> 'ZOmega':
+        return self + (-other)
+
+    def __mul__(self, other: 'ZOmega | int') -> 'ZOmega':
+        if isinstance(other, int):
+            return ZOmega(self.a * other, self.b * other, self.c * other, self.d * other, self.k)
+        if not isinstance(other, ZOmega):
+            return NotImplemented
+        a0, a1, a2, a3 = self.a, self.b, self.c, self.d
+        b0, b1, b2, b3 = other.a, other.b, other.c, other.d
+        # polynomial multiplication modulo ω^4 = -1
+        return ZOmega(a0*b0 - a1*b3 - a2*b2 - a3*b1,
+                      a0*b1 + a1*b0 - a2*b3 - a3*b2,
+                      a0*b2 + a1*b1 + a2*b0 - a3*b3,
+                      a0*b3 + a1*b2 + a2*b1 + a3*b0,
+                      self.k + other.k)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, int):
+            other = ZOmega(other)
+        if not isinstance(other, ZOmega):
+            return NotImplemented
+        return (self.a == other.a and self.b == other.b and self.c == other.c and
+                self.d == other.d and self.k == other.k)
+
+    def __hash__(self) -> int:
+        return hash((self.a, self.b, self.c, self.d, self.k))
+
+    def __bool__(self) -> bool:
+        return bool(self.a or self.b or self.c or self.d)
+
+    def __repr__(self) -> str:
+        return "ZOmega({}, {}, {}, {}, k={})".format(self.a, self.b, self.c, self.d, self.k)
+
+    def conjugate(self) -> 'ZOmega':
+        """Returns the complex conjugate, using that the conjugate of ``ω`` is ``-ω³``."""
+        return ZOmega(self.a, -self.d, -self.c, -self.b, self.k)
+
+    def to_number(self) -> complex:
+        r = math.sqrt(2) ** (self.k & 1) * 2.0 ** (self.k >> 1)
+        s = (self.b - self.d) / math.sqrt(2)
+        t = (self.b + self.d) / math.sqrt(2)
+        return complex((self.a + s) * r, (self.c + t) * r)
+
+    def __complex__(self) -> complex:
+        return self.to_number()
+
+_ONE = ZOmega(1)
+
 class Scalar:
-    """Represents a global scalar for a Graph instance."""
+    """Represents a global scalar for a Graph instance.
+
+    Legless spiders whose phase is a multiple of pi/4 are not stored in ``phasenodes``
+    but multiplied into ``factor``, an exact element of Z[ω, 1/√2], whose powers of √2
+    are moved into ``power2`` and which is moved into ``phase`` when it is a power of ω.
+    The scalars of Clifford+T diagrams thus stay small, and
+    :meth:`to_exact` turns them into a :class:`ZOmega` that can be summed exactly."""
+    __slots__ = ('power2', 'phase', 'factor', 'phasenodes', 'sum_of_phases', 'floatfactor',
+                 'is_unknown', 'is_zero')
+
     def __init__(self) -> None:
         self.power2: int = 0 # Stores power of square root of two
         self.phase: FractionLike = Fraction(0) # Stores complex phase of the number
-        self.phasenodes: list[FractionLike] = [] # Stores list of legless spiders, by their phases.
+        self.factor: ZOmega = _ONE # Stores the legless spiders with a phase that is a multiple of pi/4
+        self.phasenodes: list[FractionLike] = [] # Stores list of the other legless spiders, by their phases.
         self.sum_of_phases: dict[FractionLike, int] = {} # Represents the term (c1*exp(i*phase1) + ... + cn*exp(i*phaseN)). The dictionary maps phase -> coefficient.
         self.floatfactor: complex = 1.0
         self.is_unknown: bool = False # Whether this represents an unknown scalar value
@@ -105,6 +231,8 @@ class Scalar:
         s += "sqrt(2)^{:d}".format(self.power2)
         if self.phase:
             s += phase_to_str(self.phase)
+        if self.factor != _ONE:
+            s += "({})".format(factor_to_str(self.factor))
         for node in self.phasenodes:
             s += "(1+exp(({})ipi))".format(str(node))
         if self.sum_of_phases:
@@ -122,6 +250,7 @@ class Scalar:
             return NotImplemented
         return (self.power2 == other.power2 and
                 self.phase == other.phase and
+                self.factor == other.factor and
                 self.phasenodes == other.phasenodes and
                 self.sum_of_phases == other.sum_of_phases and
                 self.floatfactor == other.floatfactor and
@@ -148,12 +277,14 @@ class Scalar:
         s = Scalar()
         s.power2 = self.power2
         s.phase = self.phase if not conjugate else -self.phase
-        s.phasenodes = copy.copy(self.phasenodes) if not conjugate else [-p for p in self.phasenodes]
+        s.factor = self.factor if not conjugate else self.factor.conjugate()
+        s.phasenodes = self.phasenodes.copy() if not conjugate else [-p for p in self.phasenodes]
         s.floatfactor = self.floatfactor if not conjugate else self.floatfactor.conjugate()
         s.is_unknown = self.is_unknown
         s.is_zero = self.is_zero
         if not conjugate:
-            s.sum_of_phases = copy.deepcopy(self.sum_of_phases)
+            # the phases and coefficients are immutable, so a shallow copy suffices
+            s.sum_of_phases = self.sum_of_phases.copy()
         else:
             s.sum_of_phases = {-phase: coeff for phase, coeff in self.sum_of_phases.items()}
         return s
@@ -187,6 +318,7 @@ class Scalar:
         """
         s = Scalar()
         s.power2 = self.power2
+        s.factor = self.factor
         s.floatfactor = self.floatfactor
         s.is_unknown = self.is_unknown
         s.is_zero = self.is_zero
@@ -222,21 +354,42 @@ class Scalar:
         if self.is_zero: return 0
 
         val = cexp(self.phase)
+        if self.factor != _ONE:
+            val *= self.factor.to_number()
         for node in self.phasenodes: # Node should be a Fraction
             val *= 1+cexp(node)
-        sum_of_phases_val = 0j
-        for phase, coeff in self.sum_of_phases.items():
-            sum_of_phases_val += coeff * cexp(phase)
-        if sum_of_phases_val != 0:
-            val *= sum_of_phases_val
+        if self.sum_of_phases:
+            val *= sum(coeff * cexp(phase) for phase, coeff in self.sum_of_phases.items())
         val *= math.sqrt(2)**self.power2
         return val*self.floatfactor
 
+    def to_exact(self) -> ZOmega | None:
+        """Returns the scalar as an exact :class:`ZOmega`, or ``None`` if it isn't one,
+        i.e. if it has a float factor, is unknown, or contains a phase that is not a
+        multiple of pi/4."""
+        if self.is_zero: return ZOmega()
+        if self.is_unknown or self.floatfactor != 1: return None
+        n = omega_exponent(self.phase)
+        if n is None: return None
+        val = self.factor * ZOmega.omega_power(n)
+        for node in self.phasenodes:
+            m = omega_exponent(node)
+            if m is None: return None
+            val = val * (ZOmega.omega_power(m) + 1)
+        if self.sum_of_phases:
+            total = ZOmega()
+            for phase, coeff in self.sum_of_phases.items():
+                m = omega_exponent(phase)
+                if m is None: return None
+                total = total + ZOmega.omega_power(m) * coeff
+            val = val * total
+        return val * ZOmega(1, k=self.power2)
+
     def to_latex(self) -> str:
         """Converts the Scalar into a string that is compatible with LaTeX."""
         if self.is_zero: return "0"
         elif self.is_unknown: return "Unknown"
-        f = self.floatfactor
+        f = self.floatfactor * self.factor.to_number()
         for node in self.phasenodes:
             f *= 1+cexp(node)
         if self.phase == 1:
@@ -277,7 +430,7 @@ class Scalar:
         to represent pi's and sqrt's."""
         if self.is_zero: return "0"
         elif self.is_unknown: return "Unknown"
-        f = self.floatfactor
+        f = self.floatfactor * self.factor.to_number()
         for node in self.phasenodes:
             f *= 1+cexp(node)
         s = ""
@@ -325,6 +478,9 @@ class Scalar:
         d = {"power2": self.power2, "phase": str(self.phase)}
         if abs(self.floatfactor - 1) > 0.00001:
             d["floatfactor"] =  str(self.floatfactor)
+        if self.factor != _ONE:
+            d["factor"] = [self.factor.a, self.factor.b, self.factor.c, self.factor.d]
+            if self.factor.k: d["factor"].append(self.factor.k)
         if self.phasenodes:
             d["phasenodes"] = [str(p) for p in self.phasenodes]
         if self.sum_of_phases:
@@ -351,6 +507,8 @@ class Scalar:
         scalar.power2 = int(d["power2"])
         if "floatfactor" in d:
             scalar.floatfactor = complex(d["floatfactor"])
+        if "factor" in d:
+            scalar.multiply_exact(ZOmega(*(int(x) for x in d["factor"])))
         if "phasenodes" in d:
             scalar.phasenodes = [string_to_phase(p) for p in d["phasenodes"]]
         if "sum_of_phases" in d:
@@ -375,12 +533,31 @@ class Scalar:
     def add_node(self, node: FractionLike) -> None:
         """A solitary spider with a phase ``node`` is converted into the
         scalar 1+e^(i*pi*node)."""
+        n = omega_exponent(node)
         if node == 0:
             self.power2 += 2
+        elif n is not None and n != 4:
+            self.multiply_exact(ZOmega.omega_power(n) + 1)
         else:
             self.phasenodes.append(node)
         if node == 1: self.is_zero = True
 
+    def multiply_exact(self, z: ZOmega) -> None:
+        """Multiplies the scalar by an exact element of Z[ω, 1/√2]."""
+        if not z:
+            self.is_zero = True
+            return
+        f = self.factor * z
+        self.power2 += f.k
+        coeffs = (f.a, f.b, f.c, f.d)
+        if sum(map(abs, coeffs)) == 1:
+            # f is ±ω^n, so only contributes to the phase
+            n = next(i for i, c in enumerate(coeffs) if c)
+            self.add_phase(Fraction(n if coeffs[n] == 1 else n + 4, 4))
+            self.factor = _ONE
+        else:
+            self.factor = ZOmega(*coeffs) if f.k else f
+
     def add_float(self,f: complex) -> None:
         if f == 0.0:
             self.is_zero = True
@@ -407,6 +584,7 @@ class Scalar:
         """Multiplies two instances of Scalar together."""
         self.power2 += other.power2
         self.phase = (self.phase +other.phase)%2
+        if other.factor != _ONE: self.multiply_exact(other.factor)
         self.phasenodes.extend(other.phasenodes)
         self.multiply_sum_of_phases(other.sum_of_phases)
         self.floatfactor *= other.floatfactor
@@ -451,6 +629,10 @@ class Scalar:
         return
 
 
+def factor_to_str(z: ZOmega) -> str:
+    terms = [(c, w) for c, w in ((z.a, ""), (z.b, "w"), (z.c, "w^2"), (z.d, "w^3")) if c]
+    return " + ".join((str(c) if not w else coeff_to_str(c) + w) for c, w in terms)
+
 def coeff_to_str(coeff: int) -> str:
     if coeff == 1:
         return ""
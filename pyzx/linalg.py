@@ -32,8 +32,14 @@ MatLike = List[List[Z2]]
 
 class Mat2(object):
     """A matrix over Z2, with methods for multiplication, primitive row and column
-    operations, Gaussian elimination, rank, and epi-mono factorisation."""
-    
+    operations, Gaussian elimination, rank, and epi-mono factorisation.
+
+    Matrices with at least ``PACKED_MIN_SIZE`` rows and columns are eliminated
+    using the bit-packed rows of :class:`PackedMat2`."""
+
+    # below this many rows or columns the list-based elimination is faster
+    PACKED_MIN_SIZE: int = 64
+
     @staticmethod
     def id(n: int) -> 'Mat2':
         return Mat2([[1 if i == j else 0
@@ -107,6 +113,11 @@ class Mat2(object):
 
     def copy(self) -> 'Mat2':
         return Mat2([list(row) for row in self.data])
+    def packed(self) -> 'PackedMat2':
+        """Returns a copy of the matrix as a :class:`PackedMat2`."""
+        return PackedMat2(self.data)
+    def _use_packed(self) -> bool:
+        return min(self.rows(), self.cols()) >= self.PACKED_MIN_SIZE
     def transpose(self) -> 'Mat2':
         return Mat2([[self.data[i][j] for i in range(self.rows())] for j in range(self.cols())])
     def rows(self) -> int:
@@ -172,6 +183,13 @@ class Mat2(object):
         Note x and y need not be matrices. x can be any object that implements the method
         row_add(), and y any object that implements col_add().
         """
+        if self._use_packed():
+            p = self.packed()
+            rank = p.gauss(full_reduce, x, y, blocksize, pivot_cols)
+            # overwrite the rows in place, as the list-based elimination does
+            for row, new_row in zip(self.data, p.data):
+                row[:] = new_row
+            return rank
 
         rows = self.rows()
         cols = self.cols()
@@ -251,6 +269,7 @@ class Mat2(object):
 
     def rank(self) -> int:
         """Returns the rank of the matrix."""
+        if self._use_packed(): return self.packed().gauss()
         m = self.copy()
         return m.gauss()
 
@@ -277,6 +296,9 @@ class Mat2(object):
     def inverse(self) -> Optional['Mat2']:
         """Returns the inverse of m is invertible and None otherwise."""
         if self.rows() != self.cols(): return None
+        if self._use_packed():
+            pinv = self.packed().inverse()
+            return pinv.to_mat2() if pinv is not None else None
         m = self.copy()
         inv = Mat2.id(self.rows())
         rank = m.gauss(x=inv, full_reduce=True)
@@ -285,6 +307,9 @@ class Mat2(object):
 
     def solve(self, b: 'Mat2') -> Optional['Mat2']:
         """Return a vector x such that M * x = b, or None if there is no solution."""
+        if self._use_packed():
+            px = self.packed().solve(b.packed())
+            return px.to_mat2() if px is not None else None
         m = self.copy()
         b1 = b.copy()
         rank = m.gauss(x=b1, full_reduce=True)
@@ -321,6 +346,8 @@ class Mat2(object):
         if gauss_fast:
             data = gauss_fast(self.data,1)
             m = Mat2(data)
+        elif self._use_packed():
+            return self.packed().nullspace(should_copy=False)
         elif should_copy:
             m = self.copy()
             m.gauss(full_reduce=True)
@@ -376,6 +403,387 @@ class CNOTMaker(object):
         self.cnots.append(CNOT(r2,r1))
 
 
+class PackedMat2(object):
+    """A matrix over Z2 with the same interface as :class:`Mat2`, but whose rows are
+    packed into 64-bit words, so that row additions, row swaps and the search for
+    pivots work on 64 columns at a time.
+
+    The bits are stored in the ``(rows, words)`` array ``self.words``, where column
+    ``j`` is bit ``j % 64`` of word ``j // 64``, as in :class:`REF`. The attribute
+    ``data`` returns the matrix as a fresh list of lists, so writing into it does
+    not change the matrix; use indexing for that instead.
+
+    :class:`Mat2` automatically does its Gaussian elimination with this class once
+    the matrix has at least ``Mat2.PACKED_MIN_SIZE`` rows and columns."""
+    BASE = 64
+
+    @staticmethod
+    def id(n: int) -> 'PackedMat2':
+        m = PackedMat2.zeros(n, n)
+        for i in range(n):
+            m.words[i, i // 64] |= np.uint64(1) << np.uint64(i % 64)
+        return m
+    @staticmethod
+    def zeros(m: int, n: int) -> 'PackedMat2':
+        return PackedMat2.from_words(np.zeros((m, _num_words(n)), dtype=np.uint64), n)
+    @staticmethod
+    def unit_vector(d: int, i: int) -> 'PackedMat2':
+        m = PackedMat2.zeros(d, 1)
+        m.words[i, 0] = 1
+        return m
+    @staticmethod
+    def from_words(words: NDArray[np.uint64], cols: int) -> 'PackedMat2':
+        """Builds a matrix with ``cols`` columns directly from an array of packed rows."""
+        m = PackedMat2.__new__(PackedMat2)
+        m.words = words
+        m._cols = cols
+        return m
+
+    def __init__(self, data: Union[MatLike, NDArray[np.integer]]):
+        a = np.array(data, dtype=np.uint8)
+        if a.ndim != 2: a = a.reshape(len(a), 0)
+        self.words: NDArray[np.uint64] = _pack_rows(a)
+        self._cols: int = a.shape[1]
+
+    @property
+    def data(self) -> MatLike:
+        return self.to_array().tolist()
+    @data.setter
+    def data(self, data: MatLike) -> None:
+        m = PackedMat2(data)
+        self.words = m.words
+        self._cols = m._cols
+
+    def to_array(self) -> NDArray[np.uint8]:
+        """Returns the matrix as a ``(rows, cols)`` array of zeros and ones."""
+        bits = np.unpackbits(self.words.view(np.uint8), axis=1, bitorder='little')
+        return bits[:, :self._cols]
+    def to_mat2(self) -> Mat2:
+        """Returns a copy of the matrix as a :class:`Mat2`."""
+        return Mat2(self.data)
+
+    def __mul__(self, m: 'PackedMat2') -> 'PackedMat2':
+        # float64 is exact here, and unlike integer matmul is done by BLAS
+        prod = self.to_array().astype(np.float64) @ m.to_array().astype(np.float64)
+        return PackedMat2(prod.astype(np.int64) % 2)
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (Mat2, PackedMat2)): return False
+        if self.rows() != other.rows() or self.cols() != other.cols(): return False
+        if isinstance(other, Mat2): other = PackedMat2(other.data)
+        return bool(np.array_equal(self.words, other.words))
+    def __str__(self) -> str:
+        return "\n".join("[ " +
+            "  ".join(str(value) for value in row) +
+            " ]" for row in self.data)
+    def __repr__(self) -> str:
+        return str(self)
+    def __getitem__(self, key: Tuple[Union[int,slice],Union[int,slice]]) -> Union['PackedMat2',Z2]:
+        if isinstance(key,tuple):
+            rs,cs = key
+            if isinstance(rs,slice) or isinstance(cs,slice):
+                if not isinstance(rs,slice): rs = slice(rs,rs+1)
+                if not isinstance(cs,slice): cs = slice(cs,cs+1)
+                return PackedMat2(self.to_array()[rs, cs])
+            else:
+                if rs < 0: rs += self.rows()
+                if cs < 0: cs += self._cols
+                if not 0 <= cs < self._cols: raise IndexError("column index out of range")
+                return cast(Z2, int(self.words[rs, cs // 64] >> np.uint64(cs % 64)) & 1)
+        else:
+            raise IndexError("Expected a pair of indices/slices.")
+    def __setitem__(self, key, val):
+        if isinstance(key,tuple):
+            a = self.to_array()
+            a[key] = val.to_array() if isinstance(val, PackedMat2) else (val.data if isinstance(val, Mat2) else val)
+            self.words = _pack_rows(a)
+        else:
+            raise IndexError("Expected a pair of indices/slices.")
+
+    def copy(self) -> 'PackedMat2':
+        return PackedMat2.from_words(self.words.copy(), self._cols)
+    def transpose(self) -> 'PackedMat2':
+        return PackedMat2(self.to_array().T)
+    def rows(self) -> int:
+        return self.words.shape[0]
+    def cols(self) -> int:
+        return self._cols if self.rows() != 0 else 0
+    def row_add(self, r0: int, r1: int) -> None:
+        """Add r0 to r1"""
+        self.words[r1] ^= self.words[r0]
+    def col_add(self, c0: int, c1: int) -> None:
+        """Add c0 to c1"""
+        self.words[:, c1 // 64] ^= self.column(c0) << np.uint64(c1 % 64)
+    def row_swap(self, r0: int, r1: int) -> None:
+        """Swap the rows r0 and r1"""
+        self.words[[r0, r1]] = self.words[[r1, r0]]
+    def col_swap(self, c0: int, c1: int) -> None:
+        """Swap the columns c0 and c1"""
+        diff = self.column(c0) ^ self.column(c1)
+        self.words[:, c0 // 64] ^= diff << np.uint64(c0 % 64)
+        self.words[:, c1 // 64] ^= diff << np.uint64(c1 % 64)
+    def column(self, c: int) -> NDArray[np.uint64]:
+        """Returns column c as an array of zeros and ones."""
+        return (self.words[:, c // 64] >> np.uint64(c % 64)) & np.uint64(1)
+
+    def permute_rows(self, p: List[int]) -> None:
+        """Permute the rows of the matrix according to the permutation p."""
+        self.words = self.words[p]
+    def permute_cols(self, p: List[int]) -> None:
+        """Permute the columns of the matrix according to the permutation p."""
+        self.words = _pack_rows(self.to_array()[:, p])
+
+    @staticmethod
+    def _strip_bits(words: NDArray[np.uint64], i0: int, i1: int) -> NDArray[np.uint64]:
+        # the bits i0..i1-1 of each of the given packed rows as an integer
+        keys = np.zeros(len(words), dtype=np.uint64)
+        for k, c in enumerate(range(i0, i1)):
+            keys |= ((words[:, c // 64] >> np.uint64(c % 64)) & np.uint64(1)) << np.uint64(k)
+        return keys
+
+    def _chunk_keys(self, rows: NDArray[np.intp], i0: int, i1: int) -> List[int]:
+        return self._strip_bits(self.words[rows], i0, i1).tolist()
+
+    def gauss(self, full_reduce:bool=False, x:Any=None, y:Any=None, blocksize:int=6, pivot_cols:Optional[List[int]]=None) -> int:
+        """Compute the echelon form. Returns the number of non-zero rows in the result, i.e.
+        the rank of the matrix.
+
+        This does exactly the same sequence of primitive row operations as
+        :meth:`Mat2.gauss`, and takes the same parameters, but each step acts on
+        all affected rows at once."""
+        if pivot_cols is None: pivot_cols = []
+        rows = self.rows()
+        cols = self.cols()
+        w = self.words
+        pivot_row = 0
+        for sec in range(math.ceil(cols / blocksize)):
+            i0 = sec * blocksize
+            i1 = min(cols, (sec+1) * blocksize)
+
+            # search for duplicate chunks of 'blocksize' bits and eliminate them.
+            # Only row r changes when it is reduced, so all keys can be computed up front.
+            chunks: Dict[int,int] = dict()
+            for r, t in zip(range(pivot_row, rows), self._chunk_keys(np.arange(pivot_row, rows), i0, i1)):
+                if not t: continue
+                if t in chunks:
+                    w[r] ^= w[chunks[t]]
+                    if x is not None: x.row_add(chunks[t], r)
+                    if y is not None: y.col_add(r, chunks[t])
+                else:
+                    chunks[t] = r
+
+            for p in range(i0, i1):
+                if pivot_row >= rows: break
+                nz = np.flatnonzero(self.column(p)[pivot_row:])
+                if len(nz) == 0: continue
+                r0 = pivot_row + int(nz[0])
+                if r0 != pivot_row:
+                    w[pivot_row] ^= w[r0]
+                    if x is not None: x.row_add(r0, pivot_row)
+                    if y is not None: y.col_add(pivot_row, r0)
+                below = pivot_row + 1 + np.flatnonzero(self.column(p)[pivot_row+1:])
+                if len(below):
+                    w[below] ^= w[pivot_row]
+                    if x is not None or y is not None:
+                        for r1 in below.tolist():
+                            if x is not None: x.row_add(pivot_row, r1)
+                            if y is not None: y.col_add(r1, pivot_row)
+                pivot_cols.append(p)
+                pivot_row += 1
+
+        rank = pivot_row
+
+        if full_reduce:
+            pivot_row -= 1
+            pivot_cols1 = pivot_cols.copy()
+
+            for sec in range(math.ceil(cols / blocksize) - 1, -1, -1):
+                i0 = sec * blocksize
+                i1 = min(cols, (sec+1) * blocksize)
+
+                # search for duplicate chunks of 'blocksize' bits and eliminate them
+                chunks = dict()
+                if pivot_row >= 0:
+                    for r, t in zip(range(pivot_row, -1, -1), self._chunk_keys(np.arange(pivot_row, -1, -1), i0, i1)):
+                        if not t: continue
+                        if t in chunks:
+                            w[r] ^= w[chunks[t]]
+                            if x is not None: x.row_add(chunks[t], r)
+                            if y is not None: y.col_add(r, chunks[t])
+                        else:
+                            chunks[t] = r
+
+                while len(pivot_cols1) != 0 and i0 <= pivot_cols1[-1] < i1:
+                    pcol = pivot_cols1.pop()
+                    if pivot_row > 0:
+                        above = np.flatnonzero(self.column(pcol)[:pivot_row])
+                        if len(above):
+                            w[above] ^= w[pivot_row]
+                            if x is not None or y is not None:
+                                for r in above.tolist():
+                                    if x is not None: x.row_add(pivot_row, r)
+                                    if y is not None: y.col_add(r, pivot_row)
+                    pivot_row -= 1
+
+        return rank
+
+    def gauss_m4ri(self, full_reduce:bool=False, ncols:Optional[int]=None, k:Optional[int]=None) -> int:
+        """Compute the echelon form with the Method of Four Russians (M4RI). Returns the
+        rank of the matrix. Unlike :meth:`gauss`, the row operations are not reported,
+        and rows are swapped to bring the pivots to the top.
+
+        The columns are handled in strips of ``k`` columns. The up to ``k`` pivot rows of
+        a strip are reduced among themselves, after which a table of all ``2^k`` sums of
+        these rows is built, so that every other row is reduced with a single lookup
+        and XOR. See:
+
+        M. Albrecht, G. Bard, W. Hart. Algorithm 898: Efficient Multiplication of Dense
+        Matrices over GF(2). ACM TOMS 2010
+
+        If ``full_reduce`` is True, the pivots are also cleared from the rows above, giving
+        the reduced echelon form. Only the first ``ncols`` columns are searched for
+        pivots, which allows eliminating an augmented matrix such as ``[A | I]``.
+        """
+        rows = self.rows()
+        if ncols is None: ncols = self.cols()
+        if k is None: k = max(1, min(8, rows.bit_length() - 3))
+        w = self.words
+        pivot_row = 0
+        c0 = 0
+        while c0 < ncols and pivot_row < rows:
+            c1 = min(ncols, c0 + k)
+            pivots: List[int] = [] # pivot columns of this strip, one per row from pivot_row
+            # bits c0..c1-1 of the remaining rows, kept reduced by the pivots found so far
+            keys = self._strip_bits(w[pivot_row:], c0, c1)
+            for c in range(c0, c1):
+                r = len(pivots)
+                if pivot_row + r >= rows: break
+                b = np.uint64(1) << np.uint64(c - c0)
+                nz = np.flatnonzero(keys[r:] & b)
+                if len(nz) == 0: continue
+                i = r + int(nz[0])
+                # the key of row i was reduced, now do the same to the row itself
+                for j, pc in enumerate(pivots):
+                    if (int(w[pivot_row + i, pc // 64]) >> (pc % 64)) & 1:
+                        w[pivot_row + i] ^= w[pivot_row + j]
+                if i != r:
+                    w[[pivot_row + r, pivot_row + i]] = w[[pivot_row + i, pivot_row + r]]
+                    keys[[r, i]] = keys[[i, r]]
+                hits = np.flatnonzero(keys & b)
+                hits = hits[hits != r]
+                keys[hits] ^= keys[r]
+                # keep the pivot rows of the strip reduced among themselves
+                for j in hits[hits < r].tolist():
+                    w[pivot_row + j] ^= w[pivot_row + r]
+                pivots.append(c)
+
+            if pivots:
+                npiv = len(pivots)
+                table = np.zeros((1 << npiv, w.shape[1]), dtype=np.uint64)
+                for i in range(npiv):
+                    table[1 << i: 2 << i] = table[:1 << i] ^ w[pivot_row + i]
+                targets = np.arange(pivot_row + npiv, rows)
+                if full_reduce:
+                    targets = np.concatenate((np.arange(pivot_row), targets))
+                if len(targets):
+                    sub = w[targets]
+                    idx = np.zeros(len(targets), dtype=np.uint64)
+                    for i, pc in enumerate(pivots):
+                        idx |= ((sub[:, pc // 64] >> np.uint64(pc % 64)) & np.uint64(1)) << np.uint64(i)
+                    w[targets] = sub ^ table[idx.astype(np.intp)]
+                pivot_row += npiv
+            c0 = c1
+        return pivot_row
+
+    def rank(self) -> int:
+        """Returns the rank of the matrix."""
+        return self.copy().gauss_m4ri()
+
+    def factor(self) -> Tuple['PackedMat2','PackedMat2']:
+        """Produce a factorisation m = m0 * m1, where
+
+        m0.cols() = m1.rows() = m.rank()
+        """
+        m0 = PackedMat2.id(self.rows())
+        m1 = self.copy()
+        rank = m1.gauss(y = m0)
+        m0 = PackedMat2(m0.to_array()[:, :rank])
+        m1 = PackedMat2.from_words(m1.words[:rank].copy(), m1._cols)
+        return (m0, m1)
+
+    def inverse(self) -> Optional['PackedMat2']:
+        """Returns the inverse of m is invertible and None otherwise."""
+        n = self.rows()
+        if n != self.cols(): return None
+        aug = PackedMat2(np.hstack((self.to_array(), np.eye(n, dtype=np.uint8))))
+        rank = aug.gauss_m4ri(full_reduce=True, ncols=n)
+        if rank < n: return None
+        else: return PackedMat2(aug.to_array()[:, n:])
+
+    def solve(self, b: 'PackedMat2') -> Optional['PackedMat2']:
+        """Return a vector x such that M * x = b, or None if there is no solution."""
+        cols = self.cols()
+        # like Mat2.solve, ignore any rows of b beyond those of M
+        aug = PackedMat2(np.hstack((self.to_array(), b.to_array()[:self.rows()])))
+        rank = aug.gauss_m4ri(full_reduce=True, ncols=cols)
+        a = aug.to_array()
+        # zero LHS with non-zero RHS = no solutions
+        if np.any(a[rank:, cols]): return None
+        x = np.zeros((cols, 1), dtype=np.uint8)
+        x[a[:rank, :cols].argmax(axis=1), 0] = a[:rank, cols]
+        return PackedMat2(x)
+
+    def nullspace(self, should_copy:bool=True) -> List[List[Z2]]:
+        """Returns a list of non-zero vectors that span the nullspace
+        of the matrix. If the matrix has trivial kernel it returns the empty list."""
+        m = self.copy() if should_copy else self
+        m.gauss_m4ri(full_reduce=True)
+        return _nullspace_from_rref(m.to_array())
+
+    def to_cnots(self, optimize: bool = False, use_log_blocksize: bool = False) -> List[CNOT]:
+        """Returns a list of CNOTs that implements the matrix as a reversible circuit of qubits."""
+        cn: Optional[CNOTMaker]
+        if not optimize:
+            cn = CNOTMaker()
+            blocksize = 5
+            if use_log_blocksize:
+                blocksize = int(math.log2(self.rows()))
+            self.copy().gauss(full_reduce=True,x=cn, blocksize=blocksize)
+        else:
+            best = 1000000
+            best_cn = None
+            for size in range(1,self.rows() + 1):
+                cn = CNOTMaker()
+                self.copy().gauss(full_reduce=True,x=cn, blocksize=size)
+                if len(cn.cnots) < best:
+                    best = len(cn.cnots)
+                    best_cn = cn
+            cn = best_cn
+        assert cn is not None
+        return cn.cnots
+
+
+def _num_words(cols: int) -> int:
+    return max(1, (cols + 63) // 64)
+
+def _pack_rows(a: NDArray[np.uint8]) -> NDArray[np.uint64]:
+    """Packs the rows of a 0/1 array into 64-bit words, little-endian in each word."""
+    n, m = a.shape
+    padded = np.zeros((n, _num_words(m) * 64), dtype=np.uint8)
+    padded[:, :m] = a
+    return np.packbits(padded, axis=-1, bitorder='little').view(np.uint64)
+
+def _nullspace_from_rref(a: NDArray[np.uint8]) -> List[List[Z2]]:
+    # a basis of the nullspace of a matrix in fully reduced echelon form
+    cols = a.shape[1]
+    a = a[a.any(axis=1)]
+    pivots = a.argmax(axis=1)
+    nonpivots = np.setdiff1d(np.arange(cols), pivots)
+    vectors = np.zeros((len(nonpivots), cols), dtype=np.uint8)
+    vectors[np.arange(len(nonpivots)), nonpivots] = 1
+    vectors[:, pivots] = a[:, nonpivots].T
+    return vectors.tolist()
+
+
 class REF:
     """
     A class to efficiently compute cut-ranks for multiple partitions.
@@ -81,15 +81,15 @@ def rand_pivot(c, g, reduce_prob=0.1):
              and the new circuit and graph.
     """
 
-    g_tmp = g.copy()
+    g_tmp = g.clone()
     apply_rand_pivot(g_tmp)
 
-    g_fr = g_tmp.copy()
+    g_fr = g_tmp.clone()
     full_reduce(g_fr)
-    c_new = extract_circuit(g_fr.copy()).to_basic_gates()
+    c_new = extract_circuit(g_fr.clone()).to_basic_gates()
     c_new = basic_optimization(c_new)
     if random.uniform(0, 1) < reduce_prob:
-        g_tmp = g_fr.copy()
+        g_tmp = g_fr
     return True, (c_new, g_tmp)
 
 def rand_lc(c, g, reduce_prob=0.1):    
@@ -103,15 +103,15 @@ def rand_lc(c, g, reduce_prob=0.1):
              and the new circuit and graph.
     """
 
-    g_tmp = g.copy()
+    g_tmp = g.clone()
     apply_rand_lc(g_tmp)
 
-    g_fr = g_tmp.copy()
+    g_fr = g_tmp.clone()
     full_reduce(g_fr)
-    c_new = extract_circuit(g_fr.copy()).to_basic_gates()
+    c_new = extract_circuit(g_fr.clone()).to_basic_gates()
     c_new = basic_optimization(c_new)
     if random.uniform(0, 1) < reduce_prob:
-        g_tmp = g_fr.copy()
+        g_tmp = g_fr
     return True, (c_new, g_tmp)
 
 
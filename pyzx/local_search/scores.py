@@ -51,7 +51,7 @@ def g_wgc(g, two_qb_weight=10, g_simplify=False, c_simplify=True):
     :param c_simplify: If True, applies basic optimization to circuit before returning weighted count.
     :return: Weighted gate count of the extracted circuit."""
 
-    g_tmp = g.copy()
+    g_tmp = g.clone()
     if g_simplify:
         full_reduce(g_tmp)
 
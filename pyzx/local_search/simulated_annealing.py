@@ -66,7 +66,8 @@ def anneal(g, iters=1000,
     :return: A tuple containing the best ZX-diagram found and a list of best scores over iterations.
     """
 
-    g_best = g.copy()
+    # g is only ever cloned, never modified in place, so the accepted candidates need not be copied
+    g_best = g.clone()
     sz = score(g_best)
     sz_best = sz
 
@@ -74,7 +75,7 @@ def anneal(g, iters=1000,
 
     for i in tqdm(range(iters), desc="annealing...", disable=quiet):
 
-        g1 = g.copy()
+        g1 = g.clone()
 
         # cong_method = np.random.choice(["LC", "PIVOT"], 1, p=cong_ps)[0]
         cong_method = "PIVOT"
@@ -97,11 +98,11 @@ def anneal(g, iters=1000,
             (temp != 0 and random.random() < math.exp((sz - sz1)/temp)):
 
             sz = sz1
-            g = g1.copy()
+            g = g1
             if sz < sz_best:
-                g_best = g.copy()
+                g_best = g
                 sz_best = sz
         elif random.uniform(0, 1) < reset_prob:
-            g = g_best.copy()
+            g = g_best
 
     return g_best, best_scores
@@ -82,7 +82,7 @@ def to_quimb_tensor(g: BaseGraph) -> "qtn.TensorNetwork": # type:ignore
     if g.scalar.is_zero:
         return qtn.TensorNetwork([qtn.Tensor(data=0j, inds=(), tags=("S",))])
 
-    scalar_float = _cexp(g.scalar.phase) * g.scalar.floatfactor
+    scalar_float = _cexp(g.scalar.phase) * g.scalar.floatfactor * g.scalar.factor.to_number()
 
     # phasenodes contribute factor (1 + e^(i*pi*node))
     for node in g.scalar.phasenodes:
@@ -304,10 +304,28 @@ def generate_decomposition(g: BaseGraph,
     return decomp
 
 
+def bit_parity(x: NDArray[np.int64]) -> NDArray[np.int8]:
+    """
+    Compute the parity of the number of set bits of each entry.
+
+    Args:
+        x: np.ndarray of non-negative integers
+
+    Returns:
+        binary np.ndarray of the same shape
+    """
+    x = np.asarray(x, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        x = x ^ (x >> shift)
+    return (x & 1).astype(np.int8)
+
+
 def mat_image(M: NDArray[np.int8]) -> NDArray[np.int64]:
     """
     Compute y = xM for all possible vectors x.
 
+    Bit k of the index x and of the returned integer y correspond to row k and column k of M.
+
     Args:
         M: binary matrix of shape (n, m)
 
@@ -315,33 +333,117 @@ def mat_image(M: NDArray[np.int8]) -> NDArray[np.int64]:
         np.ndarray of shape (2^n,) -- list of vectors represented as int64
     """
     n, m = M.shape
-    M_ints = M @ (1 << np.arange(m))
-    ys = np.zeros(1, dtype=np.int64)
+    M_ints = M.astype(np.int64) @ (np.ones(m, dtype=np.int64) << np.arange(m, dtype=np.int64))
+    ys = np.zeros(2 ** n, dtype=np.int64)
     for pos in range(n):
-        ys = np.concatenate([ys, M_ints[pos] ^ ys])
+        np.bitwise_xor(ys[:1 << pos], M_ints[pos], out=ys[1 << pos:2 << pos])
     return ys
 
 
+def image_basis(M: NDArray[np.int8]) -> Tuple[NDArray[np.int8], NDArray[np.int8]]:
+    """
+    Find an invertible T such that TM = [R; 0] with R of full row rank.
+
+    Args:
+        M: binary matrix of shape (n, m)
+
+    Returns:
+        tuple (T, R) where T has shape (n, n) and R has shape (rank(M), m)
+    """
+    n, m = M.shape
+    A = np.hstack([M % 2, np.eye(n, dtype=np.int8)]).astype(np.int8)
+    r = 0
+    for col in range(m):
+        if r == n:
+            break
+        pivots = np.flatnonzero(A[r:, col])
+        if len(pivots) == 0:
+            continue
+        p = r + pivots[0]
+        A[[r, p]] = A[[p, r]]
+        rows = np.flatnonzero(A[:, col])
+        rows = rows[rows != r]
+        A[rows] ^= A[r]
+        r += 1
+    return A[:, m:], A[:r, :m]
+
+
 def apply_parity_map(Psi: NDArray[np.complex128],
                      M: NDArray[np.int8]) -> NDArray[np.complex128]:
     """
     Apply parity map M to state Psi.
 
+    When M is injective this is a single gather of the columns of Psi. Otherwise M is first
+    brought into the form TM = [R; 0], so that the amplitudes along the kernel of M can be summed
+    with one reshape before mapping through R.
+
     Args:
-        Psi: np.ndarray of shape (..., 2^n)
+        Psi: np.ndarray of shape (B, 2^n)
         M: binary matrix of shape (n, m)
 
     Returns:
-        np.ndarray of shape (..., 2^m)
+        np.ndarray of shape (B, 2^m)
     """
-    m = M.shape[1]
-    ys = mat_image(M)
-    Phi = np.zeros((Psi.shape[0], 2 ** m), dtype=Psi.dtype)
-    np.add.at(Phi, (slice(None), ys), Psi)  # type: ignore
+    n, m = M.shape
+    T, R = image_basis(M)
+    r = R.shape[0]
+    if r < n:
+        # x = x'T, and x'[:r] alone determines the image xM = x'[:r] R
+        Psi = np.take(Psi, mat_image(T), axis=1).reshape(Psi.shape[0], 2 ** (n - r), 2 ** r).sum(axis=1)
+        ys = mat_image(R)
+    else:
+        ys = mat_image(M)
+    # gathering through the inverse image is much faster than scattering into Phi;
+    # vectors outside of the image point at an extra zero column
+    src = np.full(2 ** m, 2 ** r, dtype=np.int64)
+    src[ys] = np.arange(2 ** r)
+    if r < m:
+        Psi = np.hstack([Psi, np.zeros((Psi.shape[0], 1), dtype=Psi.dtype)])
+    Phi = np.take(Psi, src, axis=1)
     Phi /= sqrt(2) ** (M.sum() - m)
     return Phi
 
 
+def walsh_hadamard(Psi: NDArray[np.complex128]) -> NDArray[np.complex128]:
+    """
+    Apply the unnormalised Walsh-Hadamard transform on the last axis, i.e. H^{⊗n} up to
+    a factor sqrt(2)^n.
+
+    Args:
+        Psi: np.ndarray of shape (..., 2^n)
+
+    Returns:
+        np.ndarray of the same shape
+    """
+    Psi = np.array(Psi, dtype=np.complex128)
+    shape, size = Psi.shape[:-1], Psi.shape[-1]
+    h = 1
+    while h < size:
+        blocks = Psi.reshape(shape + (size // (2 * h), 2, h))
+        lo, hi = blocks[..., 0, :], blocks[..., 1, :]
+        diff = lo - hi
+        lo += hi
+        hi[...] = diff
+        h *= 2
+    return Psi
+
+
+def sign_table(E: NDArray[np.int8]) -> NDArray[np.int8]:
+    """
+    Generate S_{a,b} = (-1)^{<a, Eb>}.
+
+    Args:
+        E: binary matrix of shape (n, m)
+
+    Returns:
+        np.ndarray of shape (2^n, 2^m) with entries ±1
+    """
+    n = E.shape[0]
+    Eb = mat_image(E.T)
+    a = np.arange(2 ** n, dtype=np.int64)
+    return 1 - 2 * bit_parity(a[:, None] & Eb[None, :])
+
+
 def phase_tensor(E: NDArray[np.int8]) -> NDArray[np.complex128]:
     """
     Generate P_{a,b} = (-1)^{<a, Eb>} / sqrt(2)^|E|.
@@ -352,13 +454,7 @@ def phase_tensor(E: NDArray[np.int8]) -> NDArray[np.complex128]:
     Returns:
         np.ndarray of shape (2^{n+m},)
     """
-    n, m = E.shape
-    Eb = mat_image(E.T)
-    aEb = np.zeros((1, 2 ** m), dtype=np.int8)
-    for pos in range(n):
-        aEb = np.vstack([aEb, aEb ^ ((Eb >> pos) & 1)])
-    P = (-1) ** aEb.reshape(-1, order='F') / sqrt(2) ** E.sum()
-    return P
+    return sign_table(E).reshape(-1, order='F') / sqrt(2) ** E.sum()
 
 
 def conv_naive(Psi_v: NDArray[np.complex128],
@@ -389,7 +485,7 @@ def conv_naive(Psi_v: NDArray[np.complex128],
                 for a in product(range(2), repeat=r_v):
                     for b in product(range(2), repeat=r_w):
                         phase = np.dot(a, E_vu @ x) + np.dot(b, E_wu @ x) + np.dot(a, E_vw @ b)
-                        Psi_u_hat[i][j][x] += Psi_v[i][a] * Psi_w[j][b] * (-1) ** phase
+                        Psi_u_hat[(i, j) + x] += Psi_v[i][a] * Psi_w[j][b] * (-1) ** phase
     Psi_u = np.fft.fftn(Psi_u_hat, axes=tuple(range(2, r_u + 2)))
     Psi_u /= sqrt(2) ** (E_vw.sum() + E_vu.sum() + E_wu.sum() + r_u)
     return Psi_u.reshape((-1, 2 ** r_u), order='F')
@@ -415,10 +511,12 @@ def conv_vw(Psi_v: NDArray[np.complex128],
     Returns:
         np.ndarray of shape (2^{b_v + b_w}, 2^{r_u})
     """
-    Psi_vw = np.kron(Psi_w, Psi_v).astype(np.complex128)
-    Psi_vw *= phase_tensor(E_vw)
+    r_v, r_w = E_vw.shape
+    P = phase_tensor(E_vw).reshape(2 ** r_w, 2 ** r_v)
+    # rows are indexed by (i_w, i_v) and columns by (b, a), as in np.kron(Psi_w, Psi_v)
+    Psi_vw = np.multiply(Psi_w[:, None, :, None], (Psi_v[:, None, :] * P)[None], dtype=np.complex128)
     E = np.vstack([E_vu, E_wu])
-    Psi_u = apply_parity_map(Psi_vw, E)
+    Psi_u = apply_parity_map(Psi_vw.reshape(Psi_vw.shape[0] * Psi_vw.shape[1], -1), E)
     return Psi_u
 
 
@@ -443,15 +541,16 @@ def conv_uv(Psi_v: NDArray[np.complex128],
     Returns:
         np.ndarray of shape (2^{b_v + b_w}, 2^{r_u})
     """
-    r_u, r_v, r_w = E_vu.shape[1], E_vu.shape[0], E_wu.shape[0]
+    r_u, r_v = E_vu.shape[1], E_vu.shape[0]
     E = np.hstack([E_vw.T, E_wu])
-    Psi_vu = apply_parity_map(Psi_w, E).reshape((-1,) + (2,) * r_v + (2 ** r_u,), order='F')
-    Psi_vu_hat = (np.fft.fftn(Psi_vu, axes=tuple(range(1, r_v + 1)))
-                  .reshape((-1, 2 ** (r_v + r_u)), order='F') / sqrt(2) ** r_v).astype(np.complex128)
-    E2 = np.block([[np.eye(r_v), E_vu],
-                   [np.zeros((r_u, r_v)), np.eye(r_u)]]).astype(np.int8)
-    Psi_vu_hat = apply_parity_map(Psi_vu_hat, E2).reshape((-1, 2 ** r_v, 2 ** r_u), order='F')
-    Psi_u = np.tensordot(Psi_v, Psi_vu_hat, axes=(1, 1)).reshape((-1, 2 ** r_u), order='F')
+    Psi_vu = apply_parity_map(Psi_w, E).reshape((-1, 2 ** r_u, 2 ** r_v))
+    Psi_vu_hat = walsh_hadamard(Psi_vu)
+    # the parity map [[I, E_vu], [0, I]] sends (x_v, x_u) to (x_v, x_u + x_v E_vu)
+    x_v = np.arange(2 ** r_v)
+    y_u = np.arange(2 ** r_u)[None, :] ^ mat_image(E_vu)[:, None]
+    Psi_vu_hat = Psi_vu_hat[:, y_u, x_v[:, None]]
+    Psi_u = np.tensordot(Psi_v, Psi_vu_hat, axes=(1, 1)).transpose(1, 0, 2).reshape((-1, 2 ** r_u))
+    Psi_u /= sqrt(2) ** (r_v + E_vu.sum())
     return Psi_u
 
 
@@ -26,22 +26,201 @@ The RewriteSingleVertex and RewriteDoubleVertex classes can only be run manually
 while the RewriteSimpSingleVertex and RewriteSimpDoubleVertex classes can also be run automatically on the entire graph.
 The RewriteSimpGraph class is for rewrites that act on the entire graph at once, and cannot be run manually on specific vertices,
 because their behaviour is too complex to fit into these other cases.
+
+When run automatically on a backend that records the vertices changed by the appliers
+(see :meth:`~pyzx.graph.base.BaseGraph.track_touched`), the RewriteSimpSingleVertex and
+RewriteSimpDoubleVertex classes only scan the whole graph for matches once. Every following round
+only re-checks the vertices that were touched in the previous round, together with their neighbours,
+so that the cost of a simplification scales with the number of rewrites instead of the size of the graph.
+
+The automatic ``simp`` methods optionally take a :class:`Stats` object, in which they record for every
+rewrite how many times it scanned the graph for matches, how many matches it found and applied,
+how many vertices and edges the applications added and removed, and how much time was spent
+matching versus applying. A ``trace`` callback on the :class:`Stats` object is called after every round.
 """
 
-from typing import Callable, Optional, Generic, Set, Tuple, List
+import time
+from typing import Any, Callable, Dict, Optional, Generic, Set, Tuple, List, Iterable
 
 from .graph.base import BaseGraph, VT, ET
 
-class Rewrite(Generic[VT, ET]):
 
+class RewriteStats(object):
+    """The counters that :class:`Stats` keeps for a single rewrite.
+
+    The vertices and edges added or removed are counted from the change in the size of the graph
+    made by each application, so a rewrite that removes one edge and adds another counts as neither.
+    Rewrites that act on the entire graph at once don't scan for matches separately,
+    so all their time is counted as applying, and every round that changed the graph counts as one rewrite."""
     def __init__(self) -> None:
-        pass
+        self.scans: int = 0
+        self.matches: int = 0
+        self.rewrites: int = 0
+        self.vertices_added: int = 0
+        self.vertices_removed: int = 0
+        self.edges_added: int = 0
+        self.edges_removed: int = 0
+        self.match_time: float = 0.0
+        self.apply_time: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+class Stats(object):
+    """Collects statistics about the rewrites run by the simplification routines.
+
+    Pass an instance as the ``stats`` argument of e.g. :func:`~pyzx.simplify.full_reduce`
+    or of the ``simp`` method of a rewrite. Afterwards ``num_rewrites`` maps the name of every rewrite
+    to the number of times it was applied, and ``profile`` maps it to its :class:`RewriteStats`.
+
+    If ``trace`` is given, it is called after every round of a rewrite (a scan for matches followed
+    by applying them) with a dictionary containing the name of the rewrite, the number of the round,
+    the matches found and rewrites applied in that round, the time spent matching and applying,
+    and the number of vertices and edges of the graph afterwards."""
+    def __init__(self, trace: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+        self.num_rewrites: Dict[str,int] = {}
+        self.profile: Dict[str,RewriteStats] = {}
+        self.trace = trace
+    def count_rewrites(self, rule: str, n: int) -> None:
+        if rule in self.num_rewrites:
+            self.num_rewrites[rule] += n
+        else:
+            self.num_rewrites[rule] = n
+    def rewrite_stats(self, rule: str) -> RewriteStats:
+        """Returns the counters of the given rewrite, creating them if necessary."""
+        if rule not in self.profile:
+            self.profile[rule] = RewriteStats()
+        return self.profile[rule]
+    def __str__(self) -> str:
+        s = "REWRITES\n"
+        nt = 0
+        for r,n in self.num_rewrites.items():
+            nt += n
+            s += "%s %s\n" % (str(n).rjust(6),r)
+        s += "%s TOTAL" % str(nt).rjust(6)
+        if self.profile:
+            s += "\n\nPROFILE\n"
+            s += "%s %s %s %s %s %s %s\n" % ("scans".rjust(6), "matches".rjust(8), "applied".rjust(8),
+                                          "vertices".rjust(9), "edges".rjust(9), "match(s)".rjust(9), "apply(s)".rjust(9))
+            for r,p in self.profile.items():
+                s += "%s %s %s %s %s %s %s %s\n" % (str(p.scans).rjust(6), str(p.matches).rjust(8), str(p.rewrites).rjust(8),
+                        ("%+d" % (p.vertices_added - p.vertices_removed)).rjust(9),
+                        ("%+d" % (p.edges_added - p.edges_removed)).rjust(9),
+                        ("%.3f" % p.match_time).rjust(9), ("%.3f" % p.apply_time).rjust(9), r)
+            s = s[:-1]
+        return s
+
+class _Recorder(Generic[VT, ET]):
+    """Records the work done by a single call of ``simp`` into a :class:`Stats` object.
+    A round starts with the scan for matches and ends with :meth:`end_round`."""
+    def __init__(self, stats: Stats, name: str, graph: BaseGraph[VT, ET]) -> None:
+        self.stats = stats
+        self.name = name
+        self.graph = graph
+        self.record = stats.rewrite_stats(name)
+        self.round = 0
+        self.matches = 0
+        self.apply_time = 0.0
+        self.start = time.perf_counter()
+
+    def scanned(self, matches: int) -> None:
+        self.record.scans += 1
+        self.record.matches += matches
+        self.matches = matches
+
+    def apply(self, applier: Callable[..., Any], *args: Any) -> Any:
+        g = self.graph
+        nv, ne = g.num_vertices(), g.num_edges()
+        t = time.perf_counter()
+        result = applier(g, *args)
+        self.apply_time += time.perf_counter() - t
+        dv, de = g.num_vertices() - nv, g.num_edges() - ne
+        r = self.record
+        if dv > 0: r.vertices_added += dv
+        else: r.vertices_removed -= dv
+        if de > 0: r.edges_added += de
+        else: r.edges_removed -= de
+        return result
+
+    def end_round(self, rewrites: int) -> None:
+        now = time.perf_counter()
+        match_time = now - self.start - self.apply_time
+        r = self.record
+        r.rewrites += rewrites
+        r.match_time += match_time
+        r.apply_time += self.apply_time
+        if rewrites: self.stats.count_rewrites(self.name, rewrites)
+        self.round += 1
+        if self.stats.trace is not None:
+            self.stats.trace({'rewrite': self.name, 'round': self.round,
+                              'matches': self.matches, 'rewrites': rewrites,
+                              'match_time': match_time, 'apply_time': self.apply_time,
+                              'vertices': self.graph.num_vertices(), 'edges': self.graph.num_edges()})
+        self.matches = 0
+        self.apply_time = 0.0
+        self.start = time.perf_counter()
+
+
+def _start_tracking(graph: BaseGraph[VT, ET], incremental: bool) -> Tuple[Optional[Set[VT]], Optional[Set[VT]]]:
+    """Starts recording the vertices touched by the appliers, if the backend supports it.
+    Returns the new record (or None) and the record that was active before."""
+    if not (incremental and graph.records_touched):
+        return None, None
+    touched: Set[VT] = set()
+    return touched, graph.track_touched(touched)
+
+def _touched_region(graph: BaseGraph[VT, ET], touched: Set[VT], outer: Optional[Set[VT]]) -> Set[VT]:
+    """Returns the vertices in ``touched`` that still exist, together with their neighbours.
+    Since the matchers only look at a vertex and its direct neighbours, these are the only vertices
+    whose matches can have changed. The record is emptied for the next round, after passing
+    its contents on to the ``outer`` record if there is one."""
+    vertices = graph.vertices()
+    region: Set[VT] = set()
+    for v in touched:
+        if v in vertices:
+            region.add(v)
+            region.update(graph.neighbors(v))
+    if outer is not None: outer.update(touched)
+    touched.clear()
+    return region
+
+def _in_graph_order(graph: BaseGraph[VT, ET], vertices: Iterable[VT]) -> List[VT]:
+    """Returns the given vertices in the order of ``graph.vertices()``. The matches are collected in
+    a set, whose iteration order depends on the order in which they were added, so a re-scan of part
+    of the graph has to visit the vertices in the same order as a scan of the entire graph to apply
+    the same rewrites."""
+    vertices = vertices if isinstance(vertices, (set, frozenset)) else set(vertices)
+    return [v for v in graph.vertices() if v in vertices]
+
+def _run_applier(graph: BaseGraph[VT, ET], applier: Callable[..., Any], args: Tuple[Any, ...],
+                 rmv_isolated: bool, rec: Optional[_Recorder[VT, ET]] = None) -> Any:
+    """Runs the applier on the graph, recording it in ``rec`` if it is given, and then removes
+    the vertices it left isolated if ``rmv_isolated`` is set. If the backend records touched
+    vertices, only the vertices changed by the applier are checked instead of the entire graph."""
+    step: Optional[Set[VT]] = set() if rmv_isolated and graph.records_touched else None
+    if step is not None: outer = graph.track_touched(step)
+    try:
+        result = applier(graph, *args) if rec is None else rec.apply(applier, *args)
+    finally:
+        if step is not None:
+            graph.track_touched(outer)
+            if outer is not None: outer.update(step)
+    if rmv_isolated:
+        graph.remove_isolated_vertices(step)
+    return result
+
+class Rewrite(Generic[VT, ET]):
+    name: str
+    """The name under which the rewrite is recorded in :class:`Stats`."""
 
-    def simp(self, graph: BaseGraph[VT, ET]) -> bool:
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name if name is not None else type(self).__name__
+
+    def simp(self, graph: BaseGraph[VT, ET], stats: Optional[Stats] = None) -> bool:
         raise Exception("This rewrite rule cannot terminate when run automatically. Try using apply() instead to manually target vertices.")
 
-    def __call__(self, graph: BaseGraph[VT, ET]) -> bool:
-        return self.simp(graph)
+    def __call__(self, graph: BaseGraph[VT, ET], stats: Optional[Stats] = None) -> bool:
+        return self.simp(graph, stats)
 
 class RewriteSingleVertex(Rewrite[VT, ET]):
     """
@@ -54,6 +233,9 @@ class RewriteSingleVertex(Rewrite[VT, ET]):
         function that checks whether a given vertex can be rewritten.
     rmv_isolated : bool
         whether to remove isolated vertices after running the applier.
+    name : Optional[str]
+        the name under which the rewrite is recorded in :class:`Stats`.
+        Defaults to the name of the applier.
     """
 
     applier: Callable[[BaseGraph[VT, ET], VT], bool]
@@ -63,8 +245,9 @@ class RewriteSingleVertex(Rewrite[VT, ET]):
 
     def __init__(self, is_match: Callable[[BaseGraph[VT, ET], VT], bool],
                  applier: Callable[[BaseGraph[VT, ET], VT], bool],
-                 rmv_isolated: bool = False) -> None:
-        super().__init__()
+                 rmv_isolated: bool = False,
+                 name: Optional[str] = None) -> None:
+        super().__init__(name if name is not None else getattr(applier, '__name__', None))
         self.is_match = is_match
         self.applier = applier
         self.rmv_isolated = rmv_isolated
@@ -72,9 +255,7 @@ class RewriteSingleVertex(Rewrite[VT, ET]):
     def apply(self, graph: BaseGraph[VT, ET], v: VT) -> bool:
         applied: bool = False
         if self.is_match(graph, v):
-            applied = self.applier(graph, v)
-            if self.rmv_isolated:
-                graph.remove_isolated_vertices()
+            applied = _run_applier(graph, self.applier, (v,), self.rmv_isolated)
         return applied
 
 class RewriteSimpSingleVertex(RewriteSingleVertex[VT, ET]):
@@ -90,45 +271,72 @@ class RewriteSimpSingleVertex(RewriteSingleVertex[VT, ET]):
         optional function that checks whether graph can be rewritten automatically.
     rmv_isolated : bool
         whether to remove isolated vertices after running the applier.
+    incremental : bool
+        whether simp(g) only re-checks the vertices touched in the previous round.
+        If False, every round scans the entire graph.
+    name : Optional[str]
+        the name under which the rewrite is recorded in :class:`Stats`.
+        Defaults to the name of the applier.
     """
     simp_match: Optional[Callable[[BaseGraph[VT, ET], VT], bool]]
+    incremental: bool
 
     def __init__(self, is_match: Callable[[BaseGraph[VT, ET], VT], bool],
                  applier: Callable[[BaseGraph[VT, ET], VT], bool],
                  simp_match: Optional[Callable[[BaseGraph[VT, ET], VT], bool]] = None,
-                 rmv_isolated: bool = False) -> None:
-        super().__init__(is_match, applier, rmv_isolated)
+                 rmv_isolated: bool = False,
+                 incremental: bool = True,
+                 name: Optional[str] = None) -> None:
+        super().__init__(is_match, applier, rmv_isolated, name)
         self.simp_match = simp_match
+        self.incremental = incremental
 
-    def find_all_matches(self, graph: BaseGraph[VT, ET]) -> Set[VT]:
+    def find_all_matches(self, graph: BaseGraph[VT, ET], vertices: Optional[Iterable[VT]] = None) -> Set[VT]:
+        """Returns all the matching vertices in the graph,
+        or only those among ``vertices`` if it is given."""
         all_matches: Set[VT] = set()
         if self.simp_match is not None:
             match = self.simp_match
         else:
             match = self.is_match
 
-        for v in graph.vertices():  # Make a subset of vertices
+        if vertices is None: vertices = graph.vertices()
+        else: vertices = _in_graph_order(graph, vertices)
+        for v in vertices:  # Make a subset of vertices
             if match(graph, v):
                 all_matches.add(v)
         return all_matches
 
-    def simp(self, graph: BaseGraph[VT, ET]) -> bool:
+    def simp(self, graph: BaseGraph[VT, ET], stats: Optional[Stats] = None) -> bool:
         if self.simp_match is not None:
             match = self.simp_match
         else:
             match = self.is_match
         applied: bool = False
-        while True:
-            j = 0
+        rec = _Recorder(stats, self.name, graph) if stats is not None else None
+        touched, outer = _start_tracking(graph, self.incremental)
+        try:
             all_matches = self.find_all_matches(graph)
-            for m in all_matches:
-                if match(graph, m):
-                    j += 1
-                    self.applier(graph, m)
-                    applied = True
-                    if self.rmv_isolated:
-                        graph.remove_isolated_vertices()
-            if j == 0: break
+            while True:
+                if rec is not None: rec.scanned(len(all_matches))
+                j = 0
+                for m in all_matches:
+                    if match(graph, m):
+                        j += 1
+                        _run_applier(graph, self.applier, (m,), self.rmv_isolated, rec)
+                        applied = True
+                if rec is not None: rec.end_round(j)
+                if j == 0: break
+                region = None if touched is None else _touched_region(graph, touched, outer)
+                # a scan of most of the graph is cheaper as a full scan, which finds the same matches
+                if region is None or 2 * len(region) > graph.num_vertices():
+                    all_matches = self.find_all_matches(graph)
+                else:
+                    all_matches = self.find_all_matches(graph, region)
+        finally:
+            if touched is not None:
+                graph.track_touched(outer)
+                if outer is not None: outer.update(touched)
         return applied
 
 class RewriteDoubleVertex(Rewrite[VT, ET]):
@@ -142,14 +350,18 @@ class RewriteDoubleVertex(Rewrite[VT, ET]):
         function that checks whether the given vertices can be rewritten.
     rmv_isolated : bool
         whether to remove isolated vertices after running the applier.
+    name : Optional[str]
+        the name under which the rewrite is recorded in :class:`Stats`.
+        Defaults to the name of the applier.
     """
     applier: Callable[[BaseGraph[VT, ET], VT, VT], bool]
     is_match: Callable[[BaseGraph[VT, ET], VT, VT], bool]
 
     def __init__(self, is_match: Callable[[BaseGraph[VT, ET], VT, VT], bool],
                  applier: Callable[[BaseGraph[VT, ET], VT, VT], bool],
-                 rmv_isolated: bool = False) -> None:
-        super().__init__()
+                 rmv_isolated: bool = False,
+                 name: Optional[str] = None) -> None:
+        super().__init__(name if name is not None else getattr(applier, '__name__', None))
         self.is_match = is_match
         self.applier = applier
         self.rmv_isolated = rmv_isolated
@@ -157,9 +369,7 @@ class RewriteDoubleVertex(Rewrite[VT, ET]):
     def apply(self, graph: BaseGraph[VT, ET], v1: VT, v2: VT) -> bool:
         applied: bool = False
         if self.is_match(graph, v1, v2):
-            applied = self.applier(graph, v1, v2)
-            if self.rmv_isolated:
-                graph.remove_isolated_vertices()
+            applied = _run_applier(graph, self.applier, (v1, v2), self.rmv_isolated)
         return applied
 
 
@@ -185,43 +395,71 @@ class RewriteSimpDoubleVertex(RewriteDoubleVertex[VT, ET]):
         optional whole-graph routine to run instead of the default per-pair simp loop.
         Use this when the rule needs to batch-match before any apply (e.g., rules
         that introduce new vertices which would otherwise interact with later matches).
+    incremental : bool
+        whether simp(g) only re-checks the pairs touched in the previous round.
+        If False, every round scans the entire graph.
+    name : Optional[str]
+        the name under which the rewrite is recorded in :class:`Stats`.
+        Defaults to the name of the applier.
     """
     simp_match: Optional[Callable[[BaseGraph[VT, ET], VT, VT], bool]]
     simp_override: Optional[Callable[[BaseGraph[VT, ET]], bool]]
     is_ordered: bool
+    incremental: bool
 
     def __init__(self, is_match: Callable[[BaseGraph[VT, ET], VT, VT], bool],
                  applier: Callable[[BaseGraph[VT, ET], VT, VT], bool],
                  simp_match: Optional[Callable[[BaseGraph[VT, ET], VT, VT], bool]] = None,
                  is_ordered: bool = False,
                  rmv_isolated: bool = False,
-                 simp_override: Optional[Callable[[BaseGraph[VT, ET]], bool]] = None) -> None:
-        super().__init__(is_match, applier, rmv_isolated)
+                 simp_override: Optional[Callable[[BaseGraph[VT, ET]], bool]] = None,
+                 incremental: bool = True,
+                 name: Optional[str] = None) -> None:
+        super().__init__(is_match, applier, rmv_isolated, name)
         self.simp_match = simp_match
         self.is_ordered = is_ordered
         self.simp_override = simp_override
+        self.incremental = incremental
 
-    def find_all_matches(self, graph: BaseGraph[VT, ET]) -> Set[Tuple[VT, VT]]:
+    def find_all_matches(self, graph: BaseGraph[VT, ET], vertices: Optional[Iterable[VT]] = None) -> Set[Tuple[VT, VT]]:
+        """Returns all the matching pairs of neighbouring vertices in the graph,
+        or only the pairs containing a vertex of ``vertices`` if it is given."""
         all_matches: Set[Tuple[VT, VT]] = set()
         if self.simp_match is not None:
             match = self.simp_match
         else:
             match = self.is_match
 
-        for v1 in graph.vertices():
+        if vertices is None:
+            for v1 in graph.vertices():
+                for v2 in graph.neighbors(v1):
+                    if v1 == v2: continue
+                    if match(graph, v1, v2):
+                        pair = (v1, v2) if (self.is_ordered or v1 <= v2) else (v2, v1)
+                        all_matches.add(pair)
+            return all_matches
+
+        # The same scan as above, restricted to the pairs with a vertex in ``vertices``, so that
+        # the matches are found in the same order as by a scan of the entire graph
+        region = vertices if isinstance(vertices, (set, frozenset)) else set(vertices)
+        outer = set(region)
+        for v in region:
+            outer.update(graph.neighbors(v))
+        for v1 in _in_graph_order(graph, outer):
+            inside = v1 in region
             for v2 in graph.neighbors(v1):
-                if v1 == v2: continue
+                if v1 == v2 or not (inside or v2 in region): continue
                 if match(graph, v1, v2):
                     pair = (v1, v2) if (self.is_ordered or v1 <= v2) else (v2, v1)
                     all_matches.add(pair)
         return all_matches
 
-    def simp(self, graph: BaseGraph[VT, ET]) -> bool:
+    def simp(self, graph: BaseGraph[VT, ET], stats: Optional[Stats] = None) -> bool:
         applied: bool = False
+        rec = _Recorder(stats, self.name, graph) if stats is not None else None
         if self.simp_override is not None:
-            applied = self.simp_override(graph)
-            if applied and self.rmv_isolated:
-                graph.remove_isolated_vertices()
+            applied = _run_applier(graph, self.simp_override, (), self.rmv_isolated, rec)
+            if rec is not None: rec.end_round(int(applied))
             return applied
 
         if self.simp_match is not None:
@@ -229,19 +467,30 @@ class RewriteSimpDoubleVertex(RewriteDoubleVertex[VT, ET]):
         else:
             match = self.is_match
 
-        while True:
-            j = 0
+        touched, outer = _start_tracking(graph, self.incremental)
+        try:
             all_matches = self.find_all_matches(graph)
-
-            for m in all_matches:
-                if match(graph, m[0], m[1]):
-                    j += 1
-                    self.applier(graph, m[0], m[1])
-                    applied = True
-                    if self.rmv_isolated:
-                        graph.remove_isolated_vertices()
-            if j == 0:
-                break
+            while True:
+                if rec is not None: rec.scanned(len(all_matches))
+                j = 0
+                for m in all_matches:
+                    if match(graph, m[0], m[1]):
+                        j += 1
+                        _run_applier(graph, self.applier, m, self.rmv_isolated, rec)
+                        applied = True
+                if rec is not None: rec.end_round(j)
+                if j == 0:
+                    break
+                region = None if touched is None else _touched_region(graph, touched, outer)
+                # a scan of most of the graph is cheaper as a full scan, which finds the same matches
+                if region is None or 2 * len(region) > graph.num_vertices():
+                    all_matches = self.find_all_matches(graph)
+                else:
+                    all_matches = self.find_all_matches(graph, region)
+        finally:
+            if touched is not None:
+                graph.track_touched(outer)
+                if outer is not None: outer.update(touched)
         return applied
 
 class RewriteSimpGraph(Rewrite[VT, ET]):
@@ -252,6 +501,9 @@ class RewriteSimpGraph(Rewrite[VT, ET]):
         function that both checks if a rewrite can be done and performs the rule.
     simp_applier : Callable[[BaseGraph[VT, ET]], bool]
         that both checks if a rewrite can be done and performs the rule on the entire graph.
+    name : Optional[str]
+        the name under which the rewrite is recorded in :class:`Stats`.
+        Defaults to the name of ``simp_applier``.
     """
     applier: Callable[[BaseGraph[VT, ET], List[VT]], bool]
     simp_applier: Callable[[BaseGraph[VT, ET]], bool]
@@ -259,8 +511,9 @@ class RewriteSimpGraph(Rewrite[VT, ET]):
 
     def __init__(self,
                  applier: Callable[[BaseGraph[VT, ET], List[VT]], bool],
-                 simp_applier: Callable[[BaseGraph[VT, ET]], bool]) -> None:
-        super().__init__()
+                 simp_applier: Callable[[BaseGraph[VT, ET]], bool],
+                 name: Optional[str] = None) -> None:
+        super().__init__(name if name is not None else getattr(simp_applier, '__name__', None))
         self.applier = applier
         self.simp_applier = simp_applier
 
@@ -268,6 +521,11 @@ class RewriteSimpGraph(Rewrite[VT, ET]):
     def apply(self, graph: BaseGraph[VT, ET], vertices: List[VT]) -> bool:
         return self.applier(graph, vertices)
 
-    def simp(self, graph: BaseGraph[VT, ET]) -> bool:
-        return  self.simp_applier(graph)
+    def simp(self, graph: BaseGraph[VT, ET], stats: Optional[Stats] = None) -> bool:
+        if stats is None:
+            return self.simp_applier(graph)
+        rec = _Recorder(stats, self.name, graph)
+        applied = rec.apply(self.simp_applier)
+        rec.end_round(int(applied))
+        return applied
 
@@ -70,6 +70,7 @@ def unsafe_fuse_hboxes(g: BaseGraph[VT ,ET], v1: VT, v2: VT) -> bool:
     if not is_standard_hbox(g, v2):  # Ensure v2 is the standard one.
         v1, v2 = v2, v1
     rem_verts.append(v2)
+    candidates = set(g.neighbors(v2))
     g.scalar.add_power(1)
     for n in g.neighbors(v2):
         if n == v1: continue
@@ -81,7 +82,7 @@ def unsafe_fuse_hboxes(g: BaseGraph[VT ,ET], v1: VT, v2: VT) -> bool:
 
     g.add_edge_table(etab)
     g.remove_vertices(rem_verts)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices(candidates)
 
     return True
 
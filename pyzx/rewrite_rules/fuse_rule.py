@@ -143,6 +143,7 @@ def unsafe_fuse_w(g: BaseGraph[VT,ET], v: VT, w: VT) -> bool:
         v1_out, v2_out = v2_out, v1_out
     # always delete the second vertex in the match
     rem_verts.extend([v2_in, v2_out])
+    candidates = set(g.neighbors(v2_in)) | set(g.neighbors(v2_out))
 
     # edges from the second vertex are transferred to the first
     for w in g.neighbors(v2_out):
@@ -156,7 +157,7 @@ def unsafe_fuse_w(g: BaseGraph[VT,ET], v: VT, w: VT) -> bool:
 
     g.add_edge_table(etab)
     g.remove_vertices(rem_verts)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices(candidates)
     return True
 
 
@@ -97,6 +97,7 @@ def unsafe_hbox_parallel_not_remove(g: BaseGraph[VT,ET], h: VT, n: VT) -> bool:
     rem.append(h)
     rem.append(n)
     v = [v for v in g.neighbors(n) if v != h][0]  # The other neighbor of n
+    candidates = set(g.neighbors(h)) | {v}
 
     for w in g.neighbors(h):
         if w == v or w == n: continue
@@ -112,6 +113,6 @@ def unsafe_hbox_parallel_not_remove(g: BaseGraph[VT,ET], h: VT, n: VT) -> bool:
 
     g.add_edge_table(etab)
     g.remove_vertices(rem)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices(candidates)
 
     return True
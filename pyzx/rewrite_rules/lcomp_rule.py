@@ -37,6 +37,8 @@ from fractions import Fraction
 from pyzx.utils import EdgeType, VertexType
 from pyzx.graph.base import BaseGraph, VT, ET
 
+_HALF, _THREE_HALVES = Fraction(1, 2), Fraction(3, 2)
+
 
 def check_lcomp(
         g: BaseGraph[VT,ET],
@@ -56,7 +58,7 @@ def check_lcomp(
     va = g.phase(v)
 
     if vt != VertexType.Z: return False
-    if not (va == Fraction(1, 2) or va == Fraction(3, 2)): return False
+    if not (va == _HALF or va == _THREE_HALVES): return False
     # if not phase_is_clifford(va) or phase_is_pauli(va): return False
 
     if g.is_ground(v): return False
@@ -106,6 +108,6 @@ def unsafe_lcomp(g: BaseGraph[VT,ET], v: VT) -> bool:
 
     g.add_edge_table(etab)
     g.remove_vertices(rem)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices(vn)
 
     return True
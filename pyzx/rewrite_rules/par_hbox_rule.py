@@ -247,17 +247,21 @@ def unsafe_par_hbox_intro(g: BaseGraph[VT, ET], matches: List[TYPE_MATCH_PAR_HBO
     """Removes an H-box according to the Intro rule (See Section 3.2 of arxiv:2103.06610)."""
     rem_verts = []
     rem_edges = []
+    candidates = set()
     for h, h2, v, NOTs, singles in matches:
         rem_verts.append(h2)
         rem_verts.extend(singles)
         rem_verts.extend(NOTs)
         rem_edges.append(g.edge(h, v))
+        candidates.update((h, v))
+        for u in [h2, *NOTs, *singles]:
+            candidates.update(g.neighbors(u))
         g.scalar.add_power(2 * len(singles))
 
 
     g.remove_edges(rem_edges)
     g.remove_vertices(rem_verts)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices(candidates)
 
     return True
 
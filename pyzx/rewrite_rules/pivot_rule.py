@@ -48,12 +48,20 @@ from typing import Tuple, List, Dict, Set, Optional
 from collections import Counter
 from fractions import Fraction
 
-from pyzx.utils import VertexType, EdgeType, phase_is_pauli, phase_is_clifford
+from pyzx.utils import FractionLike, VertexType, EdgeType, phase_is_pauli, phase_is_clifford
 from pyzx.graph.base import BaseGraph, VT, ET
 
 MatchPivotType = Tuple[Tuple[VT,VT],Tuple[List[VT],List[VT]]]
 
 
+def _is_zero_or_one(phase: FractionLike) -> bool:
+    """The same as ``phase in (0, 1)``, but reads the numerator and denominator of
+    numeric phases instead of comparing them to two ``Fraction`` objects."""
+    if type(phase) is int or type(phase) is Fraction:
+        return phase.denominator == 1 and 0 <= phase.numerator <= 1
+    return phase in (0, 1)
+
+
 def boundary_list_for_vertex(
         g: BaseGraph[VT,ET],
         v0: VT
@@ -98,7 +106,7 @@ def check_pivot(
 
     v0a = phases[v]
     v1a = phases[w]
-    if not ((v0a in (0,1)) and (v1a in (0,1))): return False
+    if not (_is_zero_or_one(v0a) and _is_zero_or_one(v1a)): return False
     if g.is_ground(v) or g.is_ground(w):
         return False
 
@@ -369,12 +377,12 @@ def match_pivot_gadget(
         v0a = phases[v0]
         v1a = phases[v1]
 
-        if v0a not in (0,1):
-            if v1a in (0,1):
+        if not _is_zero_or_one(v0a):
+            if _is_zero_or_one(v1a):
                 v0, v1 = v1, v0
                 v0a, v1a = v1a, v0a
             else: continue
-        elif v1a in (0,1): continue
+        elif _is_zero_or_one(v1a): continue
         # Now v0 has a Pauli phase and v1 has a non-Pauli phase
 
         if g.is_ground(v0):
@@ -435,6 +443,8 @@ def unsafe_pivot(g: BaseGraph[VT,ET], v0: VT, v1: VT) -> bool:
     assert b1 is not None
 
     m = ((v0, v1), (b0, b1))
+    # Only vertices next to the pivot can become isolated
+    candidates = set(g.neighbors(v0)) | set(g.neighbors(v1))
 
     # compute:
     #  n[0] <- non-boundary neighbors of m[0] only
@@ -497,7 +507,7 @@ def unsafe_pivot(g: BaseGraph[VT,ET], v0: VT, v1: VT) -> bool:
     g.add_edge_table(etab)
     g.remove_edges(rem_edges)
     g.remove_vertices(rem_verts)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices(candidates)
 
     return True
 
@@ -514,8 +524,11 @@ def pivot_NOT_REWORKED(g: BaseGraph[VT,ET], matches: List[MatchPivotType[VT]]) -
     rem_verts: List[VT] = []
     rem_edges: List[ET] = []
     etab: Dict[Tuple[VT,VT],List[int]] = dict()
+    candidates: Set[VT] = set()
 
     for m in matches:
+        candidates.update(g.neighbors(m[0][0]))
+        candidates.update(g.neighbors(m[0][1]))
         # compute:
         #  n[0] <- non-boundary neighbors of m[0] only
         #  n[1] <- non-boundary neighbors of m[1] only
@@ -578,6 +591,6 @@ def pivot_NOT_REWORKED(g: BaseGraph[VT,ET], matches: List[MatchPivotType[VT]]) -
     g.add_edge_table(etab)
     g.remove_edges(rem_edges)
     g.remove_vertices(rem_verts)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices(candidates)
 
     return True
@@ -96,9 +96,12 @@ def unsafe_apply_supplementarity(
         ) -> bool:
     """Given the output of :func:``match_supplementarity``, removes non-Clifford spiders that act on the same set of targets through supplementarity."""
     rem: List[VT] = []
+    candidates: Set[VT] = set()
     for v, w, t, neigh in matches:
         rem.append(v)
         rem.append(w)
+        candidates.update(g.neighbors(v))
+        candidates.update(g.neighbors(w))
         alpha = g.phase(v)
         beta = g.phase(w)
         g.scalar.add_power(-2*len(neigh))
@@ -121,7 +124,7 @@ def unsafe_apply_supplementarity(
 
 
     g.remove_vertices(rem)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices(candidates)
 
     return True
 
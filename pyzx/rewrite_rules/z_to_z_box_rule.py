@@ -66,5 +66,5 @@ def unsafe_z_to_z_box(g: BaseGraph[VT,ET], v: VT) -> bool:
     label = np.round(np.e**(1j * np.pi * phase), 8)
     set_z_box_label(g, v, label)
     g.set_phase(v, 0)
-    g.remove_isolated_vertices()
+    g.remove_isolated_vertices([v])
     return True
@@ -15,10 +15,14 @@
 # limitations under the License.
 
 
+import hashlib
 import itertools
+import json
 import math
+import os
 import sys
-from collections.abc import Iterator, Sequence
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from typing import Any, Literal
 
 from pyzx.graph.base import BaseGraph
@@ -59,12 +63,181 @@ hamiltonian_path_architectures = [FULLY_CONNECTED, LINE, CIRCLE, SQUARE, IBM_QX4
                 IBM_QX5, IBM_Q20_TOKYO, RIGETTI_8Q_AGAVE, RIGETTI_16Q_ASPEN,
                 IBMQ_POUGHKEEPSIE]
 
+class ShortestPaths(Mapping[tuple[int, int], tuple[int, list[tuple[int, int]]]]):
+    """
+    All-pairs shortest paths in (a subgraph of) an architecture, as computed by :meth:`Architecture.floyd_warshall`.
+
+    It maps each pair of vertices ``(v1, v2)`` such that there is a path from v1 to v2 to a tuple with their distance
+    and a shortest path, given as a list of edges. The distances and paths are stored as a distance matrix and a
+    predecessor matrix, so that a path is only built when it is looked up.
+    """
+
+    def __init__(self, vertices: Sequence[int], dist: np.ndarray, pred: np.ndarray):
+        """
+        :param vertices: The vertices indexing the rows and columns of the matrices
+        :param dist: dist[i, j] is the length of a shortest path from vertices[i] to vertices[j], or -1 if there is none
+        :param pred: pred[i, j] is the index of the vertex preceding vertices[j] on that path, or -1 if i == j
+        """
+        self.vertices = list(vertices)
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+        self.dist = dist
+        self.pred = pred
+
+    def distance(self, v1: int, v2: int) -> int | None:
+        """Returns the length of a shortest path from v1 to v2, or None if there is no path."""
+        d = int(self.dist[self.index[v1], self.index[v2]])
+        return d if d >= 0 else None
+
+    def path(self, v1: int, v2: int) -> list[tuple[int, int]]:
+        """Returns the edges of a shortest path from v1 to v2, following the predecessor matrix back from v2."""
+        i, j = self.index[v1], self.index[v2]
+        if self.dist[i, j] < 0:
+            raise KeyError((v1, v2))
+        edges = []
+        while j != i:
+            p = int(self.pred[i, j])
+            edges.append((self.vertices[p], self.vertices[j]))
+            j = p
+        edges.reverse()
+        return edges
+
+    def __getitem__(self, key: tuple[int, int]) -> tuple[int, list[tuple[int, int]]]:
+        v1, v2 = key
+        if v1 not in self.index or v2 not in self.index:
+            raise KeyError(key)
+        d = int(self.dist[self.index[v1], self.index[v2]])
+        if d < 0:
+            raise KeyError(key)
+        return d, self.path(v1, v2)
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            v1, v2 = key  # type: ignore
+            return bool(self.dist[self.index[v1], self.index[v2]] >= 0)
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for i, j in zip(*np.nonzero(self.dist >= 0)):
+            yield self.vertices[i], self.vertices[j]
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.dist >= 0))
+
+
+def _incremental_shortest_paths(adjacency: np.ndarray, order: Sequence[int], snapshots: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Computes all-pairs shortest paths in a directed graph with unit edge weights, adding the vertices one at a time.
+
+    When a vertex k is added, the distances from and to k follow from those of its neighbours, and every other
+    distance can only improve by going through k. So each step takes O(n^2) vectorised work, and the tables of all
+    the nested subgraphs spanned by ``order[:1]``, ``order[:2]``, ... are computed in O(n^3) in total.
+
+    :param adjacency: Boolean matrix, with adjacency[i, j] set when there is an edge from i to j
+    :param order: The indices of the vertices, in the order in which they are added
+    :param snapshots: Whether to return the tables of every subgraph, or only of the last one
+    :return: The distance and predecessor matrices (see :class:`ShortestPaths`), stacked into arrays of shape
+        (len(order), n, n) if snapshots is set, where entry t contains the tables for the subgraph spanned by order[:t+1]
+    """
+    n = adjacency.shape[0]
+    dtype = np.int16 if 2 * n + 2 < np.iinfo(np.int16).max else np.int32
+    inf = n + 1  # Larger than any distance, and small enough that inf + inf doesn't overflow
+    cols = np.arange(n)
+    dist = np.full((n, n), inf, dtype=dtype)
+    pred = np.full((n, n), -1, dtype=dtype)
+    present = np.zeros(n, dtype=bool)
+    if snapshots:
+        all_dist = np.empty((len(order), n, n), dtype=dtype)
+        all_pred = np.empty((len(order), n, n), dtype=dtype)
+    for t, k in enumerate(order):
+        # Paths ending in k: the last edge comes from a neighbour of k already in the subgraph
+        into_k = np.flatnonzero(adjacency[:, k] & present)
+        if len(into_k):
+            cand = dist[:, into_k]
+            best = cand.argmin(axis=1)
+            d = cand[cols, best] + 1
+            reached = d < inf
+            dist[:, k] = np.where(reached, d, inf)
+            pred[:, k] = np.where(reached, into_k[best], -1)
+        # Paths starting in k: the first edge goes to a neighbour of k already in the subgraph
+        out_of_k = np.flatnonzero(adjacency[k, :] & present)
+        if len(out_of_k):
+            cand = dist[out_of_k, :]
+            best = cand.argmin(axis=0)
+            d = cand[best, cols] + 1
+            reached = d < inf
+            first = out_of_k[best]
+            dist[k, :] = np.where(reached, d, inf)
+            pred[k, :] = np.where(reached, np.where(cols == first, k, pred[first, cols]), -1)
+        dist[k, k] = 0
+        pred[k, k] = -1
+        present[k] = True
+        # Paths through k
+        via_k = dist[:, k, None] + dist[None, k, :]
+        better = via_k < dist
+        np.copyto(dist, via_k, where=better, casting='unsafe')
+        np.copyto(pred, np.broadcast_to(pred[k, :], (n, n)), where=better)
+        if snapshots:
+            all_dist[t] = np.where(dist < inf, dist, -1)
+            all_pred[t] = pred
+    if snapshots:
+        return all_dist, all_pred
+    return np.where(dist < inf, dist, -1).astype(dtype), pred
+
+
+def _steiner_prim(paths: ShortestPaths, root: int, terminals: Iterable[int]) -> list[tuple[int, list[tuple[int, int]]]]:
+    """
+    Approximates a Steiner tree with Prim's algorithm on the metric closure of the graph.
+
+    Starting from the root, it repeatedly adds the terminal that is closest to any vertex of the tree built so far,
+    together with a shortest path to it. Ties are broken by the order of the terminals. The distance from the tree to
+    every vertex is kept in an array, which is updated with a row of the distance matrix for each vertex added to
+    the tree, so each step takes O(n) vectorised time.
+
+    :param paths: The shortest paths in the subgraph to use
+    :param root: The vertex at which the tree starts
+    :param terminals: The vertices that the tree should contain
+    :return: The terminals in the order in which they were added, each with the edges of the path that added it
+    """
+    n = len(paths.vertices)
+    inf = n + 1
+    root_idx = paths.index[root]
+    # rank[i] is the position of vertices[i] among the terminals, or n if it isn't one
+    rank = np.full(n, n)
+    for r, v in enumerate(terminals):
+        rank[paths.index[v]] = min(rank[paths.index[v]], r)
+    rank[root_idx] = n
+    remaining = rank < n
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[root_idx] = True
+    best = np.where(paths.dist[root_idx] >= 0, paths.dist[root_idx], inf).astype(np.int64)
+    source = np.full(n, root_idx)
+    added = []
+    while remaining.any():
+        target = int(np.where(remaining, best * (n + 1) + rank, inf * (n + 1)).argmin())
+        if best[target] >= inf or not remaining[target]:
+            raise ValueError("The considered subgraph is not connected")
+        path = paths.path(paths.vertices[source[target]], paths.vertices[target])
+        added.append((paths.vertices[target], path))
+        remaining[target] = False
+        for _, v in path:
+            i = paths.index[v]
+            if in_tree[i]:
+                continue
+            in_tree[i] = True
+            row = paths.dist[i]
+            # On a tie, prefer the vertex that comes first
+            closer = (row >= 0) & ((row < best) | ((row == best) & (i < source)))
+            best[closer] = row[closer]
+            source[closer] = i
+    return added
+
 class Architecture:
     """
     Class that represents the architecture of the qubits to be taken into account when routing.
     """
 
-    def __init__(self, name: str, coupling_graph: BaseGraph[int, tuple[int, int]] | None = None, coupling_matrix: np.ndarray | None = None, backend: str | None = None, qubit_map: list[int] | None = None, reduce_order: list[int] | None = None, **kwargs: Any):
+    def __init__(self, name: str, coupling_graph: BaseGraph[int, tuple[int, int]] | None = None, coupling_matrix: np.ndarray | None = None, backend: str | None = None, qubit_map: list[int] | None = None, reduce_order: list[int] | None = None, distance_cache: str | None = None, **kwargs: Any):
         """
         Class that represents the architecture of the qubits to be taken into account when routing.
 
@@ -73,6 +246,7 @@ class Architecture:
         :param backend: The PyZX Graph backend to be used when creating it from the adjacency matrix, optional
         :param reduce_order: A list of integers representing the order in which the qubits should be scanned for some operations (e.g. steiner tree reduction), optional
         :param qubit_map: A qubit placement mapping list such that qubit_map[logical_qubit] = graph_node
+        :param distance_cache: A directory in which the tables computed by :func:`pre_calc_distances` are stored, keyed by a hash of the coupling graph, optional
         """
         self.name = name
         if coupling_graph is None:
@@ -88,6 +262,8 @@ class Architecture:
                      coupling_matrix[row, col] == 1]
             self.graph.add_edges(edges)
         self.vertices = list(self.graph.vertices())
+        # The neighbours of every vertex in the coupling graph
+        self.neighbors: dict[int, list[int]] = {v: list(self.graph.neighbors(v)) for v in self.vertices}
 
         if qubit_map is not None:
             self.qubit_map = qubit_map
@@ -106,7 +282,13 @@ class Architecture:
 
         # Pre-calculated distances between all pairs of qubits in the architecture
         # See :func:`pre_calc_distances` for more details
-        self.distances: dict[Literal["upper", "full"], list[dict[tuple[int, int], tuple[int, list[tuple[int, int]]]]]] | None = None
+        self.distances: dict[Literal["upper", "full"], list[ShortestPaths]] | None = None
+        self.distance_cache = distance_cache
+        # Steiner trees computed by :func:`steiner_tree`, keyed by the root, the terminals and the `upper` flag
+        self._steiner_trees: dict[tuple[int, frozenset[int], bool], list[tuple[int, int]]] = {}
+        # Shortest paths in the subgraphs used by :func:`rec_steiner_tree`, keyed by the usable vertices, the `rec` vertices and the `upper` flag
+        self._subgraph_paths: dict[tuple[frozenset[int], frozenset[int], bool], ShortestPaths] = {}
+        self.steiner_cache_size = 4096
 
         self.n_qubits = len(self.vertices)
         self.reduce_order = self._get_reduce_order() if reduce_order is None else reduce_order
@@ -120,17 +302,72 @@ class Architecture:
         """Get the logical architecture qubit for an internal graph vertex index."""
         return int(self.graph.qubit(vertex))
 
-    def pre_calc_distances(self) -> dict[Literal["upper", "full"], list[dict[tuple[int, int], tuple[int, list[tuple[int, int]]]]]]:
+    def pre_calc_distances(self) -> dict[Literal["upper", "full"], list[ShortestPaths]]:
         """
         Pre-calculates the distances between all pairs of qubits in the architecture.
 
+        The tables of all the nested subgraphs are computed together in O(n^3) time (see :func:`_incremental_shortest_paths`).
+        If the architecture has a ``distance_cache`` directory, they are loaded from there when they have been computed before,
+        and stored there otherwise.
+
         :return: The computed distances. distances["upper"|"full"][until][(v1,v2)] contains the distance between v1 and v2, and the shortest path, where
             upper|full indicates whether to consider bidirectional edges or not (respectively),
             until indicates the number of qubits to consider, for "full" the distance is calculated only between qubits with index <= until),
             and for "upper" the distance is calculated only between qubits with index >= until)
         """
-        return {"upper": [self.floyd_warshall(self.vertices[until:], upper=True) for until, v in enumerate(self.vertices)],
-                "full": [self.floyd_warshall(self.vertices[:until+1], upper=False) for until, v in enumerate(self.vertices)]}
+        tables = self._load_distance_tables()
+        if tables is None:
+            n = len(self.vertices)
+            index = {v: i for i, v in enumerate(self.vertices)}
+            undirected = np.zeros((n, n), dtype=bool)
+            directed = np.zeros((n, n), dtype=bool)
+            for edge in self.graph.edges():
+                src, tgt = self.graph.edge_st(edge)
+                i, j = index[src], index[tgt]
+                undirected[i, j] = undirected[j, i] = True
+                if self.vertex2qubit(src) > self.vertex2qubit(tgt):
+                    directed[i, j] = True
+                else:
+                    directed[j, i] = True
+            # The subgraphs for "upper" grow from the last vertex backwards, those for "full" from the first vertex onwards
+            upper_dist, upper_pred = _incremental_shortest_paths(undirected, range(n - 1, -1, -1))
+            full_dist, full_pred = _incremental_shortest_paths(directed, range(n))
+            tables = {"upper_dist": upper_dist[::-1], "upper_pred": upper_pred[::-1],
+                      "full_dist": full_dist, "full_pred": full_pred}
+            self._store_distance_tables(tables)
+        return {"upper": [ShortestPaths(self.vertices, d, p) for d, p in zip(tables["upper_dist"], tables["upper_pred"])],
+                "full": [ShortestPaths(self.vertices, d, p) for d, p in zip(tables["full_dist"], tables["full_pred"])]}
+
+    def coupling_hash(self) -> str:
+        """
+        Returns a hash of the coupling graph and of the qubit of every vertex, which determine the distances computed by :func:`pre_calc_distances`.
+        """
+        edges = sorted(sorted(self.graph.edge_st(e)) for e in self.graph.edges())
+        data = json.dumps([self.vertices, edges, [self.vertex2qubit(v) for v in self.vertices]])
+        return hashlib.sha256(data.encode()).hexdigest()[:32]
+
+    def _distance_cache_file(self) -> str | None:
+        if self.distance_cache is None:
+            return None
+        return os.path.join(self.distance_cache, "distances_" + self.coupling_hash() + ".npz")
+
+    def _load_distance_tables(self) -> dict[str, np.ndarray] | None:
+        fname = self._distance_cache_file()
+        if fname is None or not os.path.exists(fname):
+            return None
+        with np.load(fname) as f:
+            return {k: f[k] for k in f.files}
+
+    def _store_distance_tables(self, tables: dict[str, np.ndarray]) -> None:
+        fname = self._distance_cache_file()
+        if fname is None:
+            return
+        os.makedirs(os.path.dirname(fname) or ".", exist_ok=True)
+        # Write to a temporary file first, so that a concurrent run never loads a partially written file
+        tmp = fname + ".%d.tmp" % os.getpid()
+        with open(tmp, "wb") as f:
+            np.savez(f, **tables)
+        os.replace(tmp, fname)
 
     def _get_reduce_order(self) -> list[int]:
         """
@@ -300,7 +537,7 @@ class Architecture:
         :param vertex: Location of vertex within the graph
         :return: A set of all neighboring vertices
         """
-        return set(self.graph.neighbors(vertex))
+        return set(self.neighbors[vertex])
 
     def to_quil_device(self): # type: ignore # TODO: this legacy function doesn't work -- remove?
         """
@@ -333,43 +570,34 @@ class Architecture:
             filename = self.name + ".png"
         plt.savefig(filename)
 
-    def floyd_warshall(self, subgraph_vertices: Sequence[int], upper: bool = True, rec_vertices: Sequence[int] = []) -> dict[tuple[int, int], tuple[int, list[tuple[int, int]]]]:
+    def floyd_warshall(self, subgraph_vertices: Sequence[int], upper: bool = True, rec_vertices: Sequence[int] = []) -> ShortestPaths:
         """
-        Implementation of the Floyd-Warshall algorithm to calculate the all-pair distances in a given graph.
+        Calculates the all-pair distances in a given subgraph.
+
+        Despite its name, this no longer runs the Floyd-Warshall algorithm, but adds the vertices one at a time
+        with :func:`_incremental_shortest_paths`, which takes O(n^3) vectorised time.
 
         :param subgraph_vertices: Subset of vertices to consider
         :param upper: Whether use bidirectional edges or only ordered edges (src, tgt) such that src > tgt, default True
         :param rec_vertices: A subgraph for which edges are considered undirected, as if the `upper` flag was set
-        :return: A dict with for each pair of qubits in the graph, a tuple with their distance and the corresponding shortest path
+        :return: A mapping with for each pair of connected qubits in the graph, a tuple with their distance and the corresponding shortest path
         """
-        # https://en.wikipedia.org/wiki/Floyd%E2%80%93Warshall_algorithm
-        distances: dict[tuple[int, int], tuple[int, list[tuple[int, int]]]] = {}
         vertices = list(subgraph_vertices) if subgraph_vertices is not None else self.vertices
+        index = {v: i for i, v in enumerate(vertices)}
+        rec = set(rec_vertices)
+        adjacency = np.zeros((len(vertices), len(vertices)), dtype=bool)
         for edge in self.graph.edges():
             src, tgt = self.graph.edge_st(edge)
-            if src in vertices and tgt in vertices:
-                if upper or (src in rec_vertices and tgt in rec_vertices):
-                    distances[(src, tgt)] = (1, [(src, tgt)])
-                    distances[(tgt, src)] = (1, [(tgt, src)])
+            if src in index and tgt in index:
+                i, j = index[src], index[tgt]
+                if upper or (src in rec and tgt in rec):
+                    adjacency[i, j] = adjacency[j, i] = True
                 elif self.vertex2qubit(src) > self.vertex2qubit(tgt):
-                    distances[(src, tgt)] = (1, [(src, tgt)])
+                    adjacency[i, j] = True
                 else:
-                    distances[(tgt, src)] = (1, [(tgt, src)])
-        for v in vertices:
-            distances[(v, v)] = (0, [])
-        for v0 in vertices + vertices:
-            for v1 in vertices:
-                for v2 in vertices:
-                    # Consider the path v0 -> v1 -> v2 as a shortest path candidate for v0 -> v2
-                    if (v0, v1) in distances.keys() and (v1, v2) in distances.keys():
-                        if (v0, v2) not in distances.keys() or distances[(v0, v2)][0] > distances[(v0, v1)][0] + distances[(v1, v2)][0]:
-                            # There is a path v0 -> v1 -> v2 that is either the first one we see, or the shortest one yet
-                            distances[(v0, v2)] = (distances[(v0, v1)][0] + distances[(v1, v2)][0],
-                                                distances[(v0, v1)][1] + distances[(v1, v2)][1])
-                            if upper:
-                                distances[(v2, v0)] = (distances[(v0, v1)][0] + distances[(v1, v2)][0],
-                                                distances[(v2, v1)][1] + distances[(v1, v0)][1])
-        return distances
+                    adjacency[j, i] = True
+        dist, pred = _incremental_shortest_paths(adjacency, range(len(vertices)), snapshots=False)
+        return ShortestPaths(vertices, dist, pred)
 
     def shortest_path(self, start_qubit: int, end_qubit: int, qubits_to_use: Sequence[int] | None = None) -> list[int] | None:
         """
@@ -380,27 +608,26 @@ class Architecture:
         :param qubits_to_use: An optional list of qubit indicies to be traversed along the path, default None
         :return: An optional list showcasing the path from the start_qubit to the end_qubit
         """
-        if qubits_to_use is None:
-            nodes = self.vertices
-        else:
-            nodes = [self.qubit2vertex(n) for n in qubits_to_use]
+        nodes = None if qubits_to_use is None else set(self.qubit2vertex(n) for n in qubits_to_use)
         start = self.qubit2vertex(start_qubit)
         end = self.qubit2vertex(end_qubit)
 
-        queue = [(start, [start])]
-        visited = [start]
-  
-        while queue != []:
-            
-            node, path = queue.pop()
+        # Maps each visited vertex to the vertex it was reached from
+        parent: dict[int, int | None] = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
             if node == end:
-                return path
-            edges = [edge for edge in self.graph.edges() if node in edge]
-            neighbors = [n for edge in edges for n in edge if n != node and n in nodes]
-            for new_node in neighbors:
-                if new_node not in visited:
-                    queue.append((new_node, path + [new_node]))
-                    visited.append(new_node)
+                path = []
+                current: int | None = node
+                while current is not None:
+                    path.append(current)
+                    current = parent[current]
+                return path[::-1]
+            for new_node in self.neighbors[node]:
+                if new_node not in parent and (nodes is None or new_node in nodes):
+                    parent[new_node] = node
+                    queue.append(new_node)
         return None
 
     def steiner_tree(self, start_qubit: int, qubits_to_use: Sequence[int], upper: bool = True) -> Iterator[tuple[int, int] | None]:
@@ -421,72 +648,57 @@ class Architecture:
         # https://en.wikipedia.org/wiki/Prim%27s_algorithm
 
         # returns an iterator that walks the steiner tree, yielding (adj_node, leaf) pairs. If the walk is finished, it yields None
-        if self.distances is None:
-            self.distances = self.pre_calc_distances()
         root = self.qubit2vertex(start_qubit)
         target_nodes = set(self.qubit2vertex(q) for q in qubits_to_use)
 
         # Check that all nodes are valid and that there are no duplicates
         assert all(n >= root if upper else n <= root for n in target_nodes)
         assert len(qubits_to_use) == len(set(qubits_to_use))
-        
-        # The vertices and edges of the generated tree
+
+        # Gaussian elimination of many matrices on the same architecture asks for the same trees over and over,
+        # in particular for the small sets of terminals of the last columns, so the trees are memoised.
+        key = (root, frozenset(target_nodes), upper)
+        generated_edges = self._steiner_trees.get(key)
+        if generated_edges is None:
+            generated_edges = self._build_steiner_tree(root, target_nodes, upper)
+            if len(self._steiner_trees) >= self.steiner_cache_size:
+                del self._steiner_trees[next(iter(self._steiner_trees))]
+            self._steiner_trees[key] = generated_edges
+
+        yield from generated_edges
+        yield None
+
+        # Now go through the tree in reverse order
+        yield from reversed(generated_edges)
+        yield None
+
+    def _build_steiner_tree(self, root: int, target_nodes: set[int], upper: bool) -> list[tuple[int, int]]:
+        """
+        Computes the edges of the tree for :func:`steiner_tree`, as pairs of qubits in BFS order starting from the root.
+        """
+        if self.distances is None:
+            self.distances = self.pre_calc_distances()
+        # All distances between nodes with index <= root (if not upper) or index >= root (if upper), and the corresponding shortest paths
+        distances = self.distances["upper"][root] if upper else self.distances["full"][root]
+
+        # The vertices of the generated tree: the root, the target nodes and the intermediary vertices on the paths between them
         tree_vertices: set[int] = {root}
-        edges: set[tuple[int, int]] = set()
-        # Map with all distances between nodes with index <= root (if not upper) or index >= root (if upper), and the corresponding shortest paths
-        distances: dict[tuple[int, int], tuple[int, list[tuple[int, int]]]] = self.distances["upper"][root] if upper else self.distances["full"][root]
-        # Nodes that are not yet in the tree
-        remaining_nodes = set(n for n in target_nodes if n != root)
-        # Non-target nodes added to the tree
-        steiner_pnts: set[int] = set()
-
-        while remaining_nodes:
-            # Each candidate is a tuple of (tree node, candidate, distance, path)
-            candidates = []
-            for node in remaining_nodes:
-                for v in tree_vertices.union(steiner_pnts):
-                    if (v, node) not in distances.keys():
-                        # The nodes are not connected in the considered subgraph
-                        continue
-                    dist, path = distances[(v, node)]
-                    candidates.append((node, v, dist, path))
-            if not candidates:
-                raise ValueError("The considered subgraph is not connected")
-            best_option = min(candidates, key=lambda x: x[2])
-            new_node = best_option[0]
-            new_path = best_option[3]
-
-            # Add the target node and all intermediary vertices to the three
-            tree_vertices.add(new_node)
-            edges.update(new_path)
-            for _u,v in new_path:
-                if v not in tree_vertices:
-                    tree_vertices.add(v)
-                    steiner_pnts.add(v)
-            remaining_nodes.remove(new_node)
-        edges = set(edges)  # remove duplicates
-            
+        for node, path in _steiner_prim(distances, root, sorted(target_nodes)):
+            tree_vertices.add(node)
+            tree_vertices.update(v for _u, v in path)
+
         # Compute all the edges of the steiner tree in BFS order, starting from the root
         visited = {root}
-        queue = [root]
+        queue = deque([root])
         generated_edges: list[tuple[int, int]] = []
-        
-        while queue != []:
-            node = queue.pop(0)
-            neighbors = [v for v in self.graph.neighbors(node) if v in tree_vertices and v not in visited]
-
-            for v in neighbors:
-                queue.append(v)
-                visited.add(v)
-                edge = (self.vertex2qubit(node), self.vertex2qubit(v))
-                generated_edges.append(edge)
-                yield edge
-        yield None
-        
-        # Now go through the tree in reverse order
-        for edge in generated_edges[::-1]:
-            yield edge
-        yield None
+        while queue:
+            node = queue.popleft()
+            for v in self.neighbors[node]:
+                if v in tree_vertices and v not in visited:
+                    queue.append(v)
+                    visited.add(v)
+                    generated_edges.append((self.vertex2qubit(node), self.vertex2qubit(v)))
+        return generated_edges
 
     def rec_steiner_tree(self, start_qubit: int, terminal_qubits: Sequence[int], usable_qubits: Sequence[int], rec_qubits: Sequence[int], upper: bool = True) -> Iterator[tuple[int, int] | None]:
         """
@@ -506,23 +718,22 @@ class Architecture:
         usable_nodes = [self.qubit2vertex(i) for i in usable_qubits]
         nodes = [self.qubit2vertex(i) for i in terminal_qubits]
         rec_nodes = [self.qubit2vertex(i) for i in rec_qubits]
-        # Calculate all-pairs shortest path
-        distances = self.floyd_warshall(usable_nodes, upper=upper, rec_vertices=rec_nodes)
+        # Calculate all-pairs shortest path. The same subgraphs come back for every matrix reduced on this architecture, so these are memoised too.
+        key = (frozenset(usable_nodes), frozenset() if upper else frozenset(rec_nodes), upper)
+        distances = self._subgraph_paths.get(key)
+        if distances is None:
+            distances = self.floyd_warshall(sorted(usable_nodes), upper=upper, rec_vertices=rec_nodes)
+            if len(self._subgraph_paths) >= self.steiner_cache_size // 16:
+                del self._subgraph_paths[next(iter(self._subgraph_paths))]
+            self._subgraph_paths[key] = distances
         # Build the spanning tree of shortest paths with root start, containing at least nodes
         vertices = [start]
         edges: list[tuple[int, int]] = []
         steiner_pnts: list[int] = []
-        while nodes != []:
-            options = [(node, v, *distances[(v, node)]) for node in nodes for v in (vertices + steiner_pnts) if
-                        (v, node) in distances.keys()]
-            if options == []:
-                raise ValueError("The considered subgraph is not connected")
-            best_option = min(options, key=lambda x: x[2])
-            vertices.append(best_option[0])
-            edges += best_option[3]
-            steiner = [v for edge in best_option[3] for v in edge if v not in vertices]
-            steiner_pnts += steiner
-            nodes.remove(best_option[0])
+        for node, path in _steiner_prim(distances, start, nodes):
+            vertices.append(node)
+            edges += path
+            steiner_pnts += [v for edge in path for v in edge if v not in vertices]
         edges = list(set(edges)) #removes duplicates
 
         vs = {start} # Start with the root
@@ -556,7 +767,7 @@ class Architecture:
         """
         # TODO make a transposed copy of self
         qubit_map = list(reversed(self.qubit_map))
-        arch = Architecture(self.name + "_transpose", coupling_graph=self.graph, qubit_map=qubit_map)
+        arch = Architecture(self.name + "_transpose", coupling_graph=self.graph, qubit_map=qubit_map, distance_cache=self.distance_cache)
         return arch
         
     def arities(self) -> list[tuple[int, int]]:
@@ -235,6 +235,8 @@ def permuted_gauss(
     fitness_func: FitnessFunction | None = None,
     x: CNOT_tracker | None = None,
     y: CNOT_tracker | None = None,
+    n_threads: int | None = 1,
+    seed: int | None = None,
     **kwargs: Any,
 ) -> tuple[list[int], CNOT_tracker, int]:
     """
@@ -254,6 +256,8 @@ def permuted_gauss(
     :param fitness_func: Optional fitness function to use
     :param x: Optional tracker for the row operations
     :param y: Optional tracker for the column operations
+    :param n_threads: Number of worker processes evaluating the fitness for the genetic algorithm
+    :param seed: Seed for the genetic algorithm, to make the permutation found reproducible
     :return: Best permutation found, list of CNOTS corresponding to the
         elimination.
     """
@@ -274,6 +278,8 @@ def permuted_gauss(
             crossover_prob,
             mutate_prob,
             fitness_func,
+            n_threads=n_threads,
+            seed=seed,
         )
         permsize = len(matrix.data) if row else len(matrix.data[0])
         best_permutation = np.array(optimizer.find_optimum(
@@ -311,6 +317,8 @@ def sequential_gauss(
     p_crossover: float = 0.3,
     pso_mutation: float = 0.2,
     full_reduce: bool = True,
+    n_threads: int | None = None,
+    seed: int | None = None,
     **kwargs: Any,
 ) -> tuple[list[CNOT_tracker], list[list[int]], int]:
     """
@@ -331,6 +339,8 @@ def sequential_gauss(
     :param p_crossover: The crossover percentage with the personal best of a particle for the particle swarm optimizer. Must be between 0.0 and 1.0.
     :param pso_mutation: The mutation percentage of a particle for the particle swarm optimizer. Must be between 0.0 and 1.0.
     :param full_reduce: Fully reduce the matrices
+    :param n_threads: Number of worker processes for the particle swarm optimizer. If None, use all available processors.
+    :param seed: Seed for the genetic algorithm and particle swarm optimizer, to make the result reproducible
     :return: List of CNOT trackers corresponding to the eliminations, list of
         final permutations for each matrix, and the cost of the eliminations.
     """
@@ -371,6 +381,7 @@ def sequential_gauss(
                 fitness_func=fitness_func,
                 row=row,
                 col=col,
+                seed=seed,
                 **kwargs,
             )
             # if not col and not row:
@@ -399,6 +410,7 @@ def sequential_gauss(
                 fitness_func=fitness_func,
                 input_perm=input_perm,
                 output_perm=output_perm,
+                seed=seed,
                 **kwargs,
             )
 
@@ -411,6 +423,8 @@ def sequential_gauss(
             s_best_crossover=s_crossover,
             p_best_crossover=p_crossover,
             mutation=pso_mutation,
+            n_threads=n_threads,
+            seed=seed,
         )
         best_solution = optimizer.find_optimum(
             architecture.n_qubits if architecture is not None else n_qubits,
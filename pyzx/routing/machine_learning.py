@@ -28,6 +28,183 @@ if TYPE_CHECKING:
     from .parity_maps import CNOT_tracker
 
 
+def _random_state(seed: int | None) -> Any:
+    """
+    Returns the source of randomness of an optimiser.
+
+    :param seed: Seed for the optimiser, or None to use the global state of numpy.random
+    :return: A RandomState seeded with seed, or the numpy.random module itself
+    """
+    return np.random if seed is None else np.random.RandomState(seed)
+
+
+# The function evaluated by the worker processes of a FitnessEvaluator, set once per worker by _init_worker
+_worker_func: Callable[[list[int]], Any] | None = None
+
+
+def _init_worker(func: Callable[[list[int]], Any]) -> None:
+    """
+    Initialises a worker process of a FitnessEvaluator.
+
+    :param func: The function to evaluate, which is shipped to each worker only once
+    """
+    global _worker_func
+    _worker_func = func
+
+
+def _evaluate(func: Callable[[list[int]], Any], key: bytes, seed: int | None) -> Any:
+    """
+    Evaluates func on a chromosome encoded as an array of int32.
+
+    :param func: The function to evaluate
+    :param key: The bytes of the chromosome
+    :param seed: If not None, numpy.random is seeded with it during the evaluation
+    :return: The value of func on the chromosome
+    """
+    chromosome = np.frombuffer(key, dtype=np.int32).tolist()
+    if seed is None:
+        return func(chromosome)
+    state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        return func(chromosome)
+    finally:
+        np.random.set_state(state)
+
+
+def _evaluate_in_worker(task: tuple[bytes, int | None]) -> Any:
+    """
+    Evaluates the function of the worker process on a chromosome.
+
+    :param task: The bytes of the chromosome and its seed
+    :return: The value of the function on the chromosome
+    """
+    assert _worker_func is not None
+    return _evaluate(_worker_func, *task)
+
+
+class FitnessEvaluator:
+    """
+    Evaluates a fitness function, or the step function of a particle swarm, on batches of permutations.
+
+    The function is shipped to each worker process once, when the pool is started, after which the permutations are
+    sent as arrays of int32. Results are memoised by the bytes of the permutation, so individuals that come back in a
+    later generation are not evaluated again.
+    """
+    def __init__(
+        self,
+        func: Callable[[list[int]], Any],
+        n_threads: int | None = 1,
+        seed: int | None = None,
+        cache_size: int = 65536,
+    ):
+        """
+        Creates and returns a fitness evaluator.
+
+        :param func: The function to evaluate on the permutations
+        :param n_threads: Number of worker processes to use. If None, use all available processors. With 1, the
+            permutations are evaluated in this process, default 1
+        :param seed: If not None, numpy.random is seeded during each evaluation with a seed derived from this seed and
+            the permutation, so that the value for a permutation is reproducible and does not depend on the number of
+            worker processes, default None
+        :param cache_size: The maximal number of memoised results. With 0, nothing is memoised, default 65536
+        """
+        self.func = func
+        self.n_threads = n_threads if n_threads is not None else cpu_count()
+        self.seed = seed
+        self.cache_size = cache_size
+        self._cache: dict[bytes, Any] = {}
+        self.pool: Pool | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Prepares the object state for pickling by removing the pool.
+
+        :return: The state dictionary
+        """
+        state = self.__dict__.copy()
+        del state["pool"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """
+        Restores the object state after unpickling
+
+        :param state: The state to be restored to the dictionary
+        """
+        self.__dict__.update(state)
+        self.pool = None
+
+    def _seed_for(self, key: bytes) -> int | None:
+        """
+        Derives the seed used to evaluate a permutation.
+
+        :param key: The bytes of the permutation
+        :return: The seed, or None when the evaluator has no seed
+        """
+        if self.seed is None:
+            return None
+        entropy = [self.seed] + np.frombuffer(key, dtype=np.int32).tolist()
+        return int(np.random.SeedSequence(entropy).generate_state(1)[0])
+
+    def __call__(self, chromosome: Sequence[int]) -> Any:
+        """
+        Evaluates the function on a single permutation.
+
+        :param chromosome: The permutation
+        :return: The value of the function
+        """
+        return self.map([chromosome])[0]
+
+    def map(self, chromosomes: Sequence[Sequence[int]]) -> list[Any]:
+        """
+        Evaluates the function on a batch of permutations, running up to n_threads evaluations concurrently.
+
+        :param chromosomes: The permutations
+        :return: The values of the function, in the order of the permutations
+        """
+        keys = [np.asarray(c, dtype=np.int32).tobytes() for c in chromosomes]
+        results: list[Any] = [None] * len(keys)
+        # The permutations to evaluate and their positions in the batch, duplicates are evaluated once when memoising
+        tasks: list[tuple[bytes, list[int]]] = []
+        pending: dict[bytes, list[int]] = {}
+        for i, key in enumerate(keys):
+            if key in self._cache:
+                results[i] = self._cache[key]
+            elif self.cache_size > 0 and key in pending:
+                pending[key].append(i)
+            else:
+                pending[key] = [i]
+                tasks.append((key, pending[key]))
+        if not tasks:
+            return results
+
+        args = [(key, self._seed_for(key)) for key, _ in tasks]
+        if self.n_threads > 1 and len(tasks) > 1:
+            if self.pool is None:
+                self.pool = Pool(self.n_threads, initializer=_init_worker, initargs=(self.func,))
+            values = self.pool.map(_evaluate_in_worker, args)
+        else:
+            values = [_evaluate(self.func, *a) for a in args]
+        for (key, positions), value in zip(tasks, values):
+            for i in positions:
+                results[i] = value
+            if self.cache_size > 0:
+                if len(self._cache) >= self.cache_size:
+                    del self._cache[next(iter(self._cache))]
+                self._cache[key] = value
+        return results
+
+    def close(self) -> None:
+        """
+        Closes and joins the pool of worker processes, if it was started. A new pool is started when needed.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+
 class GeneticAlgorithm:
     """
     A genetic algorithm for optimising permutations based on a fitness function.
@@ -39,6 +216,8 @@ class GeneticAlgorithm:
         mutation_prob: float,
         fitness_func: Callable[[list[int]], float],
         maximize: bool = False,
+        n_threads: int | None = 1,
+        seed: int | None = None,
     ):
         """
         Creates and returns a genetic algorithm.
@@ -48,6 +227,8 @@ class GeneticAlgorithm:
         :param mutation_prob: Probability of mutation for an offspring
         :param fitness_func: Function to evaluate fitness of permutations
         :param maximize: True, Maximise the fitness, False, Minimise the Fitness, default False
+        :param n_threads: Number of worker processes evaluating the fitness. If None, use all available processors, default 1
+        :param seed: Seed for a reproducible run. If None, numpy.random is used, default None
         """
         self.population_size = population_size
         self.negative_population_size = int(np.sqrt(population_size))
@@ -58,6 +239,8 @@ class GeneticAlgorithm:
         self.maximize = maximize
         self.n_qubits = 0
         self.population: list[tuple[list[int], Any]] = []
+        self.rng = _random_state(seed)
+        self.evaluator = FitnessEvaluator(fitness_func, n_threads, seed=seed)
 
     def _select(self) -> NDArray:
         """
@@ -74,7 +257,7 @@ class GeneticAlgorithm:
             adjusted_scores = [max_fitness - f for f in fitness_scores]
             adjusted_total = sum(adjusted_scores)
             selection_chance = [f / adjusted_total for f in adjusted_scores]
-        return np.random.choice(
+        return self.rng.choice(
             self.population_size, size=2, replace=False, p=selection_chance
         )
 
@@ -85,16 +268,14 @@ class GeneticAlgorithm:
 
         :param n: The size of the random permutation
         """
-        population = [[int(x) for x in np.random.permutation(n)] for _ in range(self.population_size)]
-        self.population = [
-            (list(chromosome), self.fitness_func(chromosome))
-            for chromosome in population
-        ]
+        population = [[int(x) for x in self.rng.permutation(n)] for _ in range(self.population_size)]
+        self.population = list(zip(population, self.evaluator.map(population)))
         self._sort(self.population)
         self.negative_population = self.population[-self.negative_population_size :]
 
     def find_optimum(
-        self, n_qubits: int, n_generations: int, initial_order: list[int] | None = None, n_child: int | None = None, continued: bool = False
+        self, n_qubits: int, n_generations: int, initial_order: list[int] | None = None, n_child: int | None = None, continued: bool = False,
+        close_pool: bool = True,
     ) -> list[int]:
         """
         Runs the genetic algorithm to find the best permutation over a number of generations.
@@ -104,6 +285,7 @@ class GeneticAlgorithm:
         :param initial_order: Initial permuation to start from, if None, creates population with the number of qubits, default None
         :param n_child: Number of children to generate per generation, default None
         :param continued: True, continue to previous population, default False
+        :param close_pool: Whether to close and join the worker processes after finding the optimum, default True
         :return: The best permutation
         """
         self.n_qubits = n_qubits
@@ -122,6 +304,8 @@ class GeneticAlgorithm:
 
         for _ in range(n_generations):
             self._update_population(n_child)
+        if close_pool:
+            self.evaluator.close()
         if partial_solution and initial_order is not None:
             return np.array(self.population[0][0] + initial_order[n_qubits:]).tolist()
         return np.array(self.population[0][0]).tolist()
@@ -133,14 +317,12 @@ class GeneticAlgorithm:
         :param children: The children to be added to the population
         """
         n_child = len(children)
-        self.population.extend(
-            [(child, self.fitness_func(child)) for child in children]
-        )
+        self.population.extend(zip(children, self.evaluator.map(children)))
         self._sort(self.population)
         self.negative_population.extend(self.population[-n_child:])
         self.negative_population = [
             self.negative_population[i]
-            for i in np.random.choice(
+            for i in self.rng.choice(
                 self.negative_population_size + n_child,
                 size=self.negative_population_size,
                 replace=False,
@@ -156,16 +338,16 @@ class GeneticAlgorithm:
         """
         children: list[list[int]] = []
         # Create a child from weak parents to avoid local optima
-        p1, p2 = np.random.choice(self.negative_population_size, size=2, replace=False)
+        p1, p2 = self.rng.choice(self.negative_population_size, size=2, replace=False)
         child = self._crossover(
             self.negative_population[p1][0], self.negative_population[p2][0]
         )
         children.append(child)
         for _ in range(n_child):
-            if np.random.random() < self.crossover_prob:
+            if self.rng.random() < self.crossover_prob:
                 p1, p2 = self._select()
                 child = self._crossover(self.population[p1][0], self.population[p2][0])
-                if np.random.random() < self.mutation_prob:
+                if self.rng.random() < self.mutation_prob:
                     child = self._mutate(child)
                 children.append(child)
         self._add_children(children)
@@ -178,8 +360,8 @@ class GeneticAlgorithm:
         :param parent2: The second parent
         :return: The child of the 2 parents
         """
-        crossover_start = np.random.choice(int(self.n_qubits / 2))
-        crossover_length = np.random.choice(self.n_qubits - crossover_start)
+        crossover_start = self.rng.choice(int(self.n_qubits / 2))
+        crossover_length = self.rng.choice(self.n_qubits - crossover_start)
         crossover_end = crossover_start + crossover_length
         child = -1 * np.ones_like(parent1)
         child[crossover_start:crossover_end] = parent1[crossover_start:crossover_end]
@@ -199,7 +381,7 @@ class GeneticAlgorithm:
         :param parent: The parent to mutate
         :return: A mutated parent
         """
-        gen1, gen2 = np.random.choice(len(parent), size=2, replace=False)
+        gen1, gen2 = self.rng.choice(len(parent), size=2, replace=False)
         _ = parent[gen1]
         parent[gen1] = parent[gen2]
         parent[gen2] = _
@@ -219,6 +401,7 @@ class ParticleSwarmOptimization:
         mutation: float,
         maximize: bool = False,
         n_threads: int | None = None,
+        seed: int | None = None,
     ):
         """
         Setup the optimizer
@@ -229,7 +412,9 @@ class ParticleSwarmOptimization:
         :param p_best_crossover: The crossover percentage with the personal best of a particle. Must be between 0.0 and 1.0.
         :param mutation: The mutation percentage of a particle. Must be between 0.0 and 1.0.
         :param maximize: Whether to maximize the fitness function.
-        :param n_threads: Number of threads to use for the optimization. If None, use all available threads.
+        :param n_threads: Number of worker processes evaluating the step function. If None, use all available processors.
+        :param seed: Seed for a reproducible run. The step function is then memoised, as numpy.random is seeded for each
+            position (see FitnessEvaluator). If None, numpy.random is used and the step function is always evaluated.
         """
         self.step_func = step_func
         self.size = swarm_size
@@ -239,35 +424,11 @@ class ParticleSwarmOptimization:
         self.best_particle: Particle | None = None
         self.maximize = maximize
         self.swarm: list[Particle] = []
-        self.pool: Pool | None = None
-        n_threads = (
-            min(n_threads, cpu_count()) if n_threads is not None else cpu_count()
+        self.rng = _random_state(seed)
+        # The step function is randomised, so only memoise it when its random choices are fixed by the seed
+        self.evaluator = FitnessEvaluator(
+            step_func, n_threads, seed=seed, cache_size=0 if seed is None else 65536
         )
-        if n_threads > 1:
-            self.pool = Pool(n_threads)
-
-    def __getstate__(self) -> dict[str, Any]:
-        """
-        Prepares the object state for pickling by removing non-serialisable fields.
-
-        :return: The state dictionary
-        """
-        state = self.__dict__.copy()
-        # Don't pickle baz
-        # del state["fitness_func"]
-        del state["pool"]
-        return state
-
-    def __setstate__(self, state: dict[str, Any]) -> None:
-        """
-        Restores the object state after unpickling
-
-        :param state: The state to be restored to the dictionary
-        """
-        self.__dict__.update(state)
-        # Add baz back since it doesn't exist in the pickle
-        # self.fitness_func = None
-        self.pool = None
 
     def _create_swarm(self, n: int) -> None:
         """
@@ -285,6 +446,7 @@ class ParticleSwarmOptimization:
                 self.mutation,
                 self.maximize,
                 id=i,
+                rng=self.rng,
             )
             for i in range(self.size)
         ]
@@ -298,7 +460,7 @@ class ParticleSwarmOptimization:
         :param n_qubits: The number of qubits
         :param n_steps: The number of steps
         :param quiet: Whether to show updates on the iteration and fitness score as it iterates, default True
-        :param close_pool: Whether to close and join the pool after finding the optimum, default True
+        :param close_pool: Whether to close and join the worker processes after finding the optimum, default True
         :return: The optimum solution for swarm
         """
         self._create_swarm(n_qubits)
@@ -313,40 +475,27 @@ class ParticleSwarmOptimization:
                     self.best_particle.best,
                     self.best_particle.best_point,
                 )
-        if close_pool and self.pool:
-            self.pool.close()
-            self.pool.join()
+        if close_pool:
+            self.evaluator.close()
         
         if not self.best_particle.best_solution:
             raise ValueError("No valid solution found.")
         
         return self.best_particle.best_solution
 
-    @staticmethod
-    def particle_update_func(args: tuple['Particle', 'Particle']) -> 'Particle':
-        """
-        Update a single particle in the swarm using the current global best particle.
-
-        :param args: Tuple of swarm_best and particle, where swarm_best is the current best performing particle and the particle is the particle to be updated
-        :return: The next evolution of the particle
-        """
-        swarm_best, p = args
-        p.step(swarm_best)
-        return p
-
     def _update_swarm(self) -> None:
         """
         Update the state of all particles in the swarm, after updating the method finds the best particle in the swarm.
         """
         if self.best_particle is not None:
-            if self.pool is not None:
-                self.swarm = self.pool.map(
-                    self.particle_update_func, [(self.best_particle, p) for p in self.swarm]
-                )
+            if self.evaluator.n_threads > 1:
+                results = self.evaluator.map([p.current for p in self.swarm])
             else:
-                self.swarm = [
-                    self.particle_update_func((self.best_particle, p)) for p in self.swarm
-                ]
+                # Evaluate each particle just before it moves, so that numpy.random is drawn in the same order as by step
+                results = (self.evaluator(p.current) for p in self.swarm)
+            # The best point is read for every particle, as the best particle itself may have moved earlier in the step
+            for p, result in zip(self.swarm, results):
+                p.update(result, self.best_particle.best_point)
         if self.maximize:
             top = max(
                 self.swarm, key=lambda p: p.best if p.best is not None else -np.inf
@@ -372,6 +521,7 @@ class Particle:
         mutation: float,
         maximize: bool = False,
         id: int | None = None,
+        rng: Any = None,
     ):
         """
         Creates and returns a single particle.
@@ -383,10 +533,12 @@ class Particle:
         :param mutation: Mutation rate as a proportion of the permatation length
         :param maximize: True, Maximise the fitness, False, Minimise the fitness, default False
         :param id: Id for the particle, default None
+        :param rng: The source of randomness, a RandomState or None for numpy.random, default None
         """
         self.step_func = step_func
         self.size = size
-        self.current: list[int] = np.random.permutation(size).tolist()
+        self.rng = rng if rng is not None else np.random
+        self.current: list[int] = self.rng.permutation(size).tolist()
         self.best_point = self.current
         self.best: int | None = None
         self.best_solution: tuple[list["CNOT_tracker"], list[list[int]]] | None = None
@@ -420,7 +572,17 @@ class Particle:
         :param swarm_best: The best particle in the swarm
         :return: True, a better solution was found, False, no better solution was found
         """
-        new, solution, fitness = self.step_func(self.current)
+        return self.update(self.step_func(self.current), swarm_best.best_point)
+
+    def update(self, result: tuple[list[int], Any, Any], swarm_best_point: list[int]) -> bool:
+        """
+        Moves the particle given the value of the step function at its current position.
+
+        :param result: The new position, solution and fitness returned by the step function
+        :param swarm_best_point: The best position of the swarm
+        :return: True, a better solution was found, False, no better solution was found
+        """
+        new, solution, fitness = result
         is_better = self.best is None or not self.compare(fitness)
         if is_better:
             self.best = fitness
@@ -429,7 +591,7 @@ class Particle:
         elif all([self.current[i] == n for i, n in enumerate(new)]):
             new = self._mutate(self.current)
             new = self._crossover(new, self.best_point, self.p_crossover)
-            new = self._crossover(new, swarm_best.best_point, self.s_crossover)
+            new = self._crossover(new, swarm_best_point, self.s_crossover)
             # Sanity check TODO can be removed!
             if any([i not in new for i in range(self.size)]):
                 raise Exception(
@@ -447,8 +609,8 @@ class Particle:
         :return: A mutated particle permutation
         """
         new_particle = particle.copy()
-        m_idxs = np.random.choice(self.size, size=self.mutation, replace=False)
-        m_perm = np.random.permutation(self.mutation)
+        m_idxs = self.rng.choice(self.size, size=self.mutation, replace=False)
+        m_perm = self.rng.permutation(self.mutation)
         for old_i, new_i in enumerate(m_perm):
             new_particle[m_idxs[old_i]] = particle[m_idxs[new_i]]
         return new_particle
@@ -462,7 +624,7 @@ class Particle:
         :param n: The number of genes to crossover
         :return: A new mutated particle permutation resulting from the crossover
         """
-        cross_idxs = np.random.choice(self.size, size=n, replace=False)
+        cross_idxs = self.rng.choice(self.size, size=n, replace=False)
         new_particle = [-1] * len(particle)
         for i in cross_idxs:
             new_particle[i] = best_particle[i]
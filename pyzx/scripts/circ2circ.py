@@ -15,8 +15,15 @@
 # limitations under the License.
 
 
+import csv
+import glob
+import json
 import os
+import signal
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set
 
 from ..circuit import Circuit, determine_file_type
 from .. import simplify
@@ -32,12 +39,23 @@ This puts an optimised version of the circuit in the same directory and of the s
 
 If we want to specify the output location and type we can run
     python -m pyzx opt -d outputfile.qc -t qc inputfile.qasm
+
+Several circuits can be optimised in one go by passing several files, directories
+or glob patterns, for instance
+    python -m pyzx opt --jobs 8 --timeout 600 --results results.csv -d optimised/ 'circuits/**/*.qasm'
+
+In this batch mode, -d is the directory to put the optimised circuits in. Without it,
+each optimised circuit is put next to its source, with '.opt' added before the extension.
+For every circuit a row with the gate counts before and after optimisation and the
+time it took is written to the --results file (CSV, or JSON lines if it ends in .json or
+.jsonl) as soon as it is done. If the results file already exists, the circuits it lists
+are skipped, so an interrupted batch can be resumed by running the same command again.
 """
 
 import argparse
 parser = argparse.ArgumentParser(prog="pyzx opt", description=description, formatter_class=argparse.RawTextHelpFormatter)
-parser.add_argument('source',type=str,help='source circuit')
-parser.add_argument('-d',type=str,help='destination for output file', dest='dest',default='')
+parser.add_argument('source',type=str,nargs='+',help='source circuit(s): files, directories or glob patterns')
+parser.add_argument('-d',type=str,help='destination for output file (or directory in batch mode)', dest='dest',default='')
 parser.add_argument('-t',type=str,default='match', dest='outformat',
     help='Specify the output format (qasm, qc, quipper). By default matches the input')
 parser.add_argument('-v',default=False, action='store_true', dest='verbose',
@@ -46,55 +64,248 @@ parser.add_argument('-g',type=str,default='full', dest='simp',
     help='ZX-simplifier to use. Options are full (default), cliff, or tele')
 parser.add_argument('-p',default=False, action='store_true', dest='phasepoly',
     help='Whether to also run the phase-polynomial optimizer (default is false)')
+parser.add_argument('-j','--jobs',type=int,default=1, dest='jobs',
+    help='Number of circuits to optimise in parallel in batch mode (default 1)')
+parser.add_argument('--timeout',type=float,default=0, dest='timeout',
+    help='Give up on a circuit after this many seconds (default: no limit).\nOnly supported on platforms with SIGALRM')
+parser.add_argument('--results',type=str,default='', dest='results',
+    help='File to stream a row of statistics per circuit to in batch mode')
+parser.add_argument('--format',type=str,default='auto', dest='resultformat', choices=['auto', 'csv', 'json'],
+    help='Format of the results file. By default JSON lines for .json/.jsonl files and CSV otherwise')
+parser.add_argument('--restart',default=False, action='store_true', dest='restart',
+    help='Overwrite an existing results file instead of skipping the circuits it lists')
 
-def main(args):
-    options = parser.parse_args(args)
-    if not os.path.exists(options.source):
-        print("File {} does not exist".format(options.source))
-        return
-    ctype = determine_file_type(options.source)
-    if options.outformat == 'match':
-        dtype = ctype
-    elif options.outformat not in ('qasm', 'qc', 'quipper'):
-        print("Unsupported circuit type {}. Please use qasm, qc or quipper".format(options.outformat))
-        return
-    else:
-        dtype = options.outformat
-    if not options.dest:
-        base = os.path.splitext(options.source)[0]
-        dest = base + "." + dtype
-    else:
-        dest = options.dest
+# file extensions picked up when a directory is given as source, besides files without one
+circuit_extensions = ('.qasm', '.qc', '.tfc', '.quipper', '.quip', '.circuit')
 
-    c = Circuit.load(options.source)
-    if options.verbose:
-        print("Starting circuit:")
-        print(c.to_basic_gates().stats())
+result_fields = ['source', 'dest', 'status', 'error', 'qubits',
+                 'gates_before', 'twoqubit_before', 'tcount_before',
+                 'gates_after', 'twoqubit_after', 'tcount_after', 'time']
+
+
+def optimize_circuit(c: Circuit, simp: str='full', phasepoly: bool=False, verbose: bool=False) -> Circuit:
+    """Runs the optimisation pipeline of ``pyzx opt`` on a circuit and returns the
+    optimised circuit in terms of basic gates."""
     g = c.to_graph()
-    if options.verbose: print("Running simplification algorithm...")
-    if options.simp == 'tele':
+    if verbose: print("Running simplification algorithm...")
+    if simp == 'tele':
         g = simplify.teleport_reduce(g)
         c2 = Circuit.from_graph(g)
         c2 = c2.split_phase_gates()
     else:
-        if options.simp == 'full':
+        if simp == 'full':
             simplify.full_reduce(g)
-        if options.simp == 'cliff':
+        if simp == 'cliff':
             simplify.clifford_simp(g)
-        if options.verbose: print("Extracting circuit...")
+        if verbose: print("Extracting circuit...")
         c2 = extract.extract_circuit(g)
-    if options.verbose: print("Optimizing...")
-    if options.phasepoly:
+    if verbose: print("Optimizing...")
+    if phasepoly:
         c3 = optimize.full_optimize(c2.to_basic_gates())
     else:
         c3 = optimize.basic_optimization(c2.to_basic_gates())
     c3 = c3.to_basic_gates()
     c3 = c3.split_phase_gates()
-    if options.verbose: print(c3.stats())
-    print("Writing output to {}".format(os.path.abspath(dest)))
-    if dtype == 'qc': output = c3.to_qc()
-    if dtype == 'qasm': output = c3.to_qasm()
-    if dtype == 'quipper': output = c3.to_quipper()
+    return c3
+
+def write_circuit(c: Circuit, dest: str, dtype: str) -> None:
+    if dtype == 'qc': output = c.to_qc()
+    if dtype == 'qasm': output = c.to_qasm()
+    if dtype == 'quipper': output = c.to_quipper()
     f = open(dest, 'w')
     f.write(output)
     f.close()
+
+def main(args):
+    options = parser.parse_args(args)
+    if options.outformat not in ('match', 'qasm', 'qc', 'quipper'):
+        print("Unsupported circuit type {}. Please use qasm, qc or quipper".format(options.outformat))
+        return
+    if (len(options.source) > 1 or options.results or options.jobs > 1
+            or any(os.path.isdir(s) or glob.has_magic(s) for s in options.source)):
+        run_batch(options)
+        return
+
+    source = options.source[0]
+    if not os.path.exists(source):
+        print("File {} does not exist".format(source))
+        return
+    ctype = determine_file_type(source)
+    if options.outformat == 'match':
+        dtype = ctype
+    else:
+        dtype = options.outformat
+    if not options.dest:
+        base = os.path.splitext(source)[0]
+        dest = base + "." + dtype
+    else:
+        dest = options.dest
+
+    c = Circuit.load(source)
+    if options.verbose:
+        print("Starting circuit:")
+        print(c.to_basic_gates().stats())
+    c3 = optimize_circuit(c, options.simp, options.phasepoly, options.verbose)
+    if options.verbose: print(c3.stats())
+    print("Writing output to {}".format(os.path.abspath(dest)))
+    write_circuit(c3, dest, dtype)
+
+
+def collect_sources(patterns: List[str]) -> List[str]:
+    """Expands the directories and glob patterns given on the command line into a
+    sorted list of circuit files. Outputs of an earlier batch run without ``-d``
+    (files with '.opt' before the extension) are left out."""
+    found: Set[str] = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+                for fname in files:
+                    ext = os.path.splitext(fname)[1]
+                    if fname.startswith('.') or (ext and ext not in circuit_extensions): continue
+                    found.add(os.path.join(root, fname))
+        elif glob.has_magic(pattern):
+            found.update(f for f in glob.glob(pattern, recursive=True) if os.path.isfile(f))
+        elif os.path.isfile(pattern):
+            found.add(pattern)
+        else:
+            print("File {} does not exist".format(pattern))
+    return sorted(f for f in found if not os.path.splitext(os.path.splitext(f)[0])[1] == '.opt')
+
+class _Timeout(Exception):
+    pass
+
+def _raise_timeout(signum, frame):
+    raise _Timeout()
+
+def _optimize_file(source: str, dest: str, outformat: str, simp: str, phasepoly: bool, timeout: float) -> Dict[str, Any]:
+    # Runs in a worker process. Everything that can go wrong is reported in the row.
+    row: Dict[str, Any] = {f: '' for f in result_fields}
+    row['source'] = source
+    use_alarm = timeout > 0 and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        old_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        dtype = determine_file_type(source) if outformat == 'match' else outformat
+        if dtype not in ('qasm', 'qc', 'quipper'):
+            raise TypeError("Can't write circuits of type {}".format(dtype))
+        if not dest:
+            base, ext = os.path.splitext(source)
+            dest = base + ".opt" + (ext if outformat == 'match' and ext else "." + dtype)
+        c = Circuit.load(source).to_basic_gates()
+        row['qubits'] = c.qubits
+        row['gates_before'] = len(c.gates)
+        row['twoqubit_before'] = c.twoqubitcount()
+        row['tcount_before'] = c.tcount()
+        c3 = optimize_circuit(c, simp, phasepoly)
+        row['gates_after'] = len(c3.gates)
+        row['twoqubit_after'] = c3.twoqubitcount()
+        row['tcount_after'] = c3.tcount()
+        os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+        write_circuit(c3, dest, dtype)
+        row['dest'] = dest
+        row['status'] = 'ok'
+    except _Timeout:
+        row['status'] = 'timeout'
+    except Exception as e:
+        row['status'] = 'error'
+        row['error'] = "{}: {}".format(type(e).__name__, e)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, old_handler)
+    row['time'] = round(time.perf_counter() - start, 3)
+    return row
+
+
+class ResultsFile:
+    """Appends result rows to a CSV or JSON lines file, flushing after every row so
+    that the file is complete up to the last finished circuit."""
+    def __init__(self, fname: str, fmt: str='auto', restart: bool=False) -> None:
+        if fmt == 'auto':
+            fmt = 'json' if os.path.splitext(fname)[1] in ('.json', '.jsonl') else 'csv'
+        self.fmt = fmt
+        self.done: Set[str] = set() if restart else self._read_done(fname)
+        exists = not restart and os.path.exists(fname) and os.path.getsize(fname) > 0
+        if exists:
+            with open(fname, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                missing_newline = f.read(1) != b'\n'
+        self.f = open(fname, 'a' if exists else 'w', newline='')
+        # the last row of a crashed run might be cut off
+        if exists and missing_newline: self.f.write('\n')
+        if fmt == 'csv':
+            self.writer = csv.DictWriter(self.f, fieldnames=result_fields)
+            if not exists: self.writer.writeheader()
+
+    def _read_done(self, fname: str) -> Set[str]:
+        if not os.path.exists(fname): return set()
+        done = set()
+        with open(fname, newline='') as f:
+            if self.fmt == 'csv':
+                for row in csv.DictReader(f):
+                    if row.get('status') and row.get('time'): done.add(row['source'])
+            else:
+                for line in f:
+                    try: done.add(json.loads(line)['source'])
+                    except (ValueError, KeyError): continue
+        return done
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self.fmt == 'csv': self.writer.writerow(row)
+        else: self.f.write(json.dumps(row) + '\n')
+        self.f.flush()
+
+    def close(self) -> None:
+        self.f.close()
+
+
+def run_batch(options: argparse.Namespace) -> None:
+    sources = collect_sources(options.source)
+    dests: Dict[str, str] = {}
+    if options.dest and sources:
+        # keep the directory structure below the common parent of all the sources,
+        # including those already done, so that a resumed batch writes to the same paths
+        common = os.path.commonpath([os.path.dirname(os.path.abspath(s)) for s in sources])
+        for s in sources:
+            rel = os.path.relpath(os.path.abspath(s), common)
+            base, ext = os.path.splitext(rel)
+            if options.outformat != 'match': ext = "." + options.outformat
+            dests[s] = os.path.join(options.dest, base + ext)
+
+    results: Optional[ResultsFile] = None
+    if options.results:
+        results = ResultsFile(options.results, options.resultformat, options.restart)
+        skipped = [s for s in sources if s in results.done]
+        if skipped:
+            print("Skipping {} circuits already in {}".format(len(skipped), options.results))
+            sources = [s for s in sources if s not in results.done]
+    if not sources:
+        print("No circuits to optimise")
+        if results is not None: results.close()
+        return
+
+    def report(i: int, row: Dict[str, Any]) -> None:
+        if results is not None: results.write(row)
+        if row['status'] == 'ok':
+            print("[{}/{}] {}: {} -> {} gates, T-count {} -> {} ({:.2f}s)".format(
+                i, len(sources), row['source'], row['gates_before'], row['gates_after'],
+                row['tcount_before'], row['tcount_after'], row['time']), flush=True)
+        else:
+            print("[{}/{}] {}: {} {}".format(i, len(sources), row['source'], row['status'], row['error']), flush=True)
+
+    jobs = [(s, dests.get(s, ''), options.outformat, options.simp, options.phasepoly, options.timeout)
+            for s in sources]
+    try:
+        if options.jobs <= 1:
+            for i, job in enumerate(jobs):
+                report(i + 1, _optimize_file(*job))
+        else:
+            with ProcessPoolExecutor(max_workers=options.jobs) as pool:
+                futures = [pool.submit(_optimize_file, *job) for job in jobs]
+                for i, fut in enumerate(as_completed(futures)):
+                    report(i + 1, fut.result())
+    finally:
+        if results is not None: results.close()
@@ -51,162 +51,149 @@ from .graph.base import BaseGraph, VT, ET
 
 MatchObject = TypeVar('MatchObject')
 
-class Stats(object):
-    def __init__(self) -> None:
-        self.num_rewrites: Dict[str,int] = {}
-    def count_rewrites(self, rule: str, n: int) -> None:
-        if rule in self.num_rewrites:
-            self.num_rewrites[rule] += n
-        else:
-            self.num_rewrites[rule] = n
-    def __str__(self) -> str:
-        s = "REWRITES\n"
-        nt = 0
-        for r,n in self.num_rewrites.items():
-            nt += n
-            s += "%s %s\n" % (str(n).rjust(6),r)
-        s += "%s TOTAL" % str(nt).rjust(6)
-        return s
-
-pivot_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_pivot, unsafe_pivot)
+pivot_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_pivot, unsafe_pivot, name='pivot_simp')
 """Performs a pivot rewrite. Can be run automatically on the entire graph."""
 
 pivot_gadget_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(
     check_pivot_gadget, unsafe_pivot_gadget,
-    is_ordered=True, simp_override=pivot_gadget_for_simp)
+    is_ordered=True, simp_override=pivot_gadget_for_simp,
+    name='pivot_gadget_simp')
 """Performs pivot rewrite on an interior Pauli vertex and an interior non-Pauli vertex."""
 
 pivot_boundary_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(
     check_pivot_boundary, unsafe_pivot_boundary,
-    is_ordered=True, simp_override=pivot_boundary_for_simp)
+    is_ordered=True, simp_override=pivot_boundary_for_simp,
+    name='pivot_boundary_simp')
 """Performs pivot rewrite on an interior Pauli vertex and a non-Pauli Z-spider with exactly one boundary neighbour."""
 
-lcomp_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_lcomp, unsafe_lcomp)
+lcomp_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_lcomp, unsafe_lcomp, name='lcomp_simp')
 """Performs a local complementation rewrite on a given vertex. Can be run automatically on the entire graph."""
 
-bialg_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_bialgebra, unsafe_bialgebra, check_bialgebra_reduce)
+bialg_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_bialgebra, unsafe_bialgebra, check_bialgebra_reduce, name='bialg_simp')
 """Applies the bialgebra rule to a given pair of spiders (Z-X or X-H). Can be run automatically on the entire graph."""
 
-bialg_op_simp: RewriteSimpGraph = RewriteSimpGraph(safe_apply_bialgebra_op, simp_bialgebra_op)
+bialg_op_simp: RewriteSimpGraph = RewriteSimpGraph(safe_apply_bialgebra_op, simp_bialgebra_op, name='bialg_op_simp')
 """Applies the bialgebra rule in reverse to a given pair of Z and X spiders. Can be run automatically on the entire graph."""
 bialg_op_simp.is_match = is_bialg_op_match # type: ignore
 
-fuse_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_fuse, unsafe_fuse, None, False, True)
+fuse_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_fuse, unsafe_fuse, None, False, True, name='fuse_simp')
 """Performs spider fusion by fusing two matching Z X or w spiders into one. Can be run automatically on the entire graph."""
 
-remove_self_loop_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_self_loop, unsafe_remove_self_loop)
+remove_self_loop_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_self_loop, unsafe_remove_self_loop, name='remove_self_loop_simp')
 """Removes all self loops on a vertex. Can be run automatically."""
 
-def spider_simp(g: BaseGraph[VT,ET]) -> bool:
+def spider_simp(g: BaseGraph[VT,ET], stats: Optional[Stats]=None) -> bool:
     """Performs spider fusion and then removes any self loops"""
-    i = fuse_simp(g)
-    j = remove_self_loop_simp(g)
+    i = fuse_simp(g, stats)
+    j = remove_self_loop_simp(g, stats)
     return i or j
 
 
-id_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_remove_id, unsafe_remove_id, None, True)
+id_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_remove_id, unsafe_remove_id, None, True, name='id_simp')
 """Removes an identity spider. Can be run automatically."""
 
-add_identity_rewrite: RewriteDoubleVertex = RewriteDoubleVertex(check_edge, unsafe_add_Z_identity)
+add_identity_rewrite: RewriteDoubleVertex = RewriteDoubleVertex(check_edge, unsafe_add_Z_identity, name='add_identity_rewrite')
 """Add a Z spider to an edge."""
 
-gadget_simp: RewriteSimpGraph = RewriteSimpGraph(merge_phase_gadgets_for_apply, merge_phase_gadgets_for_simp)
+gadget_simp: RewriteSimpGraph = RewriteSimpGraph(merge_phase_gadgets_for_apply, merge_phase_gadgets_for_simp, name='gadget_simp')
 """Finds and removes phase gadgets that act on the same set of targets. Should only be run on the entire graph."""
 
-supplementarity_simp: RewriteSimpGraph = RewriteSimpGraph(safe_apply_supplementarity, simp_supplementarity)
+supplementarity_simp: RewriteSimpGraph = RewriteSimpGraph(safe_apply_supplementarity, simp_supplementarity, name='supplementarity_simp')
 """Performs a supplementarity rewrite by removing non-Clifford spiders that act on the same set of targets. Should only be run on the entire graph."""
 
-copy_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_copy, unsafe_copy)
+copy_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_copy, unsafe_copy, name='copy_simp')
 """Copies a given vertex through its neighbor. Can be run automatically on the entire graph."""
 
-color_change_rewrite: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_color_change, unsafe_color_change)
+color_change_rewrite: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_color_change, unsafe_color_change, name='color_change_rewrite')
 """Changes the color of a given vertex. CANNOT be run automatically on the entire graph."""
 
-hopf_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_hopf, unsafe_hopf)
+hopf_simp: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_hopf, unsafe_hopf, name='hopf_simp')
 """Removes parallel edges between the given vertices. Can be run automatically on the entire graph."""
 
-z_to_z_box_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_z_to_z_box, unsafe_z_to_z_box)
+z_to_z_box_simp: RewriteSimpSingleVertex = RewriteSimpSingleVertex(check_z_to_z_box, unsafe_z_to_z_box, name='z_to_z_box_simp')
 """Turns a given z-spider into a z-box. Can be run automatically on the entire graph."""
 
-gadget_phasepoly_simp: RewriteSimpGraph = RewriteSimpGraph(gadgets_phasepoly_for_apply, gadgets_phasepoly_for_simp)
+gadget_phasepoly_simp: RewriteSimpGraph = RewriteSimpGraph(gadgets_phasepoly_for_apply, gadgets_phasepoly_for_simp, name='gadget_phasepoly_simp')
 """Applies a rewrite based on rule R_13 of the paper *A Finite Presentation of CNOT-Dihedral Operators*. Should only be run on the entire graph."""
 
-push_pauli_rewrite: RewriteDoubleVertex = RewriteDoubleVertex(check_pauli, unsafe_pauli_push)
+push_pauli_rewrite: RewriteDoubleVertex = RewriteDoubleVertex(check_pauli, unsafe_pauli_push, name='push_pauli_rewrite')
 """Pushes a Pauli (i.e. a pi phase) through another spider. CANNOT be run automatically on the entire graph."""
 
-euler_expansion_rewrite: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_hadamard_edge, unsafe_euler_expansion)
+euler_expansion_rewrite: RewriteSimpDoubleVertex = RewriteSimpDoubleVertex(check_hadamard_edge, unsafe_euler_expansion, name='euler_expansion_rewrite')
 """Expands a given hadamard edge into its euler decomposition. Can be run automatically on the entire graph."""
 
-pi_commute_rewrite: RewriteSingleVertex = RewriteSingleVertex(check_pi_commute, unsafe_pi_commute)
+pi_commute_rewrite: RewriteSingleVertex = RewriteSingleVertex(check_pi_commute, unsafe_pi_commute, name='pi_commute_rewrite')
 """Pushes a pi phase out of the given vertex. CANNOT be run automatically on the entire graph."""
 
-def phase_free_simp(g: BaseGraph[VT,ET]) -> bool:
+def phase_free_simp(g: BaseGraph[VT,ET], stats: Optional[Stats]=None) -> bool:
     '''Performs the following set of simplifications on the graph:
     spider -> bialg'''
-    i1 = spider_simp(g)
-    i2 = bialg_simp(g)
+    i1 = spider_simp(g, stats)
+    i2 = bialg_simp(g, stats)
     return i1 or i2
 
-def basic_simp(g: BaseGraph[VT,ET]) -> bool:
+def basic_simp(g: BaseGraph[VT,ET], stats: Optional[Stats]=None) -> bool:
     """Keeps doing the simplifications ``id_simp`` and ``spider_simp`` until none of them can be applied anymore.
     If starting from a circuit, the result should still have causal flow."""
-    spider_simp(g)
+    spider_simp(g, stats)
     to_gh(g)
     i = 0
     while True:
-        i1 = id_simp(g)
-        i2 = spider_simp(g)
-        i3 = remove_self_loop_simp(g)
+        i1 = id_simp(g, stats)
+        i2 = spider_simp(g, stats)
+        i3 = remove_self_loop_simp(g, stats)
         if not (i1 or i2 or i3): break
         i += 1
     return i != 0
 
-def interior_clifford_simp(g: BaseGraph[VT,ET]) -> bool:
+def interior_clifford_simp(g: BaseGraph[VT,ET], stats: Optional[Stats]=None) -> bool:
     """Keeps doing the simplifications ``id_simp``, ``spider_simp``,
     ``pivot_simp`` and ``lcomp_simp`` until none of them can be applied anymore."""
-    spider_simp(g)
+    spider_simp(g, stats)
     to_gh(g)
     i = 0
     while True:
-        i1 = id_simp(g)
-        i2 = spider_simp(g)
-        i3 = pivot_simp(g)
-        i4 = lcomp_simp(g)
+        i1 = id_simp(g, stats)
+        i2 = spider_simp(g, stats)
+        i3 = pivot_simp(g, stats)
+        i4 = lcomp_simp(g, stats)
         if not (i1 or i2 or i3 or i4): break
         i += 1
     return i != 0
 
 def clifford_simp(g: BaseGraph[VT,ET], matchf: Optional[Callable[[Union[VT, ET]],bool]]=None, quiet:bool=True, stats:Optional[Stats]=None) -> int:
     """Keeps doing rounds of :func:`interior_clifford_simp` and
-    :func:`pivot_boundary_simp` until they can't be applied anymore."""
+    :func:`pivot_boundary_simp` until they can't be applied anymore.
+    If ``stats`` is given, the rewrites that were run are recorded in it."""
     i = False
     while True:
-        i = interior_clifford_simp(g)
-        i2 = pivot_boundary_simp(g)
+        i = interior_clifford_simp(g, stats)
+        i2 = pivot_boundary_simp(g, stats)
         if not i2:
             break
     return i
 
 def reduce_scalar(g: BaseGraph[VT,ET], quiet:bool=True, stats:Optional[Stats]=None) -> int:
     """Modification of ``full_reduce`` that is tailered for scalar ZX-diagrams.
-    It skips the boundary pivots. Input must already be in graph-like form."""
+    It skips the boundary pivots. Input must already be in graph-like form.
+    If ``stats`` is given, the rewrites that were run are recorded in it."""
     i = 0
     while True:
-        i1 = id_simp(g)
-        i2 = spider_simp(g)
-        i3 = remove_self_loop_simp(g)
-        i4 = pivot_simp(g)
-        i5 = lcomp_simp(g)
+        i1 = id_simp(g, stats)
+        i2 = spider_simp(g, stats)
+        i3 = remove_self_loop_simp(g, stats)
+        i4 = pivot_simp(g, stats)
+        i5 = lcomp_simp(g, stats)
         if i1 or i2 or i3 or i4 or i5:
             i += 1
             continue
-        i5 = pivot_gadget_simp(g)
-        i6 = gadget_simp(g)
-        i7 = copy_simp(g)
+        i5 = pivot_gadget_simp(g, stats)
+        i6 = gadget_simp(g, stats)
+        i7 = copy_simp(g, stats)
         if i5 or i6 or i7:
             i += 1
             continue
-        i8 = supplementarity_simp(g)
+        i8 = supplementarity_simp(g, stats)
         if not i8: break
         i += 1
     return i
@@ -214,19 +201,21 @@ def reduce_scalar(g: BaseGraph[VT,ET], quiet:bool=True, stats:Optional[Stats]=No
 
 def full_reduce(g: BaseGraph[VT,ET], matchf: Optional[Callable[[Union[VT, ET]],bool]]=None, quiet:bool=True, stats:Optional[Stats]=None) -> None:
     """The main simplification routine of PyZX. It uses a combination of :func:`clifford_simp` and
-    the gadgetization strategies :func:`pivot_gadget_simp` and :func:`gadget_simp`. It also attempts to run :func:`supplementarity_simp` and :func:`copy_simp`."""
+    the gadgetization strategies :func:`pivot_gadget_simp` and :func:`gadget_simp`. It also attempts to run :func:`supplementarity_simp` and :func:`copy_simp`.
+    If ``stats`` is given, the number of matches, rewrites and the time spent in every rewrite are recorded in it,
+    see :class:`~pyzx.rewrite.Stats`."""
     if any(g.types()[h] == VertexType.H_BOX for h in g.vertices()):
         raise ValueError("Input graph is not a ZX-diagram as it contains an H-box. "
                          "Maybe call pyzx.hsimplify.from_hypergraph_form(g) first?")
-    interior_clifford_simp(g)
-    pivot_gadget_simp(g)
+    interior_clifford_simp(g, stats)
+    pivot_gadget_simp(g, stats)
     while True:
-        clifford_simp(g)
-        i = gadget_simp(g)
-        interior_clifford_simp(g)
-        k = copy_simp(g)
-        l = supplementarity_simp(g)
-        j = pivot_gadget_simp(g)
+        clifford_simp(g, stats=stats)
+        i = gadget_simp(g, stats)
+        interior_clifford_simp(g, stats)
+        k = copy_simp(g, stats)
+        l = supplementarity_simp(g, stats)
+        j = pivot_gadget_simp(g, stats)
         if not (i or j or k or l):
             g.remove_isolated_vertices()
             break
@@ -446,8 +435,8 @@ class Simplifier(Generic[VT, ET]):
             self.simplifygraph.phase_mult[i1] = 1
             if v1 in self.phantom_phases: # Already fused with non-Clifford before
                 v3,i3 = self.phantom_phases[v1]
-                self.mastergraph.phase_index[v3] = i1
-                del self.mastergraph.phase_index[v1]
+                self.mastergraph.set_phase_index(v3, i1)
+                self.mastergraph.remove_phase_index(v1)
                 p1 = self.mastergraph.phase(v3)
                 if phase_is_clifford(p1 + p2):
                     del self.phantom_phases[v1]
@@ -28,9 +28,11 @@ ensure its enum name is included atop simulation/strategies/__init__.py and its
 """
 
 from .decompositions import Decomp, apply_decomp, check_valid, get_alpha, get_decomp_spec
-from .strategies import Strategy, full_decompose, simulate, get_strategy_spec
+from .strategies import Strategy, full_decompose, iter_full_decompose, simulate, get_strategy_spec
 from .decompositions import get_reference as _get_decomp_reference
 from .strategies import get_reference as _get_strategy_reference
+from .common import ScalarSum
+from .parallel import parallel_simulate, split_decompose
 
 def get_reference(kind:Decomp|Strategy) -> str:
     """Returns a string listing any relevant links to publications associated with the specified decomposition or strategy.
@@ -51,8 +53,13 @@ __all__ = [
 
     "Strategy",
     "full_decompose",
+    "iter_full_decompose",
     "simulate",
     "get_strategy_spec",
 
+    "ScalarSum",
+    "parallel_simulate",
+    "split_decompose",
+
     "get_reference"
 ]
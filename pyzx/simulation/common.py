@@ -8,7 +8,7 @@ import math
 sq2 = math.sqrt(2)
 #omega = (1+1j)/sq2
 from fractions import Fraction
-from typing import List, Optional, Dict, Tuple, Any
+from typing import List, Optional, Dict, Tuple, Any, Iterable, Union
 
 import numpy as np
 
@@ -16,6 +16,7 @@ from ..utils import EdgeType, FractionLike, VertexType, toggle_vertex, toggle_ed
 from .. import simplify
 from ..circuit import Circuit
 from ..graph.base import BaseGraph,VT,ET
+from ..graph.scalar import Scalar, ZOmega
 from ..symbolic import Poly
 
 class SumGraph(object):
@@ -78,7 +79,7 @@ class SumGraph(object):
         phases = [Fraction(random.randint(0,3),2) for _ in range(q)]
         connections = [(i1,i2) for i1 in range(q) for i2 in range(i1+1,q) if random.random() > 0.5]
         
-        val: complex = 0
+        val = ScalarSum()
         for g in terms:
             g = g.copy()
             vs = g.outputs()
@@ -94,8 +95,8 @@ class SumGraph(object):
             simplify.full_reduce(g)
             g.remove_isolated_vertices()
             if g.num_vertices() != 0: raise Exception("Diagram wasn't fully reduced")
-            val += g.scalar.to_number()
-        return val
+            val.add(g.scalar)
+        return val.to_number()
 
     def estimate_norm(self, epsilon:float=0.05) -> float:
         """Uses the algorithm of https://arxiv.org/pdf/1808.00128.pdf (p.22)
@@ -191,7 +192,81 @@ class SumGraph(object):
 
             outputs.append(output)
         return outputs
-    
+
+def _compensated_add(total: float, compensation: float, x: float) -> Tuple[float, float]:
+    """One step of Neumaier's variant of Kahan summation.
+    Returns the new running total and the new compensation term."""
+    t = total + x
+    if abs(total) >= abs(x): compensation += (total - t) + x
+    else: compensation += (x - t) + total
+    return t, compensation
+
+class ScalarSum(object):
+    """Running sum of the scalars of a stream of ZX-diagrams, such as the terms of
+    a stabiliser decomposition.
+
+    Scalars that are exactly representable (see :meth:`Scalar.to_exact`) are added
+    exactly in :class:`~pyzx.graph.scalar.ZOmega`. Any other scalar is added as a
+    complex number using compensated (Kahan-Neumaier) summation, so that the rounding
+    error does not grow with the number of terms. Only the scalar of each term is
+    read, so a term can be discarded as soon as it has been added, and the memory
+    used does not depend on the number of terms.
+
+    Example: ``ScalarSum().extend(terms).to_number()``
+    """
+    def __init__(self) -> None:
+        self.exact = ZOmega()
+        self.num_terms = 0
+        self.num_inexact = 0
+        self._real = 0.0
+        self._real_c = 0.0
+        self._imag = 0.0
+        self._imag_c = 0.0
+
+    def add(self, term: Union[BaseGraph, Scalar]) -> None:
+        """Adds the scalar of ``term``, which is either a graph or a :class:`Scalar`."""
+        scalar = term if isinstance(term, Scalar) else term.scalar
+        self.num_terms += 1
+        if scalar.is_zero: return
+        z = scalar.to_exact()
+        if z is not None:
+            self.exact += z
+        else:
+            self.num_inexact += 1
+            self._add_complex(scalar.to_number())
+
+    def extend(self, terms: Iterable[Union[BaseGraph, Scalar]]) -> 'ScalarSum':
+        """Adds the scalars of all the terms in ``terms``, consuming it lazily
+        when it is an iterator. Returns the sum itself, so that calls can be chained."""
+        for term in terms:
+            self.add(term)
+        return self
+
+    def merge(self, other: 'ScalarSum') -> None:
+        """Adds another partial sum to this one, for instance one computed for
+        a different branch of a decomposition."""
+        self.exact += other.exact
+        self.num_terms += other.num_terms
+        self.num_inexact += other.num_inexact
+        self._add_complex(complex(other._real, other._imag))
+        self._add_complex(complex(other._real_c, other._imag_c))
+
+    def _add_complex(self, val: complex) -> None:
+        self._real, self._real_c = _compensated_add(self._real, self._real_c, val.real)
+        self._imag, self._imag_c = _compensated_add(self._imag, self._imag_c, val.imag)
+
+    def to_exact(self) -> Optional[ZOmega]:
+        """Returns the sum as an element of :class:`~pyzx.graph.scalar.ZOmega`,
+        or ``None`` if some term could not be added exactly."""
+        if self.num_inexact: return None
+        return self.exact
+
+    def to_number(self) -> complex:
+        val = self.exact.to_number()
+        if self.num_inexact:
+            val += complex(self._real + self._real_c, self._imag + self._imag_c)
+        return val
+
 def calculate_path_sum(g: BaseGraph[VT,ET]) -> complex:
     """Input should be a fully reduced scalar graph-like Clifford+T ZX-diagram.
     Calculates the scalar it represents."""
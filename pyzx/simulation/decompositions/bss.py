@@ -4,18 +4,24 @@ The Bravyi-Smith-Smolin decomposition introduced in https://arxiv.org/abs/1506.0
 
 from . import Decomp, register_decomp, register_validity_checker
 from ...graph.base import BaseGraph,VT,ET
-from ..common import SumGraph, sq2
+from ..common import SumGraph
+from ...graph.scalar import ZOmega
 from ...utils import VertexType, EdgeType
 from typing import List
 from fractions import Fraction
 
-MAGIC_GLOBAL = -(7+5*sq2)/(2+2j)
-MAGIC_B60 = -16 + 12*sq2
-MAGIC_B66 = 96 - 68*sq2
-MAGIC_E6 = 10 - 7*sq2
-MAGIC_O6 = -14 + 10*sq2
-MAGIC_K6 = 7 - 5*sq2
-MAGIC_PHI = 10 - 7*sq2
+def _a_plus_b_sqrt2(a: int, b: int) -> ZOmega:
+    # sqrt(2) = w - w^3
+    return ZOmega(a, b, 0, -b)
+
+# -(7+5*sqrt(2))/(2+2j), where 1/(2+2j) = w^7/sqrt(2)^3
+MAGIC_GLOBAL = -_a_plus_b_sqrt2(7, 5) * ZOmega.omega_power(7) * ZOmega(1, k=-3)
+MAGIC_B60 = _a_plus_b_sqrt2(-16, 12)
+MAGIC_B66 = _a_plus_b_sqrt2(96, -68)
+MAGIC_E6 = _a_plus_b_sqrt2(10, -7)
+MAGIC_O6 = _a_plus_b_sqrt2(-14, 10)
+MAGIC_K6 = _a_plus_b_sqrt2(7, -5)
+MAGIC_PHI = _a_plus_b_sqrt2(10, -7)
 
 @register_decomp(
     Decomp.BSS,
@@ -33,7 +39,7 @@ def decompose(g:BaseGraph[VT,ET], verts:List[VT]) -> SumGraph:
 
     for func in replace_functions:
         h = func(g.clone(), verts)
-        h.scalar.add_float(MAGIC_GLOBAL)
+        h.scalar.multiply_exact(MAGIC_GLOBAL)
         graphs.append(h)
 
     return SumGraph(graphs)
@@ -46,14 +52,14 @@ def check_valid(g:BaseGraph[VT,ET], verts:List[VT]) -> bool:
     return True
 
 def replace_B60(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
-    g.scalar.add_float(MAGIC_B60)
+    g.scalar.multiply_exact(MAGIC_B60)
     g.scalar.add_power(-6)
     for v in verts:
         g.add_to_phase(v,Fraction(-1,4))
     return g
 
 def replace_B66(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
-    g.scalar.add_float(MAGIC_B66)
+    g.scalar.multiply_exact(MAGIC_B66)
     g.scalar.add_power(-6)
     g.scalar.add_phase(Fraction(1))
     for v in verts:
@@ -62,7 +68,7 @@ def replace_B66(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
     return g
 
 def replace_E6(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
-    g.scalar.add_float(MAGIC_E6)
+    g.scalar.multiply_exact(MAGIC_E6)
     g.scalar.add_power(4)
     g.scalar.add_phase(Fraction(1,2))
     av = 0.0
@@ -75,7 +81,7 @@ def replace_E6(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
     return g
 
 def replace_O6(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
-    g.scalar.add_float(MAGIC_O6)
+    g.scalar.multiply_exact(MAGIC_O6)
     g.scalar.add_power(4)
     g.scalar.add_phase(Fraction(1,2))
     av = 0.0
@@ -88,7 +94,7 @@ def replace_O6(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
     return g
 
 def replace_K6(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
-    g.scalar.add_float(MAGIC_K6)
+    g.scalar.multiply_exact(MAGIC_K6)
     g.scalar.add_power(5)
     g.scalar.add_phase(Fraction(1,4))
     av = 0.0
@@ -100,7 +106,7 @@ def replace_K6(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
     return g
 
 def replace_phi1(g: BaseGraph[VT,ET], verts: List[VT]) -> BaseGraph[VT,ET]:
-    g.scalar.add_float(MAGIC_PHI)
+    g.scalar.multiply_exact(MAGIC_PHI)
     g.scalar.add_power(9)
     g.scalar.add_phase(Fraction(3,2))
     w6 = g.add_vertex(VertexType.Z,-1, g.row(verts[5])+0.5, Fraction(1))
@@ -0,0 +1,95 @@
+"""
+Runs a decomposition strategy on several processes. The decomposition tree is expanded up to a fixed depth in the calling
+process, and each of the resulting subgraphs is then decomposed and summed independently by a pool of worker processes.
+"""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..graph.base import BaseGraph,VT,ET
+from ..simplify import tcount
+from .common import ScalarSum
+from .strategies import Strategy, get_strategy_spec, iter_full_decompose
+
+def split_decompose(kind:Strategy, g:BaseGraph[VT,ET], depth:int) -> List[BaseGraph[VT,ET]]:
+    """Applies ``depth`` levels of the decomposition strategy ``kind`` to ``g``.
+
+    Returns a list of fully reduced graphs, whose sum is equivalent to g. Graphs which no longer contain T-spiders
+    are kept as they are. The strategy must have been registered with a ``step`` function (see register_strategy)."""
+    if isinstance(kind, str):
+        kind = Strategy(kind)
+    step = get_strategy_spec(kind).step
+    if step is None:
+        raise ValueError(f"Decomposition strategy {kind} can not be split, as it has no step function registered.")
+    frontier = [g]
+    for _ in range(depth):
+        next_frontier = []
+        for h in frontier:
+            if tcount(h) == 0:
+                next_frontier.append(h)
+                continue
+            gsum = step(h)
+            gsum.full_reduce()
+            next_frontier.extend(gsum.graphs)
+        frontier = next_frontier
+    return frontier
+
+def _simulate_json(kind:str, js:str, seed:int, args:Tuple[Any,...], kwargs:Dict[str,Any]) -> ScalarSum:
+    """Decomposes a serialised graph with the random module seeded with ``seed``. Runs in the worker processes."""
+    g = BaseGraph.from_json(js)
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        return ScalarSum().extend(iter_full_decompose(Strategy(kind), g, *args, **kwargs))
+    finally:
+        random.setstate(state)
+
+def parallel_simulate(kind:Strategy, g:BaseGraph[VT,ET], *args,
+        depth:int=2, max_workers:Optional[int]=None, seed:Optional[int]=None, **kwargs) -> complex:
+    """Parallel version of :func:`~pyzx.simulation.simulate`.
+
+    The first ``depth`` levels of the decomposition are applied in this process (see :func:`split_decompose`). The
+    resulting subgraphs are serialised to JSON, and decomposed and summed by a ``ProcessPoolExecutor``. As each worker
+    returns its partial sum as a ScalarSum, the result is exact whenever all the terms are Clifford+T.
+
+    The random choices made by the strategy are deterministic: every subgraph is decomposed with its own seed, drawn
+    from a generator seeded with ``seed``, or from the random module when seed is None (so that ``random.seed`` also
+    fixes the result). Hence the result does not depend on ``max_workers`` or on the order in which the workers finish.
+
+    Args:
+        kind: The decomposition strategy to use, e.g. Strategy.BSS.
+        g: The graph to decompose.
+        *args, **kwargs: Potential additional decomposition-specific arguments
+        depth: The number of levels of the decomposition tree to expand before distributing the subgraphs.
+        max_workers: The number of worker processes, which defaults to the number of processors.
+            With ``max_workers=1`` the subgraphs are decomposed in this process, without starting a pool.
+        seed: Seed for the random choices of the strategy.
+
+    Returns:
+        A complex scalar equal to the probability amplitude of the graph g.
+    """
+    if isinstance(kind, str):
+        kind = Strategy(kind)
+    rng = random.Random(seed if seed is not None else random.getrandbits(64))
+    state = random.getstate()
+    random.seed(rng.getrandbits(64))
+    try:
+        subgraphs = split_decompose(kind, g, depth)
+    finally:
+        random.setstate(state)
+    total = ScalarSum()
+    tasks = []
+    for h in subgraphs:
+        if tcount(h) == 0: total.add(h)
+        else: tasks.append((kind.value, h.to_json(), rng.getrandbits(64), args, kwargs))
+    del subgraphs
+
+    if max_workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            total.merge(_simulate_json(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for partial in executor.map(_simulate_json, *zip(*tasks)):
+                total.merge(partial)
+    return total.to_number()
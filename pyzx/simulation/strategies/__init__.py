@@ -4,8 +4,10 @@ a new decomposition strategy.
 """
 
 from enum import Enum
-from typing import Callable, List
+from typing import Callable, Iterator, List
 from ...graph.base import BaseGraph,VT,ET
+from ..common import ScalarSum, SumGraph
+from ...simplify import tcount
 
 class Strategy(Enum):
     BSS        = "bss"
@@ -13,9 +15,10 @@ class Strategy(Enum):
     MAGIC_CAT  = "magic_cat"
 
 class StrategySpec:
-    def __init__(self, fn:Callable|None=None, reference:str="") -> None:
+    def __init__(self, fn:Callable|None=None, reference:str="", step:Callable|None=None) -> None:
         self.fn = fn
         self.reference = reference
+        self.step = step
 
 _REGISTRY: dict[Strategy,StrategySpec] = {} # this stores all the loaded decomposition strategies, indexable by their enum names
 
@@ -30,8 +33,8 @@ def simulate(kind:Strategy, g:BaseGraph[VT,ET], *args, **kwargs) -> complex:
     Returns:
         A complex scalar equal to the probability amplitude of the graph g.
     """
-    terms = full_decompose(kind, g, *args, **kwargs)
-    return sum(g.scalar.to_number() for g in terms) # todo - avoid using .to_number() here; also, use a JAX parallel summation perhaps?
+    # the terms are produced lazily, so each graph is freed as soon as its scalar has been added
+    return ScalarSum().extend(iter_full_decompose(kind, g, *args, **kwargs)).to_number()
 
 def full_decompose(kind:Strategy, g:BaseGraph[VT,ET], *args, **kwargs) -> List[BaseGraph[VT,ET]]: # todo - perhaps beter to return as a SumGraph?
     """Fully decomposes a given graph based on the specified decomposition strategy
@@ -44,15 +47,53 @@ def full_decompose(kind:Strategy, g:BaseGraph[VT,ET], *args, **kwargs) -> List[B
     Returns:
         A list of empty scalar graphs whose sum is equivalent to the original graph g.
     """
+    return list(iter_full_decompose(kind, g, *args, **kwargs))
+
+def iter_full_decompose(kind:Strategy, g:BaseGraph[VT,ET], *args, **kwargs) -> Iterator[BaseGraph[VT,ET]]:
+    """Lazy version of :func:`full_decompose`, which produces the terms one at a time.
+
+    The built-in strategies walk the decomposition tree depth-first (see :func:`depth_first_decompose`),
+    so only the graphs on the current branch are kept in memory, rather than every term of the decomposition.
+    The terms are produced in the same order as in the list returned by :func:`full_decompose`.
+
+    Args:
+        kind: The decomposition strategy to use, e.g. Strategy.BSS.
+        g: The graph to decompose.
+        *args, **kwargs: Potential additional decomposition-specific arguments
+
+    Returns:
+        An iterator over empty scalar graphs whose sum is equivalent to the original graph g.
+    """
     if isinstance(kind, str):
         kind = Strategy(kind)
     
     strat_fn = get_strategy(kind)
     if (strat_fn is None):
         raise RuntimeError(f"Decomposition strategy {kind} is not properly registered.")
-    return strat_fn(g, *args, **kwargs)
+    return iter(strat_fn(g, *args, **kwargs))
+
+def depth_first_decompose(g:BaseGraph[VT,ET], step:Callable[[BaseGraph[VT,ET]],SumGraph]) -> Iterator[BaseGraph[VT,ET]]:
+    """Repeatedly decomposes a graph, yielding the terms without T-spiders in depth-first order.
 
-def register_strategy(kind:Strategy, reference:str="") -> Callable:
+    ``step`` should replace some of the non-Clifford spiders of a graph by a sum of graphs. Every term it returns is
+    fully reduced, terms with a zero scalar are dropped, and the rest are decomposed further, before moving on to the
+    next term. Graphs are only referenced from an explicit stack, so a graph is freed once it has been decomposed,
+    and at most a few terms per level of the decomposition tree are held in memory at once.
+    """
+    stack = [g]
+    del g
+    while stack:
+        h = stack.pop()
+        if tcount(h) == 0:
+            yield h
+            continue
+        gsum = step(h)
+        del h
+        gsum.full_reduce()
+        stack.extend(reversed(gsum.graphs))
+        del gsum
+
+def register_strategy(kind:Strategy, reference:str="", step:Callable|None=None) -> Callable:
     """Registers a decomposition strategy.
 
     This decorator associates a decomposition strategy function with a ``Decomp``
@@ -61,19 +102,22 @@ def register_strategy(kind:Strategy, reference:str="") -> Callable:
     When creating a new decomposition strategy (e.g. MY_STRAT) as an e.g. my_strat.py file the simulation/decompositions folder,
     one should include @register_strategy(Strategy.MY_STRAT,...) immediately before defining the function that executes the
     strategy so that this function may be called via simulation.full_decompose(Strategy.MY_STRAT,g,...) and - to also sum the
-    resulting scalars - via simulation.simulate(Strategy.MY_STRAT,g,...).
+    resulting scalars - via simulation.simulate(Strategy.MY_STRAT,g,...). The function may return a list of terms, or, to
+    keep memory use down, produce them lazily as a generator (e.g. via depth_first_decompose).
 
     See simulation.strategies.cut_random.py for a minimal example.
 
     Args:
         kind: The enum entry of the decomposition strategy being registered.
         reference: Optional literature reference or citation associated with the decomposition strategy.
+        step: Optional function applying a single level of the decomposition to a graph and returning a SumGraph, as
+            passed to depth_first_decompose. It allows simulation.parallel_simulate to split the decomposition tree.
 
     Returns:
         A decorator which registers the decorated decomposition strategy function.
     """
     def decorator(fn):
-        _REGISTRY[kind] = StrategySpec(fn,reference)
+        _REGISTRY[kind] = StrategySpec(fn,reference,step)
         return fn
     return decorator
 
@@ -6,27 +6,24 @@ vertex cutting decomposition as a fallback.
 
 import random
 from ..decompositions import Decomp, apply_decomp
-from . import Strategy, register_strategy
+from . import Strategy, register_strategy, depth_first_decompose
 from ...graph.base import BaseGraph,VT,ET
 from ..common import SumGraph
 from ...utils import VertexType
-from ...simplify import tcount
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 @register_strategy(
     Strategy.BSS,
-    reference="https://arxiv.org/abs/2109.01076"
+    reference="https://arxiv.org/abs/2109.01076",
+    step=lambda h: replace_magic_states(h, True)
 )
-def decompose(g:BaseGraph[VT,ET]) -> List[BaseGraph[VT,ET]]: #todo - return a SumGraph rather than a List
+def iter_decompose(g:BaseGraph[VT,ET]) -> Iterator[BaseGraph[VT,ET]]:
     """Apply the Kissinger and van de Wetering (2021) decomposition strategy based on BSS with a Magic2 and vertex cutting fallback when T-count < 6."""
-    if tcount(g) == 0: return [g]
-    gsum = replace_magic_states(g, True)
-    gsum.full_reduce()
-    output = []
-    for h in gsum.graphs:
-        if h.scalar.is_zero: continue
-        output.extend(decompose(h))
-    return output
+    return depth_first_decompose(g, lambda h: replace_magic_states(h, True))
+
+def decompose(g:BaseGraph[VT,ET]) -> List[BaseGraph[VT,ET]]: #todo - return a SumGraph rather than a List
+    """Returns all the terms produced by :func:`iter_decompose` as a list."""
+    return list(iter_decompose(g))
 
 def replace_magic_states(g: BaseGraph[VT,ET], pick_random:Any=False) -> SumGraph:
     """This function takes in a ZX-diagram in graph-like form 
@@ -4,25 +4,22 @@ Recursively cut random spiders and simplify the resulting graphs until every ter
 
 import random
 from ..decompositions import Decomp, apply_decomp
-from . import Strategy, register_strategy
+from . import Strategy, register_strategy, depth_first_decompose
 from ...graph.base import BaseGraph,VT,ET
 from ..common import SumGraph
-from ...simplify import tcount
-from typing import List
+from typing import Iterator, List
 
 @register_strategy(
     Strategy.CUT_RANDOM,
-    reference=""
+    reference="",
+    step=lambda h: cut_random_spider(h)
 )
+def iter_decompose(g:BaseGraph[VT,ET]) -> Iterator[BaseGraph[VT,ET]]:
+    return depth_first_decompose(g, cut_random_spider)
+
 def decompose(g:BaseGraph[VT,ET]) -> List[BaseGraph[VT,ET]]: #todo - return a SumGraph rather than a List
-    if tcount(g) == 0: return [g]
-    gsum = cut_random_spider(g)
-    gsum.full_reduce()
-    output = []
-    for h in gsum.graphs:
-        if h.scalar.is_zero: continue
-        output.extend(decompose(h))
-    return output
+    """Returns all the terms produced by :func:`iter_decompose` as a list."""
+    return list(iter_decompose(g))
 
 def cut_random_spider(g:BaseGraph[VT,ET]) -> SumGraph:
     v = random.choice(list(g.vertices()))
@@ -4,25 +4,23 @@ Apply available cat decompositions (cat3 to cat6) in order of ascending alpha, w
 
 import random
 from ..decompositions import Decomp, apply_decomp
-from . import Strategy, register_strategy
+from . import Strategy, register_strategy, depth_first_decompose
 from ...graph.base import BaseGraph,VT,ET
 from ..common import SumGraph
 from ...simplify import tcount
-from typing import List
+from typing import Iterator, List
 
 @register_strategy(
     Strategy.MAGIC_CAT,
-    reference="https://arxiv.org/pdf/2202.09202"
+    reference="https://arxiv.org/pdf/2202.09202",
+    step=lambda h: replace_states(h)
 )
+def iter_decompose(g:BaseGraph[VT,ET]) -> Iterator[BaseGraph[VT,ET]]:
+    return depth_first_decompose(g, replace_states)
+
 def decompose(g:BaseGraph[VT,ET]) -> List[BaseGraph[VT,ET]]: #todo - return a SumGraph rather than a List
-    if tcount(g) == 0: return [g]
-    gsum = replace_states(g)
-    gsum.full_reduce()
-    output = []
-    for h in gsum.graphs:
-        if h.scalar.is_zero: continue
-        output.extend(decompose(h))
-    return output
+    """Returns all the terms produced by :func:`iter_decompose` as a list."""
+    return list(iter_decompose(g))
 
 def replace_states(g:BaseGraph[VT,ET]) -> SumGraph:
     """Find and apply decomposition in this order of preference: cat4, cat6, cat5, cat3, magic5."""
@@ -21,6 +21,7 @@ and Poly is a sum of terms.
 Lark is used to define a parser that can translate a string into a Poly.
 """
 
+import functools
 from typing import Any, Callable, Mapping, Union, Optional, Dict, List, Tuple, Set
 from lark import Lark, Transformer, Tree
 from lark.exceptions import UnexpectedToken, VisitError
@@ -415,7 +416,7 @@ def new_const(coeff: Union[int, Fraction]) -> Poly:
     return Poly([(coeff, Term([]))])
 
 
-poly_grammar = Lark("""
+_poly_grammar_source = """
     start      : expr
     phase_list : "(" expr ("," expr)* ")"
     ?expr      : expr "+" term   -> add
@@ -442,11 +443,21 @@ poly_grammar = Lark("""
     %import common.CNAME
     %import common.WS
     %ignore WS
-    """,
-    parser='lalr',
-    start=['start', 'phase_list'],
-    maybe_placeholders=True,
-    propagate_positions=True)
+    """
+
+@functools.lru_cache(maxsize=None)
+def _poly_grammar() -> Lark:
+    # Building the parser takes a noticeable part of ``import pyzx``, so it is
+    # only done when a phase expression is first parsed.
+    return Lark(_poly_grammar_source,
+        parser='lalr',
+        start=['start', 'phase_list'],
+        maybe_placeholders=True,
+        propagate_positions=True)
+
+def __getattr__(name: str) -> Any:
+    if name == 'poly_grammar': return _poly_grammar()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 class PolyTransformer(Transformer):
     """Lark transformer that builds :class:`Poly` instances from parse trees.
@@ -521,7 +532,7 @@ def parse(expr: str, new_var: Callable[[str], Poly]) -> Poly:
     It converts the string expression into a polynomial.
     Example: parse("x^2 + 3*y + 1/2", new_var) returns Poly([(1, Term([(x,2)])), (3, Term([(y,1)])), (1/2, Term([]))])
     """
-    tree = poly_grammar.parse(expr, start='start')
+    tree = _poly_grammar().parse(expr, start='start')
     for subtree in tree.iter_subtrees_topdown():
         if subtree.data != "div_factor":
             continue
@@ -548,12 +559,12 @@ def parse_phase_list(text: str) -> Tuple[List[str], int]:
     the closing ``)``.
     """
     try:
-        tree = poly_grammar.parse(text, start='phase_list')
+        tree = _poly_grammar().parse(text, start='phase_list')
     except UnexpectedToken as exc:
         # ``pos_in_stream`` marks the first token past the phase list; re-parse the prefix.
         if exc.pos_in_stream is None:
             raise
-        tree = poly_grammar.parse(text[:exc.pos_in_stream], start='phase_list')
+        tree = _poly_grammar().parse(text[:exc.pos_in_stream], start='phase_list')
     args = [text[c.meta.start_pos:c.meta.end_pos].strip()
             for c in tree.children if isinstance(c, Tree)]
     return args, tree.meta.end_pos
@@ -21,14 +21,19 @@ Due to the way the tensor is calculated it can only handle
 circuits of small size before running out of memory on a regular machine.
 Currently, it can reliably transform 9 qubit circuits into tensors.
 If the ZX-diagram is not circuit-like, but instead has nodes with high degree,
-it will run out of memory even sooner."""
+it will run out of memory even sooner.
+For larger diagrams, the 'greedy' strategy of :func:`tensorfy` sums out the spiders
+in an order that keeps the intermediate tensors small, can refuse diagrams that
+would need more than a given amount of memory, and can write the result to disk."""
 
 __all__ = ['tensorfy', 'compare_tensors', 'compose_tensors',
             'adjoint', 'is_unitary','tensor_to_matrix',
             'find_scalar_correction']
 
+import heapq
 import itertools
-from math import pi, sqrt
+import random
+from math import pi, sqrt, log, log2, frexp
 
 from typing import Optional
 
@@ -39,7 +44,7 @@ import numpy as np
 np.set_printoptions(suppress=True)
 
 # typing imports
-from typing import TYPE_CHECKING, List, Dict, Union
+from typing import TYPE_CHECKING, List, Dict, Set, Tuple, Union
 from numpy.typing import NDArray
 from .utils import FractionLike, FloatInt, VertexType, EdgeType, get_z_box_label
 if TYPE_CHECKING:
@@ -104,13 +109,18 @@ def pop_and_shift(verts, indices):
 def tensorfy(g: 'BaseGraph[VT,ET]',
              preserve_scalar: bool = True,
              strategy: str = 'auto',
-             verbose: bool = False) -> NDArray[np.complex128]:
+             verbose: bool = False,
+             memory_limit: Optional[int] = None,
+             out: Optional[str] = None) -> NDArray[np.complex128]:
     """
     Returns a multidimensional numpy array representing the linear map the ZX diagram implements.
     Available simulation strategies are:
 
-    - 'auto': for regular ZX-diagrams use 'rw-auto', otherwise revert to 'naive'
+    - 'auto': for regular ZX-diagrams use 'rw-auto', otherwise revert to 'naive'.
+      If ``memory_limit`` or ``out`` is given, use 'greedy'.
     - 'naive': statevector-like simulation
+    - 'greedy': sums out one spider at a time, in a greedily chosen order that keeps the intermediate tensors small,
+      see :func:`tensorfy_greedy`
     - 'rw-auto': choose the best of 'rw-greedy-b2t' and 'rw-greedy-linear'
     - 'rw-greedy-b2t': rank-width-based contraction routine with greedy bottom-to-top decomposition heuristic
     - 'rw-greedy-linear': rank-width-based contraction routine with greedy linear-decomposition heuristic
@@ -120,12 +130,18 @@ def tensorfy(g: 'BaseGraph[VT,ET]',
         preserve_scalar: whether to account for the diagram scalar
         strategy: which simulation strategy to use
         verbose: print additional info
+        memory_limit: the number of bytes the 'greedy' strategy may use, it raises a ``MemoryError`` if it would need more
+        out: path of a ``.npy`` file the 'greedy' strategy writes the tensor to through a ``numpy.memmap``
 
     Returns:
         Numpy tensor having (num_inputs + num_outputs) dimensions (output dimensions first)
     """
     if g.is_hybrid():
         raise ValueError("Hybrid graphs are not supported.")
+    if memory_limit is not None or out is not None:
+        if strategy == 'auto': strategy = 'greedy'
+        elif strategy != 'greedy':
+            raise ValueError("memory_limit and out are only supported by the 'greedy' strategy")
     if strategy == 'auto':
         from .graph.multigraph import Multigraph
         if any(g.type(v) == VertexType.H_BOX for v in g.vertices()):
@@ -136,6 +152,8 @@ def tensorfy(g: 'BaseGraph[VT,ET]',
             strategy = 'rw-auto'
     if strategy == 'naive':
         return tensorfy_naive(g, preserve_scalar=preserve_scalar)
+    elif strategy == 'greedy':
+        return tensorfy_greedy(g, preserve_scalar=preserve_scalar, memory_limit=memory_limit, out=out, verbose=verbose)
     elif strategy.startswith('rw-'):
         from .rank_width import tensorfy_rw
         return tensorfy_rw(g, strategy=strategy, preserve_scalar=preserve_scalar, verbose=verbose)
@@ -250,6 +268,295 @@ def tensorfy_naive(g: 'BaseGraph[VT,ET]', preserve_scalar: bool = True) -> NDArr
     if preserve_scalar: tensor *= g.scalar.to_number()
     return tensor
 
+def _factor_graph(g: 'BaseGraph[VT,ET]') -> Tuple[List[Tuple[np.ndarray, List[int]]], List[int], int]:
+    """Writes the diagram ``g`` as a sum over the values of a set of boolean variables of a product of factors.
+
+    Every Z-spider, X-spider and Z-box gets a single variable, since its tensor is diagonal up to Hadamards
+    on its legs. Spiders connected by an edge without a Hadamard (counting an X-spider as a Z-spider with
+    Hadamards on all its legs) share the same variable, and otherwise their variables are connected by
+    an (unnormalised) Hadamard factor. The other vertices get a variable per leg and their dense tensor as factor.
+
+    Returns the factors, each with the list of its variables, the variables of the outputs followed by the inputs,
+    and the number of Hadamard factors, each of which misses a factor of ``1/sqrt(2)``."""
+    inputs = g.inputs()
+    outputs = g.outputs()
+    if not inputs and not outputs:
+        if any(g.type(v)==VertexType.BOUNDARY for v in g.vertices()):
+            raise ValueError("Diagram contains BOUNDARY-type vertices, but has no inputs or outputs set. Perhaps call g.auto_detect_io() first?")
+    counter = itertools.count()
+    parent: Dict[int, int] = {}
+    def find(x: int) -> int:
+        while parent.get(x, x) != x:
+            parent[x] = parent.get(parent[x], parent[x])
+            x = parent[x]
+        return x
+
+    diagonal = (VertexType.Z, VertexType.X, VertexType.Z_BOX)
+    types = g.types()
+    var: Dict['VT', int] = {v: next(counter) for v in g.vertices() if types[v] in diagonal}
+    legs: Dict['VT', List[int]] = {v: [] for v in g.vertices() if types[v] not in diagonal}
+    def end(v: 'VT') -> Tuple[int, int]:
+        if v in var: return var[v], int(types[v] == VertexType.X)
+        legs[v].append(next(counter))
+        return legs[v][-1], 0
+
+    had = np.array([[1,1],[1,-1]], dtype=complex)
+    id2 = np.identity(2, dtype=complex)
+    factors: List[Tuple[np.ndarray, List[int]]] = []
+    for e in g.edges():
+        s, t = g.edge_st(e)
+        et = g.edge_type(e)
+        if types[s] == VertexType.DUMMY or types[t] == VertexType.DUMMY: continue
+        if s == t and et != EdgeType.HADAMARD and et != EdgeType.SIMPLE:
+            raise NotImplementedError(f"Tensor contraction with {repr(e)} self-loops is not implemented.")
+        x, px = end(s)
+        y, py = end(t)
+        if (px + py + (et == EdgeType.HADAMARD)) % 2:
+            factors.append((had, [x, y]))
+        else:
+            parent[find(x)] = find(y)
+    hadamards = len(factors)
+
+    open_var: Dict['VT', int] = {}
+    for v in itertools.chain(inputs, outputs):
+        if types[v] != VertexType.BOUNDARY: raise ValueError("Wrong type for input or output:", v, types[v])
+        if len(legs[v]) != 1: raise ValueError("Boundary vertex %s should have exactly one edge" % str(v))
+        open_var[v] = next(counter)
+        factors.append((id2, [open_var[v], legs[v][0]]))
+    for v in g.vertices():
+        ty = types[v]
+        if v in open_var or ty == VertexType.DUMMY: continue
+        p = g.phase(v)
+        if isinstance(p, Poly):
+            raise ValueError(f"Can't convert diagram with parameters to tensor: {str(p)}")
+        phase = pi*p
+        if ty == VertexType.Z or ty == VertexType.X:
+            factors.append((np.array([1, np.exp(1j*phase)]), [var[v]]))
+        elif ty == VertexType.Z_BOX:
+            if phase != 0: raise ValueError("Phase on Z box")
+            label = get_z_box_label(g, v)
+            if isinstance(label, Poly):
+                raise ValueError(f"Can't convert diagram with parameters to tensor: {str(label)}")
+            factors.append((np.array([1, label], dtype=complex), [var[v]]))
+        elif ty == VertexType.H_BOX:
+            h_label = g.vdata(v, 'label', None)
+            if h_label is not None:
+                factors.append((H_to_tensor(len(legs[v]), 0, label=complex(h_label)), legs[v]))
+            else:
+                factors.append((H_to_tensor(len(legs[v]), phase), legs[v]))
+        elif ty == VertexType.W_INPUT or ty == VertexType.W_OUTPUT:
+            if phase != 0: raise ValueError("Phase on W node")
+            factors.append((W_to_tensor(len(legs[v])), legs[v]))
+        else:
+            raise ValueError("Vertex %s has non-ZXH type but is not an input or output" % str(v))
+
+    result = []
+    for t, vs in factors:
+        vs = [find(x) for x in vs]
+        if len(set(vs)) < len(vs):
+            # A variable that occurs twice, e.g. because of a self-loop: take the diagonal
+            labels = {x: i for i, x in enumerate(dict.fromkeys(vs))}
+            t = np.einsum(t, [labels[x] for x in vs], list(labels.values()))
+            vs = list(labels)
+        result.append((t, vs))
+    return result, [open_var[v] for v in itertools.chain(outputs, inputs)], hadamards
+
+def elimination_order(factors: List[List[int]], keep: Set[int],
+                      rng: Optional[random.Random] = None, temperature: float = 0.3
+                      ) -> Tuple[List[Tuple[int, List[int], List[int]]], List[int], int]:
+    """Greedily chooses an order in which to sum out the variables of a product of factors.
+
+    Every variable that is not in ``keep`` is summed out, by replacing all the factors that contain it
+    by a single new factor on their other variables. At every step the variable is chosen for which the
+    new factor is smallest compared to the factors it replaces, a variant of the minimum-degree heuristic
+    for the treewidth of the graph connecting variables that share a factor. If ``rng`` is given, the costs
+    are perturbed by random noise scaled by ``temperature``, so that repeated calls try different orders.
+
+    Returns the list of steps, each consisting of the eliminated variable, the factors it was in
+    and the variables of the new factor (which gets number ``len(factors)+k`` in step ``k``),
+    the factors left at the end, and the largest number of entries of new factors held in memory at once."""
+    factor_vars = [set(vs) for vs in factors]
+    var_factors: Dict[int, Set[int]] = {}
+    for f, vs in enumerate(factor_vars):
+        for x in vs: var_factors.setdefault(x, set()).add(f)
+    alive = set(range(len(factors)))
+
+    def cost(x: int) -> float:
+        new = len(set().union(*(factor_vars[f] for f in var_factors[x]))) - 1
+        return new - log2(sum(2**len(factor_vars[f]) for f in var_factors[x]))
+    def entry(x: int) -> Tuple[float, float, int]:
+        c = cost(x)
+        noise = -temperature*log(-log(rng.random())) if rng is not None else 0
+        return (c + noise, c, x)
+    heap = [entry(x) for x in var_factors if x not in keep]
+    heapq.heapify(heap)
+    done: Set[int] = set()
+    steps: List[Tuple[int, List[int], List[int]]] = []
+    live = 0
+    peak = 0
+    while heap:
+        _, c, x = heapq.heappop(heap)
+        if x in done: continue
+        if c != cost(x):
+            heapq.heappush(heap, entry(x))
+            continue
+        done.add(x)
+        bucket = sorted(var_factors.pop(x))
+        vs = set().union(*(factor_vars[f] for f in bucket)) - {x}
+        new = len(factor_vars)
+        factor_vars.append(vs)
+        live += 2**len(vs)
+        peak = max(peak, live)
+        for f in bucket:
+            if f >= len(factors): live -= 2**len(factor_vars[f])
+        alive.difference_update(bucket)
+        alive.add(new)
+        for y in vs:
+            var_factors[y].difference_update(bucket)
+            var_factors[y].add(new)
+            if y not in keep: heapq.heappush(heap, entry(y))
+        steps.append((x, bucket, sorted(vs)))
+    return steps, sorted(alive), peak
+
+def _einsum(operands: List[Tuple[np.ndarray, List[int]]], result: List[int], out: Optional[np.ndarray] = None) -> np.ndarray:
+    labels: Dict[int, int] = {}
+    args: List[object] = []
+    for t, vs in operands:
+        args.append(t)
+        args.append([labels.setdefault(x, len(labels)) for x in vs])
+    args.append([labels.setdefault(x, len(labels)) for x in result])
+    return np.einsum(*args, out=out)  # type: ignore
+
+def _normalise(t: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Divides ``t`` in place by the power of 2 that brings its largest entry in [0.5, 1),
+    and returns it with the exponent of that power. A NumPy scalar, as returned by ``np.einsum``
+    for a 0-d result, is first turned into an array."""
+    t = np.asarray(t)
+    m = np.abs(t).max() if t.size else 0
+    if not m or not np.isfinite(m): return t, 0
+    e = frexp(m)[1]
+    t *= 2.0**-e
+    return t, e
+
+def _format_bytes(n: float) -> str:
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if n < 1024: break
+        n /= 1024
+    return "%.1f %s" % (n, unit)
+
+def tensorfy_greedy(g: 'BaseGraph[VT,ET]',
+                    preserve_scalar: bool = True,
+                    memory_limit: Optional[int] = None,
+                    out: Optional[str] = None,
+                    verbose: bool = False,
+                    tries: int = 16) -> NDArray[np.complex128]:
+    """Computes the tensor of a ZX-diagram by summing out one spider at a time, in the order chosen by
+    :func:`elimination_order` to keep the intermediate tensors small.
+
+    If the intermediate tensors don't fit in ``memory_limit``, the variables occurring most in the largest
+    of them are fixed, and the computation is repeated for each of their values. The results are written
+    to the matching slice of the tensor, or added up for the variables of internal spiders.
+    Each fixed variable halves the memory needed at best, but doubles the running time.
+    The memory used is estimated before anything is computed.
+
+    Args:
+        g: ZX diagram
+        preserve_scalar: whether to account for the diagram scalar
+        memory_limit: if given, the number of bytes the computation may use. If even after fixing variables
+            it would need more than this, a ``MemoryError`` stating the estimated size is raised.
+        out: if given, the path of a ``.npy`` file. The tensor is then written to it through a ``numpy.memmap``,
+            and does not count towards ``memory_limit``. The returned array is the memmap,
+            which can later be opened again with ``np.load(out, mmap_mode='r')``.
+        verbose: print the size estimate
+        tries: the number of orders to try with :func:`elimination_order`, the one using the least memory is picked
+
+    Returns:
+        Numpy tensor having (num_inputs + num_outputs) dimensions (output dimensions first)
+    """
+    if g.is_hybrid():
+        raise ValueError("Hybrid graphs are not supported.")
+    factors, open_vars, hadamards = _factor_graph(g)
+    itemsize = np.dtype(np.complex128).itemsize
+    base = sum(t.size for t, _ in factors)
+    final = 0 if out is not None else 2**len(open_vars)
+
+    fixed: List[int] = []
+    while True:
+        index_lists = [[x for x in vs if x not in fixed] for _, vs in factors]
+        keep = set(open_vars) - set(fixed)
+        rng = random.Random(0)
+        steps, remaining, peak = min((elimination_order(index_lists, keep, rng if i else None) for i in range(tries)),
+                                     key=lambda order: order[2])
+        largest = max([len(vs) for _, _, vs in steps] + [len(vs) for _, vs in factors], default=0)
+        summed = any(x not in open_vars for x in fixed)
+        buffer = 2**(len(open_vars) - len(set(fixed) & set(open_vars))) if summed else 0
+        needed = (base + peak + final + buffer) * itemsize
+        if memory_limit is None or needed <= memory_limit: break
+        if (base + final) * itemsize > memory_limit: break  # fixing more variables won't help
+        counts: Dict[int, int] = {}
+        for _, _, vs in steps:
+            if len(vs) == largest:
+                for x in vs: counts[x] = counts.get(x, 0) + 1
+        if not counts: break
+        fixed.append(max(counts, key=lambda x: (counts[x], x in open_vars)))
+    if verbose:
+        print("Summing out %d variables in %d slices, the largest factor has %d variables and about %s of memory is needed"
+              % (len(steps), 2**len(fixed), largest, _format_bytes(needed)))
+    if memory_limit is not None and needed > memory_limit:
+        sliced = ", in %d slices" % 2**len(fixed) if fixed else ""
+        raise MemoryError("Computing this tensor needs about %s of memory (the largest intermediate tensor "
+                          "has %d indices%s), which exceeds the memory limit of %s"
+                          % (_format_bytes(needed), largest, sliced, _format_bytes(memory_limit)))
+
+    # The intermediate tensors are rescaled by powers of 2 to keep their entries of order 1, and these powers
+    # are added up separately, as the scalar of a large diagram doesn't fit in a float by itself.
+    # Without preserve_scalar, the first nonzero slice is written with its entries of order 1.
+    exponent: Optional[int] = None
+    mantissa: complex = 1
+    if preserve_scalar:
+        scalar = g.scalar.copy()
+        half_powers = scalar.power2 - hadamards  # of 2, i.e. powers of sqrt(2)
+        scalar.power2 = 0
+        exponent = half_powers // 2
+        mantissa = scalar.to_number() * (sqrt(2) if half_powers % 2 else 1)
+    shape = (2,)*len(open_vars)
+    if out is not None:
+        result = np.lib.format.open_memmap(out, mode='w+', dtype=np.complex128, shape=shape)
+    else:
+        result = np.zeros(shape, dtype=np.complex128)
+    unfixed = [x for x in open_vars if x not in fixed]
+
+    position = {x: i for i, x in enumerate(fixed)}
+    for values in itertools.product((0, 1), repeat=len(fixed)):
+        e = 0
+        live = {}
+        for f, (t, vs) in enumerate(factors):
+            index = tuple(values[position[x]] if x in position else slice(None) for x in vs)
+            live[f] = (t[index], [x for x in vs if x not in position])
+        for k, (x, bucket, vs) in enumerate(steps):
+            t = _einsum([live.pop(f) for f in bucket], vs)
+            t, shift = _normalise(t)
+            e += shift
+            live[len(factors) + k] = (t, vs)
+        # The trailing Ellipsis keeps this a view when every open variable is fixed
+        target = result[tuple(values[position[x]] if x in position else slice(None) for x in open_vars) + (Ellipsis,)]
+        ops = [live[f] for f in remaining]
+        if summed:
+            # A slice of an internal variable is added to the result
+            value = _einsum(ops, unfixed) if ops else np.ones((), dtype=np.complex128)
+        else:
+            value = target
+            if ops: _einsum(ops, unfixed, out=value)
+            else: value[...] = 1
+        value, shift = _normalise(value)
+        e += shift
+        if exponent is None and value.any(): exponent = -e
+        value *= mantissa * np.ldexp(1.0, e + (exponent if exponent is not None else -e))
+        if summed: target += value
+    if out is not None:
+        result.flush()
+    return result
+
 def tensor_to_matrix(t: np.ndarray, inputs: int, outputs: int) -> np.ndarray:
     """Takes a tensor generated by ``tensorfy`` and turns it into a matrix.
     The ``inputs`` and ``outputs`` arguments specify the final shape of the matrix:
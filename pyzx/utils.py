@@ -21,7 +21,7 @@ import os
 from argparse import ArgumentTypeError
 from enum import IntEnum
 from fractions import Fraction
-from typing import Union, Optional, List, Dict, Any
+from typing import Union, Optional, List, Dict, Tuple, Any
 from typing_extensions import Literal, Final
 
 from .symbolic import Poly
@@ -87,6 +87,50 @@ def normalize_phase(phase: Any) -> FractionLike:
             settings.float_to_fraction_max_denominator)
     return phase
 
+def dyadic_phase(phase: FractionLike) -> Optional[Tuple[int, int]]:
+    """Encode a dyadic phase as an integer. Returns ``(n, k)`` such that ``phase``
+    equals ``n/2**k`` modulo 2, with ``0 <= n < 2*2**k`` and ``k`` as small as possible,
+    so that phases with a common ``k`` are added by adding their numerators modulo
+    ``2*2**k``. Returns ``None`` for phases that are not dyadic rationals, such as
+    ``Fraction(1, 3)`` or a :class:`~pyzx.symbolic.Poly`."""
+    if type(phase) is int:
+        return (phase % 2, 0)
+    if type(phase) is Fraction:
+        d = phase.denominator
+        if d & (d - 1): return None
+        return (phase.numerator % (2 * d), d.bit_length() - 1)
+    return None
+
+def phase_from_dyadic(n: int, k: int) -> FractionLike:
+    """The inverse of :func:`dyadic_phase`: the phase ``n/2**k`` modulo 2, as an ``int``
+    when ``k`` is 0 and as a ``Fraction`` otherwise."""
+    if k == 0: return n % 2
+    return Fraction(n % (2 << k), 1 << k)
+
+def add_phases(a: FractionLike, b: FractionLike) -> FractionLike:
+    """Returns ``(a + b) % 2``. When both phases are ``int`` or ``Fraction`` with
+    power-of-two denominators, the sum is computed on the integer numerators over the
+    larger denominator instead of through ``Fraction`` arithmetic. Phases that do not
+    support ``%``, such as :class:`~pyzx.symbolic.Poly` with variables, are summed
+    without reduction."""
+    ta, tb = type(a), type(b)
+    if ta is int and tb is int:
+        return (a + b) % 2
+    if (ta is int or ta is Fraction) and (tb is int or tb is Fraction):
+        da, db = a.denominator, b.denominator
+        if not (da & (da - 1) or db & (db - 1)):
+            if da >= db:
+                n = a.numerator + b.numerator * (da // db)
+                d = da
+            else:
+                n = a.numerator * (db // da) + b.numerator
+                d = db
+            return Fraction(n % (2 * d), d)
+    try:
+        return (a + b) % 2
+    except Exception:
+        return a + b
+
 def half_phase(phase: FractionLike) -> FractionLike:
     return Fraction(phase / 2) if isinstance(phase, int) else phase / 2
 
@@ -180,14 +224,14 @@ def phase_is_clifford(phase: FractionLike) -> bool:
     if isinstance(phase, Poly):
         return phase.is_clifford
     if isinstance(phase, (Fraction, int)):
-        return phase in [Fraction(i, 2) for i in range(4)]
+        return phase.denominator <= 2 and 0 <= phase.numerator < 2 * phase.denominator
     raise TypeError(f"phase must be FractionLike, got {type(phase).__name__}")
 
 def phase_is_pauli(phase: FractionLike) -> bool:
     if isinstance(phase, Poly):
         return phase.is_pauli
     if isinstance(phase, (Fraction, int)):
-        return phase in (0, 1)
+        return phase.denominator == 1 and 0 <= phase.numerator <= 1
     raise TypeError(f"phase must be FractionLike, got {type(phase).__name__}")
 
 tikz_classes = {
@@ -16,6 +16,7 @@
 
 
 import copy
+import random
 import unittest
 import sys
 from typing import List, Optional
@@ -44,7 +45,7 @@ from pyzx.routing.architecture import (
     IBMQ_SINGAPORE,
 )
 from pyzx.routing.parity_maps import CNOT_tracker
-from pyzx.routing.machine_learning import GeneticAlgorithm
+from pyzx.routing.machine_learning import FitnessEvaluator, GeneticAlgorithm, ParticleSwarmOptimization
 from pyzx.circuit import CNOT
 from pyzx.extract import permutation_as_swaps
 from pyzx.generate import build_random_parity_map
@@ -278,6 +279,57 @@ class TestSteiner(unittest.TestCase):
                     self.matrix[i], best_permutation, best_permutation
                 )
 
+    def test_fitness_evaluator(self):
+        calls = []
+
+        def fitness(chromosome):
+            calls.append(chromosome)
+            return sum(i * g for i, g in enumerate(chromosome)) + np.random.randint(2)
+
+        evaluator = FitnessEvaluator(fitness, seed=1)
+        perms = [[0, 1, 2], [2, 1, 0], [0, 1, 2]]
+        values = evaluator.map(perms)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(values[0], values[2])
+        self.assertEqual(evaluator(perms[1]), values[1])
+        self.assertEqual(len(calls), 2)
+        # The seeded evaluations do not depend on the state of numpy.random
+        self.assertEqual(FitnessEvaluator(fitness, seed=1).map(perms), values)
+
+        fitness_func = FitnessFunction(CostMetric.COUNT, self.matrix[0], ElimMode.STEINER_MODE, self.arch)
+        results = []
+        for n_threads in [1, 2]:
+            optimizer = GeneticAlgorithm(4, 0.8, 0.2, fitness_func, n_threads=n_threads, seed=42)
+            results.append((optimizer.find_optimum(self.n_qubits, 3), optimizer.population))
+        self.assertEqual(results[0], results[1])
+
+    def test_pso_update_matches_step(self):
+        def step(perm):
+            new = list(perm)
+            i, j = np.random.choice(len(new), 2, replace=False)
+            if np.random.random() < 0.5:
+                new[i], new[j] = new[j], new[i]
+            return new, None, sum(abs(g - i) for i, g in enumerate(new)) + np.random.randint(3)
+
+        swarms = []
+        for sequential in [False, True]:
+            np.random.seed(7)
+            optimizer = ParticleSwarmOptimization(6, step, 0.4, 0.3, 0.3, n_threads=1)
+            optimizer._create_swarm(7)
+            optimizer.best_particle = optimizer.swarm[0]
+            for _ in range(10):
+                if sequential:
+                    # Without a seed and with one process, the swarm moves like consecutive calls to Particle.step
+                    for p in optimizer.swarm:
+                        p.step(optimizer.best_particle)
+                    top = min(optimizer.swarm, key=lambda p: p.best)
+                    if top.compare(optimizer.best_particle.best):
+                        optimizer.best_particle = top
+                else:
+                    optimizer._update_swarm()
+            swarms.append([(p.current, p.best, p.best_point) for p in optimizer.swarm])
+        self.assertEqual(swarms[0], swarms[1])
+
     def test_pso_optimization(self):
         modes = [
             ElimMode.STEINER_MODE,
@@ -362,6 +414,80 @@ class TestSteiner(unittest.TestCase):
                                         circuits[i].cnot_depth(), c.cnot_depth()
                                     )
 
+    def test_pre_calc_distances(self):
+        import os
+        import tempfile
+        arch = create_architecture(IBMQ_SINGAPORE)
+        distances = arch.pre_calc_distances()
+        edges = set(arch.graph.edge_st(e) for e in arch.graph.edges())
+        for until in (0, 5, arch.n_qubits - 1):
+            upper = distances["upper"][until]
+            full = distances["full"][until]
+            for (v1, v2) in upper:
+                dist, path = upper[(v1, v2)]
+                self.assertEqual(dist, len(path))
+                self.assertEqual(dist, upper[(v2, v1)][0])
+                self.assertTrue(all(u >= until and v >= until for u, v in path))
+                self.assertTrue(all((u, v) in edges or (v, u) in edges for u, v in path))
+            for (v1, v2) in full:
+                dist, path = full[(v1, v2)]
+                self.assertEqual(dist, len(path))
+                self.assertTrue(all(u <= until and v <= until for u, v in path))
+                self.assertTrue(all(arch.vertex2qubit(u) > arch.vertex2qubit(v) for u, v in path))
+        # The whole architecture is connected
+        self.assertEqual(len(distances["upper"][0]), arch.n_qubits ** 2)
+        self.assertNotIn((0, arch.n_qubits), distances["upper"][0])
+
+        with tempfile.TemporaryDirectory() as cache:
+            arch = create_architecture(IBMQ_SINGAPORE, distance_cache=cache)
+            arch.pre_calc_distances()
+            self.assertEqual(len(os.listdir(cache)), 1)
+            arch2 = create_architecture(IBMQ_SINGAPORE, distance_cache=cache)
+            self.assertEqual(arch.coupling_hash(), arch2.coupling_hash())
+            cached = arch2.pre_calc_distances()
+            for until in range(arch.n_qubits):
+                self.assertEqual(dict(cached["upper"][until]), dict(distances["upper"][until]))
+                self.assertEqual(dict(cached["full"][until]), dict(distances["full"][until]))
+
+    def test_shortest_path_and_steiner_tree(self):
+        arch = create_architecture(SQUARE, n_qubits=16)
+        distances = arch.pre_calc_distances()["upper"][0]
+        for start, end in [(0, 15), (3, 12), (5, 6)]:
+            path = arch.shortest_path(start, end)
+            v1, v2 = arch.qubit2vertex(start), arch.qubit2vertex(end)
+            self.assertEqual((path[0], path[-1]), (v1, v2))
+            self.assertEqual(len(path) - 1, distances[(v1, v2)][0])
+            self.assertTrue(all(arch.graph.connected(u, v) for u, v in zip(path, path[1:])))
+        self.assertIsNone(arch.shortest_path(0, 15, qubits_to_use=[0, 15]))
+
+        for root, terminals in [(0, [5, 10, 15]), (3, [4, 8, 12]), (6, [7, 13])]:
+            edges = list(arch.steiner_tree(root, terminals))
+            self.assertEqual(edges.count(None), 2)
+            top_down = edges[: edges.index(None)]
+            tree_vertices = {arch.qubit2vertex(root)} | {v for e in top_down for v in e}
+            self.assertTrue(all(arch.qubit2vertex(t) in tree_vertices for t in terminals))
+            self.assertEqual(len(top_down), len(tree_vertices) - 1)
+            self.assertTrue(all(arch.graph.connected(u, v) for u, v in top_down))
+            # A second query is answered from the memoised tree
+            self.assertEqual(list(arch.steiner_tree(root, list(reversed(terminals)))), edges)
+
+    def test_steiner_gauss_cnot_count(self):
+        # Pins the output of steiner_gauss on a 16-qubit square. The count depends on which of
+        # several shortest paths the distance tables store, so a change to them shows up here.
+        arch = create_architecture(SQUARE, n_qubits=16)
+        rng = random.Random(SEED)
+        total = 0
+        for _ in range(10):
+            matrix = Mat2.id(16)
+            for _ in range(48):
+                control, target = rng.sample(range(16), 2)
+                matrix.row_add(control, target)
+            tracker = CNOT_tracker(16)
+            steiner_gauss(matrix, arch, full_reduce=True, x=tracker)
+            self.assertGates(tracker, architecture=arch)
+            total += tracker.count_cnots()
+        self.assertEqual(total, 1485)
+
     @unittest.skip("This test fails because the steiner_gauss tries to find a steiner tree in a disconnected subgraph of the architecture")
     def test_small_steiner_gauss(self):
         """
@@ -27,9 +27,9 @@ if __name__ == '__main__':
     sys.path.append('.')
 from pyzx.circuit import Circuit
 from pyzx.circuit.gates import CNOT, Measurement, Reset
-from pyzx.generate import cliffordT
+from pyzx.generate import cliffordT, CNOT_HAD_PHASE_circuit
 from pyzx.simplify import clifford_simp
-from pyzx.extract import extract_circuit
+from pyzx.extract import extract_circuit, lookahead_extract
 from pyzx import simplify
 
 np: Optional[ModuleType]
@@ -84,6 +84,17 @@ class TestExtract(unittest.TestCase):
                 t2 = c.to_tensor(False)
                 self.assertTrue(compare_tensors(t,t2,False))
 
+    def test_extract_circuit_backends(self):
+        random.seed(SEED)
+        c = CNOT_HAD_PHASE_circuit(5, 120, p_had=0.2, p_t=0.3)
+        for backend in ('simple', 'multigraph', 'array', 'cow'):
+            with self.subTest(backend=backend):
+                g = c.to_graph(backend=backend)
+                simplify.full_reduce(g, quiet=True)
+                self.assertEqual(g.backend, backend)
+                c2 = extract_circuit(g)
+                self.assertTrue(c.verify_equality(c2))
+
     def test_cz_optimize_extract(self):
         qb_no = 8
         c = Circuit(qb_no)
@@ -103,6 +114,18 @@ class TestExtract(unittest.TestCase):
 
 
 
+    def test_lookahead_extract_parallel(self):
+        random.seed(SEED)
+        c = CNOT_HAD_PHASE_circuit(4, 120, clifford=False)
+        g = c.to_graph()
+        simplify.full_reduce(g, quiet=True)
+        for optimize_for_depth in [False, True]:
+            with self.subTest(optimize_for_depth=optimize_for_depth):
+                c1 = lookahead_extract(g.clone(), optimize_for_depth)
+                c2 = lookahead_extract(g.clone(), optimize_for_depth, max_workers=2)
+                self.assertListEqual(c1.gates, c2.gates)
+                self.assertTrue(c.verify_equality(c2))
+
     def test_extract_measurement_graph_raises(self):
         """Regression test for zxcalc/pyzx#420: extract_circuit should
         raise ValueError on reduced graphs from circuits with measurements."""
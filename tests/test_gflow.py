@@ -0,0 +1,279 @@
+# PyZX - Python library for quantum circuit rewriting
+#        and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+import random
+import sys
+import itertools
+from fractions import Fraction
+
+if __name__ == '__main__':
+    sys.path.append('..')
+    sys.path.append('.')
+
+from pyzx.generate import cliffordT
+from pyzx.gflow import gflow
+from pyzx.graph import Graph
+from pyzx.linalg import Mat2
+from pyzx.simplify import interior_clifford_simp, full_reduce
+from pyzx.utils import VertexType, EdgeType, vertex_is_zx, phase_is_pauli, phase_is_clifford
+
+
+def boundary_spiders(g, boundary):
+    ty = g.types()
+    return set(n for b in boundary for n in g.neighbors(b) if vertex_is_zx(ty[n]))
+
+def odd_neighbourhood(g, vs, pauli_y):
+    odd = set()
+    for v in vs:
+        odd ^= set(w for w in g.neighbors(v) if vertex_is_zx(g.type(w)))
+        if v in pauli_y: odd ^= {v}
+    return odd
+
+def pauli_planes(g):
+    """The non-output spiders measured in X and in Y when searching for a Pauli flow."""
+    outputs = boundary_spiders(g, g.outputs())
+    spiders = [v for v in g.vertices() if vertex_is_zx(g.type(v)) and v not in outputs]
+    pauli_x = set(v for v in spiders if phase_is_pauli(g.phase(v) % 2))
+    pauli_y = set(v for v in spiders if v not in pauli_x and phase_is_clifford(g.phase(v) % 2))
+    return pauli_x, pauli_y
+
+def pauli_flow_violations(g, earlier, u, c, pauli_x, pauli_y):
+    """The conditions of a Pauli flow that the correction set ``c`` of ``u`` violates,
+    where ``earlier(u, v)`` says whether ``u`` is measured strictly before ``v``."""
+    odd = odd_neighbourhood(g, c, set())
+    errors = []
+    if c & boundary_spiders(g, g.inputs()): errors.append('input in correction set')
+    for v in c - {u}:
+        if v not in pauli_x | pauli_y and not earlier(u, v): errors.append(('P1', v))
+    for v in odd - {u}:
+        if v not in pauli_y and not earlier(u, v): errors.append(('P2', v))
+    for v in pauli_y - {u}:
+        if not earlier(u, v) and (v in c) != (v in odd): errors.append(('P3', v))
+    if u in pauli_y:
+        if (u in c) == (u in odd): errors.append('Y')
+    elif u in pauli_x:
+        if u not in odd: errors.append('X')
+    elif u in c or u not in odd: errors.append('XY')
+    return errors
+
+def has_pauli_flow(g):
+    """Whether ``g`` has a Pauli flow, by trying every order of the measured spiders.
+
+    A flow for a partial order is also a flow for any total order extending it,
+    so it suffices to look at total orders. Only feasible for a handful of spiders."""
+    pauli_x, pauli_y = pauli_planes(g)
+    inputs = boundary_spiders(g, g.inputs())
+    outputs = boundary_spiders(g, g.outputs())
+    spiders = [v for v in g.vertices() if vertex_is_zx(g.type(v))]
+    measured = [v for v in spiders if v not in outputs]
+    sets = [set(c) for r in range(len(spiders) + 1)
+            for c in itertools.combinations([v for v in spiders if v not in inputs], r)]
+    for order in itertools.permutations(measured):
+        position = {v: i for i, v in enumerate(order)}
+        position.update((v, len(order)) for v in outputs)
+        earlier = lambda u, v: position[u] < position[v]
+        if all(any(not pauli_flow_violations(g, earlier, u, c, pauli_x, pauli_y) for c in sets)
+               for u in measured):
+            return True
+    return False
+
+def reference_gflow(g, focus=False, pauli=False):
+    """The earlier implementation of :func:`gflow`, which solves a new system for every
+    vertex on every layer."""
+    l = {}
+    gflow = {}
+    ty = g.types()
+    vertices = set(v for v in g.vertices() if vertex_is_zx(ty[v]))
+    pattern_inputs = boundary_spiders(g, g.inputs())
+    pattern_outputs = boundary_spiders(g, g.outputs())
+    pauli_x, pauli_y = pauli_planes(g) if pauli else (set(), set())
+    processed = pattern_outputs.copy() | g.grounds()
+    non_outputs = list(vertices.difference(pattern_outputs))
+    zerovec = Mat2.zeros(len(non_outputs), 1)
+    for v in processed:
+        l[v] = 0
+    k = 1
+    while True:
+        correct = set()
+        candidates = [v for v in (processed | pauli_x | pauli_y).difference(pattern_inputs)
+                      if focus or any(w not in processed for w in g.neighbors(v))]
+        if focus:
+            clean = non_outputs
+        else:
+            clean = [v for v in vertices if v not in processed and
+                     any(w in candidates for w in g.neighbors(v))]
+        m = Mat2([[1 if g.connected(v,w) or (v==w and v in pauli_y) else 0
+                   for v in candidates] for w in clean])
+        for index, u in enumerate(clean):
+            if not focus or (u not in processed and any(w in candidates for w in g.neighbors(u))):
+                vu = zerovec.copy()
+                vu.data[index][0] = 1
+                x = m.solve(vu)
+                if x:
+                    correct.add(u)
+                    gflow[u] = {candidates[i] for i in range(x.rows()) if x.data[i][0]}
+                    l[u] = k
+        if not correct:
+            if len(vertices) == len(processed):
+                return {v: k - i - 1 for v,i in l.items()}, gflow
+            return None
+        processed.update(correct)
+        k += 1
+
+def random_open_graph(n, p=0.5):
+    """A graph-like diagram on ``n`` spiders with random phases and one or two inputs
+    and outputs."""
+    g = Graph()
+    phases = [Fraction(0), Fraction(1,2), Fraction(1), Fraction(3,2), Fraction(1,4)]
+    spiders = [g.add_vertex(VertexType.Z, phase=random.choice(phases)) for _ in range(n)]
+    for v, w in itertools.combinations(spiders, 2):
+        if random.random() < p: g.add_edge((v, w), EdgeType.HADAMARD)
+    random.shuffle(spiders)
+    inputs = [g.add_vertex(VertexType.BOUNDARY) for _ in range(random.randint(1, 2))]
+    outputs = [g.add_vertex(VertexType.BOUNDARY) for _ in range(random.randint(1, 2))]
+    for b, v in zip(inputs, spiders): g.add_edge((b, v))
+    for b, v in zip(outputs, reversed(spiders)): g.add_edge((v, b))
+    g.set_inputs(tuple(inputs))
+    g.set_outputs(tuple(outputs))
+    return g
+
+
+class TestGFlow(unittest.TestCase):
+
+    def assert_valid_flow(self, g, result, focus, reverse, pauli):
+        l, corrections = result
+        inputs = boundary_spiders(g, g.inputs())
+        outputs = boundary_spiders(g, g.outputs())
+        if reverse: inputs, outputs = outputs, inputs
+        pauli_y = set()
+        if pauli:
+            pauli_y = set(v for v in g.vertices() if vertex_is_zx(g.type(v)) and
+                          not phase_is_pauli(g.phase(v) % 2) and phase_is_clifford(g.phase(v) % 2))
+        non_outputs = set(v for v in g.vertices() if vertex_is_zx(g.type(v))) - outputs
+        self.assertEqual(set(corrections), non_outputs)
+        for u, c in corrections.items():
+            self.assertFalse(c & inputs)
+            odd = odd_neighbourhood(g, c, pauli_y)
+            self.assertIn(u, odd)
+            for w in (odd & non_outputs) - {u}:
+                self.assertFalse(focus)
+                # vertices corrected later have to be measured earlier
+                if reverse: self.assertLess(l[w], l[u])
+                else: self.assertGreater(l[w], l[u])
+
+    def test_circuit_has_gflow(self):
+        random.seed(1)
+        for _ in range(10):
+            g = cliffordT(4, 40, 0.2)
+            interior_clifford_simp(g)
+            for focus in (False, True):
+                for reverse in (False, True):
+                    with self.subTest(focus=focus, reverse=reverse):
+                        result = gflow(g, focus=focus, reverse=reverse)
+                        self.assertIsNotNone(result)
+                        self.assert_valid_flow(g, result, focus, reverse, False)
+
+    def test_pauli_flow(self):
+        random.seed(2)
+        for _ in range(10):
+            g = cliffordT(4, 40, 0.2)
+            full_reduce(g)
+            result = gflow(g, focus=True, pauli=True)
+            self.assertIsNotNone(result)
+            self.assert_valid_flow(g, result, True, False, True)
+
+    def test_no_gflow(self):
+        g = cliffordT(2, 10, 0.2)
+        interior_clifford_simp(g)
+        # an isolated spider can't be corrected
+        g.add_vertex(VertexType.Z)
+        self.assertIsNone(gflow(g))
+
+    def assert_valid_pauli_flow(self, g, result):
+        l, corrections = result
+        pauli_x, pauli_y = pauli_planes(g)
+        outputs = boundary_spiders(g, g.outputs())
+        non_outputs = set(v for v in g.vertices() if vertex_is_zx(g.type(v))) - outputs
+        self.assertEqual(set(corrections), non_outputs)
+        earlier = lambda u, v: l[u] < l[v]
+        for u, c in corrections.items():
+            self.assertEqual(pauli_flow_violations(g, earlier, u, c, pauli_x, pauli_y), [])
+
+    def test_pauli_flow_against_reference(self):
+        random.seed(3)
+        for _ in range(100):
+            g = random_open_graph(random.randint(3, 5))
+            result = gflow(g, pauli=True)
+            reference = reference_gflow(g, pauli=True)
+            if result is not None:
+                self.assert_valid_pauli_flow(g, result)
+            else:
+                self.assertFalse(has_pauli_flow(g))
+            if reference is not None and all(
+                    not pauli_flow_violations(g, lambda u, v: reference[0][u] < reference[0][v],
+                                              u, c, *pauli_planes(g))
+                    for u, c in reference[1].items()):
+                self.assertIsNotNone(result)
+
+    def test_pauli_flow_reference_on_circuits(self):
+        random.seed(4)
+        for _ in range(10):
+            g = cliffordT(4, 40, 0.2)
+            full_reduce(g)
+            result = gflow(g, pauli=True)
+            self.assertIsNotNone(result)
+            self.assert_valid_pauli_flow(g, result)
+            self.assertIsNotNone(reference_gflow(g, pauli=True))
+
+    def test_pauli_flow_y_vertex_next_to_input(self):
+        # the Y-measured spider 2 is only connected to the input,
+        # but it can be corrected with a set that contains itself
+        g = Graph()
+        vs = [g.add_vertex(VertexType.Z, phase=p) for p in (1, 0, Fraction(1,2), Fraction(1,2))]
+        for e in [(0,2), (0,3), (1,3)]: g.add_edge((vs[e[0]], vs[e[1]]), EdgeType.HADAMARD)
+        i, o = g.add_vertex(VertexType.BOUNDARY), g.add_vertex(VertexType.BOUNDARY)
+        g.add_edge((i, vs[0]))
+        g.add_edge((vs[1], o))
+        g.set_inputs((i,))
+        g.set_outputs((o,))
+        self.assertIsNone(reference_gflow(g, pauli=True))
+        result = gflow(g, pauli=True)
+        self.assertIsNotNone(result)
+        self.assert_valid_pauli_flow(g, result)
+
+    def test_no_pauli_flow_for_y_vertex_in_same_layer(self):
+        # the reference puts the Y-measured spider 2 in the same layer as the
+        # spider 0 it helps correct, which breaks condition P3 of a Pauli flow
+        g = Graph()
+        vs = [g.add_vertex(VertexType.Z, phase=p) for p in (Fraction(1,4), 0, Fraction(1,2), 0)]
+        for e in [(0,2), (0,3), (1,3)]: g.add_edge((vs[e[0]], vs[e[1]]), EdgeType.HADAMARD)
+        i, o = g.add_vertex(VertexType.BOUNDARY), g.add_vertex(VertexType.BOUNDARY)
+        g.add_edge((i, vs[3]))
+        g.add_edge((vs[1], o))
+        g.set_inputs((i,))
+        g.set_outputs((o,))
+        reference = reference_gflow(g, pauli=True)
+        self.assertIsNotNone(reference)
+        self.assertIn(('P3', vs[2]), pauli_flow_violations(
+            g, lambda u, v: reference[0][u] < reference[0][v], vs[0], reference[1][vs[0]], *pauli_planes(g)))
+        self.assertFalse(has_pauli_flow(g))
+        self.assertIsNone(gflow(g, pauli=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
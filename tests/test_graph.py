@@ -20,6 +20,7 @@ from fractions import Fraction
 import itertools
 import json
 import os
+import random
 import sys
 import tempfile
 if __name__ == '__main__':
@@ -27,8 +28,9 @@ if __name__ == '__main__':
     sys.path.append('.')
 
 from pyzx.graph import Graph
-from pyzx.utils import EdgeType, VertexType
-from pyzx.generate import identity
+from pyzx.utils import EdgeType, VertexType, toggle_edge
+from pyzx.generate import identity, CNOT_HAD_PHASE_circuit
+from pyzx.simplify import full_reduce
 
 import numpy as np
 from pyzx.tensor import compare_tensors
@@ -247,6 +249,60 @@ class TestGraphBasicMethods(unittest.TestCase):
         self.assertEqual(g.edge_type(g.edge(v1,v2)),EdgeType.HADAMARD)
         self.assertTrue((g.phase(v1)==1  and g.phase(v2)==0) or (g.phase(v1)==0 and g.phase(v2)==1))
 
+    def test_add_edge_table_matches_add_edge(self):
+        from pyzx.graph.base import BaseGraph
+        rng = random.Random(5)
+        types = [VertexType.Z, VertexType.X, VertexType.Z_BOX]
+        for backend in ('simple', 'multigraph', 'cow'):
+            for _ in range(30):
+                with self.subTest(backend=backend):
+                    g = Graph(backend)
+                    vs = [g.add_vertex(rng.choice(types), phase=Fraction(rng.randrange(4), 4)) for _ in range(6)]
+                    for v in vs:
+                        if g.type(v) == VertexType.Z_BOX: g.set_vdata(v, 'label', rng.choice([1, 1j]))
+                    for s, t in itertools.combinations(vs, 2):
+                        if rng.random() < 0.4:
+                            g.add_edge((s, t), rng.choice([EdgeType.SIMPLE, EdgeType.HADAMARD]))
+                    b = g.add_vertex(VertexType.BOUNDARY)
+                    etab = {(b, vs[0]): [1, 0]}
+                    for s, t in itertools.combinations_with_replacement(vs, 2):
+                        if rng.random() < 0.5:
+                            etab[(s, t)] = [rng.randrange(4), rng.randrange(4)]
+                    g2 = g.copy()
+                    g.add_edge_table(etab)
+                    BaseGraph.add_edge_table(g2, etab)
+                    self.assertEqual(g.num_edges(), g2.num_edges())
+                    self.assertEqual(sorted((g.edge_st(e), g.edge_type(e)) for e in g.edges()),
+                                     sorted((g2.edge_st(e), g2.edge_type(e)) for e in g2.edges()))
+                    for v in vs:
+                        self.assertEqual(g.phase(v) % 2, g2.phase(v) % 2)
+                        self.assertEqual(g.vdata(v, 'label', 1), g2.vdata(v, 'label', 1))
+                    self.assertEqual(g.scalar, g2.scalar)
+
+    def test_vertex_from_phase_index(self):
+        for backend in ('simple', 'multigraph', 'array', 'cow'):
+            with self.subTest(backend=backend):
+                g = Graph(backend)
+                g.track_phases = True
+                vs = [g.add_vertex(VertexType.Z) for _ in range(4)]
+                for v in vs:
+                    self.assertEqual(g.vertex_from_phase_index(g.phase_index[v]), v)
+                i0, i1, i2 = (g.phase_index[v] for v in vs[:3])
+                g.update_phase_index(vs[0], vs[1])
+                self.assertEqual(g.vertex_from_phase_index(i0), vs[1])
+                self.assertEqual(g.vertex_from_phase_index(i1), vs[0])
+                g.fuse_phases(vs[2], vs[3])
+                g.remove_vertex(vs[3])
+                self.assertEqual(g.vertex_from_phase_index(i2), vs[2])
+                g.remove_phase_index(vs[0])
+                g.set_phase_index(vs[2], i1)
+                self.assertEqual(g.vertex_from_phase_index(i1), vs[2])
+                with self.assertRaises(ValueError):
+                    g.vertex_from_phase_index(i2)
+                for h in (g.clone(), g.copy()):
+                    for v, i in h.phase_index.items():
+                        self.assertEqual(h.vertex_from_phase_index(i), v)
+
     def test_copy(self):
         g = Graph()
         v1, v2 = g.add_vertices(2)
@@ -338,6 +394,34 @@ class TestGraphBasicMethods(unittest.TestCase):
         with self.assertRaises(TypeError):
             g.add_vertex(VertexType.Z, phase=phase)
 
+    def test_add_to_phase_dyadic(self):
+        from pyzx.utils import add_phases, dyadic_phase, phase_from_dyadic
+        phases = [0, 1, 3, -1, Fraction(1, 2), Fraction(-3, 4), Fraction(7, 8), Fraction(1, 3), Fraction(5, 6)]
+        for a, b in itertools.product(phases, repeat=2):
+            self.assertEqual(add_phases(a, b), (a + b) % 2)
+            self.assertIs(type(add_phases(a, b)), type((a + b) % 2))
+        for a in phases:
+            d = dyadic_phase(a)
+            if Fraction(a).denominator % 3 == 0:
+                self.assertIsNone(d)
+            else:
+                self.assertEqual(phase_from_dyadic(*d), a % 2)
+        self.assertEqual(dyadic_phase(Fraction(-3, 4)), (5, 2))
+        for backend in ('simple', 'multigraph', 'array', 'cow'):
+            with self.subTest(backend=backend):
+                g = Graph(backend)
+                v = g.add_vertex(VertexType.Z, phase=Fraction(3, 4))
+                g.add_to_phase(v, Fraction(1, 2))
+                self.assertEqual(g.phase(v), Fraction(5, 4))
+                g.add_to_phase(v, Fraction(3, 4))
+                self.assertEqual(g.phase(v), 0)
+                g.add_to_phase(v, Fraction(1, 3))
+                self.assertEqual(g.phase(v), Fraction(1, 3))
+                g.set_phase(v, Fraction(5, 2))
+                self.assertEqual(g.phase(v), Fraction(1, 2))
+                with self.assertRaises(TypeError):
+                    g.add_to_phase(v, 0.5)
+
     @unittest.skipUnless(np, "numpy needs to be installed for this to run")
     def test_remove_isolated_vertex_preserves_semantics(self):
         g = Graph()
@@ -367,6 +451,195 @@ class TestGraphBasicMethods(unittest.TestCase):
                         self.assertEqual(g2.num_vertices(),0)
                         self.assertTrue(compare_tensors(g,g2))
 
+    def test_track_touched(self):
+        for backend in ('simple', 'multigraph', 'cow'):
+            with self.subTest(backend=backend):
+                g = Graph(backend)
+                v1 = g.add_vertex(VertexType.Z)
+                v2 = g.add_vertex(VertexType.Z)
+                v3 = g.add_vertex(VertexType.Z)
+                g.add_edge((v1, v2))
+                g.add_edge((v2, v3))
+                touched: set = set()
+                self.assertIsNone(g.track_touched(touched))
+                g.set_phase(v1, Fraction(1, 2))
+                self.assertEqual(touched, {v1})
+                touched.clear()
+                g.remove_vertex(v2)
+                self.assertTrue({v1, v3}.issubset(touched))
+                self.assertIs(g.track_touched(None), touched)
+                touched.clear()
+                g.set_phase(v3, 1)
+                self.assertEqual(touched, set())
+
+    def test_remove_isolated_vertices_candidates(self):
+        for backend in ('simple', 'multigraph', 'array', 'cow'):
+            with self.subTest(backend=backend):
+                g = Graph(backend)
+                a = g.add_vertex(VertexType.Z, phase=Fraction(1, 2))
+                b = g.add_vertex(VertexType.Z, phase=Fraction(1, 4))
+                c = g.add_vertex(VertexType.X, phase=1)
+                g.add_edge((b, c), EdgeType.HADAMARD)
+                d, e, f = [g.add_vertex(VertexType.Z) for _ in range(3)]
+                g.add_edges([(d, e), (e, f)])
+                x = g.add_vertex(VertexType.Z)
+                g.remove_vertex(x)
+                g2 = g.copy()
+                # only the pair containing c is removed, and x no longer exists
+                g2.remove_isolated_vertices([c, e, x])
+                self.assertEqual(set(g2.vertices()), {a, d, e, f})
+                self.assertTrue(compare_tensors(g, g2, preserve_scalar=True))
+                g2.remove_isolated_vertices()
+                self.assertEqual(set(g2.vertices()), {d, e, f})
+                self.assertTrue(compare_tensors(g, g2, preserve_scalar=True))
+
+    def test_rewrite_removes_isolated_neighbours(self):
+        from pyzx.rewrite_rules.lcomp_rule import lcomp
+        g = Graph()
+        a = g.add_vertex(VertexType.Z)
+        v = g.add_vertex(VertexType.Z, phase=Fraction(1, 2))
+        w = g.add_vertex(VertexType.Z, phase=Fraction(1, 4))
+        g.add_edge((v, w), EdgeType.HADAMARD)
+        g2 = g.copy()
+        self.assertTrue(lcomp(g2, v))
+        # w is left isolated by the rewrite, while a is not looked at
+        self.assertEqual(set(g2.vertices()), {a})
+        self.assertTrue(compare_tensors(g, g2, preserve_scalar=True))
+
+
+class TestGraphArray(unittest.TestCase):
+
+    def test_add_remove_reuses_free_ids(self):
+        g = Graph('array')
+        v1, v2, v3 = g.add_vertices(3)
+        g.add_edges([(v1, v2), (v2, v3)])
+        g.remove_vertex(v2)
+        self.assertEqual(g.num_vertices(), 2)
+        self.assertEqual(g.num_edges(), 0)
+        self.assertNotIn(v2, g.vertices())
+        v4 = g.add_vertex(VertexType.Z)
+        self.assertEqual(v4, v2)
+        self.assertEqual(g.vertex_degree(v4), 0)
+        self.assertEqual(set(g.vertices()), {v1, v3, v4})
+
+    def test_attributes(self):
+        g = Graph('array')
+        v = g.add_vertex(VertexType.X, qubit=2, row=1.5, phase=Fraction(3, 4))
+        w = g.add_vertex(VertexType.Z)
+        g.set_phase(w, Fraction(5, 2))
+        self.assertEqual(g.type(v), VertexType.X)
+        self.assertEqual(g.qubit(v), 2)
+        self.assertEqual(g.row(v), 1.5)
+        self.assertEqual(g.phase(v), Fraction(3, 4))
+        self.assertEqual(g.phase(w), Fraction(1, 2))
+        self.assertEqual(dict(g.types()), {v: VertexType.X, w: VertexType.Z})
+        self.assertEqual(g.phases()[w], Fraction(1, 2))
+
+    def test_high_degree_vertex(self):
+        g = Graph('array')
+        c = g.add_vertex(VertexType.Z)
+        vs = [g.add_vertex(VertexType.Z) for _ in range(100)]
+        for v in vs:
+            g.add_edge((c, v), EdgeType.HADAMARD)
+        self.assertEqual(g.vertex_degree(c), 100)
+        self.assertEqual(set(g.neighbors(c)), set(vs))
+        for v in vs[::2]:
+            g.remove_edge(g.edge(c, v))
+        self.assertEqual(set(g.neighbors(c)), set(vs[1::2]))
+        self.assertEqual(g.num_edges(), 50)
+        self.assertEqual(g.edge_type(g.edge(vs[1], c)), EdgeType.HADAMARD)
+
+    def test_parallel_edges(self):
+        g = Graph('array')
+        v, w = g.add_vertex(VertexType.Z), g.add_vertex(VertexType.Z)
+        g.add_edge((v, w), EdgeType.HADAMARD)
+        g.add_edge((v, w), EdgeType.HADAMARD)
+        self.assertFalse(g.connected(v, w))
+
+    def test_clone_and_copy_match_simple(self):
+        c = identity(3)
+        g = c.copy(backend='array')
+        self.assertEqual(g.backend, 'array')
+        self.assertTrue(compare_tensors(c, g))
+        h = g.clone()
+        v = h.add_vertex(VertexType.Z)
+        h.add_edge((v, next(iter(h.vertices()))))
+        self.assertEqual(g.num_vertices(), c.num_vertices())
+        self.assertTrue(compare_tensors(c, g.clone()))
+
+
+class TestGraphCOW(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(3)
+        self.circuit = CNOT_HAD_PHASE_circuit(4, 40, p_had=0.3, p_t=0.3)
+        self.graph = self.circuit.to_graph(backend='cow')
+
+    def state(self, g):
+        return (sorted((g.edge_st(e), g.edge_type(e)) for e in g.edges()), dict(g.types()), dict(g.phases()),
+                dict(g.qubits()), dict(g.rows()), set(g.grounds()), g.inputs(), g.outputs(), g.num_edges())
+
+    def test_clone_shares_until_modified(self):
+        g = self.graph
+        h = g.clone()
+        self.assertIs(h.graph, g.graph)
+        self.assertIs(h.phases(), g.phases())
+        v = next(v for v in h.vertices() if h.type(v) == VertexType.Z)
+        w = next(iter(h.neighbors(v)))
+        h.set_phase(v, Fraction(1, 4))
+        self.assertIsNot(h.phases(), g.phases())
+        self.assertIs(h.graph, g.graph)
+        h.set_edge_type(h.edge(v, w), toggle_edge(h.edge_type(h.edge(v, w))))
+        self.assertIsNot(h.graph, g.graph)
+        # only the adjacency of the two endpoints is copied
+        self.assertIsNot(h.graph[v], g.graph[v])
+        self.assertIsNot(h.graph[w], g.graph[w])
+        for u in h.vertices():
+            if u not in (v, w): self.assertIs(h.graph[u], g.graph[u])
+
+    def test_clones_are_independent(self):
+        g = self.graph
+        before = self.state(g)
+        h = g.clone()
+        h2 = h.clone()
+        full_reduce(h)
+        self.assertEqual(self.state(g), before)
+        self.assertEqual(self.state(h2), before)
+        full_reduce(g)
+        self.assertEqual(self.state(g), self.state(h))
+        self.assertEqual(self.state(h2), before)
+        self.assertTrue(compare_tensors(self.circuit, h2))
+        self.assertTrue(compare_tensors(self.circuit, g))
+
+    def test_data_is_copied_on_write(self):
+        g = self.graph
+        v, w = list(g.vertices())[:2]
+        g.set_vdata(v, 'label', 1)
+        g.set_edata((v, w), 'label', 1)
+        g.set_ground(v)
+        h = g.clone()
+        h.set_vdata(v, 'label', 2)
+        h.set_edata((v, w), 'label', 2)
+        h.set_ground(v, False)
+        h.set_qubit(v, 10)
+        h.set_row(v, 10)
+        self.assertEqual((g.vdata(v, 'label'), g.edata((v, w), 'label')), (1, 1))
+        self.assertEqual((h.vdata(v, 'label'), h.edata((v, w), 'label')), (2, 2))
+        self.assertTrue(g.is_ground(v))
+        self.assertNotEqual((g.qubit(v), g.row(v)), (10, 10))
+        h.clear_vdata(v)
+        self.assertEqual(g.vdata(v, 'label'), 1)
+
+    def test_copy_keeps_backend(self):
+        h = self.graph.clone()
+        h.remove_vertex(next(v for v in h.vertices() if h.type(v) == VertexType.Z and
+                             all(h.type(w) != VertexType.BOUNDARY for w in h.neighbors(v))))
+        g = h.copy()
+        self.assertEqual(g.backend, 'cow')
+        self.assertEqual(g.num_vertices(), h.num_vertices())
+        self.assertTrue(compare_tensors(g, h))
+
+
 class TestGraphCircuitMethods(unittest.TestCase):
 
     def setUp(self):
@@ -0,0 +1,89 @@
+# PyZX - Python library for quantum circuit rewriting
+#        and optimization using the ZX-calculus
+# Copyright (C) 2018 - Aleks Kissinger and John van de Wetering
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+if __name__ == '__main__':
+    sys.path.append('..')
+    sys.path.append('.')
+
+import pyzx
+
+# modules that a headless worker calling full_reduce and extract_circuit shouldn't need
+heavy_modules = ['IPython', 'ipywidgets', 'matplotlib', 'quimb',
+                 'pyzx.drawing', 'pyzx.editor', 'pyzx.d3', 'pyzx.tikz', 'pyzx.routing',
+                 'pyzx.local_search', 'pyzx.simulation', 'pyzx.quimb']
+
+def loaded_modules(code):
+    # the modules in sys.modules after running code in a fresh interpreter
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    code += '; import sys, json; print(json.dumps(sorted(sys.modules)))'
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_import_is_light(self):
+        loaded = loaded_modules('import pyzx')
+        self.assertEqual([m for m in loaded if m.startswith('pyzx')], ['pyzx'])
+        for m in heavy_modules:
+            self.assertNotIn(m, loaded)
+
+    def test_optimisation_worker_imports(self):
+        code = ('import pyzx as zx; '
+                'c = zx.Circuit(2); c.add_gate("HAD", 0); c.add_gate("T", 0); c.add_gate("CNOT", 0, 1); c.add_gate("T", 1); '
+                'g = c.to_graph(); zx.full_reduce(g); zx.extract_circuit(g)')
+        loaded = loaded_modules(code)
+        for m in ['pyzx.simplify', 'pyzx.extract', 'pyzx.circuit', 'pyzx.graph.graph']:
+            self.assertIn(m, loaded)
+        for m in heavy_modules:
+            self.assertNotIn(m, loaded)
+
+    def test_submodule_access_imports_only_that_submodule(self):
+        loaded = loaded_modules('import pyzx; pyzx.gflow')
+        self.assertIn('pyzx.gflow', loaded)
+        for m in heavy_modules:
+            self.assertNotIn(m, loaded)
+
+    def test_star_exports_match_modules(self):
+        for module, names in pyzx._star_exports.items():
+            mod = importlib.import_module(module, 'pyzx')
+            self.assertEqual(sorted(names), sorted(mod.__all__), module)
+
+    def test_public_names(self):
+        self.assertIs(pyzx.Graph, importlib.import_module('pyzx.graph.graph').Graph)
+        self.assertIs(pyzx.full_reduce, importlib.import_module('pyzx.simplify').full_reduce)
+        self.assertIs(pyzx.simplify, importlib.import_module('pyzx.simplify'))
+        self.assertIs(pyzx.fuse, importlib.import_module('pyzx.rewrite_rules').fuse)
+        self.assertAlmostEqual(pyzx.SQRT_TWO.to_number() ** 2, pyzx.TWO.to_number())
+        self.assertIn('draw', dir(pyzx))
+        self.assertIn('extract_circuit', pyzx.__all__)
+        for name in pyzx._submodules:
+            self.assertIn(name, pyzx.__all__)
+            self.assertIs(getattr(pyzx, name), importlib.import_module('pyzx.' + name))
+        with self.assertRaises(AttributeError):
+            pyzx.not_a_pyzx_function
+
+
+if __name__ == '__main__':
+    unittest.main()
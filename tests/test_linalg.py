@@ -16,13 +16,14 @@
 
 
 import unittest
+import random
 import sys
 import numpy as np
 if __name__ == '__main__':
     sys.path.append('..')
     sys.path.append('.')
 
-from pyzx.linalg import Mat2, rank_factorise, generalised_inverse
+from pyzx.linalg import Mat2, PackedMat2, rank_factorise, generalised_inverse
 
 
 class TestMat2(unittest.TestCase):
@@ -82,6 +83,85 @@ class TestMat2(unittest.TestCase):
         self.assertEqual(m1.rows(),self.m3.rank())
         self.assertEqual(m0*m1, self.m3)
 
+    def test_packed_gauss_matches_list_gauss(self):
+        class Recorder:
+            def __init__(self): self.ops = []
+            def row_add(self, r0, r1): self.ops.append(('row', r0, r1))
+            def col_add(self, c0, c1): self.ops.append(('col', c0, c1))
+        random.seed(42)
+        for rows, cols in [(5,5), (7,3), (3,9), (30,70), (70,30)]:
+            for full_reduce in (False, True):
+                data = [[random.randint(0,1) for _ in range(cols)] for _ in range(rows)]
+                data[1] = list(data[0])
+                m = Mat2([list(r) for r in data])
+                p = PackedMat2(data)
+                x1, y1, x2, y2 = Recorder(), Recorder(), Recorder(), Recorder()
+                old_min_size = Mat2.PACKED_MIN_SIZE
+                Mat2.PACKED_MIN_SIZE = 1000
+                try:
+                    r1 = m.gauss(full_reduce=full_reduce, x=x1, y=y1, blocksize=4, pivot_cols=[])
+                finally:
+                    Mat2.PACKED_MIN_SIZE = old_min_size
+                r2 = p.gauss(full_reduce=full_reduce, x=x2, y=y2, blocksize=4)
+                self.assertEqual(r1, r2)
+                self.assertEqual(m.data, p.data)
+                self.assertEqual(x1.ops, x2.ops)
+                self.assertEqual(y1.ops, y2.ops)
+
+    def test_m4ri_gives_reduced_echelon_form(self):
+        rng = np.random.default_rng(7)
+        for rows, cols, rank in [(1,1,1), (6,9,3), (40,40,40), (90,60,25), (60,130,60)]:
+            a = (rng.integers(0, 2, (rows, rank)) @ rng.integers(0, 2, (rank, cols))) % 2
+            expected = PackedMat2(a)
+            r = expected.gauss(full_reduce=True)
+            for k in (None, 1, 5):
+                m = PackedMat2(a)
+                self.assertEqual(m.copy().gauss_m4ri(k=k), r)
+                self.assertEqual(m.gauss_m4ri(full_reduce=True, k=k), r)
+                nonzero = expected.to_array()
+                self.assertTrue((m.to_array()[:r] == nonzero[nonzero.any(axis=1)]).all())
+                self.assertFalse(m.to_array()[r:].any())
+            for v in PackedMat2(a).nullspace():
+                self.assertFalse(((a @ np.array(v)) % 2).any())
+            self.assertEqual(len(PackedMat2(a).nullspace()), cols - r)
+
+    def test_packed_matrix_operations(self):
+        p = self.m4.packed()
+        self.assertEqual(p, self.m4)
+        self.assertEqual(p[2,4], 1)
+        self.assertEqual(p[0,1], 0)
+        self.assertEqual(p.transpose().to_mat2(), self.m4.transpose())
+        p[0,1] = 1
+        self.assertEqual(p[0,1], 1)
+        self.assertEqual((p*p).to_mat2(), Mat2(p.data)*Mat2(p.data))
+        inv = self.m4.packed().inverse()
+        self.assertEqual(inv * self.m4.packed(), PackedMat2.id(5))
+        self.assertIsNone(self.m3.packed().inverse())
+        self.assertEqual(self.m3.packed().rank(), 4)
+        b = PackedMat2([[1],[1],[0],[0],[0]])
+        self.assertEqual(self.m3.packed() * self.m3.packed().solve(b), b)
+        m0, m1 = self.m3.packed().factor()
+        self.assertEqual(m0 * m1, self.m3.packed())
+
+    def test_large_matrices_use_packed_rows(self):
+        random.seed(1)
+        n = Mat2.PACKED_MIN_SIZE + 10
+        while True:
+            m = Mat2([[random.randint(0,1) for _ in range(n)] for _ in range(n)])
+            inv = m.inverse()
+            if inv is not None: break
+        self.assertIsInstance(inv, Mat2)
+        self.assertEqual(m * inv, Mat2.id(n))
+        self.assertEqual(m.rank(), n)
+        b = Mat2([[random.randint(0,1)] for _ in range(n)])
+        self.assertEqual(m * m.solve(b), b)
+        singular = Mat2([list(r) for r in m.data])
+        singular.data[3] = list(singular.data[5])
+        self.assertEqual(singular.rank(), n-1)
+        kernel = singular.nullspace()
+        self.assertEqual(len(kernel), 1)
+        self.assertEqual(singular * Mat2([[v] for v in kernel[0]]), Mat2.zeros(n,1))
+
     def test_rank_factorise(self):
         A = np.array([[1, 1, 1, 1, 1],
                       [1, 1, 1, 1, 1],
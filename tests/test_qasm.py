@@ -118,6 +118,82 @@ class TestQASM(unittest.TestCase):
         self.assertEqual(c1.qubits, c.qubits)
         self.assertListEqual(c1.gates,c.gates)
 
+    def test_iter_gates_streams_lines(self):
+        from pyzx.circuit.qasmparser import QASMParser
+        lines = """OPENQASM 2.0;
+        include "qelib1.inc"; // the standard gates
+        qreg q[3]; creg c[1];
+        h q[0];
+        gate maj a,b,
+             c
+        { cx c,b; cx c,a;
+          ccx a,b,c; }
+        maj q[0],q[1],
+            q[2];
+        measure q[0] -> c[0];
+        if (c==1) {
+            x q[1]; z q[2];
+        }
+        rz(pi/4) q[2]""".splitlines()
+        read = []
+        def source():
+            for l in lines:
+                read.append(l)
+                yield l
+        p = QASMParser()
+        gates = p.iter_gates(source())
+        first = next(gates)
+        self.assertEqual((first.name, first.target), ('HAD', 0))
+        self.assertEqual(len(read), 4)
+        gates = [first] + list(gates)
+        self.assertEqual((p.qubit_count, p.bit_count), (3, 1))
+        self.assertListEqual(gates, QASMParser().parse("\n".join(lines)).gates)
+        self.assertEqual(len(gates), 8)
+
+    def test_qasm_file_to_graph(self):
+        import tempfile
+        from pyzx.circuit.qasmparser import qasm_file_to_graph
+        from pyzx.circuit.graphparser import gates_to_graph
+        s = """OPENQASM 2.0;
+        include "qelib1.inc";
+        qreg q[3];
+        creg c[1];
+        h q[0];
+        ccx q[0],q[1],q[2];
+        rz(pi/4) q[1];
+        measure q[0] -> c[0];
+        reset q[0];
+        if (c==1) x q[2];
+        """
+        with tempfile.TemporaryDirectory() as d:
+            fname = os.path.join(d, 'c.qasm')
+            with open(fname, 'w') as f:
+                f.write(s)
+            c = Circuit.from_qasm_file(fname)
+            for zh in (False, True):
+                with self.subTest(zh=zh):
+                    g1 = c.to_graph(zh=zh)
+                    g2 = qasm_file_to_graph(fname, zh=zh)
+                    self.assertEqual(g2.num_vertices(), g1.num_vertices())
+                    self.assertEqual(g2.num_edges(), g1.num_edges())
+                    self.assertEqual(len(g2.inputs()), len(g1.inputs()))
+                    self.assertEqual(len(g2.outputs()), len(g1.outputs()))
+                    self.assertEqual(sorted(g2.types().values()), sorted(g1.types().values()))
+            g3 = gates_to_graph((g for g in c.to_basic_gates().gates), c.qubits, c.bits)
+            self.assertEqual(g3.num_vertices(), c.to_graph().num_vertices())
+            with open(fname, 'w') as f:
+                f.write(s + "qreg r[1];\nh r[0];\n")
+            with self.assertRaises(TypeError):
+                qasm_file_to_graph(fname)
+
+    def test_unterminated_block(self):
+        from pyzx.circuit.qasmparser import QASMParser
+        header = 'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[2];\n'
+        for s in ('gate g a { h a;', 'creg c[1];\nif (c==1) { x q[0];'):
+            with self.subTest(s=s):
+                with self.assertRaises(TypeError):
+                    QASMParser().parse(header + s)
+
     def test_broadcasting(self):
         """Test that broadcasting is handled correctly.
 
@@ -26,7 +26,7 @@ if __name__ == '__main__':
     sys.path.append('.')
 
 import pyzx as zx
-from pyzx.rank_width import conv_uv, conv_vw, conv_naive
+from pyzx.rank_width import conv_uv, conv_vw, conv_naive, apply_parity_map, phase_tensor, walsh_hadamard
 from pyzx.tensor import tensorfy
 
 
@@ -72,6 +72,48 @@ class TestRankWidth(unittest.TestCase):
         self.check_amplitude(res_vw, corr, 'conv_vw')
         self.check_amplitude(res_uv, corr, 'conv_uv')
 
+    def test_convolution_shapes(self):
+        for r_u, r_v, r_w in [(0, 2, 1), (1, 0, 2), (3, 1, 0), (2, 2, 2), (1, 3, 3)]:
+            Psi_v = np.random.random((4, 2 ** r_v)) + 1j * np.random.random((4, 2 ** r_v))
+            Psi_w = np.random.random((2, 2 ** r_w)) + 1j * np.random.random((2, 2 ** r_w))
+            E_vw = np.random.randint(2, size=(r_v, r_w)).astype(np.int8)
+            E_vu = np.random.randint(2, size=(r_v, r_u)).astype(np.int8)
+            E_wu = np.random.randint(2, size=(r_w, r_u)).astype(np.int8)
+            corr = conv_naive(Psi_v, Psi_w, E_vw, E_vu, E_wu)
+            self.assertEqual(corr.shape, (8, 2 ** r_u))
+            self.check_amplitude(conv_vw(Psi_v, Psi_w, E_vw, E_vu, E_wu), corr, 'conv_vw')
+            self.check_amplitude(conv_uv(Psi_v, Psi_w, E_vw, E_vu, E_wu), corr, 'conv_uv')
+
+    def test_parity_map(self):
+        for n, m in [(3, 4), (4, 2), (4, 4), (0, 2), (2, 0)]:
+            M = np.random.randint(2, size=(n, m)).astype(np.int8)
+            if n > 1:
+                M[-1] = M[0]  # make sure the map is not injective
+            Psi = np.random.random((3, 2 ** n)) + 1j * np.random.random((3, 2 ** n))
+            corr = np.zeros((3, 2 ** m), dtype=np.complex128)
+            for x in range(2 ** n):
+                y = 0
+                for i in range(n):
+                    if (x >> i) & 1:
+                        y ^= sum(int(M[i, j]) << j for j in range(m))
+                corr[:, y] += Psi[:, x]
+            corr /= np.sqrt(2) ** (M.sum() - m)
+            self.check_amplitude(apply_parity_map(Psi, M), corr, f'{M}')
+
+    def test_phase_tensor(self):
+        E = np.random.randint(2, size=(3, 2)).astype(np.int8)
+        P = phase_tensor(E)
+        for a in range(8):
+            for b in range(4):
+                aEb = sum(((a >> i) & 1) * E[i, j] * ((b >> j) & 1) for i in range(3) for j in range(2))
+                self.assertAlmostEqual(P[a + 8 * b], (-1) ** aEb / np.sqrt(2) ** E.sum())
+
+    def test_walsh_hadamard(self):
+        Psi = np.random.random((2, 3, 16)) + 1j * np.random.random((2, 3, 16))
+        H = np.array([[1, 1], [1, -1]])
+        H4 = np.kron(np.kron(H, H), np.kron(H, H))
+        self.check_amplitude(walsh_hadamard(Psi), Psi @ H4.T)
+
     def test_tensorfy_rw_one_edge(self):
         g = zx.Graph()
         g.add_vertex(zx.VertexType.Z, phase=0)
@@ -18,7 +18,7 @@ import unittest
 import sys
 import numpy as np
 from fractions import Fraction
-from pyzx.graph.scalar import Scalar
+from pyzx.graph.scalar import Scalar, ZOmega
 from pyzx.symbolic import Poly, new_var
 
 if __name__ == '__main__':
@@ -514,6 +514,71 @@ class TestScalar(unittest.TestCase):
         unicode_repr = scalar.to_unicode()
         self.assertIsInstance(unicode_repr, str)
 
+    def test_zomega_arithmetic(self):
+        """ZOmega agrees with complex arithmetic and is canonical"""
+        rng = np.random.default_rng(7)
+        for _ in range(200):
+            x = ZOmega(*(int(c) for c in rng.integers(-6, 7, 4)), k=int(rng.integers(-3, 4)))
+            y = ZOmega(*(int(c) for c in rng.integers(-6, 7, 4)), k=int(rng.integers(-3, 4)))
+            self.assertAlmostEqual(complex(x + y), complex(x) + complex(y))
+            self.assertAlmostEqual(complex(x * y), complex(x) * complex(y))
+            self.assertAlmostEqual(complex(x.conjugate()), complex(x).conjugate())
+            self.assertEqual(x - x, 0)
+        sqrt2 = ZOmega(0, 1, 0, -1)
+        self.assertEqual(sqrt2, ZOmega(1, k=1))
+        self.assertEqual(sqrt2 * sqrt2, ZOmega(2))
+        self.assertEqual(ZOmega(2), ZOmega(1, k=2))
+        self.assertEqual(ZOmega.omega_power(2) + 1, ZOmega(1, 0, 1, 0))
+        self.assertEqual(hash(ZOmega(4, 0, 0, 0)), hash(ZOmega(1, k=4)))
+        self.assertIsNone(ZOmega.from_phase(Fraction(1, 8)))
+
+    def test_add_node_exact(self):
+        """Phase nodes that are multiples of pi/4 are folded into the exact factor"""
+        scalar = Scalar()
+        expected = 1
+        for node in [Fraction(1, 4), Fraction(1, 2), Fraction(3, 4), Fraction(7, 4), Fraction(3, 2), 0]:
+            scalar.add_node(node)
+            expected *= 1 + np.exp(1j * np.pi * node)
+        self.assertEqual(scalar.phasenodes, [])
+        self.assertEqual(scalar.factor.k, 0)
+        self.assertAlmostEqual(scalar.to_number(), expected)
+        self.assertAlmostEqual(complex(scalar.to_exact()), expected)
+        scalar.add_node(Fraction(1, 8))
+        self.assertEqual(scalar.phasenodes, [Fraction(1, 8)])
+        self.assertIsNone(scalar.to_exact())
+        scalar.add_node(1)
+        self.assertTrue(scalar.is_zero)
+        self.assertEqual(scalar.to_exact(), 0)
+
+    def test_to_exact(self):
+        """to_exact folds the phase, phase nodes and sums of phases of a Clifford+T scalar"""
+        scalar = Scalar()
+        scalar.phase = Fraction(3, 4)
+        scalar.power2 = -3
+        scalar.phasenodes = [Fraction(5, 4)]
+        scalar.sum_of_phases = {0: 1, Fraction(1, 4): 2, Fraction(5, 4): -1}
+        self.assertAlmostEqual(complex(scalar.to_exact()), scalar.to_number())
+        # a sum of phases that cancels makes the scalar zero
+        scalar.sum_of_phases = {0: 1, 1: 1}
+        self.assertEqual(scalar.to_exact(), 0)
+        self.assertAlmostEqual(scalar.to_number(), 0)
+        scalar.sum_of_phases = {}
+        scalar.floatfactor = 2.0
+        self.assertIsNone(scalar.to_exact())
+
+    def test_factor_copy_and_serialization(self):
+        """The exact factor survives copies, conjugation, multiplication and JSON"""
+        scalar = Scalar()
+        scalar.add_node(Fraction(1, 4))
+        scalar.add_node(Fraction(3, 4))
+        scalar.multiply_exact(ZOmega(3, -1, 0, 2))
+        self.assertEqual(scalar.copy(), scalar)
+        self.assertAlmostEqual(scalar.conjugate().to_number(), scalar.to_number().conjugate())
+        self.assertEqual(Scalar.from_json(scalar.to_json()), scalar)
+        other = scalar.copy()
+        other.mult_with_scalar(scalar)
+        self.assertAlmostEqual(other.to_number(), scalar.to_number() ** 2)
+
 
 
 if __name__ == '__main__':
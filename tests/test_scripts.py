@@ -23,6 +23,9 @@ if __name__ == '__main__':
     sys.path.append('.')
 
 import io
+import json
+import shutil
+import tempfile
 
 from pyzx.scripts import main
 
@@ -56,6 +59,62 @@ class TestScripts(unittest.TestCase):
         os.remove('tests/other_name.bla')
         sys.stdout = sys.__stdout__
 
+    def make_batch(self, d):
+        """Copies a test circuit to ``src/a.circuit`` and ``src/sub/b.circuit`` in ``d``,
+        and returns the source directory, output directory and results file to use."""
+        src = os.path.join(d, 'src')
+        os.makedirs(os.path.join(src, 'sub'))
+        shutil.copy('tests/test_circuit.circuit', os.path.join(src, 'a.circuit'))
+        shutil.copy('tests/test_circuit.circuit', os.path.join(src, 'sub', 'b.circuit'))
+        return src, os.path.join(d, 'out'), os.path.join(d, 'results.jsonl')
+
+    def read_results(self, results):
+        with open(results) as f:
+            return [json.loads(line) for line in f]
+
+    def test_optimize_batch_with_results(self):
+        sys.stdout = io.StringIO()
+        try:
+            with tempfile.TemporaryDirectory() as d:
+                src, out, results = self.make_batch(d)
+                main(['fakepath', 'opt', '--jobs', '2', '--results', results, '-d', out, '-t', 'qasm', src])
+                self.assertTrue(os.path.isfile(os.path.join(out, 'a.qasm')))
+                self.assertTrue(os.path.isfile(os.path.join(out, 'sub', 'b.qasm')))
+                rows = self.read_results(results)
+                self.assertEqual(sorted(os.path.basename(r['source']) for r in rows), ['a.circuit', 'b.circuit'])
+                for r in rows:
+                    self.assertEqual(r['status'], 'ok')
+                    self.assertGreater(r['gates_before'], 0)
+                # the circuits in the results file are skipped when running again
+                shutil.copy('tests/test_circuit.circuit', os.path.join(src, 'c.circuit'))
+                main(['fakepath', 'opt', '--results', results, '-d', out, '-t', 'qasm', os.path.join(src, '*.circuit')])
+                rows = self.read_results(results)
+                self.assertEqual(len(rows), 3)
+                self.assertEqual(os.path.basename(rows[-1]['source']), 'c.circuit')
+        finally:
+            sys.stdout = sys.__stdout__
+
+    def test_optimize_batch_resume_keeps_output_paths(self):
+        sys.stdout = io.StringIO()
+        output_files = lambda out: {os.path.join(r, f) for r, _, fs in os.walk(out) for f in fs}
+        try:
+            with tempfile.TemporaryDirectory() as d:
+                src, out, results = self.make_batch(d)
+                main(['fakepath', 'opt', '--results', results, '-d', out, '-t', 'qasm', src])
+                self.assertEqual(output_files(out), {os.path.join(out, 'a.qasm'), os.path.join(out, 'sub', 'b.qasm')})
+                # drop the row of b and resume: only b is redone, and written to the same path
+                rows = self.read_results(results)
+                with open(results, 'w') as f:
+                    for r in rows:
+                        if os.path.basename(r['source']) != 'b.circuit': f.write(json.dumps(r) + '\n')
+                shutil.rmtree(out)
+                main(['fakepath', 'opt', '--results', results, '-d', out, '-t', 'qasm', src])
+                self.assertEqual(output_files(out), {os.path.join(out, 'sub', 'b.qasm')})
+                rows = self.read_results(results)
+                self.assertEqual(sorted(os.path.basename(r['source']) for r in rows), ['a.circuit', 'b.circuit'])
+        finally:
+            sys.stdout = sys.__stdout__
+
     def test_tikz_conversion(self):
         sys.stdout = io.StringIO()
         main('fakepath tikz tests/test_circuit.circuit tests/tikz_circuit.tikz'.split())
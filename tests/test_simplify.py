@@ -31,9 +31,10 @@ from pyzx.circuit import Circuit
 from pyzx.circuit.qasmparser import qasm
 from pyzx.symbolic import Poly
 from fractions import Fraction
-from pyzx.generate import cliffordT
+from pyzx.generate import cliffordT, CNOT_HAD_PHASE_circuit
 from pyzx.simplify import *
-from pyzx.simplify import supplementarity_simp, to_clifford_normal_form_graph, copy_simp
+from pyzx.simplify import supplementarity_simp, to_clifford_normal_form_graph, copy_simp, fuse_simp
+from pyzx.rewrite import Stats, RewriteSimpSingleVertex, RewriteSimpDoubleVertex
 from pyzx import compare_tensors
 from pyzx.generate import cliffordT
 from tests import STEANE_X_STABILISER_QASM
@@ -361,6 +362,45 @@ class TestSimplify(unittest.TestCase):
     def test_clifford_simp(self):
         self.func_test(clifford_simp)
 
+    def test_incremental_simp_reaches_fixed_point(self):
+        random.seed(SEED)
+        for i in range(5):
+            with self.subTest(i=i):
+                g = cliffordT(4, 60, 0.2)
+                g2 = g.copy()
+                rewrites = [id_simp, fuse_simp, pivot_simp, lcomp_simp]
+                try:
+                    for r in rewrites: r.incremental = False
+                    clifford_simp(g2)
+                finally:
+                    for r in rewrites: r.incremental = True
+                clifford_simp(g)
+                self.assertTrue(compare_tensors(g, g2, False))
+                self.assertEqual(g.num_vertices(), g2.num_vertices())
+                for r in rewrites:
+                    self.assertEqual(len(r.find_all_matches(g)), 0)
+
+    def test_incremental_simp_matches_full_scan(self):
+        import pyzx.simplify
+        rewrites = [r for r in vars(pyzx.simplify).values()
+                    if isinstance(r, (RewriteSimpSingleVertex, RewriteSimpDoubleVertex))]
+        random.seed(SEED)
+        for i in range(8):
+            with self.subTest(i=i):
+                c = CNOT_HAD_PHASE_circuit(6 + i % 3, 200 + 40 * i, p_had=0.2, p_t=0.2)
+                g, g2 = c.to_graph(), c.to_graph()
+                try:
+                    for r in rewrites: r.incremental = False
+                    full_reduce(g2)
+                finally:
+                    for r in rewrites: r.incremental = True
+                full_reduce(g)
+                # the same rewrites are applied in the same order, so the graphs are equal
+                self.assertEqual(list(g.vertices()), list(g2.vertices()))
+                self.assertEqual(sorted((g.edge_st(e), g.edge_type(e)) for e in g.edges()),
+                                 sorted((g2.edge_st(e), g2.edge_type(e)) for e in g2.edges()))
+                self.assertEqual(g.phases(), g2.phases())
+
     def test_supplementarity_simp(self):
         g = Graph()
         v = g.add_vertex(1,0,0,phase=Fraction(1,4))
@@ -385,6 +425,28 @@ class TestSimplify(unittest.TestCase):
                 c2 = Circuit.from_graph(teleport_reduce(g))
                 self.assertTrue(c.verify_equality(c2))
 
+    def test_full_reduce_backends(self):
+        random.seed(4)
+        c = CNOT_HAD_PHASE_circuit(5, 80, p_had=0.2, p_t=0.3)
+        counts = []
+        for backend in ('simple', 'multigraph', 'array', 'cow'):
+            with self.subTest(backend=backend):
+                g = c.to_graph(backend=backend)
+                full_reduce(g)
+                self.assertTrue(compare_tensors(c, g))
+                counts.append((g.num_vertices(), g.num_edges()))
+        self.assertEqual(len(set(counts)), 1)
+
+    def test_teleport_reduce_backends(self):
+        random.seed(4)
+        c = CNOT_HAD_PHASE_circuit(5, 80, p_had=0.2, p_t=0.3)
+        for backend in ('simple', 'multigraph', 'array', 'cow'):
+            with self.subTest(backend=backend):
+                g = c.to_graph(backend=backend)
+                g2 = teleport_reduce(g)
+                self.assertEqual(g2.num_vertices(), g.num_vertices())
+                self.assertTrue(c.verify_equality(Circuit.from_graph(g2)))
+
     def test_to_graph_like_introduce_boundary_vertices(self):
         c = qasm(qasm_5)
         g = c.to_graph()
@@ -516,6 +578,51 @@ class TestSimplify(unittest.TestCase):
         self.assertTrue(g.num_vertices() == g1.num_vertices())
         self.assertTrue(compare_tensors(g1.to_tensor(),g.to_tensor()))
 
+    def test_full_reduce_stats(self):
+        rounds = []
+        stats = Stats(trace=rounds.append)
+        g = self.circuits[0]
+        g1 = g.copy()
+        full_reduce(g, stats=stats)
+        full_reduce(g1)
+        self.assertEqual(g.num_vertices(), g1.num_vertices())
+        self.assertTrue(compare_tensors(g.to_tensor(), g1.to_tensor()))
+
+        for name in ('fuse_simp', 'id_simp', 'pivot_simp', 'lcomp_simp', 'gadget_simp'):
+            self.assertIn(name, stats.profile)
+        self.assertGreater(stats.num_rewrites['fuse_simp'], 0)
+        for name, p in stats.profile.items():
+            self.assertEqual(p.rewrites, stats.num_rewrites.get(name, 0))
+            if p.scans: self.assertLessEqual(p.rewrites, p.matches)
+            self.assertGreaterEqual(p.match_time, 0)
+        self.assertEqual(sum(r['rewrites'] for r in rounds), sum(stats.num_rewrites.values()))
+        self.assertEqual(rounds[-1]['vertices'], g.num_vertices())
+        self.assertIn('PROFILE', str(stats))
+
+    def test_simp_stats_counts_vertices(self):
+        g = Graph()
+        b0 = g.add_vertex(VertexType.BOUNDARY, 0, 0)
+        vs = [g.add_vertex(VertexType.Z, 0, i+1) for i in range(4)]
+        b1 = g.add_vertex(VertexType.BOUNDARY, 0, 5)
+        g.add_edges([(b0, vs[0]), (vs[0], vs[1]), (vs[1], vs[2]), (vs[2], vs[3]), (vs[3], b1)])
+        stats = Stats()
+        self.assertTrue(fuse_simp(g, stats))
+        p = stats.profile['fuse_simp']
+        self.assertEqual(p.rewrites, 3)
+        self.assertEqual(p.vertices_removed, 3)
+        self.assertEqual(p.edges_removed, 3)
+        self.assertEqual(p.vertices_added + p.edges_added, 0)
+        self.assertGreaterEqual(p.scans, 2)
+
+    def test_rewrites_are_named_after_their_variable(self):
+        import pyzx.hsimplify, pyzx.ft_simplify, pyzx.circuit.sqasm
+        from pyzx.rewrite import Rewrite
+        for module in (pyzx.simplify, pyzx.hsimplify, pyzx.ft_simplify, pyzx.circuit.sqasm):
+            for name, value in vars(module).items():
+                if isinstance(value, Rewrite):
+                    with self.subTest(module=module.__name__, name=name):
+                        self.assertEqual(value.name, name)
+
     def test_measurement_outcomes_survive_reduction(self):
         """Symbolic measurement outcomes must survive full_reduce.
 
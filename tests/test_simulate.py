@@ -118,6 +118,96 @@ class TestSimulate(unittest.TestCase):
         # Check if the scalar from generated term is correct
         self.assertTrue(G.scalar.to_number() == s.to_number())
 
+    def test_simulate_sums_exactly(self):
+        """The terms of the BSS strategy have exact scalars, so simulate doesn't depend on
+        the order in which they are produced."""
+        from pyzx.generate import CNOT_HAD_PHASE_circuit
+        from pyzx.simulation import Strategy, full_decompose, simulate
+        from pyzx.tensor import tensorfy
+        random.seed(5)
+        g = CNOT_HAD_PHASE_circuit(6, 120, p_t=0.25).to_graph()
+        g.apply_state('0'*6)
+        g.apply_effect('0'*6)
+        full_reduce(g)
+        expected = complex(tensorfy(g.copy(), strategy='greedy'))
+        random.seed(1)
+        terms = full_decompose(Strategy.BSS, g.copy())
+        self.assertTrue(all(h.scalar.to_exact() is not None for h in terms))
+        values = set()
+        for seed in range(3):
+            random.seed(seed)
+            values.add(simulate(Strategy.BSS, g.copy()))
+        self.assertEqual(len(values), 1)
+        self.assertAlmostEqual(values.pop(), expected)
+
+    def test_scalar_sum(self):
+        from pyzx.graph.scalar import ZOmega
+        from pyzx.simulation import ScalarSum
+        total = ScalarSum()
+        for i in range(8):
+            s = Scalar()
+            s.add_phase(Fraction(i,4))
+            total.add(s)
+        # The eighth roots of unity sum to exactly zero
+        self.assertEqual(total.to_exact(), ZOmega())
+        self.assertEqual(total.num_terms, 8)
+        # Scalars that are not Clifford+T are added with compensated summation
+        big, one, neg = Scalar(), Scalar(), Scalar()
+        big.add_float(1e16)
+        one.add_float(1.0)
+        neg.add_float(-1e16)
+        total.extend(iter([big, one, one, neg]))
+        self.assertIsNone(total.to_exact())
+        self.assertEqual(total.to_number(), 2)
+        other = ScalarSum()
+        other.add(Scalar())
+        total.merge(other)
+        self.assertAlmostEqual(total.to_number(), 3)
+        self.assertEqual(total.num_terms, 13)
+
+    def test_iter_full_decompose(self):
+        from pyzx.generate import CNOT_HAD_PHASE_circuit
+        from pyzx.simulation import Strategy, full_decompose, iter_full_decompose
+        random.seed(3)
+        g = CNOT_HAD_PHASE_circuit(6, 150, p_t=0.3).to_graph()
+        g.apply_state('0'*6)
+        g.apply_effect('0'*6)
+        full_reduce(g)
+        for kind in (Strategy.BSS, Strategy.MAGIC_CAT):
+            random.seed(7)
+            terms = full_decompose(kind, g.copy())
+            random.seed(7)
+            it = iter_full_decompose(kind, g.copy())
+            self.assertFalse(isinstance(it, list))
+            lazy_terms = list(it)
+            self.assertEqual(len(terms), len(lazy_terms))
+            self.assertTrue(len(terms) > 1)
+            for h1, h2 in zip(terms, lazy_terms):
+                self.assertEqual(h1.scalar, h2.scalar)
+
+    def test_parallel_simulate(self):
+        from pyzx.generate import CNOT_HAD_PHASE_circuit
+        from pyzx.simulation import Strategy, parallel_simulate, split_decompose
+        from pyzx.tensor import tensorfy
+        random.seed(5)
+        g = CNOT_HAD_PHASE_circuit(6, 120, p_t=0.25).to_graph()
+        g.apply_state('0'*6)
+        g.apply_effect('0'*6)
+        full_reduce(g)
+        expected = complex(tensorfy(g.copy(), strategy='greedy'))
+        random.seed(0)
+        self.assertTrue(len(split_decompose(Strategy.BSS, g.copy(), 2)) > 1)
+        val = parallel_simulate(Strategy.BSS, g.copy(), max_workers=1, seed=3)
+        self.assertAlmostEqual(val, expected)
+        # The result only depends on the seed, not on how the work is distributed
+        self.assertEqual(val, parallel_simulate(Strategy.BSS, g.copy(), max_workers=2, seed=3))
+        random.seed(4)
+        val1 = parallel_simulate(Strategy.MAGIC_CAT, g.copy(), depth=1, max_workers=1)
+        random.seed(4)
+        val2 = parallel_simulate(Strategy.MAGIC_CAT, g.copy(), depth=1, max_workers=2)
+        self.assertEqual(val1, val2)
+        self.assertAlmostEqual(val1, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -25,17 +25,21 @@ if __name__ == '__main__':
     sys.path.append('..')
     sys.path.append('.')
 import math
+import os
+import tempfile
+from fractions import Fraction
 
 from pyzx.graph import Graph
 from pyzx.graph.multigraph import Multigraph
-from pyzx.generate import cliffords
+from pyzx.generate import cliffords, CNOT_HAD_PHASE_circuit
+from pyzx.simplify import full_reduce
 from pyzx.circuit import Circuit
-from pyzx.utils import VertexType, set_h_box_label
+from pyzx.utils import VertexType, EdgeType, set_h_box_label, set_z_box_label
 
 np: Optional[ModuleType]
 try:
     import numpy as np
-    from pyzx.tensor import tensorfy, compare_tensors, compose_tensors, adjoint, H_to_tensor
+    from pyzx.tensor import tensorfy, compare_tensors, compose_tensors, adjoint, H_to_tensor, tensor_to_matrix
 except ImportError:
     np = None
 
@@ -281,6 +285,84 @@ class TestTensor(unittest.TestCase):
 
         self.assertTrue(compare_tensors(g1, g2, preserve_scalar=True))
 
+    def greedy_test_graphs(self):
+        random.seed(SEED)
+        graphs = []
+        for q, n in [(3, 30), (4, 60)]:
+            g = CNOT_HAD_PHASE_circuit(q, n, p_had=0.2, p_t=0.2).to_graph()
+            graphs.append(g)
+            g = g.copy()
+            full_reduce(g)
+            graphs.append(g)
+        g = Multigraph()
+        g.set_auto_simplify(False)
+        i = g.add_vertex(VertexType.BOUNDARY, 0, 0)
+        x = g.add_vertex(VertexType.X, 0, 1, phase=Fraction(1, 4))
+        h = g.add_vertex(VertexType.H_BOX, 1, 1, phase=Fraction(1, 2))
+        z = g.add_vertex(VertexType.Z_BOX, 0, 2)
+        set_z_box_label(g, z, 0.5+1j)
+        o = g.add_vertex(VertexType.BOUNDARY, 0, 3)
+        g.add_edges([(i, x), (x, h), (x, h), (h, z), (z, o)])
+        g.add_edge((x, x), EdgeType.HADAMARD)
+        g.add_edge((x, z), EdgeType.HADAMARD)
+        g.add_edge((z, z))
+        g.set_inputs((i,))
+        g.set_outputs((o,))
+        graphs.append(g)
+        return graphs
+
+    def test_greedy_strategy(self):
+        for i, g in enumerate(self.greedy_test_graphs()):
+            with self.subTest(i=i):
+                t = tensorfy(g, strategy='naive')
+                self.assertTrue(np.allclose(tensorfy(g, strategy='greedy'), t))
+                self.assertTrue(compare_tensors(tensorfy(g, False, strategy='greedy'), t))
+
+    def test_greedy_memory_limit(self):
+        g = self.greedy_test_graphs()[2]
+        t = tensorfy(g, strategy='naive')
+        with self.assertRaises(MemoryError):
+            tensorfy(g, memory_limit=1000)
+        # A limit that requires the computation to be split up
+        self.assertTrue(np.allclose(tensorfy(g, memory_limit=2**14), t))
+
+    def test_greedy_scalar(self):
+        random.seed(3)
+        c = CNOT_HAD_PHASE_circuit(6, 60, p_had=0.3, p_t=0.3)
+        g = c.to_graph()
+        g.apply_state('010110')
+        g.apply_effect('110010')
+        t = tensorfy(g, strategy='naive')
+        self.assertTrue(np.allclose(tensorfy(g, strategy='greedy'), t))
+        # the result is a scalar that is summed over slices
+        self.assertTrue(np.allclose(tensorfy(g, memory_limit=8000), t))
+        # a diagram that is only a scalar
+        full_reduce(g)
+        self.assertEqual(g.num_vertices(), 0)
+        self.assertTrue(np.allclose(tensorfy(g, memory_limit=8000), t))
+
+    def test_greedy_large_circuit(self):
+        # the scalar and the intermediate tensors of this diagram are out of the range of a float,
+        # but the unitary it represents is not
+        random.seed(0)
+        c = CNOT_HAD_PHASE_circuit(3, 3000, p_had=0.2, p_t=0.2)
+        g = c.to_graph()
+        t = tensorfy(g, strategy='greedy')
+        self.assertTrue(np.isfinite(t).all())
+        self.assertTrue(np.allclose(tensor_to_matrix(t, 3, 3), c.to_matrix()))
+        self.assertTrue(compare_tensors(tensorfy(g, False, strategy='greedy'), t))
+
+    def test_greedy_memmap(self):
+        g = self.greedy_test_graphs()[2]
+        t = tensorfy(g, strategy='naive')
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'tensor.npy')
+            m = tensorfy(g, out=path, memory_limit=2**14)
+            self.assertIsInstance(m, np.memmap)
+            self.assertTrue(np.allclose(m, t))
+            self.assertTrue(np.allclose(np.load(path, mmap_mode='r'), t))
+            del m
+
 
 if __name__ == '__main__':
     unittest.main()